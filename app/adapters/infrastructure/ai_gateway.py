@@ -6,14 +6,31 @@ This gateway implements a "Gears" (Marchas) system:
 - Low Gear (Marcha Baixa): Qwen-3-32B or Llama-8B for internal Groq rate limit fallback
 - Cannon Shot (Tiro de Canhão): Gemini-1.5-Pro as external fallback when Groq entirely fails
 - Auto-Repair: Captures critical errors and dispatches auto-fix to GitHub Actions
+- Streaming: stream_completion() yields text deltas as they arrive (same Gears/fallbacks)
+- Native async clients over a pooled keep-alive connection, bounded per provider
+- Proactive scheduling: per-model requests/tokens budgets (from x-ratelimit-* headers)
+  and half-open circuit breakers pick the gear for each request before a 429 happens
 """
 
 import asyncio
+import json
 import logging
 import os
+import time
 import traceback
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from app.adapters.infrastructure.completion_cache import CompletionCache, build_cache_key
+from app.adapters.infrastructure.provider_limits import (
+    CircuitBreaker,
+    ConcurrencyLimiter,
+    LatencyWindow,
+    ModelBudget,
+    parse_reset_duration,
+)
+from app.adapters.infrastructure.token_accounting import TokenCounter
+from app.application.ports.state_store import StateStore
 
 # Try to import tiktoken, but don't fail if it's not available
 try:
@@ -46,12 +63,24 @@ def _get_tokenizer():
     return _TOKENIZER_CACHE if _TOKENIZER_CACHE else None
 
 
+# Module-level token counter so every gateway shares one memo of counted texts
+_TOKEN_COUNTER = None
+
+
+def _get_token_counter() -> TokenCounter:
+    """Get or create the shared memoizing token counter"""
+    global _TOKEN_COUNTER
+    if _TOKEN_COUNTER is None:
+        _TOKEN_COUNTER = TokenCounter(_get_tokenizer())
+    return _TOKEN_COUNTER
+
+
 def count_tokens(text: str) -> int:
     """
     Count tokens in the given text.
     
     Uses tiktoken if available, otherwise falls back to character-based approximation
-    using a 1:4 ratio (1 token ≈ 4 characters).
+    using a 1:4 ratio (1 token ≈ 4 characters). Counts are memoized per text.
     
     Args:
         text: Text to count tokens for
@@ -59,16 +88,7 @@ def count_tokens(text: str) -> int:
     Returns:
         Approximate token count
     """
-    if HAS_TIKTOKEN:
-        tokenizer = _get_tokenizer()
-        if tokenizer:
-            try:
-                return len(tokenizer.encode(text))
-            except Exception as e:
-                logger.warning(f"Error counting tokens: {e}. Using character approximation.")
-    
-    # Fallback: rough approximation (1 token ≈ 4 characters)
-    return len(text) // 4
+    return _get_token_counter().count(text)
 
 
 class LLMProvider(str, Enum):
@@ -94,6 +114,14 @@ class AIGateway:
       * Cannon Shot (Tiro de Canhão): Gemini-1.5-Pro (external fallback)
     - Automatically escalate to Gemini for large contexts (>10k tokens)
     - Auto-repair on critical errors (sends fixes to GitHub Actions)
+    - Completion cache (memory LRU + optional SQLite) for repeated prompts
+    - Native async SDK clients with a shared keep-alive pool and per-provider
+      concurrency limits (sync clients assigned directly run in the executor)
+    - Per-request gear selection: each request picks its gear from per-model
+      budgets and circuit breakers; a breaker re-admits High Gear via one probe
+    - Optional hedging: a High Gear request slower than its observed p95 is
+      raced against Low Gear and the slower call is cancelled
+    - Single-flight coalescing: identical in-flight prompts share one upstream call
     """
     
     # Token threshold for context-based escalation
@@ -110,6 +138,19 @@ class AIGateway:
     # Gemini Cannon Shot (External Fallback)
     DEFAULT_GEMINI_MODEL = "gemini-1.5-pro"  # Changed from gemini-flash-latest
     
+    # Concurrency and connection pool defaults (overridable via env vars)
+    DEFAULT_GROQ_MAX_CONCURRENCY = 32
+    DEFAULT_GEMINI_MAX_CONCURRENCY = 16
+    DEFAULT_HTTP_MAX_CONNECTIONS = 100
+    DEFAULT_HTTP_MAX_KEEPALIVE = 20
+    
+    # Seconds a rate-limited model stays out of rotation when the provider gives no retry-after
+    DEFAULT_GEAR_COOLDOWN_SECONDS = 30.0
+    
+    # Hedging: delay used until enough High Gear latencies have been observed for a p95
+    DEFAULT_HEDGE_DELAY_SECONDS = 2.0
+    HEDGE_PERCENTILE = 0.95
+    
     def __init__(
         self,
         groq_api_key: Optional[str] = None,
@@ -120,6 +161,15 @@ class AIGateway:
         default_provider: LLMProvider = LLMProvider.GROQ,
         enable_auto_repair: bool = True,
         github_adapter: Optional[Any] = None,
+        completion_cache: Optional[CompletionCache] = None,
+        enable_cache: bool = True,
+        use_async_clients: bool = True,
+        groq_max_concurrency: Optional[int] = None,
+        gemini_max_concurrency: Optional[int] = None,
+        enable_hedging: Optional[bool] = None,
+        hedge_delay_seconds: Optional[float] = None,
+        enable_single_flight: Optional[bool] = None,
+        state_store: Optional[StateStore] = None,
         # Backward compatibility parameters
         groq_model: Optional[str] = None,
     ):
@@ -135,6 +185,16 @@ class AIGateway:
             default_provider: Default provider for routing (GROQ or GEMINI)
             enable_auto_repair: Enable auto-repair on critical errors
             github_adapter: Optional GitHubAdapter instance for auto-repair
+            completion_cache: Optional CompletionCache instance (defaults to one built from env vars)
+            enable_cache: Enable the completion cache (default: True)
+            use_async_clients: Use native async SDK clients instead of the executor (default: True)
+            groq_max_concurrency: Max in-flight Groq requests (defaults to JARVIS_GROQ_MAX_CONCURRENCY)
+            gemini_max_concurrency: Max in-flight Gemini requests (defaults to JARVIS_GEMINI_MAX_CONCURRENCY)
+            enable_hedging: Race slow High Gear requests against Low Gear (defaults to JARVIS_LLM_HEDGING, off)
+            hedge_delay_seconds: Fixed hedge delay (defaults to JARVIS_LLM_HEDGE_DELAY_MS, else observed p95)
+            enable_single_flight: Coalesce identical in-flight prompts (defaults to JARVIS_LLM_SINGLE_FLIGHT, on)
+            state_store: Optional shared store so circuit breaker trips (and with them the
+                         current gear) are seen by every API worker
             groq_model: (Deprecated) Use groq_high_gear_model instead. For backward compatibility.
         """
         # Handle backward compatibility: groq_model -> groq_high_gear_model
@@ -165,8 +225,41 @@ class AIGateway:
         self.enable_auto_repair = enable_auto_repair
         self.github_adapter = github_adapter
         
-        # Current Groq gear (starts at High Gear)
-        self.current_groq_gear = GroqGear.HIGH_GEAR
+        # Per-model scheduling state; the gear is chosen per request (see current_groq_gear)
+        cooldown = float(os.getenv(
+            "JARVIS_GEAR_COOLDOWN_SECONDS", str(self.DEFAULT_GEAR_COOLDOWN_SECONDS)
+        ))
+        self._groq_budgets = {
+            GroqGear.HIGH_GEAR: ModelBudget(self.groq_high_gear_model),
+            GroqGear.LOW_GEAR: ModelBudget(self.groq_low_gear_model),
+        }
+        self._groq_breakers = {
+            GroqGear.HIGH_GEAR: CircuitBreaker(self.groq_high_gear_model, cooldown, state_store),
+            GroqGear.LOW_GEAR: CircuitBreaker(self.groq_low_gear_model, cooldown, state_store),
+        }
+        self._gemini_breaker = CircuitBreaker(self.gemini_model, cooldown, state_store)
+        
+        # Tail-latency controls: hedged High Gear requests and single-flight coalescing
+        if enable_hedging is None:
+            enable_hedging = os.getenv("JARVIS_LLM_HEDGING", "false").lower() == "true"
+        if hedge_delay_seconds is None and os.getenv("JARVIS_LLM_HEDGE_DELAY_MS"):
+            hedge_delay_seconds = float(os.getenv("JARVIS_LLM_HEDGE_DELAY_MS")) / 1000
+        if enable_single_flight is None:
+            enable_single_flight = os.getenv("JARVIS_LLM_SINGLE_FLIGHT", "true").lower() == "true"
+        self.enable_hedging = enable_hedging
+        self.hedge_delay_seconds = hedge_delay_seconds
+        self.enable_single_flight = enable_single_flight
+        self._high_gear_latency = LatencyWindow()
+        # hedge_rescues: the hedge answered after High Gear failed (not a latency win)
+        self._hedge_stats = {"hedged": 0, "fired": 0, "primary_wins": 0, "hedge_wins": 0, "hedge_rescues": 0}
+        self._in_flight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._single_flight_stats = {"leaders": 0, "coalesced": 0}
+        
+        # Completion cache for repeated prompts
+        if not enable_cache:
+            self.completion_cache = None
+        else:
+            self.completion_cache = completion_cache or CompletionCache.from_env()
         
         # Get API keys from parameters or environment
         self.groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY")
@@ -174,10 +267,27 @@ class AIGateway:
         
         # Initialize tokenizer for token counting (use cached tokenizer)
         self.tokenizer = _get_tokenizer()
+        self.token_counter = _get_token_counter()
+        
+        # Per-provider concurrency limits (requests beyond the limit queue in the event loop)
+        self.use_async_clients = use_async_clients
+        self._limiters = {
+            LLMProvider.GROQ: ConcurrencyLimiter(
+                LLMProvider.GROQ.value,
+                groq_max_concurrency
+                or int(os.getenv("JARVIS_GROQ_MAX_CONCURRENCY", str(self.DEFAULT_GROQ_MAX_CONCURRENCY))),
+            ),
+            LLMProvider.GEMINI: ConcurrencyLimiter(
+                LLMProvider.GEMINI.value,
+                gemini_max_concurrency
+                or int(os.getenv("JARVIS_GEMINI_MAX_CONCURRENCY", str(self.DEFAULT_GEMINI_MAX_CONCURRENCY))),
+            ),
+        }
         
         # Initialize providers
         self.groq_client = None
         self.gemini_client = None
+        self._http_client = None
         
         self._initialize_groq()
         self._initialize_gemini()
@@ -190,9 +300,35 @@ class AIGateway:
             f"  - Default provider: {self.default_provider.value}\n"
             f"  - Groq available: {self.groq_client is not None}\n"
             f"  - Gemini available: {self.gemini_client is not None}\n"
-            f"  - Auto-repair: {self.enable_auto_repair}"
+            f"  - Auto-repair: {self.enable_auto_repair}\n"
+            f"  - Completion cache: {self.completion_cache is not None}\n"
+            f"  - Hedging: {self.enable_hedging}, single-flight: {self.enable_single_flight}\n"
+            f"  - Async clients: groq={self.groq_async_client is not None}, "
+            f"gemini={self.gemini_async_client is not None}"
         )
     
+    @property
+    def groq_client(self) -> Optional[Any]:
+        """Synchronous Groq client"""
+        return self._groq_client
+    
+    @groq_client.setter
+    def groq_client(self, client: Optional[Any]) -> None:
+        # A directly assigned client replaces the native async one and runs in the executor
+        self._groq_client = client
+        self.groq_async_client = None
+    
+    @property
+    def gemini_client(self) -> Optional[Any]:
+        """Synchronous Gemini client"""
+        return self._gemini_client
+    
+    @gemini_client.setter
+    def gemini_client(self, client: Optional[Any]) -> None:
+        # A directly assigned client replaces the native async one and runs in the executor
+        self._gemini_client = client
+        self.gemini_async_client = None
+    
     @property
     def groq_model(self) -> str:
         """Backward compatibility property for groq_model"""
@@ -206,35 +342,239 @@ class AIGateway:
         
         try:
             from groq import Groq
-            self.groq_client = Groq(api_key=self.groq_api_key)
+            self.groq_client = Groq(api_key=self.groq_api_key, http_client=self._create_sync_http_client())
+            if self.use_async_clients:
+                self.groq_async_client = self._create_groq_async_client()
             logger.info("Groq client initialized successfully")
         except ImportError:
             logger.error("Groq library not installed. Install with: pip install groq")
         except Exception as e:
             logger.error(f"Failed to initialize Groq client: {e}")
     
+    def _create_groq_async_client(self) -> Optional[Any]:
+        """
+        Create the native async Groq client over a shared keep-alive connection pool.
+        
+        Returns:
+            AsyncGroq instance, or None if it cannot be created
+        """
+        try:
+            import httpx
+            from groq import AsyncGroq
+            
+            self._http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=int(os.getenv(
+                        "JARVIS_LLM_HTTP_MAX_CONNECTIONS", str(self.DEFAULT_HTTP_MAX_CONNECTIONS)
+                    )),
+                    max_keepalive_connections=int(os.getenv(
+                        "JARVIS_LLM_HTTP_MAX_KEEPALIVE", str(self.DEFAULT_HTTP_MAX_KEEPALIVE)
+                    )),
+                ),
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                event_hooks={"response": [self._observe_groq_response_async]},
+            )
+            return AsyncGroq(api_key=self.groq_api_key, http_client=self._http_client)
+        except Exception as e:
+            logger.warning(f"Async Groq client unavailable, using executor: {e}")
+            return None
+    
+    def _create_sync_http_client(self) -> Optional[Any]:
+        """Create the httpx client for the sync Groq SDK, observing rate limit headers"""
+        try:
+            import httpx
+            return httpx.Client(
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                event_hooks={"response": [self._observe_groq_response]},
+            )
+        except Exception as e:
+            logger.debug(f"Falling back to the SDK default HTTP client: {e}")
+            return None
+    
+    def _observe_groq_response(self, response: Any) -> None:
+        """
+        Calibrate the model budget from a Groq HTTP response (httpx event hook).
+        
+        Args:
+            response: httpx.Response
+        """
+        try:
+            model = json.loads(response.request.content or b"{}").get("model")
+        except Exception:
+            return
+        gear = self._gear_for_model(model)
+        if gear is not None:
+            self._groq_budgets[gear].update_from_headers(response.headers)
+    
+    async def _observe_groq_response_async(self, response: Any) -> None:
+        """Async variant of _observe_groq_response for the pooled AsyncClient"""
+        self._observe_groq_response(response)
+    
+    async def aclose(self) -> None:
+        """Close pooled HTTP connections held by the async clients"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+    
+    def get_concurrency_stats(self) -> Dict[str, Any]:
+        """
+        Get per-provider concurrency and queue-depth counters.
+        
+        Returns:
+            Dict keyed by provider with limit, in-flight, waiting and wait-time stats
+        """
+        return {
+            provider.value: {
+                **limiter.get_stats(),
+                "async_client": (
+                    self.groq_async_client if provider == LLMProvider.GROQ
+                    else self.gemini_async_client
+                ) is not None,
+            }
+            for provider, limiter in self._limiters.items()
+        }
+    
+    @property
+    def current_groq_gear(self) -> GroqGear:
+        """
+        Gear the next Groq request would be routed to.
+        
+        Derived from per-model circuit breakers and budgets rather than stored,
+        so concurrent requests never flip a shared gear under each other.
+        """
+        for gear in (GroqGear.HIGH_GEAR, GroqGear.LOW_GEAR):
+            if self._is_groq_gear_available(gear):
+                return gear
+        return GroqGear.LOW_GEAR
+    
     def _get_current_groq_model(self) -> str:
         """Get the current Groq model based on the active gear"""
-        if self.current_groq_gear == GroqGear.HIGH_GEAR:
+        return self._get_groq_model_for_gear(self.current_groq_gear)
+    
+    def _get_groq_model_for_gear(self, gear: GroqGear) -> str:
+        """Get the Groq model configured for a gear"""
+        if gear == GroqGear.HIGH_GEAR:
             return self.groq_high_gear_model
-        else:
-            return self.groq_low_gear_model
+        return self.groq_low_gear_model
+    
+    def _gear_for_model(self, model: Optional[str]) -> Optional[GroqGear]:
+        """Map a Groq model name back to its gear"""
+        if model == self.groq_high_gear_model:
+            return GroqGear.HIGH_GEAR
+        if model == self.groq_low_gear_model:
+            return GroqGear.LOW_GEAR
+        return None
+    
+    def _is_groq_gear_available(self, gear: GroqGear, estimated_tokens: int = 0) -> bool:
+        """Check, without side effects, whether a gear can take a request of this size"""
+        return (
+            self._groq_breakers[gear].is_available()
+            and self._groq_budgets[gear].has_capacity(estimated_tokens)
+        )
+    
+    def _acquire_groq_gear(
+        self,
+        estimated_tokens: int = 0,
+        gear: Optional[GroqGear] = None,
+    ) -> Optional[GroqGear]:
+        """
+        Pick the gear for one request and reserve budget for it.
+        
+        High Gear is preferred; Low Gear is used when High Gear is tripped or
+        its budget cannot fit the request.
+        
+        Args:
+            estimated_tokens: Estimated prompt tokens
+            gear: Only consider this gear (used by hedged requests)
+            
+        Returns:
+            Selected gear, or None if no Groq gear can take the request
+        """
+        candidates = (gear,) if gear is not None else (GroqGear.HIGH_GEAR, GroqGear.LOW_GEAR)
+        for gear in candidates:
+            if (
+                self._groq_budgets[gear].has_capacity(estimated_tokens)
+                and self._groq_breakers[gear].allow_request()
+            ):
+                self._groq_budgets[gear].record_dispatch(estimated_tokens)
+                return gear
+        return None
+    
+    def _record_groq_result(self, gear: GroqGear, error: Optional[Exception] = None) -> None:
+        """
+        Feed a request outcome into the gear's circuit breaker.
+        
+        Args:
+            gear: Gear that served the request
+            error: Exception raised by the provider, if any
+        """
+        breaker = self._groq_breakers[gear]
+        if error is None:
+            breaker.record_success()
+        elif self._is_rate_limit_error(error):
+            headers = getattr(getattr(error, "response", None), "headers", None)
+            retry_after = None
+            if headers is not None:
+                self._groq_budgets[gear].update_from_headers(headers)
+                retry_after = parse_reset_duration(headers.get("retry-after"))
+            breaker.record_failure(retry_after)
+    
+    def _estimate_request_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """
+        Estimate prompt tokens for budget checks (memoized per message).
+        
+        Skips tokenization until a tokens/min limit has been observed for some gear.
+        """
+        if not any(budget.tracks_tokens for budget in self._groq_budgets.values()):
+            return 0
+        return self.token_counter.count_messages(messages)
     
-    def _shift_to_low_gear(self) -> None:
-        """Shift to Low Gear (Marcha Baixa) for rate limit handling"""
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """
+        Get per-model budgets and circuit breaker states.
+        
+        Returns:
+            Dict keyed by model with remaining budget and breaker state
+        """
+        stats = {
+            self._get_groq_model_for_gear(gear): {
+                "gear": gear.value,
+                **self._groq_budgets[gear].get_stats(),
+                "circuit": self._groq_breakers[gear].get_stats(),
+            }
+            for gear in (GroqGear.HIGH_GEAR, GroqGear.LOW_GEAR)
+        }
+        stats[self.gemini_model] = {"circuit": self._gemini_breaker.get_stats()}
+        return stats
+    
+    def _get_model_for_provider(self, provider: LLMProvider) -> str:
+        """Get the model that will serve a request routed to the given provider"""
+        if provider == LLMProvider.GROQ:
+            return self._get_current_groq_model()
+        return self.gemini_model
+    
+    def _shift_to_low_gear(self, cooldown: Optional[float] = None) -> None:
+        """
+        Shift to Low Gear (Marcha Baixa) by opening the High Gear circuit.
+        
+        High Gear is re-admitted automatically through a half-open probe after the cooldown.
+        
+        Args:
+            cooldown: Seconds before the probe (defaults to the breaker cooldown)
+        """
         if self.current_groq_gear == GroqGear.HIGH_GEAR:
             logger.warning(
                 f"🔧 Shifting to Low Gear (Marcha Baixa): {self.groq_low_gear_model}"
             )
-            self.current_groq_gear = GroqGear.LOW_GEAR
+        self._groq_breakers[GroqGear.HIGH_GEAR].record_failure(cooldown)
     
     def _shift_to_high_gear(self) -> None:
-        """Shift back to High Gear (Marcha Alta) after recovery"""
-        if self.current_groq_gear == GroqGear.LOW_GEAR:
+        """Shift back to High Gear (Marcha Alta) by closing its circuit"""
+        if self._groq_breakers[GroqGear.HIGH_GEAR].state != CircuitBreaker.CLOSED:
             logger.info(
                 f"✅ Shifting back to High Gear (Marcha Alta): {self.groq_high_gear_model}"
             )
-            self.current_groq_gear = GroqGear.HIGH_GEAR
+        self._groq_breakers[GroqGear.HIGH_GEAR].reset()
     
     def _initialize_gemini(self) -> None:
         """Initialize Gemini client if API key is available"""
@@ -245,6 +585,9 @@ class AIGateway:
         try:
             from google import genai
             self.gemini_client = genai.Client(api_key=self.gemini_api_key)
+            if self.use_async_clients:
+                # The SDK keeps one pooled HTTP session per Client for its async surface
+                self.gemini_async_client = getattr(self.gemini_client, "aio", None)
             logger.info("Gemini client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Gemini client: {e}")
@@ -259,14 +602,35 @@ class AIGateway:
         Returns:
             Approximate token count
         """
-        # Delegate to module-level function
-        return count_tokens(text)
+        return self.token_counter.count(text)
+    
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """
+        Count tokens for many prompts at once.
+        
+        Args:
+            texts: Texts to score
+            
+        Returns:
+            Token counts in the same order as texts
+        """
+        return self.token_counter.count_batch(texts)
+    
+    def get_token_stats(self) -> Dict[str, Any]:
+        """
+        Get token accounting counters.
+        
+        Returns:
+            Dict with memo hit/miss counters and upper-bound skips
+        """
+        return self.token_counter.get_stats()
     
     def select_provider(
         self,
         payload: str,
         multimodal: bool = False,
         force_provider: Optional[LLMProvider] = None,
+        messages: Optional[List[Dict[str, str]]] = None,
     ) -> LLMProvider:
         """
         Select the best provider based on payload characteristics.
@@ -275,6 +639,7 @@ class AIGateway:
             payload: The text payload to be processed
             multimodal: Whether the request requires multimodal analysis
             force_provider: Force a specific provider (overrides automatic selection)
+            messages: Messages the payload was built from (counts are then memoized per message)
             
         Returns:
             Selected LLM provider
@@ -296,17 +661,12 @@ class AIGateway:
                 logger.error("Multimodal requested but Gemini not available")
                 raise ValueError("Multimodal analysis requires Gemini, but it's not available")
         
-        # Count tokens in payload
-        token_count = self.count_tokens(payload)
-        logger.debug(f"Payload token count: {token_count}")
-        
         # If payload exceeds threshold, escalate to Gemini
-        if token_count > self.TOKEN_THRESHOLD:
+        # (payloads clearly below it are never tokenized for this check)
+        texts = [msg.get("content", "") for msg in messages] if messages is not None else [payload]
+        if self.token_counter.exceeds(texts, self.TOKEN_THRESHOLD):
             if self.gemini_client:
-                logger.info(
-                    f"Payload exceeds {self.TOKEN_THRESHOLD} tokens ({token_count}), "
-                    "escalating to Gemini"
-                )
+                logger.info(f"Payload exceeds {self.TOKEN_THRESHOLD} tokens, escalating to Gemini")
                 return LLMProvider.GEMINI
             else:
                 logger.warning(
@@ -315,6 +675,19 @@ class AIGateway:
         
         # Default to Groq for cost-effectiveness (if available)
         if self.groq_client:
+            gears = (GroqGear.HIGH_GEAR, GroqGear.LOW_GEAR)
+            if self.gemini_client and self._gemini_breaker.is_available():
+                estimated_tokens = self._estimate_request_tokens(
+                    messages if messages is not None else [{"content": payload}]
+                )
+                gemini_preferred = not any(
+                    self._is_groq_gear_available(gear, estimated_tokens) for gear in gears
+                )
+            else:
+                gemini_preferred = False
+            if gemini_preferred:
+                logger.info("🚀 Groq budgets exhausted, routing to Gemini before hitting the limit")
+                return LLMProvider.GEMINI
             logger.debug("Using Groq as default provider")
             return LLMProvider.GROQ
         
@@ -331,6 +704,8 @@ class AIGateway:
         functions: Optional[List[Any]] = None,
         multimodal: bool = False,
         force_provider: Optional[LLMProvider] = None,
+        cache_ttl: Optional[float] = None,
+        bypass_cache: bool = False,
     ) -> Dict[str, Any]:
         """
         Generate a completion using the most appropriate provider with Gears system.
@@ -340,9 +715,12 @@ class AIGateway:
             functions: Optional function declarations for function calling
             multimodal: Whether the request requires multimodal analysis
             force_provider: Force a specific provider
+            cache_ttl: Time-to-live (seconds) for caching this result (None uses the cache default)
+            bypass_cache: Skip cache lookup and storage for this call
             
         Returns:
             Response dict with 'provider', 'response', and other metadata
+            ('cached': True when served from the completion cache)
         """
         # Combine all message content for token counting
         payload = "\n".join([msg.get("content", "") for msg in messages if msg.get("content")])
@@ -352,10 +730,438 @@ class AIGateway:
             payload=payload,
             multimodal=multimodal,
             force_provider=force_provider,
+            messages=messages,
+        )
+        
+        # Serve repeated prompts from the completion cache
+        cache_key = None
+        if self.completion_cache is not None:
+            if bypass_cache:
+                self.completion_cache.record_bypass()
+            else:
+                cache_key = build_cache_key(
+                    provider.value,
+                    self._get_model_for_provider(provider),
+                    messages,
+                    functions,
+                )
+                cached_result = await self.completion_cache.aget(cache_key)
+                if cached_result is not None:
+                    logger.debug(f"Completion cache hit ({provider.value})")
+                    return {**cached_result, "cached": True}
+        
+        # Identical prompts already in flight share one upstream call
+        flight_key = None
+        if self.enable_single_flight and not bypass_cache:
+            flight_key = cache_key or build_cache_key(
+                provider.value,
+                self._get_model_for_provider(provider),
+                messages,
+                functions,
+            )
+            in_flight = self._in_flight.get(flight_key)
+            if in_flight is not None:
+                self._single_flight_stats["coalesced"] += 1
+                logger.debug(f"Coalesced with in-flight request ({provider.value})")
+                result = await asyncio.shield(in_flight)
+                return {**result, "coalesced": True}
+        
+        if flight_key is None:
+            result = await self._generate_with_fallbacks(provider, messages, functions)
+        else:
+            result = await self._run_single_flight(
+                flight_key, self._generate_with_fallbacks(provider, messages, functions)
+            )
+        
+        if cache_key is not None:
+            # Key on the model that answered: a fallback's reply must not be
+            # served later as the requested model's
+            answered_key = build_cache_key(
+                result.get("provider", provider.value),
+                result.get("model") or self._get_model_for_provider(provider),
+                messages,
+                functions,
+            )
+            await self.completion_cache.aset(answered_key, result, ttl=cache_ttl)
+        
+        return result
+    
+    async def _run_single_flight(
+        self,
+        key: str,
+        request: Awaitable[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Run an upstream call that identical concurrent requests can join.
+        
+        The call is shielded, so a cancelled leader does not cancel it for the
+        followers waiting on the same key.
+        
+        Args:
+            key: Request key from build_cache_key()
+            request: Awaitable performing the upstream call
+            
+        Returns:
+            Response dict from the upstream call
+        """
+        task = asyncio.ensure_future(request)
+        self._in_flight[key] = task
+        self._single_flight_stats["leaders"] += 1
+        
+        def _release(done: "asyncio.Future[Dict[str, Any]]") -> None:
+            self._in_flight.pop(key, None)
+            if not done.cancelled():
+                # Mark the exception as retrieved when the leader is gone and nobody joined
+                done.exception()
+        
+        task.add_done_callback(_release)
+        return await asyncio.shield(task)
+    
+    def get_single_flight_stats(self) -> Dict[str, Any]:
+        """
+        Get single-flight coalescing counters.
+        
+        Returns:
+            Dict with leader/coalesced counts and the number of calls in flight
+        """
+        return {
+            "enabled": self.enable_single_flight,
+            **self._single_flight_stats,
+            "in_flight": len(self._in_flight),
+        }
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get completion cache counters.
+        
+        Returns:
+            Dict with hit/miss counters (or {"enabled": False} when caching is off)
+        """
+        if self.completion_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.completion_cache.get_stats()}
+    
+    async def stream_completion(
+        self,
+        messages: List[Dict[str, str]],
+        multimodal: bool = False,
+        force_provider: Optional[LLMProvider] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a completion as text deltas using the Gears system.
+        
+        Fallbacks (Low Gear, Cannon Shot) apply only until the first delta is
+        emitted; once text has reached the caller the provider cannot change.
+        Streams are not served from or stored in the completion cache.
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            multimodal: Whether the request requires multimodal analysis
+            force_provider: Force a specific provider
+            
+        Yields:
+            {"type": "delta", "text": ...} events, then a final
+            {"type": "done", "text": full_text, "provider": ..., "model": ...} event
+        """
+        payload = "\n".join([msg.get("content", "") for msg in messages if msg.get("content")])
+        provider = self.select_provider(
+            payload=payload,
+            multimodal=multimodal,
+            force_provider=force_provider,
+            messages=messages,
         )
         
+        emitted = False
+        try:
+            async for event in self._stream_from_provider(provider, messages):
+                emitted = True
+                yield event
+            return
+        except Exception as e:
+            if emitted:
+                logger.error(f"Stream from {provider.value} interrupted: {e}")
+                raise
+            fallback_stream = await self._get_stream_fallback(provider, messages, e)
+        
+        async for event in fallback_stream:
+            yield event
+    
+    async def _get_stream_fallback(
+        self,
+        provider: LLMProvider,
+        messages: List[Dict[str, str]],
+        error: Exception,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Choose the fallback stream after a provider failed before emitting any text.
+        
+        Mirrors _generate_with_fallbacks: decommissioned Groq models go to Gemini,
+        rate limits shift to Low Gear and then fire the Cannon Shot.
+        
+        Args:
+            provider: Provider that failed
+            messages: Original messages
+            error: Error raised by the provider
+            
+        Returns:
+            Async iterator of stream events from the fallback provider
+        """
+        error_traceback = traceback.format_exc()
+        
+        if self._is_model_decommissioned_error(error):
+            logger.error(
+                f"⚠️ ATENÇÃO: O modelo '{self._get_current_groq_model()}' foi descomissionado pelo Groq! "
+                f"Erro original: {error}"
+            )
+            if provider == LLMProvider.GROQ and self.gemini_client:
+                logger.warning("Tentando fallback para Gemini devido a modelo descomissionado")
+                return self._stream_from_provider(
+                    LLMProvider.GEMINI, messages, fallback_from=LLMProvider.GROQ
+                )
+            raise error
+        
+        if self._is_rate_limit_error(error):
+            logger.warning(f"Rate limit hit on {provider.value} while streaming, attempting fallback")
+            if provider == LLMProvider.GROQ and self._is_groq_gear_available(
+                GroqGear.LOW_GEAR, self._estimate_request_tokens(messages)
+            ):
+                return self._stream_low_gear_then_gemini(messages)
+            if provider == LLMProvider.GROQ and self.gemini_client:
+                logger.info("Groq rate limit reached, falling back to Gemini")
+                return self._stream_from_provider(
+                    LLMProvider.GEMINI, messages, fallback_from=LLMProvider.GROQ
+                )
+            if provider == LLMProvider.GEMINI and self.groq_client:
+                logger.info("Gemini rate limit reached, falling back to Groq")
+                return self._stream_from_provider(
+                    LLMProvider.GROQ, messages, fallback_from=LLMProvider.GEMINI
+                )
+            raise ValueError(
+                f"Rate limit reached on {provider.value} and no fallback provider available"
+            ) from error
+        
+        logger.error(f"Error streaming completion with {provider.value}: {error}")
+        await self._dispatch_auto_repair_if_enabled(
+            error=error,
+            error_traceback=error_traceback,
+            issue_title=f"Critical error in AI Gateway: {type(error).__name__}",
+            file_path="app/adapters/infrastructure/ai_gateway.py"
+        )
+        raise error
+    
+    async def _stream_low_gear_then_gemini(
+        self,
+        messages: List[Dict[str, str]],
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream with Groq Low Gear, firing the Cannon Shot (Gemini) if it is also rate limited.
+        
+        Args:
+            messages: Original messages
+            
+        Yields:
+            Stream events from Low Gear or Gemini
+        """
+        emitted = False
+        try:
+            async for event in self._stream_from_provider(LLMProvider.GROQ, messages):
+                emitted = True
+                yield event
+            return
+        except Exception as low_gear_error:
+            if emitted or not self._is_rate_limit_error(low_gear_error):
+                raise
+            logger.error(f"Low Gear also hit rate limit: {low_gear_error}")
+            if not self.gemini_client:
+                raise ValueError(
+                    "Rate limit reached on groq (both High and Low Gear) "
+                    "and no fallback provider available"
+                ) from low_gear_error
+            logger.warning("🚀 Firing Cannon Shot (Tiro de Canhão): Gemini")
+        
+        async for event in self._stream_from_provider(
+            LLMProvider.GEMINI, messages, fallback_from=LLMProvider.GROQ
+        ):
+            yield event
+    
+    async def _stream_from_provider(
+        self,
+        provider: LLMProvider,
+        messages: List[Dict[str, str]],
+        fallback_from: Optional[LLMProvider] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a completion from a single provider.
+        
+        Args:
+            provider: Provider to stream from
+            messages: List of message dicts
+            fallback_from: Provider that failed before this one, if any
+            
+        Yields:
+            Delta events followed by a single done event
+        """
+        if provider == LLMProvider.GROQ:
+            if not self.groq_client:
+                raise ValueError("Groq client not initialized")
+            gear = self._acquire_groq_gear(self._estimate_request_tokens(messages))
+            if gear is None:
+                raise ValueError("Rate limit budget exhausted for all Groq gears")
+            model = self._get_groq_model_for_gear(gear)
+            logger.debug(f"Streaming completion with Groq ({gear.value}): {model}")
+            if self.groq_async_client is not None:
+                chunks = self._iterate_async(
+                    self.groq_async_client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        stream=True,
+                    )
+                )
+            else:
+                chunks = self._iterate_in_executor(
+                    lambda: self.groq_client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        stream=True,
+                    )
+                )
+            extract_text = self._extract_groq_stream_text
+        else:
+            if not self.gemini_client:
+                raise ValueError("Gemini client not initialized")
+            model = self.gemini_model
+            gear = None
+            logger.debug(f"Streaming completion with Gemini ({model})")
+            content, config = self._build_gemini_request(messages)
+            if self.gemini_async_client is not None:
+                chunks = self._iterate_async(
+                    self.gemini_async_client.models.generate_content_stream(
+                        model=model,
+                        contents=content,
+                        config=config,
+                    )
+                )
+            else:
+                chunks = self._iterate_in_executor(
+                    lambda: self.gemini_client.models.generate_content_stream(
+                        model=model,
+                        contents=content,
+                        config=config,
+                    )
+                )
+            extract_text = self._extract_gemini_stream_text
+        
+        parts = []
+        try:
+            # The slot is held for the whole stream, not just until the first chunk
+            async with self._limiters[provider].slot():
+                async for chunk in chunks:
+                    text = extract_text(chunk)
+                    if text:
+                        parts.append(text)
+                        yield {"type": "delta", "text": text}
+        except Exception as e:
+            if gear is not None:
+                self._record_groq_result(gear, e)
+            elif self._is_rate_limit_error(e):
+                self._gemini_breaker.record_failure()
+            raise
+        
+        if gear is not None:
+            self._record_groq_result(gear)
+        else:
+            self._gemini_breaker.record_success()
+        
+        done = {
+            "type": "done",
+            "text": "".join(parts),
+            "provider": provider.value,
+            "model": model,
+        }
+        if gear is not None:
+            done["gear"] = gear.value
+        if fallback_from is not None:
+            done["fallback_from"] = fallback_from.value
+        yield done
+    
+    @staticmethod
+    async def _iterate_in_executor(
+        open_stream: Callable[[], Iterable[Any]],
+    ) -> AsyncIterator[Any]:
+        """
+        Consume a blocking SDK stream without blocking the event loop.
+        
+        Args:
+            open_stream: Callable that opens the provider stream
+            
+        Yields:
+            Chunks from the provider stream
+        """
+        loop = asyncio.get_running_loop()
+        iterator = iter(await loop.run_in_executor(None, open_stream))
+        sentinel = object()
+        while True:
+            chunk = await loop.run_in_executor(None, next, iterator, sentinel)
+            if chunk is sentinel:
+                return
+            yield chunk
+    
+    @staticmethod
+    async def _iterate_async(open_stream: Any) -> AsyncIterator[Any]:
+        """
+        Consume a native async SDK stream.
+        
+        Args:
+            open_stream: Awaitable resolving to an async iterator of chunks
+            
+        Yields:
+            Chunks from the provider stream
+        """
+        stream = await open_stream
+        async for chunk in stream:
+            yield chunk
+    
+    @staticmethod
+    def _extract_groq_stream_text(chunk: Any) -> Optional[str]:
+        """Extract delta text from a Groq streaming chunk"""
+        choices = getattr(chunk, "choices", None)
+        if not choices:
+            return None
+        delta = getattr(choices[0], "delta", None)
+        content = getattr(delta, "content", None)
+        return content if isinstance(content, str) else None
+    
+    @staticmethod
+    def _extract_gemini_stream_text(chunk: Any) -> Optional[str]:
+        """Extract delta text from a Gemini streaming chunk"""
+        try:
+            text = chunk.text
+        except Exception:
+            # Chunks without text parts (e.g. safety metadata) raise on .text
+            return None
+        return text if isinstance(text, str) else None
+    
+    async def _generate_with_fallbacks(
+        self,
+        provider: LLMProvider,
+        messages: List[Dict[str, str]],
+        functions: Optional[List[Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate a completion with the selected provider, applying Gears and fallbacks.
+        
+        Args:
+            provider: Provider selected by select_provider()
+            messages: List of message dicts with 'role' and 'content'
+            functions: Optional function declarations for function calling
+            
+        Returns:
+            Response dict with 'provider', 'response', and other metadata
+        """
         try:
             if provider == LLMProvider.GROQ:
+                if self.enable_hedging:
+                    return await self._generate_with_groq_hedged(messages, functions)
                 return await self._generate_with_groq(messages, functions)
             else:
                 return await self._generate_with_gemini(messages, functions)
@@ -389,9 +1195,11 @@ class AIGateway:
             # Check if it's a rate limit error
             elif self._is_rate_limit_error(e):
                 logger.warning(f"Rate limit hit on {provider.value}, attempting fallback")
-                # If it's Groq and we're in High Gear, try Low Gear first
-                if provider == LLMProvider.GROQ and self.current_groq_gear == GroqGear.HIGH_GEAR:
-                    self._shift_to_low_gear()
+                # If it's Groq and Low Gear can still take the request, try it first
+                # (the failing gear's circuit is already open)
+                if provider == LLMProvider.GROQ and self._is_groq_gear_available(
+                    GroqGear.LOW_GEAR, self._estimate_request_tokens(messages)
+                ):
                     try:
                         return await self._generate_with_groq(messages, functions)
                     except Exception as low_gear_error:
@@ -490,10 +1298,93 @@ class AIGateway:
         else:
             logger.debug("GitHub adapter not configured, cannot dispatch auto-repair")
     
+    def _get_hedge_delay(self) -> float:
+        """Seconds to wait on High Gear before hedging (fixed, or the observed p95)"""
+        if self.hedge_delay_seconds is not None:
+            return self.hedge_delay_seconds
+        p95 = self._high_gear_latency.percentile(self.HEDGE_PERCENTILE)
+        return p95 if p95 is not None else self.DEFAULT_HEDGE_DELAY_SECONDS
+    
+    async def _generate_with_groq_hedged(
+        self,
+        messages: List[Dict[str, str]],
+        functions: Optional[List[Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Generate with Groq, hedging a slow High Gear request with Low Gear.
+        
+        Only requests routed to High Gear are hedged, and only while Low Gear
+        can take them; whichever call answers first wins and the other is cancelled.
+        
+        Args:
+            messages: List of message dicts
+            functions: Optional function declarations
+            
+        Returns:
+            Response dict (with 'hedged': True when the Low Gear copy won)
+        """
+        estimated_tokens = self._estimate_request_tokens(messages)
+        if self.current_groq_gear != GroqGear.HIGH_GEAR or not self._is_groq_gear_available(
+            GroqGear.LOW_GEAR, estimated_tokens
+        ):
+            return await self._generate_with_groq(messages, functions)
+        
+        self._hedge_stats["hedged"] += 1
+        primary = asyncio.ensure_future(self._generate_with_groq(messages, functions))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=self._get_hedge_delay())
+            if done:
+                if primary.exception() is None:
+                    self._hedge_stats["primary_wins"] += 1
+                return primary.result()
+            
+            # Low Gear may have been claimed meanwhile; keep waiting on High Gear then
+            if not self._is_groq_gear_available(GroqGear.LOW_GEAR, estimated_tokens):
+                return await primary
+            
+            self._hedge_stats["fired"] += 1
+            logger.debug("High Gear slower than hedge delay, racing Low Gear")
+            hedge = asyncio.ensure_future(
+                self._generate_with_groq(messages, functions, gear=GroqGear.LOW_GEAR)
+            )
+            pending.add(hedge)
+            first_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            rescued = primary.done() and primary.exception() is not None
+                            self._hedge_stats["hedge_rescues" if rescued else "hedge_wins"] += 1
+                            return {**task.result(), "hedged": True}
+                        self._hedge_stats["primary_wins"] += 1
+                        return task.result()
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    def get_hedging_stats(self) -> Dict[str, Any]:
+        """
+        Get hedging counters.
+        
+        Returns:
+            Dict with hedged/fired/win/rescue counts and the current hedge delay
+        """
+        return {
+            "enabled": self.enable_hedging,
+            **self._hedge_stats,
+            "delay_ms": self._get_hedge_delay() * 1000,
+            "latency_samples": len(self._high_gear_latency),
+        }
+    
     async def _generate_with_groq(
         self,
         messages: List[Dict[str, str]],
         functions: Optional[List[Any]] = None,
+        gear: Optional[GroqGear] = None,
     ) -> Dict[str, Any]:
         """
         Generate completion using Groq with Gears system.
@@ -501,6 +1392,7 @@ class AIGateway:
         Args:
             messages: List of message dicts
             functions: Optional function declarations
+            gear: Force a gear instead of picking one from budgets and breakers
             
         Returns:
             Response dict
@@ -508,9 +1400,12 @@ class AIGateway:
         if not self.groq_client:
             raise ValueError("Groq client not initialized")
         
-        # Get current model based on active gear
-        current_model = self._get_current_groq_model()
-        current_gear = "High Gear (Marcha Alta)" if self.current_groq_gear == GroqGear.HIGH_GEAR else "Low Gear (Marcha Baixa)"
+        # Pick the gear for this request from budgets and circuit breakers
+        gear = self._acquire_groq_gear(self._estimate_request_tokens(messages), gear)
+        if gear is None:
+            raise ValueError("Rate limit budget exhausted for all Groq gears")
+        current_model = self._get_groq_model_for_gear(gear)
+        current_gear = "High Gear (Marcha Alta)" if gear == GroqGear.HIGH_GEAR else "Low Gear (Marcha Baixa)"
         
         logger.debug(f"Generating completion with Groq - {current_gear}: {current_model}")
         
@@ -528,24 +1423,32 @@ class AIGateway:
                 request_params["tools"] = tools
                 request_params["tool_choice"] = "auto"
         
-        # Make the request using run_in_executor to avoid blocking the event loop
-        loop = asyncio.get_running_loop()
-        response = await loop.run_in_executor(
-            None, 
-            lambda: self.groq_client.chat.completions.create(**request_params)
-        )
+        try:
+            async with self._limiters[LLMProvider.GROQ].slot():
+                started = time.monotonic()
+                if self.groq_async_client is not None:
+                    response = await self.groq_async_client.chat.completions.create(**request_params)
+                else:
+                    # Sync client: run in the executor to avoid blocking the event loop
+                    loop = asyncio.get_running_loop()
+                    response = await loop.run_in_executor(
+                        None,
+                        lambda: self.groq_client.chat.completions.create(**request_params)
+                    )
+        except Exception as e:
+            self._record_groq_result(gear, e)
+            raise
         
-        # After successful completion, if we're in Low Gear, consider shifting back to High Gear
-        if self.current_groq_gear == GroqGear.LOW_GEAR:
-            # Shift back to High Gear after successful completion
-            # This allows the system to recover from rate limits
-            self._shift_to_high_gear()
+        # Success closes the gear's circuit (this is how a half-open probe shifts back up)
+        self._record_groq_result(gear)
+        if gear == GroqGear.HIGH_GEAR:
+            self._high_gear_latency.record(time.monotonic() - started)
         
         return {
             "provider": LLMProvider.GROQ.value,
             "response": response,
             "model": current_model,
-            "gear": self.current_groq_gear.value,
+            "gear": gear.value,
         }
     
     async def _generate_with_gemini(
@@ -568,6 +1471,54 @@ class AIGateway:
         
         logger.debug(f"Generating completion with Gemini ({self.gemini_model})")
         
+        content, config = self._build_gemini_request(messages, functions)
+        
+        try:
+            async with self._limiters[LLMProvider.GEMINI].slot():
+                if self.gemini_async_client is not None:
+                    response = await self.gemini_async_client.models.generate_content(
+                        model=self.gemini_model,
+                        contents=content,
+                        config=config,
+                    )
+                else:
+                    # Sync client: run in the executor to avoid blocking the event loop
+                    loop = asyncio.get_running_loop()
+                    response = await loop.run_in_executor(
+                        None,
+                        lambda: self.gemini_client.models.generate_content(
+                            model=self.gemini_model,
+                            contents=content,
+                            config=config,
+                        )
+                    )
+        except Exception as e:
+            if self._is_rate_limit_error(e):
+                self._gemini_breaker.record_failure()
+            raise
+        self._gemini_breaker.record_success()
+        
+        return {
+            "provider": LLMProvider.GEMINI.value,
+            "response": response,
+            "model": self.gemini_model,
+        }
+    
+    def _build_gemini_request(
+        self,
+        messages: List[Dict[str, str]],
+        functions: Optional[List[Any]] = None,
+    ) -> tuple:
+        """
+        Convert messages and functions into Gemini contents and config.
+        
+        Args:
+            messages: List of message dicts
+            functions: Optional function declarations
+            
+        Returns:
+            Tuple of (contents, GenerateContentConfig or None)
+        """
         from google import genai
         
         # Convert messages to Gemini format (combine into single content)
@@ -590,22 +1541,8 @@ class AIGateway:
             tools = [genai.types.Tool(function_declarations=functions)]
             config_params["tools"] = tools
         
-        # Make the request using run_in_executor to avoid blocking the event loop
-        loop = asyncio.get_running_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: self.gemini_client.models.generate_content(
-                model=self.gemini_model,
-                contents=content,
-                config=genai.types.GenerateContentConfig(**config_params) if config_params else None,
-            )
-        )
-        
-        return {
-            "provider": LLMProvider.GEMINI.value,
-            "response": response,
-            "model": self.gemini_model,
-        }
+        config = genai.types.GenerateContentConfig(**config_params) if config_params else None
+        return content, config
     
     def _convert_functions_to_groq_tools(self, functions: List[Any]) -> List[Dict[str, Any]]:
         """
@@ -108,6 +108,13 @@ class TaskResponse(BaseModel):
     message: str = Field(..., description="Status message")
 
 
+class TaskWaitResponse(BaseModel):
+    """Response model for the worker long-poll (GET /v1/tasks/wait)"""
+
+    version: int = Field(..., description="Task notification version; pass it as `since` on the next wait")
+    notified: bool = Field(..., description="Whether a task was queued since the given version")
+
+
 class StatusResponse(BaseModel):
     """Response model for system status"""
 
@@ -134,6 +141,25 @@ class HistoryResponse(BaseModel):
     total: int = Field(..., description="Total number of commands in history")
 
 
+class InteractionHistoryItem(BaseModel):
+    """Single stored interaction"""
+
+    id: int = Field(..., description="Interaction ID")
+    timestamp: str = Field(..., description="ISO timestamp of execution")
+    user_input: str = Field(..., description="Original user input")
+    command_type: str = Field(..., description="Interpreted command type")
+    parameters: Dict[str, Any] = Field(default_factory=dict, description="Command parameters")
+    success: bool = Field(..., description="Whether the command succeeded")
+    response_text: str = Field(..., description="Response returned to the user")
+
+
+class InteractionHistoryResponse(BaseModel):
+    """Response model for one page of the interaction history"""
+
+    items: List[InteractionHistoryItem] = Field(..., description="Interactions, newest first")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page (None on the last page)")
+
+
 # Authentication Models
 
 
@@ -182,6 +208,9 @@ class PackageStatusResponse(BaseModel):
 
     package_name: str = Field(..., description="Name of the package")
     installed: bool = Field(..., description="Whether the package is installed")
+    state: Optional[str] = Field(
+        default=None, description="Last install state (installing, installed, failed), shared by all workers"
+    )
 
 
 class PrewarmResponse(BaseModel):
@@ -305,6 +334,60 @@ class MissionResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Additional execution metadata")
 
 
+class MissionJobResponse(BaseModel):
+    """Response model for a queued or finished mission job"""
+
+    job_id: str = Field(..., description="Job identifier (used for polling and the WebSocket)")
+    mission_id: str = Field(..., description="ID of the mission")
+    status: str = Field(..., description="Job status: queued, running, succeeded or failed")
+    queue_position: Optional[int] = Field(None, description="1-based position while queued")
+    submitted_at: float = Field(..., description="Submission time (epoch seconds)")
+    started_at: Optional[float] = Field(None, description="Execution start time (epoch seconds)")
+    finished_at: Optional[float] = Field(None, description="Completion time (epoch seconds)")
+    wait_seconds: Optional[float] = Field(None, description="Time spent in the queue")
+    run_seconds: Optional[float] = Field(None, description="Time spent executing")
+    error: Optional[str] = Field(None, description="Error message if the job failed")
+    result: Optional[MissionResponse] = Field(None, description="Mission result once finished")
+
+
+class MissionQueueStatsResponse(BaseModel):
+    """Response model for mission queue metrics"""
+
+    workers: int = Field(..., description="Missions executed concurrently")
+    max_queue_size: int = Field(..., description="Jobs allowed to wait before submissions are refused")
+    depth: int = Field(..., description="Jobs currently waiting")
+    running: int = Field(..., description="Jobs currently executing")
+    submitted: int = Field(..., description="Jobs accepted since startup")
+    rejected: int = Field(..., description="Submissions refused because the queue was full")
+    succeeded: int = Field(..., description="Jobs finished successfully")
+    failed: int = Field(..., description="Jobs finished with an error")
+    avg_wait_ms: float = Field(..., description="Average time jobs waited in the queue")
+    max_wait_ms: float = Field(..., description="Longest time a job waited in the queue")
+    avg_run_ms: float = Field(..., description="Average execution time")
+
+
+
+class TelemetryPoint(BaseModel):
+    """One downsampled telemetry bucket"""
+
+    bucket_start: str = Field(..., description="Bucket start (ISO 8601)")
+    samples: int = Field(..., description="Samples aggregated in the bucket")
+    battery_avg: Optional[float] = Field(None, description="Average battery level")
+    battery_min: Optional[float] = Field(None, description="Lowest battery level")
+    battery_max: Optional[float] = Field(None, description="Highest battery level")
+    charging: Optional[bool] = Field(None, description="Last known charging state")
+    lat: Optional[float] = Field(None, description="Last known latitude")
+    lon: Optional[float] = Field(None, description="Last known longitude")
+
+
+class TelemetryHistoryResponse(BaseModel):
+    """Response model for device telemetry history"""
+
+    device_key: str = Field(..., description="Device identifier")
+    resolution: str = Field(..., description="Rollup resolution (1m or 1h)")
+    points: List[TelemetryPoint] = Field(..., description="Buckets, oldest first")
+    latest: Optional[Dict[str, Any]] = Field(None, description="Most recent sample, including unflushed ones")
+
 class RecordAutomationRequest(BaseModel):
     """Request model for starting automation recording"""
 
@@ -375,6 +458,7 @@ class ThoughtLogListResponse(BaseModel):
 
     logs: List[ThoughtLogResponse] = Field(..., description="List of thought logs")
     total: int = Field(..., description="Total number of logs")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page, for paginated listings")
 
 
 class GitHubWorkerRequest(BaseModel):
@@ -1,14 +1,18 @@
 # -*- coding: utf-8 -*-
 """FastAPI Server for Headless Control Interface"""
 
+import asyncio
+import json
 import logging
 from datetime import datetime
 import platform
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
-from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, status, WebSocket, WebSocketDisconnect
-from fastapi.responses import JSONResponse, HTMLResponse, Response
+from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Request, status, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, HTMLResponse, Response, StreamingResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.staticfiles import StaticFiles
@@ -22,9 +26,12 @@ from app.adapters.infrastructure.api_models import (
     MessageRequest,
     MessageResponse,
     TaskResponse,
+    TaskWaitResponse,
     StatusResponse,
     HistoryResponse,
     CommandHistoryItem,
+    InteractionHistoryItem,
+    InteractionHistoryResponse,
     InstallPackageRequest,
     InstallPackageResponse,
     PackageStatusResponse,
@@ -46,2000 +53,277 @@ from app.adapters.infrastructure.api_models import (
     JarvisDispatchResponse,
 )
 from app.adapters.infrastructure.auth_adapter import AuthAdapter
-from app.adapters.infrastructure.sqlite_history_adapter import SQLiteHistoryAdapter
-from app.application.services import AssistantService, ExtensionManager
-from app.application.services.device_service import DeviceService
-from app.core.config import settings
-
-logger = logging.getLogger(__name__)
-
-# List of tables that should have RLS enabled for security
-# Update this list when adding new tables to the database
-RLS_PROTECTED_TABLES = [
-    'jarvis_capabilities',
-    'evolution_rewards',
-]
-
-# OAuth2 scheme for token authentication
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-
-# Initialize authentication adapter
-auth_adapter = AuthAdapter()
-
-
-def should_bypass_jarvis_identifier(request_source: str = None) -> bool:
-    """
-    Determine if request should bypass Jarvis intent identifier.
-    
-    GitHub Actions and GitHub Issues are processed directly by AI.
-    Only user API requests go through Jarvis intent identification.
-    
-    Args:
-        request_source: Source of the request (from RequestSource enum)
-        
-    Returns:
-        True if should bypass Jarvis identifier, False otherwise
-    """
-    from app.adapters.infrastructure.api_models import RequestSource
-    
-    if not request_source:
-        return False
-    
-    # Bypass Jarvis identifier for GitHub-sourced requests
-    bypass_sources = {
-        RequestSource.GITHUB_ACTIONS.value,
-        RequestSource.GITHUB_ISSUE.value,
-    }
-    
-    return request_source in bypass_sources
-
-
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
-    """
-    Dependency to get the current authenticated user from JWT token
-
-    Args:
-        token: JWT token from Authorization header
-
-    Returns:
-        Current user
-
-    Raises:
-        HTTPException: If token is invalid or user not found
-    """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    
-    payload = auth_adapter.verify_token(token)
-    if payload is None:
-        raise credentials_exception
-    
-    username: str = payload.get("sub")
-    if username is None:
-        raise credentials_exception
-    
-    # In production, fetch user from database
-    # For now, we'll construct user from token data
-    user = User(
-        username=username,
-        email=payload.get("email"),
-        full_name=payload.get("full_name"),
-    )
-    
-    return user
-
-
-def create_api_server(assistant_service: AssistantService, extension_manager: ExtensionManager = None) -> FastAPI:
-    """
-    Create and configure the FastAPI application
-
-    Args:
-        assistant_service: Injected AssistantService instance
-        extension_manager: Optional ExtensionManager instance for package management
-
-    Returns:
-        Configured FastAPI application
-    """
-    # Create ExtensionManager if not provided
-    if extension_manager is None:
-        extension_manager = ExtensionManager()
-    
-    # Custom Swagger UI configuration for password visibility toggle
-    swagger_ui_parameters = {
-        "persistAuthorization": True,
-        "displayRequestDuration": True,
-        "filter": True,
-        "tryItOutEnabled": True,
-        # Add custom CSS/JS for password visibility toggle
-        "syntaxHighlight.theme": "monokai",
-    }
-    
-    # Disable default docs to use our custom endpoint
-    app = FastAPI(
-        title=settings.app_name + " API",
-        version=settings.version,
-        description="Headless control interface for the AI assistant",
-        swagger_ui_parameters=swagger_ui_parameters,
-        docs_url=None,  # Disable default docs
-        redoc_url=None,  # Disable redoc
-    )
-    
-    # Mount static files for PWA support (manifest, service worker, icons)
-    static_path = Path(__file__).parent.parent.parent.parent / "static"
-    if static_path.exists():
-        app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
-        logger.info(f"Static files mounted from: {static_path}")
-    else:
-        logger.warning(f"Static directory not found at: {static_path}")
-    
-    # Initialize database adapter for distributed mode
-    db_adapter = SQLiteHistoryAdapter(database_url=settings.database_url)
-    
-    # Initialize device service for distributed orchestration
-    device_service = DeviceService(engine=db_adapter.engine)
-
-    @app.get("/", response_class=HTMLResponse)
-    async def root():
-        """
-        Root endpoint - Stark Industries command interface
-        Serves the main HTML UI for interacting with Jarvis with authentication and voice input
-        """
-        html_content = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    
-    <!-- Security Meta Tags -->
-    <meta name="referrer" content="no-referrer">
-    <meta http-equiv="X-Content-Type-Options" content="nosniff">
-    <meta http-equiv="X-Frame-Options" content="DENY">
-    <meta name="robots" content="noindex, nofollow">
-    
-    <!-- PWA Manifest -->
-    <link rel="manifest" href="/static/manifest.json">
-    
-    <!-- iOS PWA Support -->
-    <meta name="apple-mobile-web-app-capable" content="yes">
-    <meta name="mobile-web-app-capable" content="yes">
-    <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
-    <meta name="apple-mobile-web-app-title" content="J.A.R.V.I.S. Strategic HUD">
-    <link rel="apple-touch-icon" href="/static/icon-192.png">
-    
-    <!-- Theme Color -->
-    <meta name="theme-color" content="#00d4ff">
-    
-    <!-- Leaflet CSS for OpenStreetMap -->
-    <link rel="stylesheet" href="https://unpkg.com/leaflet@1.9.4/dist/leaflet.css"
-          integrity="sha256-p4NxAoJBhIIN+hmNHrzRCf9tD/miZyoHS5obTRR9BMY="
-          crossorigin=""/>
-    
-    <title>J.A.R.V.I.S. Strategic HUD</title>
-    <style>
-        * {
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }
-        
-        body {
-            font-family: 'Courier New', monospace;
-            background: linear-gradient(135deg, #0a0e27 0%, #1a1f3a 100%);
-            color: #00d4ff;
-            min-height: 100vh;
-            display: flex;
-            flex-direction: column;
-            overflow-x: hidden;
-        }
-        
-        .header {
-            background: rgba(0, 20, 40, 0.8);
-            border-bottom: 2px solid #00d4ff;
-            padding: 20px;
-            text-align: center;
-            box-shadow: 0 0 20px rgba(0, 212, 255, 0.3);
-        }
-        
-        .header h1 {
-            font-size: 2.5em;
-            text-shadow: 0 0 10px #00d4ff, 0 0 20px #00d4ff;
-            letter-spacing: 5px;
-            animation: glow 2s ease-in-out infinite alternate;
-        }
-        
-        @keyframes glow {
-            from { text-shadow: 0 0 10px #00d4ff, 0 0 20px #00d4ff; }
-            to { text-shadow: 0 0 20px #00d4ff, 0 0 30px #00d4ff, 0 0 40px #00d4ff; }
-        }
-        
-        .status {
-            display: inline-block;
-            margin-top: 10px;
-            padding: 5px 15px;
-            background: rgba(0, 212, 255, 0.1);
-            border: 1px solid #00d4ff;
-            border-radius: 20px;
-            font-size: 0.9em;
-        }
-        
-        .user-info {
-            position: absolute;
-            top: 20px;
-            right: 20px;
-            font-size: 0.9em;
-        }
-        
-        .logout-btn {
-            margin-left: 15px;
-            background: rgba(255, 0, 0, 0.2);
-            border: 1px solid #ff0000;
-            border-radius: 5px;
-            padding: 5px 10px;
-            color: #ff0000;
-            cursor: pointer;
-            transition: all 0.3s;
-        }
-        
-        .logout-btn:hover {
-            background: rgba(255, 0, 0, 0.4);
-            box-shadow: 0 0 10px rgba(255, 0, 0, 0.5);
-        }
-        
-        .modal {
-            display: none;
-            position: fixed;
-            z-index: 1000;
-            left: 0;
-            top: 0;
-            width: 100%;
-            height: 100%;
-            background-color: rgba(0, 0, 0, 0.8);
-            backdrop-filter: blur(5px);
-        }
-        
-        .modal.active {
-            display: flex;
-            align-items: center;
-            justify-content: center;
-        }
-        
-        .modal-content {
-            background: linear-gradient(135deg, #0a0e27 0%, #1a1f3a 100%);
-            padding: 40px;
-            border: 2px solid #00d4ff;
-            border-radius: 10px;
-            box-shadow: 0 0 40px rgba(0, 212, 255, 0.5);
-            max-width: 400px;
-            width: 90%;
-        }
-        
-        .modal-content h2 {
-            text-align: center;
-            margin-bottom: 30px;
-            text-shadow: 0 0 10px #00d4ff;
-        }
-        
-        .form-group {
-            margin-bottom: 20px;
-        }
-        
-        .form-group label {
-            display: block;
-            margin-bottom: 8px;
-            font-size: 0.9em;
-            letter-spacing: 1px;
-        }
-        
-        .form-group {
-            position: relative;
-        }
-        
-        .form-group input {
-            width: 100%;
-            background: rgba(0, 0, 0, 0.6);
-            border: 2px solid #00d4ff;
-            border-radius: 5px;
-            padding: 12px;
-            color: #00d4ff;
-            font-family: 'Courier New', monospace;
-            font-size: 1em;
-            outline: none;
-            transition: all 0.3s;
-        }
-        
-        .form-group input:focus {
-            border-color: #00ff88;
-            box-shadow: 0 0 15px rgba(0, 255, 136, 0.3);
-        }
-        
-        .password-toggle {
-            position: absolute;
-            right: 12px;
-            top: 38px;
-            background: transparent;
-            border: none;
-            color: #00d4ff;
-            cursor: pointer;
-            font-size: 1.2em;
-            padding: 0;
-            transition: all 0.3s;
-        }
-        
-        .password-toggle:hover {
-            color: #00ff88;
-        }
-        
-        .login-btn {
-            width: 100%;
-            background: linear-gradient(135deg, #00d4ff 0%, #0088cc 100%);
-            border: none;
-            border-radius: 5px;
-            padding: 15px;
-            color: #0a0e27;
-            font-weight: bold;
-            font-family: 'Courier New', monospace;
-            cursor: pointer;
-            text-transform: uppercase;
-            letter-spacing: 2px;
-            transition: all 0.3s;
-            box-shadow: 0 0 20px rgba(0, 212, 255, 0.3);
-        }
-        
-        .login-btn:hover {
-            background: linear-gradient(135deg, #00ff88 0%, #00cc66 100%);
-            box-shadow: 0 0 30px rgba(0, 255, 136, 0.5);
-        }
-        
-        .error-message {
-            color: #ff0000;
-            text-align: center;
-            margin-top: 15px;
-            font-size: 0.9em;
-        }
-        
-        .container {
-            flex: 1;
-            max-width: 1200px;
-            width: 100%;
-            margin: 0 auto;
-            padding: 20px;
-            display: flex;
-            flex-direction: column;
-        }
-        
-        .terminal {
-            background: rgba(0, 0, 0, 0.6);
-            border: 2px solid #00d4ff;
-            border-radius: 10px;
-            padding: 20px;
-            margin-bottom: 20px;
-            box-shadow: 0 0 30px rgba(0, 212, 255, 0.2);
-            min-height: 150px;
-            max-height: 300px;
-            overflow-y: auto;
-        }
-        
-        .message {
-            margin: 10px 0;
-            padding: 12px;
-            border-left: 3px solid #00d4ff;
-            background: rgba(0, 212, 255, 0.05);
-            animation: fadeIn 0.3s ease-in;
-            font-size: 1.1em;
-        }
-        
-        @keyframes fadeIn {
-            from { opacity: 0; transform: translateY(-10px); }
-            to { opacity: 1; transform: translateY(0); }
-        }
-        
-        .message.user {
-            border-left-color: #00ff88;
-            background: rgba(0, 255, 136, 0.05);
-        }
-        
-        .message.system {
-            border-left-color: #ff9500;
-            background: rgba(255, 149, 0, 0.05);
-        }
-        
-        .message-label {
-            font-weight: bold;
-            margin-bottom: 5px;
-            text-transform: uppercase;
-            font-size: 0.9em;
-            letter-spacing: 2px;
-        }
-        
-        .input-area {
-            display: flex;
-            gap: 10px;
-        }
-        
-        #commandInput {
-            flex: 1;
-            background: rgba(0, 0, 0, 0.6);
-            border: 2px solid #00d4ff;
-            border-radius: 5px;
-            padding: 15px;
-            color: #00d4ff;
-            font-family: 'Courier New', monospace;
-            font-size: 1.1em;
-            outline: none;
-            transition: all 0.3s;
-            resize: none;
-            min-height: 60px;
-            line-height: 1.5;
-        }
-        
-        #commandInput:focus {
-            border-color: #00ff88;
-            box-shadow: 0 0 15px rgba(0, 255, 136, 0.3);
-        }
-        
-        #voiceButton {
-            background: rgba(0, 0, 0, 0.6);
-            border: 2px solid #00d4ff;
-            border-radius: 5px;
-            padding: 15px 20px;
-            color: #00d4ff;
-            cursor: pointer;
-            transition: all 0.3s;
-            font-size: 1.2em;
-        }
-        
-        #voiceButton:hover {
-            border-color: #00ff88;
-            box-shadow: 0 0 15px rgba(0, 255, 136, 0.3);
-        }
-        
-        #voiceButton.muted {
-            background: rgba(128, 128, 128, 0.3);
-            border-color: #808080;
-            color: #808080;
-        }
-        
-        #voiceButton.listening {
-            background: rgba(0, 212, 255, 0.2);
-            border-color: #00d4ff;
-            animation: pulse-blue 2s ease-in-out infinite;
-        }
-        
-        #voiceButton.transcribing {
-            background: rgba(255, 0, 0, 0.3);
-            border-color: #ff0000;
-            animation: pulse 1s ease-in-out infinite;
-        }
-        
-        /* Legacy support */
-        #voiceButton.recording {
-            background: rgba(255, 0, 0, 0.3);
-            border-color: #ff0000;
-            animation: pulse 1s ease-in-out infinite;
-        }
-        
-        @keyframes pulse {
-            0%, 100% { box-shadow: 0 0 15px rgba(255, 0, 0, 0.5); }
-            50% { box-shadow: 0 0 30px rgba(255, 0, 0, 0.8); }
-        }
-        
-        @keyframes pulse-blue {
-            0%, 100% { box-shadow: 0 0 15px rgba(0, 212, 255, 0.5); }
-            50% { box-shadow: 0 0 30px rgba(0, 212, 255, 0.8); }
-        }
-        
-        /* Input box waveform visual feedback */
-        #commandInput.voice-active {
-            border-color: #00ff88;
-            box-shadow: 0 0 20px rgba(0, 255, 136, 0.5);
-            animation: waveform 0.5s ease-in-out infinite;
-        }
-        
-        @keyframes waveform {
-            0%, 100% { 
-                box-shadow: 0 0 20px rgba(0, 255, 136, 0.5);
-            }
-            50% { 
-                box-shadow: 0 0 30px rgba(0, 255, 136, 0.8), 0 0 40px rgba(0, 255, 136, 0.4);
-            }
-        }
-        
-        #sendButton {
-            background: linear-gradient(135deg, #00d4ff 0%, #0088cc 100%);
-            border: none;
-            border-radius: 5px;
-            padding: 15px 30px;
-            color: #0a0e27;
-            font-weight: bold;
-            font-family: 'Courier New', monospace;
-            cursor: pointer;
-            text-transform: uppercase;
-            letter-spacing: 2px;
-            transition: all 0.3s;
-            box-shadow: 0 0 20px rgba(0, 212, 255, 0.3);
-        }
-        
-        #sendButton:hover {
-            background: linear-gradient(135deg, #00ff88 0%, #00cc66 100%);
-            box-shadow: 0 0 30px rgba(0, 255, 136, 0.5);
-            transform: translateY(-2px);
-        }
-        
-        #sendButton:active {
-            transform: translateY(0);
-        }
-        
-        #sendButton:disabled {
-            background: #333;
-            cursor: not-allowed;
-            opacity: 0.5;
-        }
-        
-        .loading {
-            display: none;
-            text-align: center;
-            padding: 10px;
-            color: #00d4ff;
-        }
-        
-        .loading.active {
-            display: block;
-        }
-        
-        .reactor {
-            display: inline-block;
-            width: 40px;
-            height: 40px;
-            border: 4px solid rgba(0, 212, 255, 0.3);
-            border-radius: 50%;
-            position: relative;
-            animation: reactor-pulse 1.5s ease-in-out infinite;
-        }
-        
-        .reactor::before {
-            content: '';
-            position: absolute;
-            top: 50%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            width: 20px;
-            height: 20px;
-            background: #00d4ff;
-            border-radius: 50%;
-            box-shadow: 0 0 20px #00d4ff, 0 0 40px #00d4ff;
-            animation: reactor-core 1.5s ease-in-out infinite;
-        }
-        
-        .reactor::after {
-            content: '';
-            position: absolute;
-            top: 50%;
-            left: 50%;
-            transform: translate(-50%, -50%);
-            width: 60px;
-            height: 60px;
-            border: 2px solid rgba(0, 212, 255, 0.2);
-            border-radius: 50%;
-            animation: reactor-ring 1.5s ease-in-out infinite;
-        }
-        
-        @keyframes reactor-pulse {
-            0%, 100% {
-                border-color: rgba(0, 212, 255, 0.3);
-                box-shadow: 0 0 10px rgba(0, 212, 255, 0.3);
-            }
-            50% {
-                border-color: rgba(0, 212, 255, 0.8);
-                box-shadow: 0 0 30px rgba(0, 212, 255, 0.6), 0 0 50px rgba(0, 212, 255, 0.4);
-            }
-        }
-        
-        @keyframes reactor-core {
-            0%, 100% {
-                opacity: 0.7;
-                box-shadow: 0 0 20px #00d4ff;
-            }
-            50% {
-                opacity: 1;
-                box-shadow: 0 0 40px #00d4ff, 0 0 60px #00d4ff, 0 0 80px #00d4ff;
-            }
-        }
-        
-        @keyframes reactor-ring {
-            0%, 100% {
-                opacity: 0.3;
-                transform: translate(-50%, -50%) scale(1);
-            }
-            50% {
-                opacity: 0.6;
-                transform: translate(-50%, -50%) scale(1.1);
-            }
-        }
-        
-        .spinner {
-            display: inline-block;
-            width: 20px;
-            height: 20px;
-            border: 3px solid rgba(0, 212, 255, 0.3);
-            border-radius: 50%;
-            border-top-color: #00d4ff;
-            animation: spin 1s linear infinite;
-        }
-        
-        @keyframes spin {
-            to { transform: rotate(360deg); }
-        }
-        
-        .hidden {
-            display: none !important;
-        }
-        
-        /* Mobile Edge Node Telemetry Panel */
-        .telemetry-panel {
-            display: none; /* Hidden per user request - info still tracked in background */
-        }
-        
-        .telemetry-item {
-            padding: 10px;
-            background: rgba(0, 212, 255, 0.05);
-            border-left: 3px solid #00d4ff;
-            border-radius: 5px;
-        }
-        
-        .telemetry-label {
-            font-size: 0.8em;
-            color: #00d4ff;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-            margin-bottom: 5px;
-        }
-        
-        .telemetry-value {
-            font-size: 1.2em;
-            color: #00ff88;
-            font-weight: bold;
-        }
-        
-        .battery-low {
-            border-left-color: #ff0000;
-            background: rgba(255, 0, 0, 0.1);
-        }
-        
-        .battery-low .telemetry-value {
-            color: #ff0000;
-        }
-        
-        /* Spatial Orientation Module */
-        .spatial-orientation-panel {
-            background: rgba(0, 0, 0, 0.6);
-            border: 2px solid #00ff88;
-            border-radius: 10px;
-            padding: 15px;
-            margin-bottom: 20px;
-            display: none; /* Hidden by default until location is available */
-        }
-        
-        .spatial-orientation-panel.visible {
-            display: block;
-        }
-        
-        .spatial-orientation-panel h3 {
-            color: #00ff88;
-            margin-bottom: 15px;
-            text-align: center;
-            text-shadow: 0 0 10px #00ff88;
-            font-size: 1.2em;
-        }
-        
-        .location-name {
-            text-align: center;
-            padding: 10px;
-            background: rgba(0, 255, 136, 0.05);
-            border-left: 3px solid #00ff88;
-            border-radius: 5px;
-            margin-bottom: 15px;
-            color: #00d4ff;
-            font-size: 0.95em;
-        }
-        
-        .location-name .primary {
-            font-weight: bold;
-            color: #00ff88;
-            font-size: 1.1em;
-            margin-bottom: 5px;
-        }
-        
-        .location-name .secondary {
-            font-size: 0.9em;
-            color: #00d4ff;
-            opacity: 0.8;
-        }
-        
-        .map-container {
-            position: relative;
-            width: 100%;
-            height: 300px;
-            border-radius: 8px;
-            overflow: hidden;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            border: 2px solid #00ff88;
-        }
-        
-        .map-container:hover {
-            box-shadow: 0 0 20px rgba(0, 255, 136, 0.4);
-            border-color: #00d4ff;
-        }
-        
-        #map {
-            width: 100%;
-            height: 100%;
-            z-index: 1;
-        }
-        
-        /* Dark mode for Leaflet map tiles */
-        .leaflet-tile {
-            filter: brightness(0.6) invert(1) contrast(3) hue-rotate(200deg) saturate(0.3) brightness(0.7);
-        }
-        
-        .map-overlay {
-            position: absolute;
-            bottom: 0;
-            left: 0;
-            right: 0;
-            background: rgba(0, 0, 0, 0.7);
-            padding: 8px;
-            text-align: center;
-            color: #00ff88;
-            font-size: 0.85em;
-            opacity: 0;
-            transition: opacity 0.3s ease;
-        }
-        
-        .map-container:hover .map-overlay {
-            opacity: 1;
-        }
-        
-        /* Evolution Panel */
-        .evolution-panel {
-            background: rgba(0, 0, 0, 0.6);
-            border: 2px solid #ff9500;
-            border-radius: 10px;
-            padding: 12px 15px;
-            margin-bottom: 20px;
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            gap: 10px;
-        }
-        
-        .evolution-panel h3 {
-            color: #ff9500;
-            margin: 0;
-            text-shadow: 0 0 10px #ff9500;
-            font-size: 1em;
-        }
-        
-        .evolution-status {
-            color: #ff9500;
-            font-weight: bold;
-            font-size: 1.1em;
-        }
-        
-        /* Mobile responsiveness */
-        @media (max-width: 768px) {
-            .header h1 {
-                font-size: 1.8em;
-                letter-spacing: 3px;
-            }
-            
-            .user-info {
-                position: static;
-                margin-top: 10px;
-                text-align: center;
-            }
-            
-            .modal-content {
-                padding: 30px 20px;
-                max-width: 90%;
-            }
-            
-            .container {
-                padding: 10px;
-            }
-            
-            .terminal {
-                min-height: 120px;
-                max-height: 250px;
-                padding: 15px;
-            }
-            
-            .message {
-                font-size: 1em;
-                padding: 10px;
-            }
-            
-            .input-area {
-                flex-direction: row;
-                flex-wrap: nowrap;
-                gap: 5px;
-            }
-            
-            #commandInput {
-                font-size: 1em;
-                padding: 12px;
-                min-height: 50px;
-            }
-            
-            #voiceButton {
-                padding: 12px 15px;
-                font-size: 1em;
-                min-width: 50px;
-            }
-            
-            #sendButton {
-                padding: 12px 20px;
-                font-size: 0.9em;
-            }
-            
-            .telemetry-panel {
-                grid-template-columns: 1fr;
-            }
-            
-            .spatial-orientation-panel {
-                padding: 12px;
-            }
-            
-            .spatial-orientation-panel h3 {
-                font-size: 1em;
-            }
-            
-            .location-name {
-                padding: 8px;
-                font-size: 0.9em;
-                margin-bottom: 12px;
-            }
-            
-            .map-container {
-                max-height: 250px;
-            }
-        }
-        
-        @media (max-width: 480px) {
-            .header h1 {
-                font-size: 1.5em;
-                letter-spacing: 2px;
-            }
-            
-            .header {
-                padding: 15px 10px;
-            }
-            
-            .modal-content h2 {
-                font-size: 1.3em;
-            }
-            
-            .form-group input {
-                font-size: 0.95em;
-            }
-            
-            .message {
-                padding: 10px;
-                font-size: 1em;
-            }
-            
-            #commandInput {
-                font-size: 1em;
-                min-height: 50px;
-            }
-            
-            /* Spatial orientation optimizations for portrait mobile */
-            .spatial-orientation-panel h3 {
-                font-size: 0.95em;
-                margin-bottom: 10px;
-            }
-            
-            .location-name {
-                font-size: 0.85em;
-                margin-bottom: 10px;
-            }
-            
-            .location-name .primary {
-                font-size: 1em;
-                margin-bottom: 3px;
-            }
-            
-            .location-name .secondary {
-                font-size: 0.85em;
-            }
-            
-            .map-container {
-                max-height: 200px;
-                border-width: 1px;
-            }
-            
-            .map-overlay {
-                font-size: 0.75em;
-                padding: 6px;
-            }
-        }
-    </style>
-</head>
-<body>
-    <!-- Login Modal -->
-    <div id="loginModal" class="modal active">
-        <div class="modal-content">
-            <h2>J.A.R.V.I.S. ACCESS</h2>
-            <form id="loginForm">
-                <div class="form-group">
-                    <label for="username">USERNAME</label>
-                    <input type="text" id="username" name="username" required autocomplete="off">
-                </div>
-                <div class="form-group">
-                    <label for="password">PASSWORD</label>
-                    <input type="password" id="password" name="password" required autocomplete="off">
-                    <button type="button" class="password-toggle" id="passwordToggle" title="Show/Hide Password">👁️</button>
-                </div>
-                <button type="submit" class="login-btn">AUTHENTICATE</button>
-                <div id="loginError" class="error-message"></div>
-            </form>
-        </div>
-    </div>
-    
-    <!-- Main Interface -->
-    <div id="mainInterface" class="hidden">
-        <div class="header">
-            <h1>J.A.R.V.I.S.</h1>
-            <div class="status">● SYSTEM ONLINE</div>
-            <div class="user-info">
-                <span id="userDisplay"></span>
-                <button class="logout-btn" id="logoutBtn">LOGOUT</button>
-            </div>
-        </div>
-        
-        <div class="container">
-            <!-- Mobile Edge Node Telemetry Panel -->
-            <div class="telemetry-panel" id="telemetryPanel">
-                <div class="telemetry-item" id="batteryTelemetry">
-                    <div class="telemetry-label">Battery</div>
-                    <div class="telemetry-value" id="batteryValue">-- %</div>
-                </div>
-                <div class="telemetry-item">
-                    <div class="telemetry-label">Location</div>
-                    <div class="telemetry-value" id="locationValue">Detecting...</div>
-                </div>
-                <div class="telemetry-item">
-                    <div class="telemetry-label">Device Type</div>
-                    <div class="telemetry-value" id="deviceType">Desktop</div>
-                </div>
-                <div class="telemetry-item">
-                    <div class="telemetry-label">Connection</div>
-                    <div class="telemetry-value" id="connectionStatus">Online</div>
-                </div>
-            </div>
-            
-            <!-- Spatial Orientation Module -->
-            <div class="spatial-orientation-panel" id="spatialOrientationPanel">
-                <h3>📍 Orientação Espacial</h3>
-                <div class="location-name" id="locationName">
-                    <div class="primary">Carregando localização...</div>
-                    <div class="secondary"></div>
-                </div>
-                <div class="map-container" id="mapContainer" title="Clique para abrir no Google Maps">
-                    <div id="map"></div>
-                    <div class="map-overlay">🗺️ Clique para visualizar no Google Maps</div>
-                </div>
-            </div>
-            
-            <!-- Real-Time Evolution Panel -->
-            <div class="evolution-panel">
-                <h3>⚙️ Progresso:</h3>
-                <div class="evolution-status" id="evolutionStatus">0%</div>
-            </div>
-            
-            <div class="terminal" id="terminal">
-                <div class="message system">
-                    <div class="message-label">System</div>
-                    <div>J.A.R.V.I.S. Command Interface initialized. Ready for input.</div>
-                </div>
-            </div>
-            
-            <div class="loading" id="loading">
-                <div class="reactor"></div>
-                <div style="margin-top: 10px;">Processing...</div>
-            </div>
-            
-            <div class="input-area">
-                <button id="voiceButton" title="Voice Input">🎤</button>
-                <textarea 
-                    id="commandInput" 
-                    placeholder="Enter command or use voice..."
-                    autocomplete="off"
-                    rows="2"
-                ></textarea>
-                <button id="sendButton">Enviar</button>
-            </div>
-        </div>
-    </div>
-    
-    <!-- Leaflet JavaScript for OpenStreetMap - loaded before inline scripts -->
-    <script src="https://unpkg.com/leaflet@1.9.4/dist/leaflet.js"
-            integrity="sha256-20nQCchB9co0qIjJZRGuk2/Z9VM+kNiyxNV1lvTlZBo="
-            crossorigin=""></script>
-    
-    <script>
-        // Authentication management
-        const AUTH_TOKEN_KEY = 'jarvis_auth_token';
-        const AUTH_USER_KEY = 'jarvis_auth_user';
-        const TOKEN_EXPIRY_KEY = 'jarvis_token_expiry';
-        const ACTIVITY_TIMEOUT = 30 * 60 * 1000; // 30 minutes
-        let lastActivity = Date.now();
-        let activityCheckInterval;
-        
-        // UI Elements
-        const loginModal = document.getElementById('loginModal');
-        const mainInterface = document.getElementById('mainInterface');
-        const loginForm = document.getElementById('loginForm');
-        const loginError = document.getElementById('loginError');
-        const userDisplay = document.getElementById('userDisplay');
-        const logoutBtn = document.getElementById('logoutBtn');
-        const terminal = document.getElementById('terminal');
-        const commandInput = document.getElementById('commandInput');
-        const sendButton = document.getElementById('sendButton');
-        const voiceButton = document.getElementById('voiceButton');
-        const loading = document.getElementById('loading');
-        const passwordToggle = document.getElementById('passwordToggle');
-        const passwordInput = document.getElementById('password');
-        
-        // Voice recognition - V.A.S. (Voice Activated System)
-        let recognition = null;
-        let isRecording = false;
-        let vasState = 'listening'; // 'muted', 'listening' (wake word detection), 'transcribing'
-        let silenceTimer = null;
-        const SILENCE_TIMEOUT = 3000; // 3 seconds
-        // Wake word detection works with Portuguese pronunciation since lang='pt-BR'
-        // Both app name (jarvis) and user-configured wake word (e.g., xerife) are supported
-        const WAKE_WORDS = ['jarvis']; // Will be updated with configured wake_word from /v1/status
-        let lastSpeechTime = Date.now();
-        let resultIndex = 0; // Track the last processed result index to avoid echo
-        
-        // Voice synthesis
-        function speak(text) {
-            if ('speechSynthesis' in window) {
-                // Cancel any ongoing speech
-                window.speechSynthesis.cancel();
-                
-                const utterance = new SpeechSynthesisUtterance(text);
-                utterance.lang = 'pt-BR'; // Portuguese Brazilian
-                utterance.rate = 1.0;
-                utterance.pitch = 1.0;
-                utterance.volume = 1.0;
-                
-                window.speechSynthesis.speak(utterance);
-            }
-        }
-        
-        // Generate time-based greeting
-        function getGreeting() {
-            const hour = new Date().getHours();
-            let timeGreeting;
-            
-            if (hour >= 5 && hour < 12) {
-                timeGreeting = 'Bom dia';
-            } else if (hour >= 12 && hour < 18) {
-                timeGreeting = 'Boa tarde';
-            } else {
-                timeGreeting = 'Boa noite';
-            }
-            
-            const welcomeMessages = [
-                'Bem-vindo de volta',
-                'É bom ter você de volta',
-                'Prazer em vê-lo novamente',
-                'Sistemas online e prontos'
-            ];
-            
-            const randomWelcome = welcomeMessages[Math.floor(Math.random() * welcomeMessages.length)];
-            
-            return `${timeGreeting}. ${randomWelcome}.`;
-        }
-        
-        // Initialize Web Speech API for V.A.S.
-        if ('webkitSpeechRecognition' in window || 'SpeechRecognition' in window) {
-            const SpeechRecognition = window.SpeechRecognition || window.webkitSpeechRecognition;
-            recognition = new SpeechRecognition();
-            recognition.continuous = true; // Continuous mode for wake word detection
-            recognition.interimResults = true; // Get interim results for real-time transcription
-            recognition.lang = 'pt-BR'; // Portuguese Brazilian
-            
-            recognition.onresult = (event) => {
-                // Process only new results to avoid echo
-                for (let i = resultIndex; i < event.results.length; i++) {
-                    const result = event.results[i];
-                    const transcript = result[0].transcript.trim().toLowerCase();
-                    
-                    lastSpeechTime = Date.now();
-                    
-                    if (vasState === 'listening') {
-                        // Wake word detection mode - check for any wake word
-                        const detectedWakeWord = WAKE_WORDS.find(word => transcript.includes(word));
-                        if (detectedWakeWord) {
-                            // Wake word detected! Switch to transcribing mode
-                            vasState = 'transcribing';
-                            updateVoiceButtonState();
-                            commandInput.classList.add('voice-active');
-                            addMessage(`Wake word "${detectedWakeWord}" detected. Transcribing...`, 'system');
-                            // Clear the wake word from input and reset result index
-                            commandInput.value = '';
-                            resultIndex = event.results.length; // Skip all results up to this point
-                            break; // Exit loop after detecting wake word
-                        }
-                    } else if (vasState === 'transcribing') {
-                        // Transcription mode - write to input box
-                        if (result.isFinal) {
-                            // Final result - append to input
-                            const currentValue = commandInput.value;
-                            const newText = result[0].transcript.trim();
-                            commandInput.value = currentValue ? currentValue + ' ' + newText : newText;
-                            resultIndex = i + 1; // Mark this result as processed
-                        }
-                    }
-                }
-                
-                // Reset silence timer when speech is detected (outside loop)
-                if (silenceTimer) {
-                    clearTimeout(silenceTimer);
-                }
-                
-                // Start silence detection for transcribing state (outside loop to avoid multiple timers)
-                if (vasState === 'transcribing') {
-                    silenceTimer = setTimeout(() => {
-                        handleSilence();
-                    }, SILENCE_TIMEOUT);
-                    
-                    // Visual feedback during speech
-                    commandInput.classList.add('voice-active');
-                }
-            };
-            
-            recognition.onerror = (event) => {
-                console.error('Speech recognition error:', event.error);
-                
-                // Don't show error message for 'no-speech' - it's expected during listening
-                if (event.error !== 'no-speech') {
-                    addMessage(`Voice error: ${event.error}`, 'system');
-                }
-                
-                // Reset state on certain errors
-                if (event.error === 'not-allowed' || event.error === 'service-not-allowed') {
-                    vasState = 'muted';
-                    isRecording = false;
-                    updateVoiceButtonState();
-                    addMessage('Microphone access denied. Please allow microphone permissions.', 'system');
-                }
-            };
-            
-            recognition.onend = () => {
-                // Only stop if we're in muted state, otherwise restart for continuous listening
-                if (vasState === 'listening' && isRecording) {
-                    // Restart for continuous wake word detection
-                    try {
-                        recognition.start();
-                    } catch (e) {
-                        // Ignore if already started; log other errors
-                        if (e.name !== 'InvalidStateError') {
-                            console.error('Recognition restart error:', e);
-                        }
-                    }
-                } else if (vasState === 'transcribing' && isRecording) {
-                    // Keep transcribing until manually stopped or silence detected
-                    try {
-                        recognition.start();
-                    } catch (e) {
-                        // Ignore if already started; log other errors
-                        if (e.name !== 'InvalidStateError') {
-                            console.error('Recognition restart error:', e);
-                        }
-                    }
-                } else {
-                    isRecording = false;
-                    updateVoiceButtonState();
-                }
-            };
-            
-            recognition.onstart = () => {
-                isRecording = true;
-            };
-        } else {
-            // Browser doesn't support Speech API - show fallback message
-            addMessage('Comando de voz indisponível neste ambiente', 'system');
-            voiceButton.style.display = 'none';
-        }
-        
-        // Handle silence detection
-        function handleSilence() {
-            if (vasState === 'transcribing') {
-                // Silence detected - return to wake word listening mode
-                vasState = 'listening';
-                updateVoiceButtonState();
-                commandInput.classList.remove('voice-active');
-                addMessage('Silence detected. Returning to wake word mode...', 'system');
-                // Reset result index for clean state
-                resultIndex = 0;
-            }
-        }
-        
-        // Update voice button visual state
-        function updateVoiceButtonState() {
-            // Remove all state classes
-            voiceButton.classList.remove('muted', 'listening', 'transcribing', 'recording');
-            
-            // Add current state class
-            voiceButton.classList.add(vasState);
-            
-            // Update button icon/text based on state
-            if (vasState === 'muted') {
-                voiceButton.innerHTML = '🔇';
-                voiceButton.title = 'Microphone Off - Click to enable wake word detection';
-            } else if (vasState === 'listening') {
-                voiceButton.innerHTML = '🎤';
-                const wakeWordsDisplay = WAKE_WORDS.join('" or "');
-                voiceButton.title = `Listening for wake word "${wakeWordsDisplay}" - Click to mute`;
-            } else if (vasState === 'transcribing') {
-                voiceButton.innerHTML = '🔴';
-                voiceButton.title = 'Transcribing - Click to stop';
-            }
-        }
-        
-        // Check authentication on load
-        function checkAuth() {
-            const token = localStorage.getItem(AUTH_TOKEN_KEY);
-            const expiry = localStorage.getItem(TOKEN_EXPIRY_KEY);
-            
-            if (token && expiry && Date.now() < parseInt(expiry)) {
-                const user = localStorage.getItem(AUTH_USER_KEY);
-                showMainInterface(user);
-                startActivityMonitoring();
-                return true;
-            } else {
-                logout();
-                return false;
-            }
-        }
-        
-        // Login function
-        async function login(username, password) {
-            try {
-                const formData = new URLSearchParams();
-                formData.append('username', username);
-                formData.append('password', password);
-                
-                const response = await fetch('/token', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/x-www-form-urlencoded',
-                    },
-                    body: formData
-                });
-                
-                if (!response.ok) {
-                    throw new Error('Invalid credentials');
-                }
-                
-                const data = await response.json();
-                
-                // Store token and expiry (24 hours)
-                localStorage.setItem(AUTH_TOKEN_KEY, data.access_token);
-                localStorage.setItem(AUTH_USER_KEY, username);
-                localStorage.setItem(TOKEN_EXPIRY_KEY, Date.now() + (24 * 60 * 60 * 1000));
-                
-                showMainInterface(username);
-                startActivityMonitoring();
-            } catch (error) {
-                loginError.textContent = 'Authentication failed. Please check your credentials.';
-                throw error;
-            }
-        }
-        
-        // Logout function
-        function logout() {
-            localStorage.removeItem(AUTH_TOKEN_KEY);
-            localStorage.removeItem(AUTH_USER_KEY);
-            localStorage.removeItem(TOKEN_EXPIRY_KEY);
-            
-            if (activityCheckInterval) {
-                clearInterval(activityCheckInterval);
-            }
-            
-            loginModal.classList.add('active');
-            mainInterface.classList.add('hidden');
-            loginError.textContent = '';
-        }
-        
-        // Show main interface
-        async function showMainInterface(username) {
-            userDisplay.textContent = `User: ${username}`;
-            loginModal.classList.remove('active');
-            mainInterface.classList.remove('hidden');
-            
-            // Fetch wake word from status endpoint and add it to WAKE_WORDS (non-blocking)
-            fetchWakeWord();
-            
-            // Greet the user when HUD opens
-            const greeting = getGreeting();
-            addMessage(greeting, 'jarvis');
-            speak(greeting);
-        }
-        
-        // Fetch configured wake word from backend
-        async function fetchWakeWord() {
-            try {
-                const token = localStorage.getItem(AUTH_TOKEN_KEY);
-                const response = await fetch('/v1/status', {
-                    method: 'GET',
-                    headers: {
-                        'Authorization': `Bearer ${token}`
-                    }
-                });
-                
-                if (response.ok) {
-                    const data = await response.json();
-                    if (data.wake_word && !WAKE_WORDS.includes(data.wake_word)) {
-                        WAKE_WORDS.push(data.wake_word);
-                        console.log(`Wake words configured: ${WAKE_WORDS.join(', ')}`);
-                    }
-                }
-            } catch (error) {
-                console.error('Error fetching wake word:', error);
-                // Continue with default wake words if fetch fails
-            }
-        }
-        
-        // Activity monitoring
-        function updateActivity() {
-            lastActivity = Date.now();
-        }
-        
-        function checkActivity() {
-            const token = localStorage.getItem(AUTH_TOKEN_KEY);
-            if (!token) return;
-            
-            const timeSinceActivity = Date.now() - lastActivity;
-            if (timeSinceActivity > ACTIVITY_TIMEOUT) {
-                addMessage('Session expired due to inactivity', 'system');
-                setTimeout(() => logout(), 2000);
-            }
-        }
-        
-        function startActivityMonitoring() {
-            // Update activity on user interaction
-            ['mousedown', 'keydown', 'scroll', 'touchstart'].forEach(event => {
-                document.addEventListener(event, updateActivity);
-            });
-            
-            // Check activity every minute
-            activityCheckInterval = setInterval(checkActivity, 60000);
-        }
-        
-        // Login form handler
-        loginForm.addEventListener('submit', async (e) => {
-            e.preventDefault();
-            loginError.textContent = '';
-            
-            const username = document.getElementById('username').value;
-            const password = document.getElementById('password').value;
-            
-            try {
-                await login(username, password);
-            } catch (error) {
-                console.error('Login error:', error);
-            }
-        });
-        
-        // Password toggle handler
-        if (passwordToggle) {
-            passwordToggle.addEventListener('click', () => {
-                if (passwordInput.type === 'password') {
-                    passwordInput.type = 'text';
-                    passwordToggle.textContent = '🙈';
-                } else {
-                    passwordInput.type = 'password';
-                    passwordToggle.textContent = '👁️';
-                }
-            });
-        }
-        
-        // Logout handler
-        logoutBtn.addEventListener('click', logout);
-        
-        // Voice button handler for V.A.S.
-        if (voiceButton) {
-            voiceButton.addEventListener('click', () => {
-                if (!recognition) {
-                    addMessage('Voice recognition not supported in this browser', 'system');
-                    return;
-                }
-                
-                if (vasState === 'muted') {
-                    // Start wake word listening mode
-                    vasState = 'listening';
-                    resultIndex = 0; // Reset result index for clean state
-                    try {
-                        recognition.start();
-                        updateVoiceButtonState();
-                        addMessage('Wake word detection active. Say "Jarvis" to start transcribing.', 'system');
-                    } catch (e) {
-                        console.error('Failed to start recognition:', e);
-                        vasState = 'muted';
-                        updateVoiceButtonState();
-                    }
-                } else if (vasState === 'listening') {
-                    // Stop and mute
-                    vasState = 'muted';
-                    resultIndex = 0; // Reset result index for clean state
-                    try {
-                        recognition.stop();
-                    } catch (e) {
-                        // Ignore if already stopped; log other errors
-                        if (e.name !== 'InvalidStateError') {
-                            console.error('Recognition stop error:', e);
-                        }
-                    }
-                    isRecording = false;
-                    updateVoiceButtonState();
-                    addMessage('Voice detection disabled.', 'system');
-                } else if (vasState === 'transcribing') {
-                    // Stop transcribing and return to listening mode
-                    vasState = 'listening';
-                    resultIndex = 0; // Reset result index for clean state
-                    commandInput.classList.remove('voice-active');
-                    if (silenceTimer) {
-                        clearTimeout(silenceTimer);
-                        silenceTimer = null;
-                    }
-                    updateVoiceButtonState();
-                    addMessage('Transcription stopped. Back to wake word mode.', 'system');
-                }
-            });
-            
-            // Initialize button state
-            updateVoiceButtonState();
-        }
-        
-        // Add message to terminal
-        function addMessage(text, type = 'system') {
-            const messageDiv = document.createElement('div');
-            messageDiv.className = `message ${type}`;
-            
-            const label = document.createElement('div');
-            label.className = 'message-label';
-            label.textContent = type === 'user' ? 'User' : type === 'system' ? 'System' : 'J.A.R.V.I.S.';
-            
-            const content = document.createElement('div');
-            content.textContent = text;
-            
-            messageDiv.appendChild(label);
-            messageDiv.appendChild(content);
-            terminal.appendChild(messageDiv);
-            
-            // Keep only the last 2 messages for better mobile readability
-            const messages = terminal.querySelectorAll('.message');
-            if (messages.length > 2) {
-                // Remove oldest messages, keeping only last 2 regardless of sender
-                for (let i = 0; i < messages.length - 2; i++) {
-                    messages[i].remove();
-                }
-            }
-        }
-        
-        // Send command function
-        async function sendCommand() {
-            const command = commandInput.value.trim();
-            if (!command) return;
-            
-            const token = localStorage.getItem(AUTH_TOKEN_KEY);
-            if (!token) {
-                logout();
-                return;
-            }
-            
-            // Add user message
-            addMessage(command, 'user');
-            
-            // Clear input
-            commandInput.value = '';
-            
-            // Disable button and show loading
-            sendButton.disabled = true;
-            loading.classList.add('active');
-            
-            try {
-                const response = await fetch('/v1/message', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                        'Authorization': `Bearer ${token}`
-                    },
-                    body: JSON.stringify({
-                        text: command
-                    })
-                });
-                
-                if (!response.ok) {
-                    if (response.status === 401) {
-                        addMessage('Session expired. Please login again.', 'system');
-                        setTimeout(() => logout(), 2000);
-                        return;
-                    }
-                    throw new Error(`HTTP error! status: ${response.status}`);
-                }
-                
-                const data = await response.json();
-                
-                // Extract and display the response field
-                if (data.response) {
-                    addMessage(data.response, 'system');
-                    // Speak the response aloud
-                    speak(data.response);
-                } else if (data.error) {
-                    addMessage(`Error: ${data.error}`, 'system');
-                } else {
-                    addMessage('Command executed successfully', 'system');
-                }
-                
-                updateActivity();
-            } catch (error) {
-                addMessage(`Error: ${error.message}`, 'system');
-                console.error('Error:', error);
-            } finally {
-                // Re-enable button and hide loading
-                sendButton.disabled = false;
-                loading.classList.remove('active');
-            }
-        }
-        
-        // Send on button click
-        sendButton.addEventListener('click', sendCommand);
-        
-        // Send on Enter key (Shift+Enter for new line in textarea)
-        commandInput.addEventListener('keydown', (e) => {
-            if (e.key === 'Enter' && !e.shiftKey) {
-                e.preventDefault(); // Prevent new line
-                sendCommand();
-            }
-            // Shift+Enter will create a new line (default behavior)
-        });
-        
-        // Initialize app
-        checkAuth();
-        
-        // ============================================
-        // Mobile Edge Node Telemetry System
-        // ============================================
-        
-        // Configuration constants
-        const BATTERY_LOW_THRESHOLD = 15; // Percentage - triggers power-saving mode
-        const TELEMETRY_INTERVAL_MS = 30000; // 30 seconds
-        const GPS_CACHE_MAX_AGE_MS = 300000; // 5 minutes
-        const SIGNIFICANT_DISPLACEMENT_METERS = 100; // Performance requirement: update map only if position changes > 100m
-        
-        let batteryLevel = 100;
-        let batteryCharging = false;
-        let currentLocation = null;
-        let lastMapLocation = null; // Track last location where map was updated
-        let deviceType = detectDeviceType();
-        let telemetryInterval = null;
-        let leafletMap = null; // Leaflet map instance
-        let mapMarker = null; // Map marker instance
-        
-        // Detect device type using user agent
-        // Maps various mobile/tablet user agents to device categories
-        function detectDeviceType() {
-            const ua = navigator.userAgent.toLowerCase();
-            // Tablet detection: iPads, Android tablets, Surface tablets, etc.
-            if (/(tablet|ipad|playbook|silk)|(android(?!.*mobi))/i.test(ua)) {
-                return 'Tablet';
-            }
-            // Mobile detection: smartphones, feature phones
-            if (/mobile|iphone|ipod|android|blackberry|opera mini|opera mobi|skyfire|maemo|windows phone|palm|iemobile|symbian|symbianos|fennec/i.test(ua)) {
-                return 'Mobile';
-            }
-            return 'Desktop';
-        }
-        
-        // Update device type display
-        document.getElementById('deviceType').textContent = deviceType;
-        
-        // Initialize Battery API
-        async function initBatteryMonitoring() {
-            if ('getBattery' in navigator) {
-                try {
-                    const battery = await navigator.getBattery();
-                    
-                    // Update battery level
-                    function updateBatteryStatus() {
-                        batteryLevel = Math.round(battery.level * 100);
-                        batteryCharging = battery.charging;
-                        
-                        const batteryValue = document.getElementById('batteryValue');
-                        const batteryTelemetry = document.getElementById('batteryTelemetry');
-                        
-                        batteryValue.textContent = `${batteryLevel}% ${batteryCharging ? '⚡' : ''}`;
-                        
-                        // Low battery warning (uses BATTERY_LOW_THRESHOLD constant)
-                        if (batteryLevel < BATTERY_LOW_THRESHOLD && !batteryCharging) {
-                            batteryTelemetry.classList.add('battery-low');
-                            checkBatteryEmergency();
-                        } else {
-                            batteryTelemetry.classList.remove('battery-low');
-                        }
-                    }
-                    
-                    // Initial update
-                    updateBatteryStatus();
-                    
-                    // Listen for changes
-                    battery.addEventListener('levelchange', updateBatteryStatus);
-                    battery.addEventListener('chargingchange', updateBatteryStatus);
-                    
-                } catch (error) {
-                    console.error('Battery API error:', error);
-                    document.getElementById('batteryValue').textContent = 'N/A';
-                }
-            } else {
-                document.getElementById('batteryValue').textContent = 'N/A';
-            }
-        }
-        
-        // Calculate distance between two coordinates using Haversine formula
-        function calculateDistance(lat1, lon1, lat2, lon2) {
-            const R = 6371e3; // Earth's radius in meters
-            const φ1 = lat1 * Math.PI / 180;
-            const φ2 = lat2 * Math.PI / 180;
-            const Δφ = (lat2 - lat1) * Math.PI / 180;
-            const Δλ = (lon2 - lon1) * Math.PI / 180;
-            
-            // Cache sine calculations for efficiency
-            const sinHalfDeltaPhi = Math.sin(Δφ/2);
-            const sinHalfDeltaLambda = Math.sin(Δλ/2);
-            
-            const a = sinHalfDeltaPhi * sinHalfDeltaPhi +
-                      Math.cos(φ1) * Math.cos(φ2) *
-                      sinHalfDeltaLambda * sinHalfDeltaLambda;
-            const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1-a));
-            
-            return R * c; // Distance in meters
-        }
-        
-        // Update the spatial orientation module with map and geocoding
-        async function updateSpatialOrientation(latitude, longitude) {
-            const panel = document.getElementById('spatialOrientationPanel');
-            const mapContainer = document.getElementById('mapContainer');
-            const locationName = document.getElementById('locationName');
-            
-            // Check if we should update the map (significant displacement or first time)
-            if (lastMapLocation) {
-                const distance = calculateDistance(
-                    lastMapLocation.latitude,
-                    lastMapLocation.longitude,
-                    latitude,
-                    longitude
-                );
-                
-                // Only update if displacement is significant
-                if (distance < SIGNIFICANT_DISPLACEMENT_METERS) {
-                    console.log(`Displacement: ${distance.toFixed(2)}m - Skipping map update`);
-                    return;
-                }
-                
-                console.log(`Significant displacement: ${distance.toFixed(2)}m - Updating map`);
-            }
-            
-            // Update last map location
-            lastMapLocation = { latitude, longitude };
-            
-            // Initialize Leaflet map if not already initialized
-            if (!leafletMap) {
-                leafletMap = L.map('map', {
-                    zoomControl: true,
-                    attributionControl: true,
-                    dragging: false,
-                    scrollWheelZoom: false,
-                    doubleClickZoom: false,
-                    boxZoom: false,
-                    keyboard: false,
-                    tap: false
-                }).setView([latitude, longitude], 16);
-                
-                // Add OpenStreetMap tiles with dark mode styling
-                L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
-                    attribution: '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',
-                    maxZoom: 19,
-                }).addTo(leafletMap);
-                
-                // Create a custom icon for the marker
-                const customIcon = L.divIcon({
-                    className: 'custom-marker',
-                    html: '<div style="background-color: #00ff88; width: 20px; height: 20px; border-radius: 50%; border: 3px solid #00d4ff; box-shadow: 0 0 10px rgba(0, 255, 136, 0.6);"></div>',
-                    iconSize: [20, 20],
-                    iconAnchor: [10, 10]
-                });
-                
-                // Add marker
-                mapMarker = L.marker([latitude, longitude], { icon: customIcon }).addTo(leafletMap);
-            } else {
-                // Update map view and marker position
-                leafletMap.setView([latitude, longitude], 16);
-                mapMarker.setLatLng([latitude, longitude]);
-            }
-            
-            // Make map clickable - redirect to Google Maps
-            mapContainer.onclick = () => {
-                const googleMapsUrl = `https://www.google.com/maps?q=${latitude},${longitude}`;
-                window.open(googleMapsUrl, '_blank');
-            };
-            
-            // Fetch location name using Nominatim (OSM) Reverse Geocoding
-            try {
-                const nominatimUrl = `https://nominatim.openstreetmap.org/reverse?format=json&lat=${latitude}&lon=${longitude}&zoom=18&addressdetails=1`;
-                const response = await fetch(nominatimUrl, {
-                    headers: {
-                        'User-Agent': 'JARVIS-HUD/1.0 (https://github.com/TheDrack/Jarvis_Xerife)'
-                    }
-                });
-                const data = await response.json();
-                
-                if (data && data.address) {
-                    const address = data.address;
-                    
-                    // Extract neighborhood, suburb, or locality
-                    const neighborhood = address.neighbourhood || address.suburb || address.quarter || '';
-                    const locality = address.city || address.town || address.village || address.municipality || '';
-                    const establishment = address.amenity || address.building || '';
-                    
-                    // Display location name with clear logic
-                    const primaryLocation = establishment || neighborhood || locality || 'Localização atual';
-                    
-                    // Determine secondary location
-                    let secondaryLocation = '';
-                    if (establishment && neighborhood) {
-                        secondaryLocation = neighborhood;
-                    } else if (establishment && locality) {
-                        secondaryLocation = locality;
-                    } else if (neighborhood && locality) {
-                        secondaryLocation = locality;
-                    }
-                    
-                    locationName.innerHTML = `
-                        <div class="primary">${primaryLocation}</div>
-                        ${secondaryLocation ? `<div class="secondary">${secondaryLocation}</div>` : ''}
-                    `;
-                } else {
-                    locationName.innerHTML = `
-                        <div class="primary">Localização: ${latitude.toFixed(4)}, ${longitude.toFixed(4)}</div>
-                    `;
-                }
-            } catch (error) {
-                console.error('Nominatim geocoding error:', error);
-                locationName.innerHTML = `
-                    <div class="primary">Localização: ${latitude.toFixed(4)}, ${longitude.toFixed(4)}</div>
-                `;
-            }
-            
-            // Show the panel
-            panel.classList.add('visible');
-        }
-        
-        // Initialize Geolocation with spatial orientation module
-        function initGeolocation() {
-            if ('geolocation' in navigator) {
-                navigator.geolocation.getCurrentPosition(
-                    (position) => {
-                        currentLocation = {
-                            latitude: position.coords.latitude,
-                            longitude: position.coords.longitude,
-                            accuracy: position.coords.accuracy
-                        };
-                        
-                        const lat = position.coords.latitude.toFixed(4);
-                        const lon = position.coords.longitude.toFixed(4);
-                        document.getElementById('locationValue').textContent = `${lat}, ${lon}`;
-                        
-                        // Update spatial orientation module
-                        updateSpatialOrientation(position.coords.latitude, position.coords.longitude);
-                    },
-                    (error) => {
-                        console.error('Geolocation error:', error);
-                        document.getElementById('locationValue').textContent = 'Denied';
-                        // Keep spatial orientation panel hidden if location is denied
-                    },
-                    {
-                        enableHighAccuracy: false, // Low accuracy to save battery on all devices
-                        timeout: 10000,
-                        maximumAge: GPS_CACHE_MAX_AGE_MS
-                    }
-                );
-                
-                // Watch for location changes and update spatial orientation
-                navigator.geolocation.watchPosition(
-                    (position) => {
-                        currentLocation = {
-                            latitude: position.coords.latitude,
-                            longitude: position.coords.longitude,
-                            accuracy: position.coords.accuracy
-                        };
-                        
-                        const lat = position.coords.latitude.toFixed(4);
-                        const lon = position.coords.longitude.toFixed(4);
-                        document.getElementById('locationValue').textContent = `${lat}, ${lon}`;
-                        
-                        // Update spatial orientation (will only update map if displacement > 50m)
-                        updateSpatialOrientation(position.coords.latitude, position.coords.longitude);
-                    },
-                    (error) => {
-                        console.error('Geolocation watch error:', error);
-                    },
-                    {
-                        enableHighAccuracy: false,
-                        timeout: 10000,
-                        maximumAge: GPS_CACHE_MAX_AGE_MS
-                    }
-                );
-            } else {
-                document.getElementById('locationValue').textContent = 'N/A';
-            }
-        }
-        
-        // Send telemetry to JARVIS
-        async function sendTelemetry() {
-            const token = localStorage.getItem(AUTH_TOKEN_KEY);
-            if (!token) return;
-            
-            const telemetryData = {
-                device_type: deviceType,
-                battery: {
-                    level: batteryLevel,
-                    charging: batteryCharging
-                },
-                location: currentLocation,
-                timestamp: new Date().toISOString()
-            };
-            
-            try {
-                // Send via API (you can also use WebSocket for real-time updates)
-                await fetch('/v1/telemetry', {
-                    method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                        'Authorization': `Bearer ${token}`
-                    },
-                    body: JSON.stringify(telemetryData)
-                });
-            } catch (error) {
-                console.error('Telemetry error:', error);
-            }
-        }
-        
-        // Battery Emergency - Suggest power saving
-        async function checkBatteryEmergency() {
-            if (batteryLevel < BATTERY_LOW_THRESHOLD && !batteryCharging) {
-                const message = `⚠️ ALERTA: Bateria baixa (${batteryLevel}%). Sugerindo modo de economia de energia.`;
-                addMessage(message, 'system');
-                
-                // Auto-suggest power saving to JARVIS
-                const token = localStorage.getItem(AUTH_TOKEN_KEY);
-                if (token) {
-                    try {
-                        await fetch('/v1/message', {
-                            method: 'POST',
-                            headers: {
-                                'Content-Type': 'application/json',
-                                'Authorization': `Bearer ${token}`
-                            },
-                            body: JSON.stringify({
-                                text: `Bateria crítica (${batteryLevel}%). Ative modo economia.`,
-                                priority: 'high',
-                                source: 'mobile_telemetry'
-                            })
-                        });
-                    } catch (error) {
-                        console.error('Failed to send battery alert:', error);
-                    }
-                }
-            }
-        }
-        
-        // Evolution tracking
-        async function updateEvolutionStatus() {
-            const token = localStorage.getItem(AUTH_TOKEN_KEY);
-            if (!token) return;
-            
-            try {
-                // Fetch roadmap progress from JARVIS
-                const response = await fetch('/v1/roadmap/progress', {
-                    method: 'GET',
-                    headers: {
-                        'Authorization': `Bearer ${token}`
-                    }
-                });
-                
-                if (response.ok) {
-                    const data = await response.json();
-                    
-                    const evolutionStatus = document.getElementById('evolutionStatus');
-                    const pluginCount = document.getElementById('pluginCount');
-                    
-                    // Display roadmap completion percentage
-                    if (data.completion_percentage !== undefined) {
-                        evolutionStatus.innerHTML = `
-                            <div><strong>${data.completion_percentage.toFixed(1)}%</strong></div>
-                            <div style="margin-top: 5px; font-size: 0.85em;">
-                                ✅ ${data.completed || 0} | 🔄 ${data.in_progress || 0} | 📋 ${data.planned || 0}
-                            </div>
-                        `;
-                    } else if (data.error) {
-                        evolutionStatus.innerHTML = `
-                            <div>❌ Erro</div>
-                            <div style="margin-top: 5px; font-size: 0.85em;">${data.error}</div>
-                        `;
-                    }
-                    
-                    // Update plugin count if available (keeping backward compatibility)
-                    if (data.plugin_count !== undefined) {
-                        pluginCount.textContent = data.plugin_count;
-                    }
-                }
-            } catch (error) {
-                console.error('Evolution status error:', error);
-            }
-        }
-        
-        // Start telemetry monitoring
-        function startTelemetryMonitoring() {
-            // Initialize monitors
-            initBatteryMonitoring();
-            initGeolocation();
-            
-            // Send telemetry at configured interval (TELEMETRY_INTERVAL_MS)
-            telemetryInterval = setInterval(() => {
-                sendTelemetry();
-                updateEvolutionStatus();
-            }, TELEMETRY_INTERVAL_MS);
-            
-            // Initial evolution status
-            updateEvolutionStatus();
-        }
-        
-        // Start telemetry when authenticated
-        if (checkAuth()) {
-            startTelemetryMonitoring();
-        }
-        
-        // ============================================
-        // PWA Service Worker Registration
-        // ============================================
+from app.adapters.infrastructure.db_executor import AsyncDatabaseProxy, DatabaseExecutor
+from app.adapters.infrastructure.health_monitor import HealthMonitor
+from app.adapters.infrastructure.hud_assets import ASSET_URL_PREFIX, HudAssetBundle, StaticAsset
+from app.adapters.infrastructure.hud_event_hub import RESYNC, HudEventHub
+from app.adapters.infrastructure.json_responses import (
+    FastJSONResponse,
+    SelectiveGZipMiddleware,
+    stream_json_list,
+)
+from app.adapters.infrastructure.password_hashing import (
+    HashingQueueFull,
+    LoginAttemptLimiter,
+    PasswordHashingPool,
+)
+from app.adapters.infrastructure.sqlite_history_adapter import SQLiteHistoryAdapter
+from app.adapters.infrastructure.state_store import get_state_store
+from app.adapters.infrastructure.task_notifier import TaskNotifier
+from app.application.services import AssistantService, ExtensionManager
+from app.application.services.device_service import DeviceService
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+
+logger = logging.getLogger(__name__)
+
+# List of tables that should have RLS enabled for security
+# Update this list when adding new tables to the database
+RLS_PROTECTED_TABLES = [
+    'jarvis_capabilities',
+    'evolution_rewards',
+]
+
+# OAuth2 scheme for token authentication
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+
+# Initialize authentication adapter
+auth_adapter = AuthAdapter()
+
+
+def should_bypass_jarvis_identifier(request_source: str = None) -> bool:
+    """
+    Determine if request should bypass Jarvis intent identifier.
+    
+    GitHub Actions and GitHub Issues are processed directly by AI.
+    Only user API requests go through Jarvis intent identification.
+    
+    Args:
+        request_source: Source of the request (from RequestSource enum)
         
-        // Register service worker for PWA functionality
-        if ('serviceWorker' in navigator) {
-            window.addEventListener('load', () => {
-                navigator.serviceWorker.register('/static/sw.js')
-                    .then((registration) => {
-                        console.log('Service Worker registered successfully:', registration.scope);
-                    })
-                    .catch((error) => {
-                        console.error('Service Worker registration failed:', error);
-                    });
-            });
-        }
-    </script>
-</body>
-</html>
+    Returns:
+        True if should bypass Jarvis identifier, False otherwise
+    """
+    from app.adapters.infrastructure.api_models import RequestSource
+    
+    if not request_source:
+        return False
+    
+    # Bypass Jarvis identifier for GitHub-sourced requests
+    bypass_sources = {
+        RequestSource.GITHUB_ACTIONS.value,
+        RequestSource.GITHUB_ISSUE.value,
+    }
+    
+    return request_source in bypass_sources
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
+    """
+    Dependency to get the current authenticated user from JWT token
+
+    Args:
+        token: JWT token from Authorization header
+
+    Returns:
+        Current user
+
+    Raises:
+        HTTPException: If token is invalid or user not found
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    
+    payload = auth_adapter.verify_token(token)
+    if payload is None:
+        raise credentials_exception
+    
+    username: str = payload.get("sub")
+    if username is None:
+        raise credentials_exception
+    
+    # In production, fetch user from database
+    # For now, we'll construct user from token data
+    user = User(
+        username=username,
+        email=payload.get("email"),
+        full_name=payload.get("full_name"),
+    )
+    
+    return user
+
+
+def _hud_response(asset: StaticAsset, request: Request) -> Response:
+    """Serve a prebuilt HUD asset, honouring Accept-Encoding and If-None-Match"""
+    status_code, body, headers = asset.respond(
+        accept_encoding=request.headers.get("accept-encoding", ""),
+        if_none_match=request.headers.get("if-none-match", ""),
+    )
+    return Response(content=body, status_code=status_code, headers=headers)
+
+
+def create_api_server(assistant_service: AssistantService, extension_manager: ExtensionManager = None) -> FastAPI:
+    """
+    Create and configure the FastAPI application
+
+    Args:
+        assistant_service: Injected AssistantService instance
+        extension_manager: Optional ExtensionManager instance for package management
+
+    Returns:
+        Configured FastAPI application
+    """
+    # Create ExtensionManager if not provided
+    if extension_manager is None:
+        extension_manager = ExtensionManager(state_store=get_state_store())
+    
+    # Custom Swagger UI configuration for password visibility toggle
+    swagger_ui_parameters = {
+        "persistAuthorization": True,
+        "displayRequestDuration": True,
+        "filter": True,
+        "tryItOutEnabled": True,
+        # Add custom CSS/JS for password visibility toggle
+        "syntaxHighlight.theme": "monokai",
+    }
+    
+    # Services created below register their start/stop coroutines here; the
+    # lifespan runs startup hooks in order and shutdown hooks in order
+    startup_hooks: list = []
+    shutdown_hooks: list = []
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        for hook in startup_hooks:
+            await hook()
+        try:
+            yield
+        finally:
+            for hook in shutdown_hooks:
+                try:
+                    await hook()
+                except Exception as e:
+                    logger.error(f"Shutdown hook {hook.__name__} failed: {e}")
+    
+    # Disable default docs to use our custom endpoint
+    app = FastAPI(
+        lifespan=lifespan,
+        title=settings.app_name + " API",
+        version=settings.version,
+        description="Headless control interface for the AI assistant",
+        swagger_ui_parameters=swagger_ui_parameters,
+        docs_url=None,  # Disable default docs
+        redoc_url=None,  # Disable redoc
+        default_response_class=FastJSONResponse if settings.fast_json_responses else JSONResponse,
+    )
+    
+    # Compress large responses; HUD assets are precompressed and SSE must flush per event
+    if settings.gzip_minimum_size > 0:
+        app.add_middleware(
+            SelectiveGZipMiddleware,
+            minimum_size=settings.gzip_minimum_size,
+            exclude_paths=("/", "/sw.js", "/v1/message/stream"),
+            exclude_prefixes=(ASSET_URL_PREFIX,),
+        )
+    
+    # Mount static files for PWA support (manifest, service worker, icons)
+    static_path = Path(__file__).parent.parent.parent.parent / "static"
+    if static_path.exists():
+        app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
+        logger.info(f"Static files mounted from: {static_path}")
+    else:
+        logger.warning(f"Static directory not found at: {static_path}")
+    
+    # Build the Strategic HUD once: content-hashed CSS/JS, precompressed bodies and
+    # ETags are computed here instead of on every page load
+    hud_bundle = HudAssetBundle.build(static_path / "hud", service_worker_path=static_path / "sw.js")
+    app.state.hud_bundle = hud_bundle
+    
+    # Initialize database adapter for distributed mode
+    db_adapter = SQLiteHistoryAdapter(database_url=settings.database_url, engine_profile=settings.db_engine_profile)
+    
+    # Initialize device service for distributed orchestration
+    device_service = DeviceService(engine=db_adapter.engine)
+    
+    # Blocking SQLModel calls run on a bounded executor so a slow query never
+    # stalls the event loop (and with it every other request and WebSocket)
+    db_executor = DatabaseExecutor(max_workers=settings.db_executor_workers)
+    async_db = AsyncDatabaseProxy(db_adapter, db_executor)
+    async_devices = AsyncDatabaseProxy(device_service, db_executor)
+    app.state.db_executor = db_executor
+    
+    # Telemetry is buffered per device and bulk-inserted with 1m/1h rollups
+    # instead of one row per ping
+    from app.application.services.telemetry_service import TelemetryService
+    telemetry_service = TelemetryService(
+        engine=db_adapter.engine,
+        buffer_size=settings.telemetry_buffer_size,
+        flush_interval=settings.telemetry_flush_interval_seconds,
+        raw_retention_hours=settings.telemetry_raw_retention_hours,
+        minute_retention_days=settings.telemetry_minute_retention_days,
+        hour_retention_days=settings.telemetry_hour_retention_days,
+    )
+    app.state.telemetry_service = telemetry_service
+    
+    # bcrypt work for /token runs off the loop, and repeated failures are
+    # rejected before any hashing is scheduled
+    password_pool = PasswordHashingPool(
+        max_workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending,
+    )
+    login_limiter = LoginAttemptLimiter(
+        max_failures_per_username=settings.login_max_failures_per_user,
+        max_failures_per_ip=settings.login_max_failures_per_ip,
+        window_seconds=settings.login_failure_window_seconds,
+        state_store=get_state_store(),
+    )
+    app.state.password_pool = password_pool
+    # Revocations made on any API worker apply on all of them (shared store only)
+    auth_adapter.token_cache.share_revocations(get_state_store())
+    
+    async def stop_revocation_sync():
+        await asyncio.to_thread(auth_adapter.token_cache.close)
+    
+    shutdown_hooks.append(stop_revocation_sync)
+    
+    # HUD state is pushed over /v1/hud/stream: sources refresh once for all
+    # connected HUDs and only changes are sent
+    hud_hub = HudEventHub(queue_size=settings.hud_client_queue_size)
+    app.state.hud_hub = hud_hub
+    
+    def _hud_device(device: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields of a device shown on the HUD (last_seen is left out so heartbeats alone are not pushed)"""
+        return {"name": device["name"], "type": device["type"], "status": device["status"]}
+
+    @app.get("/", response_class=HTMLResponse)
+    async def root(request: Request):
         """
-        return HTMLResponse(content=html_content)
+        Root endpoint - Stark Industries command interface
+        Serves the main HTML UI for interacting with Jarvis with authentication and voice input
+        (prebuilt page referencing content-hashed CSS/JS; 304 when the ETag still matches)
+        """
+        return _hud_response(hud_bundle.index, request)
+
+    @app.get("/hud/assets/{filename}")
+    async def hud_asset(filename: str, request: Request):
+        """
+        Content-hashed HUD stylesheet/script, served precompressed and cached as immutable
+        """
+        asset = hud_bundle.get_asset(filename)
+        if asset is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Asset not found")
+        return _hud_response(asset, request)
+
+    @app.get("/sw.js", include_in_schema=False)
+    async def service_worker(request: Request):
+        """
+        Service worker with the precache list of the current HUD build
+        (served from the root so its scope covers the HUD page)
+        """
+        return _hud_response(hud_bundle.service_worker, request)
     
     @app.head("/")
     async def root_head():
@@ -2050,27 +334,58 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
         return Response(status_code=200)
 
     @app.post("/token", response_model=Token)
-    async def login(form_data: OAuth2PasswordRequestForm = Depends()) -> Token:
+    async def login(request: Request, form_data: OAuth2PasswordRequestForm = Depends()) -> Token:
         """
         OAuth2 compatible token login endpoint
 
+        Password verification (bcrypt) runs on a dedicated pool; usernames and
+        client IPs with too many recent failures are rejected before any hashing.
+
         Args:
+            request: Incoming request (for the client address)
             form_data: OAuth2 password request form with username and password
 
         Returns:
             Access token
 
         Raises:
-            HTTPException: If authentication fails
-        """
-        user = auth_adapter.authenticate_user(form_data.username, form_data.password)
-        if not user:
+            HTTPException: If authentication fails (401), too many failed attempts
+                were made (429) or the hashing pool is saturated (503)
+        """
+        # The forwarded client address when the peer is a trusted proxy (serve.py
+        # runs uvicorn with proxy_headers and FORWARDED_ALLOW_IPS)
+        client_ip = request.client.host if request.client else None
+        retry_after = await asyncio.to_thread(login_limiter.acquire, form_data.username, client_ip)
+        if retry_after is not None:
+            logger.warning(f"Login throttled for user '{form_data.username}' from {client_ip}")
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect username or password",
-                headers={"WWW-Authenticate": "Bearer"},
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many failed login attempts",
+                headers={"Retry-After": str(max(1, int(retry_after + 0.5)))},
             )
         
+        try:
+            try:
+                user = await password_pool.run(auth_adapter.authenticate_user, form_data.username, form_data.password)
+            except HashingQueueFull as e:
+                logger.warning(f"Login rejected: {e}")
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication service busy, retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            
+            if not user:
+                await asyncio.to_thread(login_limiter.record_failure, form_data.username, client_ip)
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Incorrect username or password",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            await asyncio.to_thread(login_limiter.record_success, form_data.username)
+        finally:
+            await asyncio.to_thread(login_limiter.release, form_data.username, client_ip)
+        
         access_token = auth_adapter.create_access_token(
             data={
                 "sub": user["username"],
@@ -2081,6 +396,28 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
         
         return Token(access_token=access_token, token_type="bearer")
 
+    @app.post("/token/revoke", status_code=status.HTTP_204_NO_CONTENT)
+    async def revoke_token(
+        token: str = Depends(oauth2_scheme),
+        current_user: User = Depends(get_current_user),
+    ) -> Response:
+        """
+        Revoke the bearer token used for this request (logout)
+
+        The token is rejected from now on, even though it is still cached as
+        verified and has not reached its expiry.
+
+        Args:
+            token: JWT token from Authorization header
+            current_user: Current authenticated user
+
+        Returns:
+            Empty 204 response
+        """
+        await asyncio.to_thread(auth_adapter.revoke_token, token)
+        logger.info(f"User '{current_user.username}' revoked their access token")
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
     @app.post("/v1/execute", response_model=ExecuteResponse)
     async def execute_command(
         request: ExecuteRequest,
@@ -2190,6 +527,62 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
                 error=f"Internal server error: {str(e)}"
             )
 
+    @app.post("/v1/message/stream")
+    async def stream_message(
+        request: MessageRequest,
+        current_user: User = Depends(get_current_user),
+    ) -> StreamingResponse:
+        """
+        Send a message and stream the assistant's reply as Server-Sent Events (Protected endpoint)
+        
+        Conversational replies are sent as "delta" events while the LLM generates
+        them; commands produce a single "done" event. The stream always ends with
+        a "done" event carrying the same fields as /v1/message.
+
+        Args:
+            request: Message request with text
+            current_user: Current authenticated user
+
+        Returns:
+            text/event-stream response
+            
+        Example:
+            data: {"type": "delta", "text": "Bom dia"}
+            data: {"type": "done", "success": true, "response": "Bom dia, senhor.", "error": null}
+        """
+        logger.info(f"User '{current_user.username}' streaming message via API: {request.text}")
+
+        async def event_stream():
+            try:
+                async for event in assistant_service.async_stream_command(request.text):
+                    if event["type"] == "done":
+                        event = {
+                            "type": "done",
+                            "success": event["success"],
+                            "response": event["message"],
+                            "error": event["error"],
+                        }
+                    yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+            except Exception as e:
+                logger.error(f"Error streaming message: {e}", exc_info=True)
+                error_event = {
+                    "type": "done",
+                    "success": False,
+                    "response": "Erro ao processar mensagem. Tente novamente.",
+                    "error": f"Internal server error: {str(e)}",
+                }
+                yield f"data: {json.dumps(error_event, ensure_ascii=False)}\n\n"
+
+        return StreamingResponse(
+            event_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    # Wakes workers long-polling /v1/tasks/wait as soon as a task is queued
+    task_notifier = TaskNotifier(state_store=get_state_store())
+    app.state.task_notifier = task_notifier
+
     @app.post("/v1/task", response_model=TaskResponse)
     async def create_task(
         request: ExecuteRequest,
@@ -2215,7 +608,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             intent = assistant_service.interpreter.interpret(request.command)
             
             # Save as pending task in database
-            task_id = db_adapter.save_pending_command(
+            task_id = await async_db.save_pending_command(
                 user_input=request.command,
                 command_type=intent.command_type.value,
                 parameters=intent.parameters,
@@ -2226,6 +619,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
                     status_code=500,
                     detail="Failed to create task in database"
                 )
+            await task_notifier.notify()
             
             return TaskResponse(
                 task_id=task_id,
@@ -2238,6 +632,30 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             logger.error(f"Error creating task: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+    @app.get("/v1/tasks/wait", response_model=TaskWaitResponse)
+    async def wait_for_task(
+        since: Optional[int] = None,
+        timeout: float = 25.0,
+        current_user: User = Depends(get_current_user),
+    ) -> TaskWaitResponse:
+        """
+        Long-poll for new distributed tasks (Protected endpoint)
+        
+        Returns as soon as a task is created through /v1/task after version `since`,
+        or with notified=false after `timeout` seconds (capped by TASK_WAIT_MAX_SECONDS).
+        Workers claim from the queue after every response.
+
+        Args:
+            since: Last version the worker saw
+            timeout: Seconds to wait
+            current_user: Current authenticated user
+
+        Returns:
+            Current version and whether a task was queued
+        """
+        result = await task_notifier.wait(since, max(0.0, min(timeout, settings.task_wait_max_seconds)))
+        return TaskWaitResponse(**result)
+
     @app.get("/v1/status", response_model=StatusResponse)
     async def get_status() -> StatusResponse:
         """
@@ -2272,7 +690,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
         try:
             # Limit to reasonable range
             limit = max(1, min(limit, 50))
-            history = assistant_service.get_command_history(limit=limit)
+            history = await db_executor.run(assistant_service.get_command_history, limit=limit)
 
             return HistoryResponse(
                 commands=[
@@ -2290,17 +708,59 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             logger.error(f"Error getting history: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
-    @app.get("/health")
-    async def health_check():
+    @app.get("/v1/history/interactions", response_model=InteractionHistoryResponse)
+    async def get_interaction_history(
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        command_type: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        current_user: User = Depends(get_current_user),
+    ) -> InteractionHistoryResponse:
+        """
+        Page through the stored interactions, newest first (Protected endpoint)
+
+        Pages are keyset-paginated: pass the returned next_cursor to get the
+        following page; each page costs the same however deep it is.
+
+        Args:
+            limit: Page size (default: 50, max: 200)
+            cursor: next_cursor of the previous page
+            command_type: Only interactions of this command type
+            since: Only interactions at or after this time
+            until: Only interactions before this time
+            current_user: Current authenticated user
+
+        Returns:
+            One page of interactions and the cursor of the next one
+        """
+        limit = max(1, min(limit, 200))
+        try:
+            items = await async_db.get_recent_history(
+                limit=limit, cursor=cursor, command_type=command_type, since=since, until=until
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        next_cursor = None
+        if len(items) == limit:
+            last = items[-1]
+            next_cursor = encode_cursor(datetime.fromisoformat(last["timestamp"]), last["id"])
+
+        return InteractionHistoryResponse(
+            items=[InteractionHistoryItem(**item) for item in items],
+            next_cursor=next_cursor,
+        )
+
+    async def inspect_database_security() -> Dict[str, Any]:
         """
-        Health check endpoint that validates database connectivity and security settings.
+        Check database connectivity and Row Level Security (runs on a schedule, not per request).
         
         Returns:
-            JSON response with health status, database connectivity, and RLS security status
+            Dict with status, database and security sections
         """
         response = {
             "status": "healthy",
-            "version": "1.0.0",
             "database": {
                 "connected": False,
                 "type": "unknown"
@@ -2309,7 +769,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
                 "rls_enabled": False,
                 "tables_checked": [],
                 "tables_without_rls": []
-            }
+            },
         }
         
         try:
@@ -2329,55 +789,57 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
                 # Try to connect and check RLS status
                 from sqlmodel import Session, text
                 
-                with Session(db_adapter.engine) as session:
-                    # Test database connectivity
-                    session.exec(text("SELECT 1"))
-                    response["database"]["connected"] = True
-                    
-                    # Check RLS status for all tables in the public schema
-                    # Build the IN clause dynamically from RLS_PROTECTED_TABLES
-                    table_list = ", ".join(f"'{table}'" for table in RLS_PROTECTED_TABLES)
-                    rls_query = text(f"""
-                        SELECT 
-                            schemaname,
-                            tablename,
-                            rowsecurity
-                        FROM pg_tables 
-                        WHERE schemaname = 'public'
-                        AND tablename IN ({table_list})
-                        ORDER BY tablename
-                    """)
-                    
-                    results = session.exec(rls_query).fetchall()
-                    
-                    tables_with_rls = []
-                    tables_without_rls = []
-                    
-                    for row in results:
-                        table_name = row[1]  # tablename
-                        rls_enabled = row[2]  # rowsecurity
-                        
-                        response["security"]["tables_checked"].append(table_name)
-                        
-                        if rls_enabled:
-                            tables_with_rls.append(table_name)
-                        else:
-                            tables_without_rls.append(table_name)
+                # Build the IN clause dynamically from RLS_PROTECTED_TABLES
+                table_list = ", ".join(f"'{table}'" for table in RLS_PROTECTED_TABLES)
+                rls_query = text(f"""
+                    SELECT 
+                        schemaname,
+                        tablename,
+                        rowsecurity
+                    FROM pg_tables 
+                    WHERE schemaname = 'public'
+                    AND tablename IN ({table_list})
+                    ORDER BY tablename
+                """)
+                
+                def query_rls_status():
+                    with Session(db_adapter.engine) as session:
+                        # Test database connectivity
+                        session.exec(text("SELECT 1"))
+                        # Check RLS status for all tables in the public schema
+                        return session.exec(rls_query).fetchall()
+                
+                results = await db_executor.run(query_rls_status)
+                response["database"]["connected"] = True
+                
+                tables_with_rls = []
+                tables_without_rls = []
+                
+                for row in results:
+                    table_name = row[1]  # tablename
+                    rls_enabled = row[2]  # rowsecurity
                     
-                    response["security"]["tables_without_rls"] = tables_without_rls
+                    response["security"]["tables_checked"].append(table_name)
                     
-                    # All tables should have RLS enabled
-                    if len(tables_without_rls) == 0 and len(tables_with_rls) > 0:
-                        response["security"]["rls_enabled"] = True
-                        response["status"] = "healthy"
-                    elif len(tables_without_rls) > 0:
-                        response["security"]["rls_enabled"] = False
-                        response["status"] = "degraded"
-                        response["security"]["warning"] = f"Row Level Security is NOT enabled on: {', '.join(tables_without_rls)}"
+                    if rls_enabled:
+                        tables_with_rls.append(table_name)
                     else:
-                        # No tables found
-                        response["security"]["rls_enabled"] = "unknown"
-                        response["security"]["note"] = "No tables found in database"
+                        tables_without_rls.append(table_name)
+                
+                response["security"]["tables_without_rls"] = tables_without_rls
+                
+                # All tables should have RLS enabled
+                if len(tables_without_rls) == 0 and len(tables_with_rls) > 0:
+                    response["security"]["rls_enabled"] = True
+                    response["status"] = "healthy"
+                elif len(tables_without_rls) > 0:
+                    response["security"]["rls_enabled"] = False
+                    response["status"] = "degraded"
+                    response["security"]["warning"] = f"Row Level Security is NOT enabled on: {', '.join(tables_without_rls)}"
+                else:
+                    # No tables found
+                    response["security"]["rls_enabled"] = "unknown"
+                    response["security"]["note"] = "No tables found in database"
                         
         except Exception as e:
             logger.error(f"Health check failed: {e}", exc_info=True)
@@ -2386,6 +848,96 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             response["error"] = str(e)
         
         return response
+    
+    health_monitor = HealthMonitor(
+        inspect_database_security,
+        ttl=settings.health_cache_ttl_seconds,
+        refresh_interval=settings.health_refresh_interval_seconds,
+        timeout=settings.health_inspection_timeout_seconds,
+    )
+    app.state.health_monitor = health_monitor
+    
+    async def start_health_monitor():
+        health_monitor.start()
+    
+    startup_hooks.append(start_health_monitor)
+    
+    async def stop_health_monitor():
+        await health_monitor.shutdown()
+    
+    shutdown_hooks.append(stop_health_monitor)
+    
+    @app.get("/health")
+    async def health_check():
+        """
+        Health check endpoint that reports database connectivity and security settings.
+        
+        The database/RLS inspection runs in the background every
+        HEALTH_REFRESH_INTERVAL_SECONDS; this endpoint serves its cached result.
+        
+        Returns:
+            JSON response with health status, database connectivity, and RLS security status
+        """
+        report = await health_monitor.get()
+        return {
+            "status": report["status"],
+            "version": "1.0.0",
+            **{key: value for key, value in report.items() if key != "status"},
+        }
+    
+    @app.get("/v1/metrics")
+    async def get_metrics(current_user: User = Depends(get_current_user)) -> Dict[str, Any]:
+        """
+        Operational counters kept off the public /health (Protected endpoint)
+        
+        Args:
+            current_user: Current authenticated user
+            
+        Returns:
+            Token cache, login limiter and password hashing pool counters, and
+            telemetry buffer counters
+        """
+        return {
+            "auth": {
+                "token_cache": auth_adapter.token_cache.get_stats(),
+                "login_limiter": login_limiter.get_stats(),
+                "password_pool": password_pool.get_stats(),
+            },
+            "telemetry": telemetry_service.get_stats(),
+        }
+    
+    @app.get("/health/live")
+    async def liveness_check():
+        """
+        Liveness probe: answers as long as the event loop is serving requests.
+        
+        Returns:
+            {"status": "alive"}
+        """
+        return {"status": "alive"}
+    
+    @app.get("/health/ready")
+    async def readiness_check():
+        """
+        Readiness probe: one pooled SELECT 1 with a timeout.
+        
+        Returns:
+            {"status": "ready"}, or 503 if the database does not answer in time
+        """
+        from sqlmodel import text
+        
+        def ping_database():
+            with db_adapter.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+        
+        try:
+            await asyncio.wait_for(db_executor.run(ping_database), timeout=settings.health_ready_timeout_seconds)
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=503, detail="Database did not answer in time")
+        except Exception as e:
+            logger.error(f"Readiness check failed: {e}")
+            raise HTTPException(status_code=503, detail=f"Database unavailable: {str(e)}")
+        return {"status": "ready"}
 
     # Extension Manager Endpoints
 
@@ -2422,6 +974,16 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
                     already_installed=True,
                 )
 
+            # Another request (possibly on another worker) is already installing it
+            status = extension_manager.get_install_status(package_name)
+            if status is not None and status["state"] == ExtensionManager.INSTALLING:
+                return InstallPackageResponse(
+                    success=True,
+                    message=f"Installation of '{package_name}' is already in progress",
+                    package_name=package_name,
+                    already_installed=False,
+                )
+
             # Install in background
             background_tasks.add_task(extension_manager.install_package, package_name)
             
@@ -2453,10 +1015,12 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
         try:
             package_name = package_name.lower()
             installed = extension_manager.is_package_installed(package_name)
+            status = extension_manager.get_install_status(package_name)
             
             return PackageStatusResponse(
                 package_name=package_name,
                 installed=installed,
+                state=ExtensionManager.INSTALLED if installed else (status["state"] if status else None),
             )
         except Exception as e:
             logger.error(f"Error checking package status: {e}", exc_info=True)
@@ -2546,7 +1110,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
                 for cap in request.capabilities
             ]
             
-            device_id = device_service.register_device(
+            device_id = await async_devices.register_device(
                 name=request.name,
                 device_type=request.type,
                 capabilities=capabilities,
@@ -2563,6 +1127,10 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
                     detail="Failed to register device"
                 )
             
+            hud_hub.update("devices", {
+                str(device_id): _hud_device({"name": request.name, "type": request.type, "status": "online"})
+            })
+            
             return DeviceRegistrationResponse(
                 success=True,
                 device_id=device_id,
@@ -2590,32 +1158,38 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             List of registered devices with their capabilities
         """
         try:
-            devices = device_service.list_devices(status_filter=status)
+            devices = await async_devices.list_devices(status_filter=status)
+            
+            device_responses = (
+                DeviceResponse(
+                    id=device["id"],
+                    name=device["name"],
+                    type=device["type"],
+                    status=device["status"],
+                    network_id=device.get("network_id"),
+                    network_type=device.get("network_type"),
+                    lat=device.get("lat"),
+                    lon=device.get("lon"),
+                    last_ip=device.get("last_ip"),
+                    last_seen=device["last_seen"],
+                    capabilities=[
+                        CapabilityModel(
+                            name=cap["name"],
+                            description=cap["description"],
+                            metadata=cap["metadata"],
+                        )
+                        for cap in device["capabilities"]
+                    ],
+                )
+                for device in devices
+            )
+            
+            # Large fleets are encoded and sent in chunks instead of one big document
+            if len(devices) > settings.stream_list_threshold:
+                return stream_json_list({"total": len(devices)}, "devices", device_responses)
             
             return DeviceListResponse(
-                devices=[
-                    DeviceResponse(
-                        id=device["id"],
-                        name=device["name"],
-                        type=device["type"],
-                        status=device["status"],
-                        network_id=device.get("network_id"),
-                        network_type=device.get("network_type"),
-                        lat=device.get("lat"),
-                        lon=device.get("lon"),
-                        last_ip=device.get("last_ip"),
-                        last_seen=device["last_seen"],
-                        capabilities=[
-                            CapabilityModel(
-                                name=cap["name"],
-                                description=cap["description"],
-                                metadata=cap["metadata"],
-                            )
-                            for cap in device["capabilities"]
-                        ],
-                    )
-                    for device in devices
-                ],
+                devices=list(device_responses),
                 total=len(devices),
             )
         except Exception as e:
@@ -2638,7 +1212,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             Device information with capabilities
         """
         try:
-            device = device_service.get_device(device_id)
+            device = await async_devices.get_device(device_id)
             
             if device is None:
                 raise HTTPException(
@@ -2692,7 +1266,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             Updated device information
         """
         try:
-            success = device_service.update_device_status(
+            success = await async_devices.update_device_status(
                 device_id, 
                 status_update.status,
                 lat=status_update.lat,
@@ -2707,7 +1281,8 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
                 )
             
             # Get updated device info
-            device = device_service.get_device(device_id)
+            device = await async_devices.get_device(device_id)
+            hud_hub.update("devices", {str(device_id): _hud_device(device)})
             
             return DeviceResponse(
                 id=device["id"],
@@ -2768,36 +1343,46 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             )
             
             # Save the result to the database
-            with Session(db_adapter.engine) as session:
-                command_result = CommandResult(
-                    command_id=command_id,
-                    executor_device_id=result.executor_device_id,
-                    result_data=json.dumps(result.result_data),
-                    success=result.success,
-                    message=result.message or "",
-                )
-                session.add(command_result)
-                session.commit()
-                session.refresh(command_result)
-                
-                logger.info(f"Saved command result {command_result.id} for command {command_id}")
+            def save_command_result() -> int:
+                with Session(db_adapter.engine) as session:
+                    command_result = CommandResult(
+                        command_id=command_id,
+                        executor_device_id=result.executor_device_id,
+                        result_data=json.dumps(result.result_data),
+                        success=result.success,
+                        message=result.message or "",
+                    )
+                    session.add(command_result)
+                    session.commit()
+                    session.refresh(command_result)
+                    return command_result.id
+            
+            result_id = await db_executor.run(save_command_result)
+            logger.info(f"Saved command result {result_id} for command {command_id}")
             
             # Update the command status if it exists in the interactions table
             if result.success:
-                db_adapter.update_command_status(
+                await async_db.update_command_status(
                     command_id=command_id,
                     status="completed",
                     success=True,
                     response_text=result.message or "Command executed successfully on device",
                 )
             else:
-                db_adapter.update_command_status(
+                await async_db.update_command_status(
                     command_id=command_id,
                     status="failed",
                     success=False,
                     response_text=result.message or "Command execution failed on device",
                 )
             
+            hud_hub.emit("commands", {
+                "command_id": command_id,
+                "executor_device_id": result.executor_device_id,
+                "success": result.success,
+                "message": result.message or "",
+            })
+            
             return CommandResultResponse(
                 success=True,
                 command_id=command_id,
@@ -2876,64 +1461,171 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
 
     # Mission Execution Endpoints
     
-    @app.post("/v1/missions/execute", response_model=api_models.MissionResponse)
+    # Missions run on a bounded job queue instead of blocking the handler
+    # for the whole subprocess (up to the mission timeout)
+    from app.application.services.mission_queue import JobStatus, MissionJobQueue, MissionQueueFull
+    from app.application.services.task_runner import TaskRunner
+    mission_queue = MissionJobQueue(
+        runner_factory=TaskRunner,
+        workers=settings.mission_workers,
+        max_queue_size=settings.mission_queue_size,
+        max_finished_jobs=settings.mission_job_retention,
+        state_store=get_state_store(),
+    )
+    app.state.mission_queue = mission_queue
+    
+    async def stop_mission_queue():
+        await mission_queue.shutdown()
+    
+    shutdown_hooks.append(stop_mission_queue)
+    
+    def _mission_job_response(job) -> api_models.MissionJobResponse:
+        """Convert a MissionJob to its API model"""
+        data = job.to_dict()
+        data["queue_position"] = mission_queue.queue_position(job.job_id)
+        return api_models.MissionJobResponse(**data)
+    
+    @app.post(
+        "/v1/missions/execute",
+        response_model=api_models.MissionJobResponse,
+        status_code=status.HTTP_202_ACCEPTED,
+    )
     async def execute_mission(
         request: api_models.MissionRequest,
-        background_tasks: BackgroundTasks,
         current_user: User = Depends(get_current_user),
-    ) -> api_models.MissionResponse:
+    ) -> api_models.MissionJobResponse:
         """
-        Execute a serverless task mission on the Worker (Protected endpoint)
+        Queue a serverless task mission for execution (Protected endpoint)
         
         This endpoint allows executing arbitrary Python code with dependencies
-        in an isolated environment on the target device.
+        in an isolated environment on the target device. The mission runs on the
+        mission job queue; the response carries the job id, and the status and
+        result are available from /v1/missions/jobs/{job_id} (polling) or
+        /v1/missions/jobs/{job_id}/ws (WebSocket).
         
         Args:
             request: Mission execution request
-            background_tasks: FastAPI background tasks
             current_user: Current authenticated user
             
         Returns:
-            Mission execution result
+            The queued job
         """
+        from app.domain.models.mission import Mission
+        
+        logger.info(f"User '{current_user.username}' queueing mission: {request.mission_id}")
+        
+        mission = Mission(
+            mission_id=request.mission_id,
+            code=request.code,
+            requirements=request.requirements,
+            browser_interaction=request.browser_interaction,
+            keep_alive=request.keep_alive,
+            target_device_id=request.target_device_id,
+            timeout=request.timeout,
+            metadata=request.metadata,
+        )
+        
         try:
-            from app.domain.models.mission import Mission
-            from app.application.services.task_runner import TaskRunner
-            
-            logger.info(f"User '{current_user.username}' executing mission: {request.mission_id}")
-            
-            # Create Mission object
-            mission = Mission(
-                mission_id=request.mission_id,
-                code=request.code,
-                requirements=request.requirements,
-                browser_interaction=request.browser_interaction,
-                keep_alive=request.keep_alive,
-                target_device_id=request.target_device_id,
-                timeout=request.timeout,
-                metadata=request.metadata,
+            job = mission_queue.submit(mission, submitted_by=current_user.username)
+        except MissionQueueFull as e:
+            logger.warning(str(e))
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=str(e),
+                headers={"Retry-After": "5"},
             )
+        
+        return _mission_job_response(job)
+    
+    @app.get("/v1/missions/jobs/{job_id}", response_model=api_models.MissionJobResponse)
+    async def get_mission_job(
+        job_id: str,
+        current_user: User = Depends(get_current_user),
+    ) -> api_models.MissionJobResponse:
+        """
+        Get the status and result of a mission job (Protected endpoint)
+        
+        Args:
+            job_id: Job identifier returned by /v1/missions/execute
+            current_user: Current authenticated user
             
-            # Initialize TaskRunner
-            task_runner = TaskRunner()
-            
-            # Execute mission
-            result = task_runner.execute_mission(mission)
-            
-            return api_models.MissionResponse(
-                mission_id=result.mission_id,
-                success=result.success,
-                stdout=result.stdout,
-                stderr=result.stderr,
-                exit_code=result.exit_code,
-                execution_time=result.execution_time,
-                error=result.error,
-                metadata=result.metadata,
-            )
+        Returns:
+            Job status, timings and (once finished) the mission result
+        """
+        job = mission_queue.get_job(job_id)
+        if job is not None:
+            return _mission_job_response(job)
+        # Queued through another API worker
+        shared = await mission_queue.get_shared_job(job_id)
+        if shared is None:
+            raise HTTPException(status_code=404, detail=f"Mission job {job_id} not found")
+        return api_models.MissionJobResponse(**shared)
+    
+    @app.get("/v1/missions/queue", response_model=api_models.MissionQueueStatsResponse)
+    async def get_mission_queue_stats(
+        current_user: User = Depends(get_current_user),
+    ) -> api_models.MissionQueueStatsResponse:
+        """
+        Get mission queue depth and wait-time metrics (Protected endpoint)
+        
+        Args:
+            current_user: Current authenticated user
             
-        except Exception as e:
-            logger.error(f"Error executing mission: {e}", exc_info=True)
-            raise HTTPException(status_code=500, detail=f"Mission execution failed: {str(e)}")
+        Returns:
+            Queue metrics
+        """
+        return api_models.MissionQueueStatsResponse(**mission_queue.get_stats())
+    
+    @app.websocket("/v1/missions/jobs/{job_id}/ws")
+    async def mission_job_websocket(websocket: WebSocket, job_id: str, token: str = ""):
+        """
+        WebSocket with the status changes of a mission job.
+        
+        Sends the current job state on connect and after every change, and
+        closes once the job has finished.
+        
+        Query Parameters:
+            token: JWT access token (browsers cannot set headers on WebSockets)
+        """
+        payload = auth_adapter.verify_token(token) if token else None
+        if payload is None or payload.get("sub") is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        
+        job = mission_queue.get_job(job_id)
+        if job is None:
+            shared = await mission_queue.get_shared_job(job_id)
+            if shared is None:
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Unknown job")
+                return
+            # Run by another API worker: follow its published state
+            await websocket.accept()
+            try:
+                while True:
+                    await websocket.send_json(api_models.MissionJobResponse(**shared).model_dump(mode="json"))
+                    if shared["status"] in JobStatus.TERMINAL:
+                        break
+                    previous = shared
+                    while shared == previous:
+                        await asyncio.sleep(1.0)
+                        shared = await mission_queue.get_shared_job(job_id) or previous
+                await websocket.close()
+            except WebSocketDisconnect:
+                logger.debug(f"Mission job WebSocket disconnected: {job_id}")
+            return
+        
+        await websocket.accept()
+        updates = mission_queue.subscribe(job_id)
+        try:
+            await websocket.send_json(_mission_job_response(job).model_dump(mode="json"))
+            while not job.is_finished:
+                await updates.get()
+                await websocket.send_json(_mission_job_response(job).model_dump(mode="json"))
+            await websocket.close()
+        except WebSocketDisconnect:
+            logger.debug(f"Mission job WebSocket disconnected: {job_id}")
+        finally:
+            mission_queue.unsubscribe(job_id, updates)
     
     @app.post("/v1/browser/control", response_model=api_models.BrowserControlResponse)
     async def control_browser(
@@ -3071,6 +1763,25 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
     # Initialize ThoughtLog service
     from app.application.services.thought_log_service import ThoughtLogService
     thought_log_service = ThoughtLogService(engine=db_adapter.engine)
+    async_thoughts = AsyncDatabaseProxy(thought_log_service, db_executor)
+    
+    def _thought_log_response(t) -> api_models.ThoughtLogResponse:
+        """Convert a ThoughtLog row to its API model"""
+        return api_models.ThoughtLogResponse(
+            id=t.id,
+            mission_id=t.mission_id,
+            session_id=t.session_id,
+            status=t.status,
+            thought_process=t.thought_process,
+            problem_description=t.problem_description,
+            solution_attempt=t.solution_attempt,
+            success=t.success,
+            error_message=t.error_message,
+            retry_count=t.retry_count,
+            requires_human=t.requires_human,
+            escalation_reason=t.escalation_reason,
+            created_at=t.created_at.isoformat(),
+        )
     
     @app.post("/v1/thoughts", response_model=api_models.ThoughtLogResponse)
     async def create_thought_log(
@@ -3092,7 +1803,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             
             logger.info(f"User '{current_user.username}' creating thought log for mission {request.mission_id}")
             
-            thought = thought_log_service.create_thought(
+            thought = await async_thoughts.create_thought(
                 mission_id=request.mission_id,
                 session_id=request.session_id,
                 thought_process=request.thought_process,
@@ -3105,21 +1816,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             )
             
             if thought:
-                return api_models.ThoughtLogResponse(
-                    id=thought.id,
-                    mission_id=thought.mission_id,
-                    session_id=thought.session_id,
-                    status=thought.status,
-                    thought_process=thought.thought_process,
-                    problem_description=thought.problem_description,
-                    solution_attempt=thought.solution_attempt,
-                    success=thought.success,
-                    error_message=thought.error_message,
-                    retry_count=thought.retry_count,
-                    requires_human=thought.requires_human,
-                    escalation_reason=thought.escalation_reason,
-                    created_at=thought.created_at.isoformat(),
-                )
+                return _thought_log_response(thought)
             else:
                 raise HTTPException(status_code=500, detail="Failed to create thought log")
                 
@@ -3145,36 +1842,89 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
         try:
             logger.info(f"User '{current_user.username}' fetching thoughts for mission {mission_id}")
             
-            thoughts = thought_log_service.get_mission_thoughts(mission_id)
-            
-            thought_responses = [
-                api_models.ThoughtLogResponse(
-                    id=t.id,
-                    mission_id=t.mission_id,
-                    session_id=t.session_id,
-                    status=t.status,
-                    thought_process=t.thought_process,
-                    problem_description=t.problem_description,
-                    solution_attempt=t.solution_attempt,
-                    success=t.success,
-                    error_message=t.error_message,
-                    retry_count=t.retry_count,
-                    requires_human=t.requires_human,
-                    escalation_reason=t.escalation_reason,
-                    created_at=t.created_at.isoformat(),
-                )
-                for t in thoughts
-            ]
+            thoughts = await async_thoughts.get_mission_thoughts(mission_id)
+            
+            if len(thoughts) > settings.stream_list_threshold:
+                return stream_json_list({"total": len(thoughts)}, "logs", map(_thought_log_response, thoughts))
             
             return api_models.ThoughtLogListResponse(
-                logs=thought_responses,
-                total=len(thought_responses),
+                logs=[_thought_log_response(t) for t in thoughts],
+                total=len(thoughts),
             )
             
         except Exception as e:
             logger.error(f"Error fetching mission thoughts: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail=f"Failed to fetch thoughts: {str(e)}")
     
+    def _thought_page(thoughts, limit: Optional[int]) -> api_models.ThoughtLogListResponse:
+        """Build a keyset-paginated ThoughtLog listing"""
+        next_cursor = None
+        if limit is not None and thoughts and len(thoughts) == limit:
+            next_cursor = encode_cursor(thoughts[-1].created_at, thoughts[-1].id)
+        return api_models.ThoughtLogListResponse(
+            logs=[_thought_log_response(t) for t in thoughts],
+            total=len(thoughts),
+            next_cursor=next_cursor,
+        )
+    
+    @app.get("/v1/thoughts/recent", response_model=api_models.ThoughtLogListResponse)
+    async def get_recent_thoughts(
+        status: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        current_user: User = Depends(get_current_user),
+    ) -> api_models.ThoughtLogListResponse:
+        """
+        Page through recent thought logs, newest first (Protected endpoint)
+        
+        Args:
+            status: Optional interaction status filter
+            limit: Page size (default: 50, max: 200)
+            cursor: next_cursor of the previous page
+            since: Only logs created at or after this time
+            until: Only logs created before this time
+            current_user: Current authenticated user
+            
+        Returns:
+            One page of thought logs and the cursor of the next one
+        """
+        limit = max(1, min(limit, 200))
+        try:
+            thoughts = await async_thoughts.get_recent_thoughts(
+                status=status, limit=limit, cursor=cursor, since=since, until=until
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return _thought_page(thoughts, limit)
+    
+    @app.get("/v1/thoughts/session/{session_id}", response_model=api_models.ThoughtLogListResponse)
+    async def get_session_thoughts(
+        session_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        current_user: User = Depends(get_current_user),
+    ) -> api_models.ThoughtLogListResponse:
+        """
+        Page through the thought logs of a session, oldest first (Protected endpoint)
+        
+        Args:
+            session_id: Session identifier
+            limit: Page size (default: 50, max: 200)
+            cursor: next_cursor of the previous page
+            current_user: Current authenticated user
+            
+        Returns:
+            One page of thought logs and the cursor of the next one
+        """
+        limit = max(1, min(limit, 200))
+        try:
+            thoughts = await async_thoughts.get_session_thoughts(session_id, limit=limit, cursor=cursor)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return _thought_page(thoughts, limit)
+    
     @app.get("/v1/thoughts/escalations", response_model=api_models.ThoughtLogListResponse)
     async def get_pending_escalations(
         current_user: User = Depends(get_current_user),
@@ -3191,30 +1941,14 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
         try:
             logger.info(f"User '{current_user.username}' fetching pending escalations")
             
-            escalations = thought_log_service.get_pending_escalations()
-            
-            thought_responses = [
-                api_models.ThoughtLogResponse(
-                    id=t.id,
-                    mission_id=t.mission_id,
-                    session_id=t.session_id,
-                    status=t.status,
-                    thought_process=t.thought_process,
-                    problem_description=t.problem_description,
-                    solution_attempt=t.solution_attempt,
-                    success=t.success,
-                    error_message=t.error_message,
-                    retry_count=t.retry_count,
-                    requires_human=t.requires_human,
-                    escalation_reason=t.escalation_reason,
-                    created_at=t.created_at.isoformat(),
-                )
-                for t in escalations
-            ]
+            escalations = await async_thoughts.get_pending_escalations()
+            
+            if len(escalations) > settings.stream_list_threshold:
+                return stream_json_list({"total": len(escalations)}, "logs", map(_thought_log_response, escalations))
             
             return api_models.ThoughtLogListResponse(
-                logs=thought_responses,
-                total=len(thought_responses),
+                logs=[_thought_log_response(t) for t in escalations],
+                total=len(escalations),
             )
             
         except Exception as e:
@@ -3239,7 +1973,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
         try:
             logger.info(f"User '{current_user.username}' fetching consolidated log for mission {mission_id}")
             
-            consolidated = thought_log_service.generate_consolidated_log(mission_id)
+            consolidated = await async_thoughts.generate_consolidated_log(mission_id)
             
             return {
                 "mission_id": mission_id,
@@ -3432,7 +2166,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             capability_manager = CapabilityManager(engine=db_adapter.engine)
             
             # Get evolution progress
-            progress = capability_manager.get_evolution_progress()
+            progress = await db_executor.run(capability_manager.get_evolution_progress)
             
             return api_models.EvolutionStatusResponse(
                 overall_progress=progress["overall_progress"],
@@ -3472,7 +2206,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             capability_manager = CapabilityManager(engine=db_adapter.engine)
             
             # Get next evolution step
-            next_step = capability_manager.get_next_evolution_step()
+            next_step = await db_executor.run(capability_manager.get_next_evolution_step)
             
             if next_step is None:
                 raise HTTPException(
@@ -3517,7 +2251,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             capability_manager = CapabilityManager(engine=db_adapter.engine)
             
             # Run status scan
-            scan_results = capability_manager.status_scan()
+            scan_results = await db_executor.run(capability_manager.status_scan)
             
             return scan_results
             
@@ -3547,7 +2281,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             capability_manager = CapabilityManager(engine=db_adapter.engine)
             
             # Get requirements
-            blueprint = capability_manager.check_requirements(capability_id)
+            blueprint = await db_executor.run(capability_manager.check_requirements, capability_id)
             
             if "error" in blueprint:
                 raise HTTPException(status_code=404, detail=blueprint["error"])
@@ -3584,7 +2318,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
         """
         from app.application.services.local_bridge import get_bridge_manager
         
-        bridge_manager = get_bridge_manager()
+        bridge_manager = get_bridge_manager(get_state_store())
         
         try:
             # Accept connection with device type
@@ -3608,7 +2342,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
                     })
         
         finally:
-            bridge_manager.disconnect(device_id)
+            await bridge_manager.disconnect(device_id)
     
     @app.get("/v1/local-bridge/devices")
     async def list_connected_devices():
@@ -3620,7 +2354,8 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
         """
         from app.application.services.local_bridge import get_bridge_manager
         
-        bridge_manager = get_bridge_manager()
+        bridge_manager = get_bridge_manager(get_state_store())
+        await bridge_manager.refresh_routes()
         devices = bridge_manager.get_connected_devices()
         
         return {
@@ -3642,7 +2377,8 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
         """
         from app.application.services.local_bridge import get_bridge_manager
         
-        bridge_manager = get_bridge_manager()
+        bridge_manager = get_bridge_manager(get_state_store())
+        await bridge_manager.refresh_routes()
         
         if not bridge_manager.is_device_connected(device_id):
             raise HTTPException(
@@ -3724,7 +2460,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             capability_manager = CapabilityManager(engine=db_adapter.engine)
             
             # Check for missing resources
-            alert = capability_manager.resource_request(capability_id)
+            alert = await db_executor.run(capability_manager.resource_request, capability_id)
             
             if alert is None:
                 return {
@@ -3771,25 +2507,14 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
     BATTERY_LOW_THRESHOLD = 15  # Percentage - triggers power-saving suggestions
     PLUGINS_DYNAMIC_DIR = "app/plugins/dynamic"  # Directory for dynamically created plugins
     
-    @app.post("/v1/telemetry")
-    async def receive_telemetry(
-        telemetry_data: Dict[str, Any],
-        current_user: User = Depends(get_current_user)
-    ):
-        """
-        Receive telemetry data from mobile/desktop clients.
-        
-        Telemetry includes battery status, GPS location, device type, etc.
-        Used for context-aware assistance and urgency detection (Meta 37, 38).
+    def _process_telemetry(telemetry_data: Dict[str, Any], username: str) -> Dict[str, Any]:
+        """Acknowledge client telemetry and build suggestions (shared by HTTP and the HUD stream)"""
+        logger.debug(f"Telemetry received from {username}: {telemetry_data}")
         
-        Args:
-            telemetry_data: Telemetry information from client
-            current_user: Current authenticated user
-            
-        Returns:
-            Acknowledgment and any suggestions
-        """
-        logger.info(f"Telemetry received from {current_user.username}: {telemetry_data}")
+        # HUD clients have no device id; they are keyed by user and device type
+        device_key = str(telemetry_data.get("device_id") or f"{username}:{telemetry_data.get('device_type', 'unknown')}")
+        telemetry_service.start(db_executor.run)
+        telemetry_service.record(device_key, telemetry_data)
         
         response = {
             "status": "received",
@@ -3809,13 +2534,87 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
                 ]
                 response["priority"] = "high"
                 
-                logger.warning(f"Low battery detected for {current_user.username}: {battery_level}%")
-        
-        # Store telemetry for context awareness (could be saved to database)
-        # For now, just log it
+                logger.warning(f"Low battery detected for {username}: {battery_level}%")
         
         return response
     
+    @app.post("/v1/telemetry")
+    async def receive_telemetry(
+        telemetry_data: Dict[str, Any],
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Receive telemetry data from mobile/desktop clients.
+        
+        Telemetry includes battery status, GPS location, device type, etc.
+        Used for context-aware assistance and urgency detection (Meta 37, 38).
+        Connected HUDs send it over /v1/hud/stream instead.
+        
+        Args:
+            telemetry_data: Telemetry information from client
+            current_user: Current authenticated user
+            
+        Returns:
+            Acknowledgment and any suggestions
+        """
+        return _process_telemetry(telemetry_data, current_user.username)
+    
+    @app.get("/v1/telemetry/{device_key}/history", response_model=api_models.TelemetryHistoryResponse)
+    async def get_telemetry_history(
+        device_key: str,
+        resolution: str = "1m",
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 500,
+        current_user: User = Depends(get_current_user),
+    ) -> api_models.TelemetryHistoryResponse:
+        """
+        Get downsampled battery/location history of a device.
+        
+        Reads the 1m or 1h rollups; samples received within the last flush
+        interval only appear in `latest`.
+        
+        Args:
+            device_key: Device id, or "<user>:<device_type>" for HUD clients
+            resolution: Rollup resolution (1m or 1h)
+            since: Earliest bucket start (inclusive)
+            until: Latest bucket start (exclusive)
+            limit: Maximum buckets returned (1-5000, most recent)
+            current_user: Current authenticated user
+        
+        Returns:
+            Buckets oldest first and the latest sample
+        """
+        if resolution not in ("1m", "1h"):
+            raise HTTPException(status_code=400, detail="resolution must be '1m' or '1h'")
+        limit = max(1, min(limit, 5000))
+        
+        points = await db_executor.run(
+            telemetry_service.history, device_key, resolution, since=since, until=until, limit=limit
+        )
+        latest = telemetry_service.latest(device_key)
+        if latest is not None:
+            latest["recorded_at"] = latest["recorded_at"].isoformat()
+        return api_models.TelemetryHistoryResponse(
+            device_key=device_key,
+            resolution=resolution,
+            points=[api_models.TelemetryPoint(**point) for point in points],
+            latest=latest,
+        )
+    
+    async def flush_telemetry():
+        await telemetry_service.shutdown()
+    
+    shutdown_hooks.append(flush_telemetry)
+    
+    async def flush_interaction_history():
+        # Write-behind history keeps interactions queued until its writer drains them
+        close_history = getattr(getattr(assistant_service, "history", None), "close", None)
+        if callable(close_history):
+            await asyncio.to_thread(close_history)
+    
+    shutdown_hooks.append(flush_interaction_history)
+    
     @app.get("/v1/evolution/status")
     async def get_evolution_status_simple(
         current_user: User = Depends(get_current_user)
@@ -3835,7 +2634,7 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
             capability_manager = CapabilityManager(engine=db_adapter.engine)
             
             # Get next evolution step
-            next_step = capability_manager.get_next_evolution_step()
+            next_step = await db_executor.run(capability_manager.get_next_evolution_step)
             
             # Count dynamic plugins using the configured path
             plugins_dir = Path(PLUGINS_DYNAMIC_DIR)
@@ -3867,18 +2666,8 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
                 "error": str(e)
             }
     
-    @app.get("/v1/roadmap/progress")
-    async def get_roadmap_progress(
-        current_user: User = Depends(get_current_user)
-    ):
-        """
-        Get roadmap progress metrics for HUD display.
-        
-        Returns completion percentage based on ROADMAP.md missions.
-        
-        Returns:
-            Roadmap progress with completion percentage
-        """
+    def _roadmap_progress() -> Dict[str, Any]:
+        """Roadmap completion metrics (blocking: reads the roadmap through AutoEvolutionService)"""
         try:
             from app.application.services.auto_evolution import AutoEvolutionService
             
@@ -3917,5 +2706,126 @@ def create_api_server(assistant_service: AssistantService, extension_manager: Ex
                 "planned": 0,
                 "error": str(e)
             }
+    
+    @app.get("/v1/roadmap/progress")
+    async def get_roadmap_progress(
+        current_user: User = Depends(get_current_user)
+    ):
+        """
+        Get roadmap progress metrics for HUD display.
+        
+        Returns completion percentage based on ROADMAP.md missions.
+        
+        Returns:
+            Roadmap progress with completion percentage
+        """
+        return await asyncio.to_thread(_roadmap_progress)
+    
+    # HUD Push Stream
+    
+    HUD_TOPICS = ("status", "devices", "evolution", "commands")
+    
+    async def _hud_status() -> Dict[str, Any]:
+        return {
+            "app_name": settings.app_name,
+            "version": settings.version,
+            "is_active": assistant_service.is_running,
+            "wake_word": assistant_service.wake_word,
+            "language": settings.language,
+        }
+    
+    async def _hud_devices() -> Dict[str, Any]:
+        devices = await async_devices.list_devices()
+        return {str(device["id"]): _hud_device(device) for device in devices}
+    
+    async def _hud_evolution() -> Dict[str, Any]:
+        return await asyncio.to_thread(_roadmap_progress)
+    
+    hud_hub.register_source("status", _hud_status, settings.hud_status_refresh_seconds)
+    hud_hub.register_source("devices", _hud_devices, settings.hud_devices_refresh_seconds)
+    hud_hub.register_source("evolution", _hud_evolution, settings.hud_evolution_refresh_seconds)
+    
+    async def stop_hud_hub():
+        await hud_hub.shutdown()
+    
+    shutdown_hooks.append(stop_hud_hub)
+    
+    @app.websocket("/v1/hud/stream")
+    async def hud_stream(websocket: WebSocket, token: str = "", topics: str = ""):
+        """
+        Push channel for the Strategic HUD.
+        
+        Replaces interval polling of /v1/status, /v1/roadmap/progress and
+        /v1/telemetry: the token is verified once here, each state topic is
+        sent as a snapshot followed by diffs, and telemetry is sent by the
+        client over the same connection.
+        
+        Server messages: snapshot, diff, event, resync (followed by fresh
+        snapshots) and ping. Client messages: {"type": "telemetry", "data": {...}}.
+        
+        Query Parameters:
+            token: JWT access token (browsers cannot set headers on WebSockets)
+            topics: Comma-separated topics (default: status,devices,evolution,commands)
+        """
+        payload = auth_adapter.verify_token(token) if token else None
+        if payload is None or payload.get("sub") is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+        
+        requested = {topic.strip() for topic in topics.split(",") if topic.strip()} or set(HUD_TOPICS)
+        unknown = requested.difference(HUD_TOPICS)
+        if unknown:
+            await websocket.close(
+                code=status.WS_1008_POLICY_VIOLATION,
+                reason=f"Unknown topics: {', '.join(sorted(unknown))}",
+            )
+            return
+        
+        username = payload["sub"]
+        await websocket.accept()
+        subscriber = hud_hub.subscribe(requested)
+        
+        async def push() -> None:
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=settings.hud_ping_interval_seconds
+                    )
+                except asyncio.TimeoutError:
+                    message = {"type": "ping", "ts": time.time()}
+                
+                # Verified tokens are cached, so this only re-checks expiry and revocation
+                if auth_adapter.verify_token(token) is None:
+                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Token expired or revoked")
+                    return
+                
+                if message is RESYNC:
+                    await websocket.send_json(RESYNC)
+                    for snapshot in hud_hub.snapshots(subscriber.topics):
+                        await websocket.send_json(snapshot)
+                else:
+                    await websocket.send_json(message)
+        
+        async def receive() -> None:
+            while True:
+                try:
+                    message = json.loads(await websocket.receive_text())
+                except ValueError:
+                    continue
+                if isinstance(message, dict) and message.get("type") == "telemetry":
+                    ack = _process_telemetry(message.get("data") or {}, username)
+                    await websocket.send_json({"type": "event", "topic": "telemetry", "data": ack})
+        
+        tasks = [asyncio.create_task(push()), asyncio.create_task(receive())]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        except WebSocketDisconnect:
+            logger.debug(f"HUD stream disconnected: {username}")
+        finally:
+            for task in tasks:
+                task.cancel()
+            hud_hub.unsubscribe(subscriber)
 
     return app
@@ -14,6 +14,7 @@ from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from app.adapters.infrastructure.token_cache import VerifiedTokenCache
 from app.application.ports.security_provider import SecurityProvider
 from app.core.config import settings
 
@@ -43,6 +44,8 @@ class AuthAdapter(SecurityProvider):
         self.secret_key = settings.secret_key
         self.algorithm = settings.algorithm
         self.access_token_expire_minutes = settings.access_token_expire_minutes
+        # Verified payloads are reused until the token's exp (see token_cache.py)
+        self.token_cache = VerifiedTokenCache(max_entries=settings.token_cache_size)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
@@ -99,19 +102,48 @@ class AuthAdapter(SecurityProvider):
         """
         Verify and decode a JWT token
 
+        Tokens that already verified are served from the token cache until
+        their expiry; revoked tokens are always rejected.
+
         Args:
             token: The JWT token to verify
 
         Returns:
             The decoded token data if valid, None otherwise
         """
+        if self.token_cache.is_revoked(token):
+            logger.warning("Rejected revoked token")
+            return None
+
+        payload = self.token_cache.get(token)
+        if payload is not None:
+            return payload
+
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            return payload
         except JWTError as e:
             logger.error(f"Error verifying token: {e}")
             return None
 
+        self.token_cache.put(token, payload)
+        return payload
+
+    def revoke_token(self, token: str) -> None:
+        """
+        Revoke a JWT token before its expiry (e.g. on logout)
+
+        Args:
+            token: The JWT token to revoke
+        """
+        try:
+            expires_at = jwt.get_unverified_claims(token).get("exp")
+        except JWTError:
+            expires_at = None
+        if not isinstance(expires_at, (int, float)):
+            # Unknown expiry: keep the revocation for a full token lifetime
+            expires_at = datetime.now(timezone.utc).timestamp() + self.access_token_expire_minutes * 60
+        self.token_cache.revoke(token, expires_at)
+
     def authenticate_user(self, username: str, password: str) -> Optional[dict]:
         """
         Authenticate a user with username and password
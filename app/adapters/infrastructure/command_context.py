@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Command Context - Rolling buffer of recently executed commands for LLM prompts
+
+Both LLM adapters add the last few executed commands to their prompts. Instead
+of querying history on every call, the buffer reads history once and is then
+fed by record_interaction(). Commands recorded before (or while) history is
+read are kept: the seed merges history in front of them.
+"""
+
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CommandContextBuffer:
+    """
+    The last `size` executed commands, oldest first, and the context message built from them
+
+    Seeding runs once however many callers race for it: the history query runs
+    under a lock, and callers that lose the race wait for it instead of adding
+    the same history again.
+    """
+
+    def __init__(self, history_provider: Optional[Any] = None, size: int = 3):
+        """
+        Initialize the buffer
+
+        Args:
+            history_provider: Optional HistoryProvider to seed the buffer from
+            size: Number of commands kept
+        """
+        self.history_provider = history_provider
+        self.size = size
+        self._items: Deque[Dict[str, Any]] = deque(maxlen=size)
+        self._seeded = False
+        self._seed_lock = threading.Lock()
+        self._message: Optional[str] = None
+
+    @property
+    def seeded(self) -> bool:
+        """Whether history has been loaded into the buffer"""
+        return self._seeded
+
+    def record(self, user_input: str, command_type: str, success: bool) -> None:
+        """
+        Add an executed command to the buffer
+
+        Args:
+            user_input: Raw user input
+            command_type: Type of command executed
+            success: Whether the command succeeded
+        """
+        self._items.append({"user_input": user_input, "command_type": command_type, "success": success})
+        self._message = None
+
+    def seed(self) -> None:
+        """Load the last `size` commands from history into the buffer (first call only)"""
+        if self._seeded:
+            return
+        with self._seed_lock:
+            if self._seeded:
+                return
+            try:
+                if self.history_provider:
+                    recent_history = self.history_provider.get_recent_history(limit=self.size)
+                    # History is newest first; the buffer is oldest first and may
+                    # already hold commands recorded before or during the query
+                    merged = list(reversed(recent_history or [])) + list(self._items)
+                    self._items = deque(merged, maxlen=self.size)
+                    self._message = None
+            except Exception as e:
+                logger.warning(f"Error loading context from history: {e}")
+            finally:
+                self._seeded = True
+
+    async def ensure_seeded(self) -> None:
+        """Seed the buffer in a worker thread, so the history query never blocks the event loop"""
+        if not self._seeded:
+            await asyncio.to_thread(self.seed)
+
+    def message(self) -> str:
+        """
+        Build the context message from the buffered commands
+
+        Seeds the buffer synchronously if no async caller has yet.
+
+        Returns:
+            Formatted context string or empty string if there are no commands
+        """
+        self.seed()
+        if self._message is None:
+            if not self._items:
+                self._message = ""
+            else:
+                context_lines = ["Contexto (últimos comandos executados):"]
+                for item in self._items:  # Oldest first
+                    command_type = item.get("command_type", "unknown")
+                    user_input = item.get("user_input", "")
+                    success = item.get("success", False)
+                    status = "sucesso" if success else "falhou"
+                    context_lines.append(f"- '{user_input}' -> {command_type} ({status})")
+                self._message = "\n".join(context_lines)
+        return self._message
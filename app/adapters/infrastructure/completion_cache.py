@@ -0,0 +1,386 @@
+# -*- coding: utf-8 -*-
+"""Completion Cache - Response cache layer for the AI Gateway
+
+Avoids paying for repeated LLM round trips when the HUD, voice clients or
+internal services send the same normalized prompt many times in a short window.
+
+Two tiers are supported:
+- Memory tier: bounded LRU (always enabled)
+- Disk tier: optional SQLite file, shared between restarts (and processes)
+
+Entries are keyed by provider, model, messages and function declarations and
+expire according to a per-entry TTL. The disk tier stores JSON: SDK response
+models (pydantic) are saved as their fields plus class name and rebuilt on
+read, for SDK modules in SERIALIZABLE_MODEL_MODULES only. Async callers use
+aget()/aset(), which run disk I/O in a thread.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Modules whose pydantic response models may be rebuilt from the disk tier
+SERIALIZABLE_MODEL_MODULES = ("groq.", "google.genai.")
+
+_MODEL_TAG = "__model__"
+
+
+def _to_json(value: Any) -> Any:
+    """Convert a result to JSON-compatible data (TypeError if it cannot be)"""
+    if isinstance(value, BaseModel):
+        cls = type(value)
+        if not cls.__module__.startswith(SERIALIZABLE_MODEL_MODULES):
+            raise TypeError(f"{cls.__module__}.{cls.__qualname__} is not a serializable response model")
+        return {_MODEL_TAG: f"{cls.__module__}:{cls.__qualname__}", "data": value.model_dump(mode="json")}
+    if isinstance(value, dict):
+        return {str(key): _to_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(item) for item in value]
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _from_json(value: Any) -> Any:
+    """Rebuild a result stored by _to_json()"""
+    if isinstance(value, dict):
+        if _MODEL_TAG in value:
+            module_name, _, qualname = value[_MODEL_TAG].partition(":")
+            if not module_name.startswith(SERIALIZABLE_MODEL_MODULES):
+                raise ValueError(f"Refusing to rebuild {value[_MODEL_TAG]}")
+            cls: Any = importlib.import_module(module_name)
+            for part in qualname.split("."):
+                cls = getattr(cls, part)
+            if not (isinstance(cls, type) and issubclass(cls, BaseModel)):
+                raise ValueError(f"{value[_MODEL_TAG]} is not a response model")
+            return cls.model_validate(value["data"])
+        return {key: _from_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_from_json(item) for item in value]
+    return value
+
+
+def _describe_function(func: Any) -> Any:
+    """Build a stable, JSON-friendly description of a function declaration"""
+    if isinstance(func, dict):
+        return func
+    return {
+        "name": getattr(func, "name", None),
+        "description": getattr(func, "description", None),
+        "parameters": repr(getattr(func, "parameters", None)),
+    }
+
+
+def build_cache_key(
+    provider: str,
+    model: str,
+    messages: List[Dict[str, str]],
+    functions: Optional[List[Any]] = None,
+) -> str:
+    """
+    Build a deterministic cache key for a completion request.
+
+    Args:
+        provider: Provider name (groq/gemini)
+        model: Model name that will serve the request
+        messages: List of message dicts with 'role' and 'content'
+        functions: Optional function declarations
+
+    Returns:
+        SHA-256 hex digest identifying the request
+    """
+    key_material = {
+        "provider": provider,
+        "model": model,
+        "messages": [
+            {"role": msg.get("role", ""), "content": msg.get("content", "")}
+            for msg in messages
+        ],
+        "functions": [_describe_function(func) for func in (functions or [])],
+    }
+    serialized = json.dumps(key_material, sort_keys=True, ensure_ascii=False, default=repr)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """
+    Two-tier (memory LRU + optional SQLite) cache for AI Gateway completions.
+
+    Thread-safe: the memory tier is guarded by a lock and the SQLite tier opens
+    a short-lived connection per operation.
+    """
+
+    DEFAULT_MAX_ENTRIES = 256
+    DEFAULT_TTL_SECONDS = 300.0
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        default_ttl: float = DEFAULT_TTL_SECONDS,
+        db_path: Optional[str] = None,
+    ):
+        """
+        Initialize the completion cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in the memory tier
+            default_ttl: Default time-to-live (seconds) for new entries
+            db_path: Optional SQLite file for the disk tier (None disables it)
+        """
+        self.max_entries = max(1, max_entries)
+        self.default_ttl = default_ttl
+        self.db_path = db_path
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "stores": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "bypassed": 0,
+        }
+
+        if self.db_path:
+            self._initialize_disk_tier()
+
+    @classmethod
+    def from_env(cls) -> Optional["CompletionCache"]:
+        """
+        Create a cache from environment variables.
+
+        Environment:
+            JARVIS_LLM_CACHE_ENABLED: "true"/"false" (default: true)
+            JARVIS_LLM_CACHE_MAX_ENTRIES: Memory tier size (default: 256)
+            JARVIS_LLM_CACHE_TTL: Default TTL in seconds (default: 300)
+            JARVIS_LLM_CACHE_DB: Optional SQLite path for the disk tier
+
+        Returns:
+            CompletionCache instance, or None if caching is disabled
+        """
+        if os.getenv("JARVIS_LLM_CACHE_ENABLED", "true").lower() != "true":
+            logger.info("LLM completion cache disabled by configuration")
+            return None
+
+        return cls(
+            max_entries=int(os.getenv("JARVIS_LLM_CACHE_MAX_ENTRIES", str(cls.DEFAULT_MAX_ENTRIES))),
+            default_ttl=float(os.getenv("JARVIS_LLM_CACHE_TTL", str(cls.DEFAULT_TTL_SECONDS))),
+            db_path=os.getenv("JARVIS_LLM_CACHE_DB") or None,
+        )
+
+    def _initialize_disk_tier(self) -> None:
+        """Create the SQLite table for the disk tier, disabling it on failure"""
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS completion_cache ("
+                    "key TEXT PRIMARY KEY, "
+                    "expires_at REAL NOT NULL, "
+                    "payload TEXT NOT NULL)"
+                )
+            logger.info(f"Completion cache disk tier enabled at {self.db_path}")
+        except Exception as e:
+            logger.warning(f"Failed to initialize completion cache disk tier: {e}")
+            self.db_path = None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached completion.
+
+        Args:
+            key: Cache key from build_cache_key()
+
+        Returns:
+            Cached result dict, or None on miss/expiry
+        """
+        result = self._get_from_memory(key)
+        if result is not None:
+            return result
+        return self._promote(key, self._get_from_disk(key))
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached completion from a coroutine (disk reads run in a thread).
+
+        Args:
+            key: Cache key from build_cache_key()
+
+        Returns:
+            Cached result dict, or None on miss/expiry
+        """
+        result = self._get_from_memory(key)
+        if result is not None:
+            return result
+        disk_entry = await asyncio.to_thread(self._get_from_disk, key) if self.db_path else None
+        return self._promote(key, disk_entry)
+
+    def set(self, key: str, result: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """
+        Store a completion result.
+
+        Args:
+            key: Cache key from build_cache_key()
+            result: Result dict returned by the AI Gateway
+            ttl: Time-to-live in seconds (defaults to default_ttl, <= 0 skips storing)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        self._store_in_memory(key, result, ttl)
+        with self._lock:
+            self._stats["stores"] += 1
+        self._store_on_disk(key, result, ttl)
+
+    async def aset(self, key: str, result: Dict[str, Any], ttl: Optional[float] = None) -> None:
+        """
+        Store a completion result from a coroutine (disk writes run in a thread).
+
+        Args:
+            key: Cache key from build_cache_key()
+            result: Result dict returned by the AI Gateway
+            ttl: Time-to-live in seconds (defaults to default_ttl, <= 0 skips storing)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0:
+            return
+
+        self._store_in_memory(key, result, ttl)
+        with self._lock:
+            self._stats["stores"] += 1
+        if self.db_path:
+            await asyncio.to_thread(self._store_on_disk, key, result, ttl)
+
+    def record_bypass(self) -> None:
+        """Record a request that explicitly bypassed the cache"""
+        with self._lock:
+            self._stats["bypassed"] += 1
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers"""
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            try:
+                with sqlite3.connect(self.db_path) as conn:
+                    conn.execute("DELETE FROM completion_cache")
+            except Exception as e:
+                logger.warning(f"Failed to clear completion cache disk tier: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with hit/miss counters, hit rate and current size
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["disk_tier"] = self.db_path is not None
+        return stats
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _get_from_memory(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up the memory tier, dropping an expired entry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                return result
+            del self._entries[key]
+            self._stats["expirations"] += 1
+            return None
+
+    def _promote(
+        self, key: str, disk_entry: Optional[Tuple[float, Dict[str, Any]]]
+    ) -> Optional[Dict[str, Any]]:
+        """Count a disk lookup and copy a hit into the memory tier for its remaining TTL"""
+        with self._lock:
+            if disk_entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._stats["disk_hits"] += 1
+        expires_at, result = disk_entry
+        # Disk expiry is wall-clock, memory expiry is monotonic
+        self._store_in_memory(key, result, expires_at - time.time())
+        return result
+
+    def _store_in_memory(self, key: str, result: Dict[str, Any], ttl: float) -> None:
+        """Insert into the LRU, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _get_from_disk(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Read an entry (wall-clock expiry, result) from the SQLite tier, if enabled"""
+        if not self.db_path:
+            return None
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                row = conn.execute(
+                    "SELECT expires_at, payload FROM completion_cache WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    return None
+                expires_at, payload = row
+                if expires_at <= time.time():
+                    conn.execute("DELETE FROM completion_cache WHERE key = ?", (key,))
+                    with self._lock:
+                        self._stats["expirations"] += 1
+                    return None
+            return expires_at, _from_json(json.loads(payload))
+        except Exception as e:
+            logger.warning(f"Completion cache disk read failed: {e}")
+            return None
+
+    def _store_on_disk(self, key: str, result: Dict[str, Any], ttl: float) -> None:
+        """Write an entry to the SQLite tier, if enabled"""
+        if not self.db_path:
+            return
+        try:
+            payload = json.dumps(_to_json(result), ensure_ascii=False)
+        except Exception as e:
+            # SDK responses that cannot be serialized stay memory-only
+            logger.debug(f"Completion not serializable for disk cache: {e}")
+            return
+        try:
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO completion_cache (key, expires_at, payload) "
+                    "VALUES (?, ?, ?)",
+                    (key, time.time() + ttl, payload),
+                )
+        except Exception as e:
+            logger.warning(f"Completion cache disk write failed: {e}")
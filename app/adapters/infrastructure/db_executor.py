@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Database Executor - Runs blocking SQLModel calls off the event loop
+
+The persistence adapters (SQLiteHistoryAdapter, DeviceService, ThoughtLogService,
+CapabilityManager) use synchronous SQLModel sessions. Calling them directly from
+an async route blocks the event loop for the whole query, so one slow Postgres
+round-trip stalls every other request and WebSocket on the worker.
+
+- DatabaseExecutor: dedicated, bounded thread pool for database work; its size
+  should not exceed the engine's connection pool so threads never queue on it
+- AsyncDatabaseProxy: exposes the methods of an existing adapter/service as
+  coroutines that run on the executor, so callers keep the same interface
+"""
+
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class DatabaseExecutor:
+    """
+    Bounded thread pool dedicated to blocking database calls.
+
+    A separate pool (instead of the loop's default executor) keeps database work
+    from competing with other to_thread() users, and bounds the number of
+    concurrent sessions. Counters are only mutated from the event loop.
+    """
+
+    DEFAULT_MAX_WORKERS = 8
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, name: str = "jarvis-db"):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Maximum concurrent database calls (minimum 1)
+            name: Thread name prefix (used in logs and thread dumps)
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._completed = 0
+        self._errors = 0
+        self._total_wait_seconds = 0.0
+        self._total_run_seconds = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a blocking function on the database pool.
+
+        Args:
+            func: Blocking callable (e.g. an adapter method)
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+
+        Returns:
+            The value returned by func (exceptions are re-raised)
+        """
+        loop = asyncio.get_running_loop()
+        submitted = time.monotonic()
+        timings: Dict[str, float] = {}
+
+        def call() -> T:
+            started = time.monotonic()
+            timings["wait"] = started - submitted
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings["run"] = time.monotonic() - started
+
+        self._in_flight += 1
+        self._max_in_flight = max(self._max_in_flight, self._in_flight)
+        try:
+            return await loop.run_in_executor(self._executor, call)
+        except Exception:
+            self._errors += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self._completed += 1
+            self._total_wait_seconds += timings.get("wait", 0.0)
+            self._total_run_seconds += timings.get("run", 0.0)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting work and release the pool threads.
+
+        Args:
+            wait: Block until queued calls have finished
+        """
+        self._executor.shutdown(wait=wait)
+        logger.info(f"Database executor '{self.name}' shut down")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get executor counters.
+
+        Returns:
+            Dict with pool size, in-flight calls and mean queue/run times
+        """
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self._in_flight,
+            "max_in_flight": self._max_in_flight,
+            "completed": self._completed,
+            "errors": self._errors,
+            "avg_wait_ms": (
+                self._total_wait_seconds / self._completed * 1000 if self._completed else 0.0
+            ),
+            "avg_run_ms": (
+                self._total_run_seconds / self._completed * 1000 if self._completed else 0.0
+            ),
+        }
+
+
+class AsyncDatabaseProxy:
+    """
+    Async view of a synchronous persistence object.
+
+    Every public method of the wrapped object becomes a coroutine function with
+    the same signature that runs on a DatabaseExecutor::
+
+        history = AsyncDatabaseProxy(db_adapter, executor)
+        task_id = await history.save_pending_command(user_input=..., ...)
+
+    Attributes that are not callables (e.g. engine) are returned unchanged.
+    """
+
+    def __init__(self, target: Any, executor: DatabaseExecutor):
+        """
+        Initialize the proxy.
+
+        Args:
+            target: Adapter or service with blocking methods (HistoryProvider, DeviceService, ...)
+            executor: Executor the calls run on
+        """
+        self._target = target
+        self._executor = executor
+
+    @property
+    def target(self) -> Any:
+        """The wrapped synchronous object (for code that must stay synchronous)"""
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._target, name)
+        if name.startswith("_") or not callable(attribute):
+            return attribute
+
+        @functools.wraps(attribute)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self._executor.run(attribute, *args, **kwargs)
+
+        # Cache the wrapper so later lookups skip __getattr__
+        self.__dict__[name] = call
+        return call
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""Engine Profiles - Named connection tuning for the shared database engine
+
+SQLiteHistoryAdapter's engine is shared by DeviceService, ThoughtLogService,
+RewardAdapter and CapabilityManager, and used to be created with SQLAlchemy
+defaults: SQLite ran in rollback-journal mode with FULL syncs (every write
+blocked readers and waited on fsync), and PostgreSQL connections were never
+pre-pinged, recycled or bounded by a statement timeout.
+
+Profiles (selected with DB_ENGINE_PROFILE):
+
+- dev-sqlite: WAL, synchronous=NORMAL, 5 s busy timeout, small mmap
+- edge-sqlite: dev-sqlite plus a larger page cache and mmap window and a
+  longer busy timeout, for a long-running single-host install
+- cloud-postgres-pooled: pooled, pre-pinged and recycled connections, with no
+  session settings, so it is safe behind a transaction-mode pooler (PgBouncer,
+  the Supabase pooler on port 6543)
+- cloud-postgres: cloud-postgres-pooled plus server-side statement and
+  idle-transaction timeouts, for direct connections (or session-mode poolers)
+- default: SQLAlchemy defaults (no tuning)
+- auto: cloud-postgres-pooled for PostgreSQL URLs, dev-sqlite otherwise
+
+The PostgreSQL timeouts are applied with SET on each new connection rather
+than the libpq `options` startup parameter, which PgBouncer rejects. Behind a
+transaction-mode pooler even SET is unsafe (the setting stays on a server
+connection other clients then share), hence the pooled profile and auto.
+
+SQLite has no per-statement timeout; busy_timeout bounds how long a statement
+waits for another connection's lock instead.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlmodel import create_engine
+
+logger = logging.getLogger(__name__)
+
+AUTO_PROFILE = "auto"
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    """Engine settings; fields left as None keep the SQLAlchemy default"""
+
+    name: str
+    # PRAGMAs run on every new SQLite connection, in order
+    sqlite_pragmas: Dict[str, Any] = field(default_factory=dict)
+    pool_size: Optional[int] = None
+    max_overflow: Optional[int] = None
+    # Seconds after which a pooled connection is replaced (-1 never)
+    pool_recycle: Optional[int] = None
+    pool_pre_ping: bool = False
+    # Seconds a request waits for a free pooled connection
+    pool_timeout: Optional[float] = None
+    # PostgreSQL statement_timeout / idle_in_transaction_session_timeout
+    statement_timeout_ms: Optional[int] = None
+    idle_in_transaction_timeout_ms: Optional[int] = None
+    connect_timeout: Optional[int] = None
+
+
+PROFILES: Dict[str, EngineProfile] = {
+    "default": EngineProfile(name="default"),
+    "dev-sqlite": EngineProfile(
+        name="dev-sqlite",
+        sqlite_pragmas={
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 5000,
+            "temp_store": "MEMORY",
+            "mmap_size": 64 * 1024 * 1024,
+        },
+        # Covers db_executor_workers plus the history writer thread
+        pool_size=10,
+        max_overflow=5,
+        pool_timeout=10,
+    ),
+    "edge-sqlite": EngineProfile(
+        name="edge-sqlite",
+        sqlite_pragmas={
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "busy_timeout": 15000,
+            "temp_store": "MEMORY",
+            "mmap_size": 256 * 1024 * 1024,
+            "cache_size": -32000,  # KiB (negative) per connection
+            "wal_autocheckpoint": 1000,
+        },
+        pool_size=10,
+        max_overflow=5,
+        pool_timeout=30,
+    ),
+    "cloud-postgres-pooled": EngineProfile(
+        name="cloud-postgres-pooled",
+        pool_size=10,
+        max_overflow=10,
+        # Below typical load balancer / managed Postgres idle cutoffs
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        pool_timeout=30,
+        connect_timeout=10,
+    ),
+    "cloud-postgres": EngineProfile(
+        name="cloud-postgres",
+        pool_size=10,
+        max_overflow=10,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        pool_timeout=30,
+        statement_timeout_ms=15000,
+        idle_in_transaction_timeout_ms=60000,
+        connect_timeout=10,
+    ),
+}
+
+
+def resolve_profile(name: Optional[str], database_url: str) -> EngineProfile:
+    """
+    Look up an engine profile by name
+
+    Args:
+        name: Profile name, "auto" or None (auto)
+        database_url: URL the engine will connect to (used by auto)
+
+    Returns:
+        The profile
+
+    Raises:
+        ValueError: If the profile name is unknown
+    """
+    name = (name or AUTO_PROFILE).strip().lower()
+    if name == AUTO_PROFILE:
+        backend = make_url(database_url).get_backend_name()
+        name = "cloud-postgres-pooled" if backend == "postgresql" else "dev-sqlite"
+    try:
+        return PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown database engine profile: {name} (use {AUTO_PROFILE}, {', '.join(PROFILES)})"
+        ) from None
+
+
+def _engine_options(profile: EngineProfile, database_url: str) -> Dict[str, Any]:
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    options: Dict[str, Any] = {}
+
+    # In-memory SQLite uses a single-connection pool that takes no sizing options
+    in_memory = backend == "sqlite" and url.database in (None, "", ":memory:")
+    if not in_memory:
+        for option in ("pool_size", "max_overflow", "pool_recycle", "pool_timeout"):
+            value = getattr(profile, option)
+            if value is not None:
+                options[option] = value
+    if profile.pool_pre_ping:
+        options["pool_pre_ping"] = True
+
+    if backend == "postgresql" and profile.connect_timeout is not None:
+        options["connect_args"] = {"connect_timeout": profile.connect_timeout}
+    return options
+
+
+def _postgres_session_settings(profile: EngineProfile) -> List[str]:
+    """SET statements run on every new PostgreSQL connection"""
+    statements = []
+    if profile.statement_timeout_ms is not None:
+        statements.append(f"SET statement_timeout = {int(profile.statement_timeout_ms)}")
+    if profile.idle_in_transaction_timeout_ms is not None:
+        statements.append(
+            f"SET idle_in_transaction_session_timeout = {int(profile.idle_in_transaction_timeout_ms)}"
+        )
+    return statements
+
+
+def _apply_session_settings(dbapi_connection: Any, statements: List[str]) -> None:
+    """Run SET statements outside a transaction, so they last for the session"""
+    autocommit = dbapi_connection.autocommit
+    dbapi_connection.autocommit = True
+    cursor = dbapi_connection.cursor()
+    try:
+        for statement in statements:
+            cursor.execute(statement)
+    finally:
+        cursor.close()
+        dbapi_connection.autocommit = autocommit
+
+
+def create_tuned_engine(database_url: str, profile: EngineProfile) -> Engine:
+    """
+    Create an engine configured by an engine profile
+
+    Settings that do not apply to the URL's database (SQLite PRAGMAs on
+    PostgreSQL, server timeouts on SQLite) are ignored. PostgreSQL timeouts
+    are SET when a connection is opened.
+
+    Args:
+        database_url: SQLAlchemy database URL
+        profile: Profile (see resolve_profile)
+
+    Returns:
+        The engine
+    """
+    engine = create_engine(database_url, echo=False, **_engine_options(profile, database_url))
+
+    if profile.sqlite_pragmas and engine.dialect.name == "sqlite":
+        pragmas = list(profile.sqlite_pragmas.items())
+
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma, value in pragmas:
+                    cursor.execute(f"PRAGMA {pragma}={value}")
+            finally:
+                cursor.close()
+
+    session_settings = _postgres_session_settings(profile)
+    if session_settings and engine.dialect.name == "postgresql":
+
+        @event.listens_for(engine, "connect")
+        def _apply_timeouts(dbapi_connection, connection_record):
+            _apply_session_settings(dbapi_connection, session_settings)
+
+    logger.info(f"Database engine profile: {profile.name}")
+    return engine
@@ -12,12 +12,13 @@ import logging
 import os
 import time
 import traceback
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
 from app.adapters.infrastructure.ai_gateway import AIGateway, LLMProvider
+from app.adapters.infrastructure.command_context import CommandContextBuffer
 from app.adapters.infrastructure.gemini_adapter import LLMCommandAdapter
 from app.adapters.infrastructure.github_adapter import GitHubAdapter
-from app.application.ports import VoiceProvider
+from app.application.ports import StateStore, VoiceProvider
 from app.domain.models import CommandType, Intent
 from app.domain.services.agent_service import AgentService
 from app.domain.services.llm_command_interpreter import LLMCommandInterpreter
@@ -33,6 +34,7 @@ class GatewayLLMCommandAdapter:
     - Uses Groq by default for fast, cost-effective processing
     - Automatically escalates to Gemini for large payloads (>10k tokens)
     - Falls back to Gemini on Groq rate limits
+    - Answers conversational input in the same completion that classifies it
     - Maintains backward compatibility with LLMCommandAdapter interface
     """
     
@@ -47,6 +49,9 @@ class GatewayLLMCommandAdapter:
         """Get the system instruction (thread-safe, cached globally)."""
         return AgentService.get_system_instruction()
     
+    # Executed commands included as context in conversational prompts
+    CONTEXT_SIZE = 3
+    
     # Default model for auto-fix recommendations
     # Update this when new models are released
     RECOMMENDED_GEMINI_MODEL = "gemini-2.0-flash-exp"
@@ -61,6 +66,8 @@ class GatewayLLMCommandAdapter:
         wake_word: str = "xerife",
         history_provider: Optional["HistoryProvider"] = None,
         use_llm: bool = True,
+        combined_chat_response: Optional[bool] = None,
+        state_store: Optional[StateStore] = None,
     ):
         """
         Initialize the Gateway LLM Command Adapter.
@@ -74,12 +81,19 @@ class GatewayLLMCommandAdapter:
             wake_word: The wake word to filter out from commands
             history_provider: Optional history provider for context
             use_llm: Whether to use LLM for error analysis and auto-repair (default: True)
+            combined_chat_response: Classify and answer chat input in one completion
+                (defaults to LLMConfig.COMBINED_CHAT_RESPONSE)
+            state_store: Optional shared StateStore for the gateway's circuit breakers
         """
         self.wake_word = wake_word
         self.voice_provider = voice_provider
         self.history_provider = history_provider
         self.use_llm = use_llm
         
+        # Rolling context buffer: seeded from history once (off the event loop),
+        # then fed by record_interaction()
+        self._context = CommandContextBuffer(history_provider, size=self.CONTEXT_SIZE)
+        
         # Track errors locally to prevent infinite loops
         self._error_log_file = "/tmp/jarvis_auto_repair_errors.log"
         
@@ -90,17 +104,26 @@ class GatewayLLMCommandAdapter:
             groq_model=groq_model,
             gemini_model=gemini_model,
             default_provider=LLMProvider.GROQ,
+            state_store=state_store,
         )
 
         self.llm_interpreter = None
+        self.combined_chat_response = False
         try:
             from app.core.llm_config import LLMConfig
+            self.combined_chat_response = (
+                LLMConfig.COMBINED_CHAT_RESPONSE
+                if combined_chat_response is None
+                else combined_chat_response
+            )
             if LLMConfig.USE_LLM_COMMAND_INTERPRETATION:
                 self.llm_interpreter = LLMCommandInterpreter(
                     wake_word=wake_word,
                     ai_gateway=self.gateway,
                 )
                 logger.info("LLMCommandInterpreter initialized for command interpretation")
+                if history_provider is not None:
+                    self.llm_interpreter.train_router_from_history(history_provider)
         except Exception as e:
             logger.warning(f"Failed to initialize LLMCommandInterpreter: {e}")
         
@@ -157,17 +180,28 @@ class GatewayLLMCommandAdapter:
             confidence=0.0,
         )
 
-    async def interpret_async(self, raw_input: str) -> Intent:
+    async def interpret_async(self, raw_input: str, allow_reply: bool = True) -> Intent:
         """
         Async interpretation of a raw text command into a structured Intent.
         
+        In combined mode, conversational input comes back as a CHAT intent whose
+        parameters["response"] already holds the reply, so no second LLM call is needed.
+        
         Args:
             raw_input: Raw text from voice or text input
+            allow_reply: Allow the combined classify-and-reply mode (streaming callers
+                pass False so the reply can be streamed separately)
             
         Returns:
             Intent object with command type and parameters
         """
         if self.llm_interpreter:
+            if self.combined_chat_response and allow_reply:
+                # Built lazily: fast-path, memo and router hits never need the context
+                return await self.llm_interpreter.interpret_async(
+                    raw_input,
+                    conversation_instruction=self._conversation_instruction_async,
+                )
             return await self.llm_interpreter.interpret_async(raw_input)
         
         if self.gemini_adapter:
@@ -184,6 +218,29 @@ class GatewayLLMCommandAdapter:
             confidence=0.0,
         )
     
+    async def interpret_stream(self, raw_input: str) -> AsyncIterator[Union[str, Intent]]:
+        """
+        Interpret a command, streaming a conversational reply in the same completion.
+        
+        Without combined mode (or the LLM interpreter) only the Intent is yielded,
+        and conversational input comes back as UNKNOWN for a separate reply.
+        
+        Args:
+            raw_input: Raw text from voice or text input
+            
+        Yields:
+            Reply text deltas, then the Intent (CHAT with parameters["response"]
+            once a reply was streamed)
+        """
+        if self.llm_interpreter and self.combined_chat_response:
+            async for item in self.llm_interpreter.interpret_stream(
+                raw_input,
+                conversation_instruction=self._conversation_instruction_async,
+            ):
+                yield item
+            return
+        yield await self.interpret_async(raw_input, allow_reply=False)
+    
     def is_exit_command(self, raw_input: str) -> bool:
         """
         Check if the input is an exit command.
@@ -239,30 +296,8 @@ class GatewayLLMCommandAdapter:
             if not command:
                 return "Olá! Como posso ajudar?"
             
-            # Build context from history if available
-            context_message = self._build_context_message()
-            
-            # Prepare messages for AI Gateway
-            messages = []
-            
-            # Add system instruction - use Xerife personality from AgentService
-            messages.append({
-                "role": "system",
-                "content": self.get_system_instruction()
-            })
-            
-            # Add context if available
-            if context_message:
-                messages.append({
-                    "role": "system",
-                    "content": context_message
-                })
-            
-            # Add user message
-            messages.append({
-                "role": "user",
-                "content": command
-            })
+            await self._ensure_context_seeded()
+            messages = self._build_conversation_messages(command)
             
             # Generate response using AI Gateway with await
             result = await self.gateway.generate_completion(
@@ -304,6 +339,79 @@ class GatewayLLMCommandAdapter:
             
             return "Desculpe, ocorreu um erro. Pode tentar novamente?"
     
+    async def stream_conversational_response(self, user_input: str) -> AsyncIterator[str]:
+        """
+        Stream a conversational response as text deltas using AI Gateway.
+        
+        Same prompt as generate_conversational_response, but text is yielded as
+        soon as the provider produces it so the client can render and speak early.
+        
+        Args:
+            user_input: User's input text
+            
+        Yields:
+            Response text deltas
+        """
+        command = user_input.lower().strip()
+        if self.wake_word in command:
+            command = command.replace(self.wake_word, "").strip()
+        
+        if not command:
+            yield "Olá! Como posso ajudar?"
+            return
+        
+        start_time = time.time()
+        first_token_ms = None
+        emitted = False
+        try:
+            await self._ensure_context_seeded()
+            async for event in self.gateway.stream_completion(
+                messages=self._build_conversation_messages(command),
+            ):
+                if event["type"] == "delta":
+                    if first_token_ms is None:
+                        first_token_ms = (time.time() - start_time) * 1000
+                    emitted = True
+                    yield event["text"]
+                elif event["type"] == "done":
+                    total_ms = (time.time() - start_time) * 1000
+                    logger.info(
+                        f"Response streamed by: {event['provider']} "
+                        f"(first token {first_token_ms or total_ms:.2f}ms, total {total_ms:.2f}ms)"
+                    )
+        except Exception as e:
+            error_traceback = traceback.format_exc()
+            logger.error(f"Error streaming conversational response: {e}")
+            self._log_error_locally(error_traceback)
+            await self._handle_critical_error(e, user_input)
+            if not emitted:
+                yield "Desculpe, ocorreu um erro. Pode tentar novamente?"
+            return
+        
+        if not emitted:
+            yield "Desculpe, não entendi. Pode repetir?"
+    
+    def _build_conversation_messages(self, command: str) -> List[Dict[str, str]]:
+        """
+        Build gateway messages for a conversational reply.
+        
+        Args:
+            command: Normalized user command (wake word removed)
+            
+        Returns:
+            System instruction, optional history context and the user message
+        """
+        # Add system instruction - use Xerife personality from AgentService
+        messages = [{"role": "system", "content": self.get_system_instruction()}]
+        
+        # Add context from history if available
+        context_message = self._build_context_message()
+        if context_message:
+            messages.append({"role": "system", "content": context_message})
+        
+        messages.append({"role": "user", "content": command})
+        return messages
+    
     def _extract_response_text(self, result: dict) -> Optional[str]:
         """
         Extract response text from AI Gateway result.
@@ -335,35 +443,51 @@ class GatewayLLMCommandAdapter:
         
         return None
     
+    async def _conversation_instruction_async(self) -> str:
+        """Build the combined-mode instruction, loading history off the event loop"""
+        await self._ensure_context_seeded()
+        return self._build_conversation_instruction()
+    
+    def _build_conversation_instruction(self) -> str:
+        """
+        Build the persona and history context used to answer chat input in combined mode.
+        
+        Returns:
+            Instruction text with the Xerife personality and recent history
+        """
+        context_message = self._build_context_message()
+        instruction = self.get_system_instruction()
+        if context_message:
+            instruction = f"{instruction}\n\n{context_message}"
+        return instruction
+    
+    def record_interaction(self, user_input: str, command_type: str, success: bool) -> None:
+        """
+        Add an executed command to the context buffer (and the Gemini fallback's).
+        
+        Args:
+            user_input: Raw user input
+            command_type: Type of command executed
+            success: Whether the command succeeded
+        """
+        self._context.record(user_input, command_type, success)
+        if self.gemini_adapter:
+            self.gemini_adapter.record_interaction(user_input, command_type, success)
+    
+    async def _ensure_context_seeded(self) -> None:
+        """Seed the context buffer from history in a worker thread (first call only)"""
+        await self._context.ensure_seeded()
+    
     def _build_context_message(self) -> str:
         """
-        Build context message from the last 3 commands in history.
+        Build context message from the last 3 commands.
+        
+        Served from the rolling buffer; history is only queried the first time.
         
         Returns:
             Formatted context string or empty string if no history
         """
-        if not self.history_provider:
-            return ""
-        
-        try:
-            # Get last 3 commands from history
-            recent_history = self.history_provider.get_recent_history(limit=3)
-            if not recent_history:
-                return ""
-            
-            # Build context message
-            context_lines = ["Contexto (últimos comandos executados):"]
-            for item in reversed(recent_history):  # Show oldest first
-                command_type = item.get("command_type", "unknown")
-                user_input = item.get("user_input", "")
-                success = item.get("success", False)
-                status = "sucesso" if success else "falhou"
-                context_lines.append(f"- '{user_input}' -> {command_type} ({status})")
-            
-            return "\n".join(context_lines)
-        except Exception as e:
-            logger.warning(f"Error building context message: {e}")
-            return ""
+        return self._context.message()
     
     def _log_error_locally(self, error_message: str) -> None:
         """
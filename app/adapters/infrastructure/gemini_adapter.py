@@ -4,17 +4,22 @@
 Note: This adapter uses the new google-genai library.
 The library uses the latest Google Generative AI API.
 Default model is 'gemini-flash-latest' for improved performance.
+
+Request templates (tools and GenerateContentConfig) are built once per adapter,
+and the recent-command context is kept in a rolling in-memory buffer instead of
+being queried from history on every call.
 """
 
 import asyncio
 import logging
 import os
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, Optional
 
 import httpx
 from google import genai
 
+from app.adapters.infrastructure.command_context import CommandContextBuffer
 from app.application.ports import VoiceProvider
 from app.domain.models import CommandType, Intent
 from app.domain.services.agent_service import AgentService
@@ -29,6 +34,9 @@ class LLMCommandAdapter:
     Uses AsyncIO to avoid blocking the voice loop.
     """
 
+    # Number of recent interactions included as context in each prompt
+    CONTEXT_SIZE = 3
+
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -73,6 +81,19 @@ class LLMCommandAdapter:
         self.functions = AgentService.get_function_declarations()
         self.system_instruction = AgentService.get_system_instruction()
 
+        # Request templates: built once and reused for every call
+        self.tools = [genai.types.Tool(function_declarations=self.functions)]
+        self.command_config = genai.types.GenerateContentConfig(
+            system_instruction=self.system_instruction,
+            tools=self.tools,
+        )
+        self.conversation_config = genai.types.GenerateContentConfig(
+            system_instruction=self.system_instruction,
+        )
+
+        # Rolling context buffer: seeded from history once, then fed by record_interaction()
+        self._context = CommandContextBuffer(history_provider, size=self.CONTEXT_SIZE)
+
         # Store chat history for conversational context
         self.chat_history = []
 
@@ -125,24 +146,21 @@ class LLMCommandAdapter:
             )
 
         try:
+            # The one-time history query runs off the event loop
+            await self._context.ensure_seeded()
+
             # Add context from recent history if available
             context_message = self._build_context_message()
             full_message = (
                 f"{context_message}\n\n{command}" if context_message else command
             )
 
-            # Build tools for function calling
-            tools = [genai.types.Tool(function_declarations=self.functions)]
-
             # Send message to Gemini using the new client API
             response = await asyncio.to_thread(
                 self.client.models.generate_content,
                 model=self.model_name,
                 contents=full_message,
-                config=genai.types.GenerateContentConfig(
-                    system_instruction=self.system_instruction,
-                    tools=tools,
-                ),
+                config=self.command_config,
             )
 
             # Check if the model used a function call
@@ -246,17 +264,11 @@ class LLMCommandAdapter:
                 f"{context_message}\n\n{command}" if context_message else command
             )
 
-            # Build tools for function calling
-            tools = [genai.types.Tool(function_declarations=self.functions)]
-
             # Send message to Gemini using the new client API
             response = self.client.models.generate_content(
                 model=self.model_name,
                 contents=full_message,
-                config=genai.types.GenerateContentConfig(
-                    system_instruction=self.system_instruction,
-                    tools=tools,
-                ),
+                config=self.command_config,
             )
 
             # Check if the model used a function call
@@ -440,35 +452,27 @@ class LLMCommandAdapter:
         command = raw_input.lower().strip()
         return any(keyword in command for keyword in cancel_keywords)
 
+    def record_interaction(self, user_input: str, command_type: str, success: bool) -> None:
+        """
+        Add an executed command to the rolling context buffer.
+
+        Args:
+            user_input: Raw user input
+            command_type: Type of command executed
+            success: Whether the command succeeded
+        """
+        self._context.record(user_input, command_type, success)
+
     def _build_context_message(self) -> str:
         """
-        Build context message from the last 3 commands in history.
+        Build context message from the last 3 commands.
+
+        Served from the rolling buffer; history is only queried the first time.
 
         Returns:
             Formatted context string or empty string if no history
         """
-        if not self.history_provider:
-            return ""
-
-        try:
-            # Get last 3 commands from history
-            recent_history = self.history_provider.get_recent_history(limit=3)
-            if not recent_history:
-                return ""
-
-            # Build context message
-            context_lines = ["Contexto (últimos comandos executados):"]
-            for item in reversed(recent_history):  # Show oldest first
-                command_type = item.get("command_type", "unknown")
-                user_input = item.get("user_input", "")
-                success = item.get("success", False)
-                status = "sucesso" if success else "falhou"
-                context_lines.append(f"- '{user_input}' -> {command_type} ({status})")
-
-            return "\n".join(context_lines)
-        except Exception as e:
-            logger.warning(f"Error building context message: {e}")
-            return ""
+        return self._context.message()
 
     async def _create_github_issue_for_infra_failure(
         self, error: Exception, error_details: str
@@ -682,9 +686,7 @@ Este é um erro de infraestrutura externa (Google Gemini API) e requer análise
             response = self.client.models.generate_content(
                 model=self.model_name,
                 contents=prompt,
-                config=genai.types.GenerateContentConfig(
-                    system_instruction=self.system_instruction,
-                ),
+                config=self.conversation_config,
             )
 
             # Extract text response
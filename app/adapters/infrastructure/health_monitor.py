@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Health Monitor - Scheduled health inspection with a cached report
+
+/health used to open a database session and query pg_tables for the RLS
+status on every hit, and load balancers probe it every few seconds. The
+inspection now runs on a background schedule and /health serves the cached
+report:
+
+- The report is refreshed every `refresh_interval` seconds while the server runs
+- A request that finds no report, or one older than `ttl`, refreshes it inline
+- Concurrent refreshes are collapsed into one inspection
+- An inspection that outlasts `timeout` is abandoned and the last report is
+  served marked "stale", so a hung dependency never hangs /health with it
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """
+    Runs an expensive health inspection periodically and caches its result.
+
+    The inspection coroutine is expected to report failures in the returned
+    dict; an exception it raises is turned into an "unhealthy" report.
+    """
+
+    def __init__(
+        self,
+        inspect: Callable[[], Awaitable[Dict[str, Any]]],
+        ttl: float = 60.0,
+        refresh_interval: float = 30.0,
+        timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            inspect: Coroutine function producing the health report
+            ttl: Seconds a report is served before a request refreshes it inline
+            refresh_interval: Seconds between background refreshes
+            timeout: Seconds an inspection may take (None waits indefinitely)
+        """
+        self._inspect = inspect
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self._report: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        # Inspections finished (or abandoned) so far; callers queued on the lock
+        # reuse the outcome of one that finished while they waited
+        self._finished = 0
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"refreshes": 0, "failures": 0, "timeouts": 0, "hits": 0, "inline_refreshes": 0}
+
+    def _is_fresh(self) -> bool:
+        return self._report is not None and time.monotonic() - self._checked_at < self.ttl
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Get the health report, refreshing it only when missing or expired.
+
+        Returns:
+            A copy of the report with its age in seconds under "checked_seconds_ago"
+        """
+        if self._is_fresh():
+            self._stats["hits"] += 1
+        else:
+            self._stats["inline_refreshes"] += 1
+            await self._refresh(force=False, seen_finished=self._finished)
+        report = dict(self._report)
+        report["checked_seconds_ago"] = round(time.monotonic() - self._checked_at, 3)
+        return report
+
+    async def refresh(self, force: bool = True) -> Dict[str, Any]:
+        """
+        Run the inspection and cache its result.
+
+        Args:
+            force: Inspect even if a fresh report exists (False lets callers that
+                   waited on a concurrent refresh reuse its result)
+
+        Returns:
+            The new report (the last one marked "stale" if the inspection timed out)
+        """
+        return await self._refresh(force, seen_finished=self._finished)
+
+    async def _refresh(self, force: bool, seen_finished: int) -> Dict[str, Any]:
+        async with self._lock:
+            # Waiters reuse the outcome of the inspection they queued behind, even a timed-out one
+            finished_meanwhile = self._finished != seen_finished and self._report is not None
+            if not force and (self._is_fresh() or finished_meanwhile):
+                return self._report
+            try:
+                report = await asyncio.wait_for(self._inspect(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Health inspection timed out after {self.timeout}s")
+                self._stats["timeouts"] += 1
+                if self._report is not None:
+                    # Keep the last report's age: the next request may try again
+                    self._report = {**self._report, "stale": True}
+                    self._finished += 1
+                    return self._report
+                report = {"status": "unhealthy", "error": f"Health inspection timed out after {self.timeout}s"}
+            except Exception as e:
+                logger.error(f"Health inspection failed: {e}", exc_info=True)
+                self._stats["failures"] += 1
+                report = {"status": "unhealthy", "error": str(e)}
+            self._report = report
+            self._checked_at = time.monotonic()
+            self._finished += 1
+            self._stats["refreshes"] += 1
+            return report
+
+    def start(self) -> None:
+        """Start the background refresh task (idempotent; needs a running event loop)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._refresh_loop(), name="health-refresh")
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await self.refresh()
+            await asyncio.sleep(self.refresh_interval)
+
+    async def shutdown(self) -> None:
+        """Stop the background refresh task"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get refresh counters.
+
+        Returns:
+            Dict with refresh/failure/timeout counts, cache hits and report age
+        """
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["running"] = self._task is not None and not self._task.done()
+        stats["age_seconds"] = round(time.monotonic() - self._checked_at, 3) if self._report is not None else None
+        return stats
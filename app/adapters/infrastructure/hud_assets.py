@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""HUD Assets - Versioned, precompressed static bundle for the Strategic HUD
+
+The HUD used to be a ~1,850-line string built inside the `/` handler and sent
+uncompressed, without caching headers, on every load. Mobile clients on 4G reload
+that page often, so the bundle is now built once when the API server starts:
+
+- hud.css / hud.js are renamed by content hash (hud.<hash>.js) and served with
+  `Cache-Control: immutable`, so browsers never revalidate them
+- index.html references the hashed names and is revalidated with a strong ETag
+  (304 when unchanged)
+- sw.js receives the list of hashed assets, so the service worker precaches the
+  exact build and drops the previous one when the hash changes
+- Every asset is gzip-compressed at build time (and brotli when the `brotli`
+  package is installed); requests pick an encoding from Accept-Encoding
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Brotli is optional: without it only gzip (and identity) encodings are offered
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    brotli = None
+    HAS_BROTLI = False
+
+logger = logging.getLogger(__name__)
+
+# URL prefix of the content-hashed assets
+ASSET_URL_PREFIX = "/hud/assets/"
+
+# Files of static/hud that are fingerprinted and referenced from index.html
+FINGERPRINTED_FILES = ("hud.css", "hud.js")
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "no-cache"
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 512
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "application/javascript; charset=utf-8",
+}
+
+# `{{ asset:hud.js }}` placeholders in index.html
+_ASSET_PLACEHOLDER = re.compile(r"\{\{\s*asset:([\w.\-]+)\s*\}\}")
+
+# Literal in sw.js replaced with the build manifest (valid JS when served raw)
+SW_BUILD_PLACEHOLDER = '{"version": "dev", "assets": []}'
+
+
+def content_hash(body: bytes, length: int = 12) -> str:
+    """Return a short, stable hex digest of a file body"""
+    return hashlib.sha256(body).hexdigest()[:length]
+
+
+def _parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: q-value}"""
+    codings: Dict[str, float] = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        codings[token] = quality
+    return codings
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison, RFC 9110)"""
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag.strip('"')
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        # Encoded representations carry the coding as a suffix (e.g. "abc-gzip")
+        if candidate.strip('"') in (bare, f"{bare}-gzip", f"{bare}-br"):
+            return True
+    return False
+
+
+@dataclass
+class StaticAsset:
+    """A built asset with its precompressed variants"""
+
+    name: str
+    body: bytes
+    content_type: str
+    immutable: bool = False
+    encodings: Dict[str, bytes] = field(default_factory=dict)
+    etag: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.etag:
+            self.etag = f'"{content_hash(self.body, 32)}"'
+        if not self.encodings and len(self.body) >= MIN_COMPRESS_SIZE:
+            self.encodings = self._compress(self.body)
+
+    @staticmethod
+    def _compress(body: bytes) -> Dict[str, bytes]:
+        """Precompress a body; variants that do not shrink it are dropped"""
+        variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if HAS_BROTLI:
+            variants["br"] = brotli.compress(body, quality=11)
+        return {coding: data for coding, data in variants.items() if len(data) < len(body)}
+
+    @property
+    def cache_control(self) -> str:
+        return IMMUTABLE_CACHE_CONTROL if self.immutable else REVALIDATE_CACHE_CONTROL
+
+    def select_encoding(self, accept_encoding: str) -> Optional[str]:
+        """Pick the smallest precompressed variant the client accepts"""
+        if not accept_encoding or not self.encodings:
+            return None
+        accepted = _parse_accept_encoding(accept_encoding)
+        wildcard = accepted.get("*", 0.0)
+        best: Optional[str] = None
+        for coding, data in self.encodings.items():
+            if accepted.get(coding, wildcard) <= 0:
+                continue
+            if best is None or len(data) < len(self.encodings[best]):
+                best = coding
+        return best
+
+    def respond(self, accept_encoding: str = "", if_none_match: str = "") -> Tuple[int, bytes, Dict[str, str]]:
+        """
+        Build the response for a request.
+
+        Args:
+            accept_encoding: Accept-Encoding request header
+            if_none_match: If-None-Match request header
+
+        Returns:
+            Tuple of (status code, body, headers); 304 responses have an empty body
+        """
+        # Strong ETags identify one representation, so each coding gets its own tag
+        coding = self.select_encoding(accept_encoding)
+        etag = self.etag if coding is None else f'{self.etag[:-1]}-{coding}"'
+        headers = {
+            "ETag": etag,
+            "Cache-Control": self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if if_none_match and _etag_matches(if_none_match, self.etag):
+            return 304, b"", headers
+
+        headers["Content-Type"] = self.content_type
+        if coding is None:
+            return 200, self.body, headers
+        headers["Content-Encoding"] = coding
+        return 200, self.encodings[coding], headers
+
+
+class HudAssetBundle:
+    """
+    Content-hashed HUD bundle built from the static/hud sources.
+
+    Built once at startup; lookups are plain dictionary reads.
+    """
+
+    def __init__(self, index: StaticAsset, service_worker: StaticAsset, assets: Dict[str, StaticAsset], version: str):
+        self.index = index
+        self.service_worker = service_worker
+        self.assets = assets
+        self.version = version
+
+    @classmethod
+    def build(cls, source_dir: Path, service_worker_path: Optional[Path] = None) -> "HudAssetBundle":
+        """
+        Build the bundle from a directory containing index.html, hud.css and hud.js.
+
+        Args:
+            source_dir: Directory with the HUD sources (static/hud)
+            service_worker_path: Service worker template (defaults to ../sw.js)
+
+        Returns:
+            The built bundle
+
+        Raises:
+            FileNotFoundError: If index.html or a fingerprinted file is missing
+        """
+        source_dir = Path(source_dir)
+        service_worker_path = service_worker_path or source_dir.parent / "sw.js"
+
+        assets: Dict[str, StaticAsset] = {}
+        urls: Dict[str, str] = {}
+        for filename in FINGERPRINTED_FILES:
+            path = source_dir / filename
+            body = path.read_bytes()
+            hashed_name = f"{path.stem}.{content_hash(body)}{path.suffix}"
+            assets[hashed_name] = StaticAsset(
+                name=hashed_name,
+                body=body,
+                content_type=CONTENT_TYPES[path.suffix],
+                immutable=True,
+            )
+            urls[filename] = ASSET_URL_PREFIX + hashed_name
+
+        def resolve(match: "re.Match[str]") -> str:
+            name = match.group(1)
+            if name not in urls:
+                raise KeyError(f"index.html references unknown HUD asset: {name}")
+            return urls[name]
+
+        template = (source_dir / "index.html").read_text(encoding="utf-8")
+        index_body = _ASSET_PLACEHOLDER.sub(resolve, template).encode("utf-8")
+        index = StaticAsset(name="index.html", body=index_body, content_type=CONTENT_TYPES[".html"])
+
+        # The build version covers the page and every asset it references
+        version = content_hash(index_body + b"".join(a.body for a in assets.values()))
+        manifest = {"version": version, "assets": sorted(urls.values())}
+
+        sw_template = service_worker_path.read_text(encoding="utf-8")
+        if SW_BUILD_PLACEHOLDER not in sw_template:
+            logger.warning(f"Service worker at {service_worker_path} has no build placeholder; HUD assets will not be precached")
+        sw_body = sw_template.replace(SW_BUILD_PLACEHOLDER, json.dumps(manifest), 1).encode("utf-8")
+        service_worker = StaticAsset(name="sw.js", body=sw_body, content_type=CONTENT_TYPES[".js"])
+
+        bundle = cls(index=index, service_worker=service_worker, assets=assets, version=version)
+        logger.info(
+            f"HUD bundle {version} built: {len(assets)} hashed assets, "
+            f"index {len(index_body)} B -> {bundle._smallest_size(index)} B compressed"
+        )
+        return bundle
+
+    @staticmethod
+    def _smallest_size(asset: StaticAsset) -> int:
+        return min([len(asset.body)] + [len(data) for data in asset.encodings.values()])
+
+    def get_asset(self, name: str) -> Optional[StaticAsset]:
+        """Look up a content-hashed asset by file name"""
+        return self.assets.get(name)
+
+    def precache_urls(self) -> List[str]:
+        """URLs the service worker precaches for this build"""
+        return sorted(ASSET_URL_PREFIX + name for name in self.assets)
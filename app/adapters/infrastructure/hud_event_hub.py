@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""HUD Event Hub - Server-side push of HUD state over one connection
+
+The HUD used to poll /v1/status, /v1/roadmap/progress and /v1/telemetry on
+timers; every poll paid for JWT verification and, for roadmap progress, a
+re-read of the capability data. With N open HUDs the server did N times the
+same work even when nothing changed.
+
+The hub keeps the latest state per topic and pushes only what changed:
+
+- State topics (status, evolution, devices) send a snapshot on subscribe and
+  then diffs (changed keys + removed keys)
+- Event topics (commands) forward one message per event
+- Sources refresh a state topic on an interval, but only while at least one
+  client is subscribed, and once for all clients
+- Each subscriber has a bounded queue; a client that falls behind is
+  resynchronized with fresh snapshots instead of growing memory
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Sentinel delivered to a subscriber whose queue overflowed
+RESYNC = {"type": "resync"}
+
+_MISSING = object()
+
+
+def diff_state(previous: Dict[str, Any], current: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Compute a shallow diff between two state dictionaries.
+
+    Returns:
+        {"changes": {...}, "removed": [...]} or None when nothing changed
+    """
+    changes = {key: value for key, value in current.items() if previous.get(key, _MISSING) != value}
+    removed = [key for key in previous if key not in current]
+    if not changes and not removed:
+        return None
+    return {"changes": changes, "removed": removed}
+
+
+@dataclass
+class HudSubscriber:
+    """A connected HUD client"""
+
+    topics: Set[str]
+    queue: asyncio.Queue
+    dropped: int = 0
+
+
+@dataclass
+class _Source:
+    refresh: Callable[[], Awaitable[Dict[str, Any]]]
+    interval: float
+    task: Optional[asyncio.Task] = None
+    last_error: Optional[str] = field(default=None)
+
+
+class HudEventHub:
+    """
+    Topic-based pub/sub hub for HUD clients.
+
+    Must be used from a single event loop (no locking).
+    """
+
+    DEFAULT_QUEUE_SIZE = 100
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        """
+        Initialize the hub.
+
+        Args:
+            queue_size: Pending messages per subscriber before it is resynchronized
+        """
+        self.queue_size = max(1, queue_size)
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._seq: Dict[str, int] = {}
+        self._subscribers: List[HudSubscriber] = []
+        self._sources: Dict[str, _Source] = {}
+        self._stats = {"published": 0, "suppressed": 0, "events": 0, "resyncs": 0}
+
+    # Sources
+
+    def register_source(
+        self,
+        topic: str,
+        refresh: Callable[[], Awaitable[Dict[str, Any]]],
+        interval: float,
+    ) -> None:
+        """
+        Refresh a state topic periodically while it has subscribers.
+
+        Args:
+            topic: State topic
+            refresh: Coroutine function returning the topic's full state
+            interval: Seconds between refreshes
+        """
+        self._sources[topic] = _Source(refresh=refresh, interval=max(0.1, interval))
+
+    async def refresh(self, topic: str) -> None:
+        """Run a topic's source once and publish the result"""
+        source = self._sources.get(topic)
+        if source is None:
+            return
+        try:
+            self.publish(topic, await source.refresh())
+            source.last_error = None
+        except Exception as e:
+            if source.last_error != str(e):
+                logger.warning(f"HUD source '{topic}' failed: {e}")
+            source.last_error = str(e)
+
+    async def _run_source(self, topic: str, source: _Source) -> None:
+        while True:
+            await self.refresh(topic)
+            await asyncio.sleep(source.interval)
+
+    def _sync_sources(self) -> None:
+        """Start sources that gained subscribers and stop idle ones"""
+        wanted = {topic for subscriber in self._subscribers for topic in subscriber.topics}
+        for topic, source in self._sources.items():
+            running = source.task is not None and not source.task.done()
+            if topic in wanted and not running:
+                source.task = asyncio.create_task(self._run_source(topic, source), name=f"hud-source-{topic}")
+            elif topic not in wanted and running:
+                source.task.cancel()
+                source.task = None
+
+    # Publishing
+
+    def publish(self, topic: str, state: Dict[str, Any]) -> bool:
+        """
+        Replace a state topic and push the diff to its subscribers.
+
+        Returns:
+            True if anything changed
+        """
+        previous = self._state.get(topic, {})
+        diff = diff_state(previous, state)
+        if diff is None:
+            self._stats["suppressed"] += 1
+            return False
+        self._state[topic] = dict(state)
+        self._broadcast(topic, {"type": "diff", **diff})
+        self._stats["published"] += 1
+        return True
+
+    def update(self, topic: str, changes: Dict[str, Any]) -> bool:
+        """
+        Merge keys into a state topic and push the diff.
+
+        Returns:
+            True if anything changed
+        """
+        return self.publish(topic, {**self._state.get(topic, {}), **changes})
+
+    def emit(self, topic: str, data: Dict[str, Any]) -> None:
+        """Forward a one-off event (not kept as state) to a topic's subscribers"""
+        self._stats["events"] += 1
+        self._broadcast(topic, {"type": "event", "data": data})
+
+    def snapshot(self, topic: str) -> Dict[str, Any]:
+        """Current state of a topic"""
+        return dict(self._state.get(topic, {}))
+
+    def _broadcast(self, topic: str, message: Dict[str, Any]) -> None:
+        self._seq[topic] = self._seq.get(topic, 0) + 1
+        message = {**message, "topic": topic, "seq": self._seq[topic], "ts": time.time()}
+        for subscriber in self._subscribers:
+            if topic in subscriber.topics:
+                self._deliver(subscriber, message)
+
+    def _deliver(self, subscriber: HudSubscriber, message: Dict[str, Any]) -> None:
+        try:
+            subscriber.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # The client is too slow: drop its backlog and send fresh snapshots
+            subscriber.dropped += subscriber.queue.qsize()
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(RESYNC)
+            self._stats["resyncs"] += 1
+
+    # Subscriptions
+
+    def subscribe(self, topics: Iterable[str]) -> HudSubscriber:
+        """
+        Register a client for some topics.
+
+        The client's queue starts with a snapshot of every state topic it follows.
+        """
+        subscriber = HudSubscriber(topics=set(topics), queue=asyncio.Queue(maxsize=self.queue_size))
+        for message in self.snapshots(subscriber.topics):
+            subscriber.queue.put_nowait(message)
+        self._subscribers.append(subscriber)
+        self._sync_sources()
+        return subscriber
+
+    def unsubscribe(self, subscriber: HudSubscriber) -> None:
+        """Remove a client; sources nobody follows anymore are stopped"""
+        if subscriber in self._subscribers:
+            self._subscribers.remove(subscriber)
+        self._sync_sources()
+
+    def snapshots(self, topics: Iterable[str]) -> List[Dict[str, Any]]:
+        """Snapshot messages for the state topics among `topics`"""
+        return [
+            {
+                "type": "snapshot",
+                "topic": topic,
+                "seq": self._seq.get(topic, 0),
+                "ts": time.time(),
+                "state": self.snapshot(topic),
+            }
+            for topic in sorted(topics)
+            if topic in self._state
+        ]
+
+    async def shutdown(self) -> None:
+        """Stop all sources"""
+        tasks = [source.task for source in self._sources.values() if source.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for source in self._sources.values():
+            source.task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hub counters.
+
+        Returns:
+            Dict with subscriber count, published/suppressed diffs, events and resyncs
+        """
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["subscribers"] = len(self._subscribers)
+        stats["active_sources"] = sorted(
+            topic for topic, source in self._sources.items() if source.task is not None and not source.task.done()
+        )
+        return stats
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""JSON Responses - Fast serialization and compression for API responses
+
+Device lists, thought logs and consolidated mission logs can be large, and every
+response used to go through the stdlib encoder and leave the server uncompressed.
+
+- FastJSONResponse: default response class of the API; serializes with orjson
+  when installed (falls back to the same compact stdlib encoding as JSONResponse)
+- SelectiveGZipMiddleware: gzip above a size threshold, skipping routes that are
+  already precompressed (HUD assets) or must flush per chunk (SSE streams)
+- stream_json_list: serializes a large list response item by item so the first
+  bytes leave before the whole payload is encoded
+"""
+
+import json
+import logging
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# orjson is optional: without it responses use the stdlib encoder
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    orjson = None
+    HAS_ORJSON = False
+
+logger = logging.getLogger(__name__)
+
+# Items serialized per chunk by stream_json_list
+STREAM_CHUNK_ITEMS = 100
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    """Same encoding as starlette's JSONResponse"""
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def dumps_json(content: Any) -> bytes:
+    """Serialize JSON-compatible content to UTF-8 bytes with the fastest available encoder"""
+    if HAS_ORJSON:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return _stdlib_dumps(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that leaves some paths untouched.
+
+    Precompressed responses would otherwise be compressed twice on Starlette
+    versions that do not check Content-Encoding, and buffering SSE streams in the
+    compressor delays every event.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        compresslevel: int = 6,
+        exclude_paths: Sequence[str] = (),
+        exclude_prefixes: Sequence[str] = (),
+    ) -> None:
+        super().__init__(app, minimum_size=minimum_size, compresslevel=compresslevel)
+        self.exclude_paths = frozenset(exclude_paths)
+        self.exclude_prefixes = tuple(exclude_prefixes)
+
+    def is_excluded(self, path: str) -> bool:
+        """Check whether responses for a path bypass compression"""
+        return path in self.exclude_paths or path.startswith(self.exclude_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and self.is_excluded(scope.get("path", "")):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+def _iter_json_list(
+    envelope: dict,
+    list_field: str,
+    items: Iterable[Any],
+    serialize: Callable[[Any], Any],
+    chunk_items: int,
+) -> Iterator[bytes]:
+    """Yield `{...envelope, "<list_field>": [items...]}` in chunks"""
+    head = dumps_json(envelope)
+    separator = b"," if envelope else b""
+    yield head[:-1] + separator + dumps_json(list_field) + b":["
+
+    chunk = []
+    first = True
+    for item in items:
+        chunk.append(dumps_json(serialize(item)))
+        if len(chunk) >= chunk_items:
+            yield (b"" if first else b",") + b",".join(chunk)
+            first = False
+            chunk = []
+    if chunk:
+        yield (b"" if first else b",") + b",".join(chunk)
+    yield b"]}"
+
+
+def stream_json_list(
+    envelope: dict,
+    list_field: str,
+    items: Iterable[Any],
+    serialize: Optional[Callable[[Any], Any]] = None,
+    chunk_items: int = STREAM_CHUNK_ITEMS,
+    status_code: int = 200,
+) -> StreamingResponse:
+    """
+    Stream a JSON object whose largest member is a list.
+
+    Produces the same document as returning `{**envelope, list_field: [...]}`,
+    but encodes and sends `chunk_items` items at a time.
+
+    Args:
+        envelope: Scalar members of the response (e.g. {"total": 1200})
+        list_field: Name of the list member
+        items: Items of the list
+        serialize: Converts an item to JSON-compatible data (default: identity;
+                   Pydantic models are dumped with model_dump(mode="json"))
+        chunk_items: Items per chunk
+        status_code: HTTP status code
+
+    Returns:
+        StreamingResponse with media type application/json
+    """
+    if serialize is None:
+        def serialize(item: Any) -> Any:
+            if hasattr(item, "model_dump"):
+                return item.model_dump(mode="json")
+            return item
+
+    return StreamingResponse(
+        _iter_json_list(envelope, list_field, items, serialize, max(1, chunk_items)),
+        status_code=status_code,
+        media_type="application/json",
+    )
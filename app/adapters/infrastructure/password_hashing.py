@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""Password Hashing - Off-loop bcrypt work and login attempt limiting
+
+A bcrypt verification costs hundreds of milliseconds of CPU. Run on the event
+loop, a burst of logins on /token froze every other request and WebSocket.
+
+- PasswordHashingPool: small dedicated thread pool for bcrypt (the bcrypt
+  extension releases the GIL while hashing) with a bounded number of pending
+  jobs; beyond that, logins are rejected at once instead of queueing
+- LoginAttemptLimiter: sliding-window failure counters per username and per
+  client IP, checked before any bcrypt work is scheduled (fixed-window
+  counters in the StateStore when it is shared by several API workers);
+  attempts still being verified count against the limit, so a concurrent
+  burst cannot slip past it
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple, TypeVar
+
+from app.application.ports.state_store import StateStore
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class HashingQueueFull(Exception):
+    """Raised when the password hashing pool has no room for another job"""
+
+
+class PasswordHashingPool:
+    """
+    Bounded thread pool for password hashing and verification.
+
+    Counters are only mutated from the event loop, so no extra locking is needed.
+    """
+
+    DEFAULT_MAX_WORKERS = 2
+    DEFAULT_MAX_PENDING = 32
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        name: str = "jarvis-bcrypt",
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers: Concurrent bcrypt operations (minimum 1)
+            max_pending: Jobs running or queued before new ones are rejected
+                         (at least max_workers)
+            name: Thread name prefix (used in logs and thread dumps)
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max(self.max_workers, max_pending)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self._pending = 0
+        self._max_seen_pending = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Run a hashing function on the pool.
+
+        Args:
+            func: Blocking callable (e.g. AuthAdapter.authenticate_user)
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            The callable's return value
+
+        Raises:
+            HashingQueueFull: If max_pending jobs are already running or queued
+        """
+        if self._pending >= self.max_pending:
+            self._rejected += 1
+            raise HashingQueueFull(f"{self.name}: {self._pending} password hashing jobs pending")
+
+        self._pending += 1
+        self._max_seen_pending = max(self._max_seen_pending, self._pending)
+        start = time.monotonic()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+        finally:
+            self._pending -= 1
+            self._completed += 1
+            self._total_seconds += time.monotonic() - start
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pool counters.
+
+        Returns:
+            Dict with pending/completed/rejected counts and average latency
+        """
+        return {
+            "max_workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "max_seen_pending": self._max_seen_pending,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_ms": (self._total_seconds / self._completed * 1000) if self._completed else 0.0,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker threads"""
+        self._executor.shutdown(wait=wait)
+
+
+class LoginAttemptLimiter:
+    """
+    Sliding-window limiter of failed logins per username and per client IP.
+
+    Only failures count, so a user who types the right password is never
+    throttled by their own successful logins. acquire() also counts attempts
+    still in flight (until release()), so concurrent guesses are limited
+    before their failures are recorded.
+
+    With a shared StateStore, failures are counted in fixed windows of
+    `window_seconds` that every API worker sees. Calls then block on the
+    store and belong off the event loop.
+    """
+
+    FAILURES_KEY = "login:failures:"
+    IN_FLIGHT_KEY = "login:in_flight:"
+    # Seconds a shared in-flight count survives a worker that never released it
+    IN_FLIGHT_TTL = 60.0
+
+    DEFAULT_MAX_KEYS = 10000
+
+    def __init__(
+        self,
+        max_failures_per_username: int = 5,
+        max_failures_per_ip: int = 20,
+        window_seconds: float = 300.0,
+        max_keys: int = DEFAULT_MAX_KEYS,
+        state_store: Optional[StateStore] = None,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_failures_per_username: Failures allowed per username in the window
+            max_failures_per_ip: Failures allowed per client IP in the window
+            window_seconds: Sliding window length
+            max_keys: Tracked usernames/IPs before the oldest are forgotten
+            state_store: StateStore for the counters (used only if it is shared)
+        """
+        self.max_failures = {
+            "user": max(1, max_failures_per_username),
+            "ip": max(1, max_failures_per_ip),
+        }
+        self.window_seconds = window_seconds
+        self.max_keys = max(1, max_keys)
+        self._failures: "OrderedDict[str, Deque[float]]" = OrderedDict()
+        self._in_flight: Dict[str, int] = {}
+        self._blocked = 0
+        self._lock = threading.Lock()
+        self._store = state_store if state_store is not None and state_store.shared else None
+
+    def _shared_retry_after(self, kind: str, key: str, pending: int = 0) -> Optional[float]:
+        failures = self._store.get(self.FAILURES_KEY + key) or 0
+        if failures + pending < self.max_failures[kind]:
+            return None
+        if failures < self.max_failures[kind]:
+            # Blocked by attempts still in flight: they finish within seconds
+            return 1.0
+        started = self._store.get(self.FAILURES_KEY + key + ":start") or time.time()
+        return max(0.0, self.window_seconds - (time.time() - started))
+
+    def _prune(self, key: str, now: float) -> Optional[Deque[float]]:
+        """Drop failures outside the window; forget keys without failures"""
+        failures = self._failures.get(key)
+        if failures is None:
+            return None
+        while failures and now - failures[0] >= self.window_seconds:
+            failures.popleft()
+        if not failures:
+            del self._failures[key]
+            return None
+        return failures
+
+    def check(self, username: str, client_ip: Optional[str] = None) -> Optional[float]:
+        """
+        Check whether a login attempt may proceed.
+
+        Args:
+            username: Submitted username
+            client_ip: Client address (None when unknown)
+
+        Returns:
+            None if allowed, otherwise seconds until the next attempt is allowed
+        """
+        with self._lock:
+            return self._retry_after(username, client_ip, count_in_flight=False)
+
+    def acquire(self, username: str, client_ip: Optional[str] = None) -> Optional[float]:
+        """
+        Check a login attempt and, if allowed, count it as in flight.
+
+        Every allowed acquire() must be followed by release() once the attempt
+        was recorded as a success or failure.
+
+        Args:
+            username: Submitted username
+            client_ip: Client address (None when unknown)
+
+        Returns:
+            None if allowed, otherwise seconds until the next attempt is allowed
+        """
+        with self._lock:
+            retry_after = self._retry_after(username, client_ip, count_in_flight=True)
+            if retry_after is None:
+                for _, key in self._keys(username, client_ip):
+                    if self._store is not None:
+                        self._store.increment(self.IN_FLIGHT_KEY + key, ttl=self.IN_FLIGHT_TTL)
+                    else:
+                        self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        return retry_after
+
+    def release(self, username: str, client_ip: Optional[str] = None) -> None:
+        """Stop counting an attempt admitted by acquire() as in flight"""
+        with self._lock:
+            for _, key in self._keys(username, client_ip):
+                if self._store is not None:
+                    if self._store.increment(self.IN_FLIGHT_KEY + key, -1, ttl=self.IN_FLIGHT_TTL) <= 0:
+                        self._store.delete(self.IN_FLIGHT_KEY + key)
+                    continue
+                remaining = self._in_flight.get(key, 0) - 1
+                if remaining > 0:
+                    self._in_flight[key] = remaining
+                else:
+                    self._in_flight.pop(key, None)
+
+    def _retry_after(self, username: str, client_ip: Optional[str], count_in_flight: bool) -> Optional[float]:
+        now = time.monotonic()
+        retry_after = None
+        for kind, key in self._keys(username, client_ip):
+            if self._store is not None:
+                pending = (self._store.get(self.IN_FLIGHT_KEY + key) or 0) if count_in_flight else 0
+                wait = self._shared_retry_after(kind, key, max(0, pending))
+                if wait is not None:
+                    retry_after = max(retry_after or 0.0, wait)
+                continue
+            failures = self._prune(key, now)
+            recorded = len(failures) if failures is not None else 0
+            pending = self._in_flight.get(key, 0) if count_in_flight else 0
+            if recorded >= self.max_failures[kind]:
+                wait = self.window_seconds - (now - failures[0])
+                retry_after = max(retry_after or 0.0, wait)
+            elif recorded + pending >= self.max_failures[kind]:
+                retry_after = max(retry_after or 0.0, 1.0)
+        if retry_after is not None:
+            self._blocked += 1
+        return retry_after
+
+    def record_failure(self, username: str, client_ip: Optional[str] = None) -> None:
+        """Count a failed login for the username and the client IP"""
+        now = time.monotonic()
+        with self._lock:
+            for _, key in self._keys(username, client_ip):
+                if self._store is not None:
+                    count = self._store.increment(self.FAILURES_KEY + key, ttl=self.window_seconds)
+                    if count == 1:
+                        self._store.set(self.FAILURES_KEY + key + ":start", time.time(), ttl=self.window_seconds)
+                    continue
+                failures = self._prune(key, now)
+                if failures is None:
+                    failures = self._failures[key] = deque()
+                failures.append(now)
+                self._failures.move_to_end(key)
+            while len(self._failures) > self.max_keys:
+                self._failures.popitem(last=False)
+
+    def record_success(self, username: str) -> None:
+        """Forget the username's failures after a successful login"""
+        key = f"user:{username.lower()}"
+        with self._lock:
+            self._failures.pop(key, None)
+            if self._store is not None:
+                self._store.delete(self.FAILURES_KEY + key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter counters.
+
+        Returns:
+            Dict with tracked keys, attempts in flight and blocked attempts
+        """
+        return {
+            "tracked_keys": len(self._failures),
+            "in_flight": sum(count for key, count in self._in_flight.items() if key.startswith("user:")),
+            "blocked": self._blocked,
+            "shared": self._store is not None,
+        }
+
+    @staticmethod
+    def _keys(username: str, client_ip: Optional[str]) -> Iterator[Tuple[str, str]]:
+        yield "user", f"user:{username.lower()}"
+        if client_ip:
+            yield "ip", f"ip:{client_ip}"
@@ -0,0 +1,473 @@
+# -*- coding: utf-8 -*-
+"""Provider Limits - Per-provider admission control for the AI Gateway
+
+- ConcurrencyLimiter: bounds how many requests are in flight per provider so a
+  burst of HUD/voice traffic queues in the event loop instead of exhausting
+  threads, sockets or provider-side concurrency limits
+- ModelBudget: requests/min and tokens/min token buckets per model, calibrated
+  from the provider's x-ratelimit-* response headers
+- CircuitBreaker: closed/open/half-open breaker per model so traffic moves away
+  from a rate-limited model and returns through a single probe request; with a
+  shared StateStore, a trip in one API worker opens the breaker in all of them
+  (the shared state is re-read at most once per SHARED_CHECK_INTERVAL, and
+  store I/O runs on a background thread when called from the event loop)
+- LatencyWindow: rolling latency samples used to derive the hedging delay
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Mapping, Optional
+
+from app.application.ports.state_store import StateStore
+
+logger = logging.getLogger(__name__)
+
+# Single thread, so the breakers' store writes apply in the order they were made
+_store_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="breaker-store")
+
+
+class ConcurrencyLimiter:
+    """
+    asyncio.Semaphore wrapper that records queue depth and wait time.
+
+    Counters are only mutated from the event loop, so no extra locking is needed.
+    """
+
+    def __init__(self, name: str, max_concurrency: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            name: Provider name (used in logs and metrics)
+            max_concurrency: Maximum concurrent requests (minimum 1)
+        """
+        self.name = name
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._in_flight = 0
+        self._waiting = 0
+        self._max_waiting = 0
+        self._acquired = 0
+        self._total_wait_seconds = 0.0
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """
+        Hold one concurrency slot for the duration of the block.
+
+        Yields:
+            None once a slot is available
+        """
+        self._waiting += 1
+        self._max_waiting = max(self._max_waiting, self._waiting)
+        start = time.monotonic()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        wait_seconds = time.monotonic() - start
+        self._total_wait_seconds += wait_seconds
+        self._acquired += 1
+        self._in_flight += 1
+        if wait_seconds > 1.0:
+            logger.debug(f"{self.name} request waited {wait_seconds:.2f}s for a concurrency slot")
+        try:
+            yield
+        finally:
+            self._in_flight -= 1
+            self._semaphore.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter counters.
+
+        Returns:
+            Dict with limit, in-flight, queue depth and wait statistics
+        """
+        return {
+            "limit": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "max_waiting": self._max_waiting,
+            "acquired": self._acquired,
+            "avg_wait_ms": (
+                self._total_wait_seconds / self._acquired * 1000 if self._acquired else 0.0
+            ),
+        }
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate limit reset/retry duration into seconds.
+
+    Accepts plain seconds ("12", "7.5") and Go-style durations ("2m59.56s", "120ms").
+
+    Args:
+        value: Header value
+
+    Returns:
+        Duration in seconds, or None if it cannot be parsed
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(number + unit for number, unit in parts) != value:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+class TokenBucket:
+    """
+    Token bucket whose level and refill rate are calibrated from observed limits.
+
+    Until a limit has been observed the bucket is unbounded (available() is None).
+    """
+
+    def __init__(self):
+        self.capacity: Optional[float] = None
+        self.level: Optional[float] = None
+        self.refill_per_second = 0.0
+        self._updated = time.monotonic()
+
+    def observe(self, limit: Optional[float], remaining: Optional[float], reset_seconds: Optional[float]) -> None:
+        """
+        Calibrate the bucket from a provider response.
+
+        Args:
+            limit: Total limit for the window (if reported)
+            remaining: Remaining budget in the window
+            reset_seconds: Seconds until the budget is fully restored
+        """
+        if remaining is None:
+            return
+        self._refill()
+        if limit is not None:
+            self.capacity = limit
+        self.level = remaining
+        capacity = self.capacity if self.capacity is not None else remaining
+        if reset_seconds and reset_seconds > 0 and capacity > remaining:
+            self.refill_per_second = (capacity - remaining) / reset_seconds
+
+    def available(self) -> Optional[float]:
+        """Current budget, or None if no limit has been observed"""
+        if self.level is None:
+            return None
+        self._refill()
+        return self.level
+
+    def consume(self, amount: float) -> None:
+        """Optimistically consume budget for a request that is being dispatched"""
+        if self.level is None:
+            return
+        self._refill()
+        self.level -= amount
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.level is not None and self.refill_per_second:
+            self.level += (now - self._updated) * self.refill_per_second
+            if self.capacity is not None:
+                self.level = min(self.level, self.capacity)
+        self._updated = now
+
+
+class ModelBudget:
+    """Requests/min and tokens/min budget for one model"""
+
+    def __init__(self, name: str, reserve_requests: int = 1):
+        """
+        Initialize the budget.
+
+        Args:
+            name: Model name
+            reserve_requests: Requests kept in reserve before routing away
+        """
+        self.name = name
+        self.reserve_requests = reserve_requests
+        self.requests = TokenBucket()
+        self.tokens = TokenBucket()
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Calibrate from x-ratelimit-* response headers.
+
+        Args:
+            headers: Response headers (case-insensitive mapping or plain dict)
+        """
+        def header(name: str) -> Optional[str]:
+            return headers.get(name) or headers.get(name.title())
+
+        def number(name: str) -> Optional[float]:
+            try:
+                raw = header(name)
+                return float(raw) if raw is not None else None
+            except ValueError:
+                return None
+
+        self.requests.observe(
+            number("x-ratelimit-limit-requests"),
+            number("x-ratelimit-remaining-requests"),
+            parse_reset_duration(header("x-ratelimit-reset-requests")),
+        )
+        self.tokens.observe(
+            number("x-ratelimit-limit-tokens"),
+            number("x-ratelimit-remaining-tokens"),
+            parse_reset_duration(header("x-ratelimit-reset-tokens")),
+        )
+
+    def has_capacity(self, estimated_tokens: int = 0) -> bool:
+        """
+        Check whether a request of the given size fits the remaining budget.
+
+        Args:
+            estimated_tokens: Estimated prompt tokens for the request
+
+        Returns:
+            True if the request can be sent without hitting the limit
+        """
+        requests = self.requests.available()
+        if requests is not None and requests < 1 + self.reserve_requests:
+            return False
+        tokens = self.tokens.available()
+        if tokens is not None and tokens < estimated_tokens:
+            return False
+        return True
+
+    @property
+    def tracks_tokens(self) -> bool:
+        """Whether a tokens/min limit has been observed (only then do token estimates matter)"""
+        return self.tokens.available() is not None
+
+    def record_dispatch(self, estimated_tokens: int = 0) -> None:
+        """Consume budget for a request being sent (headers correct it afterwards)"""
+        self.requests.consume(1)
+        self.tokens.consume(estimated_tokens)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get remaining request/token budget"""
+        return {
+            "remaining_requests": self.requests.available(),
+            "remaining_tokens": self.tokens.available(),
+        }
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker for one model.
+
+    - closed: requests flow normally
+    - open: requests are routed elsewhere until the cooldown expires
+    - half-open: a single probe request is let through; success closes the
+      breaker, failure re-opens it
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    # Seconds a read of the shared trip is reused before the store is asked again
+    SHARED_CHECK_INTERVAL = 1.0
+
+    def __init__(self, name: str, cooldown_seconds: float = 30.0, state_store: Optional[StateStore] = None):
+        """
+        Initialize the breaker.
+
+        Args:
+            name: Model name (used in logs)
+            cooldown_seconds: Default time the breaker stays open
+            state_store: Optional store through which other processes' trips are seen
+        """
+        self.name = name
+        self.cooldown_seconds = cooldown_seconds
+        self.state_store = state_store
+        self._shared_key = f"circuit_breaker:{name}"
+        self._state = self.CLOSED
+        self._open_until = 0.0
+        self._probe_started: Optional[float] = None
+        self._trips = 0
+        self._shared_checked: Optional[float] = None
+        self._shared_check_pending = False
+
+    @property
+    def state(self) -> str:
+        """Current state (an open breaker whose cooldown expired reports half-open)"""
+        self._adopt_shared_trip()
+        if self._state == self.OPEN and time.monotonic() >= self._open_until:
+            return self.HALF_OPEN
+        return self._state
+
+    def is_available(self) -> bool:
+        """Check, without side effects, whether a request could be admitted now"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN:
+            return not self._probe_in_flight()
+        return False
+
+    def allow_request(self) -> bool:
+        """
+        Admit a request, claiming the probe slot when half-open.
+
+        Returns:
+            True if the request may be sent to this model
+        """
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._probe_in_flight():
+            self._state = self.HALF_OPEN
+            self._probe_started = time.monotonic()
+            logger.info(f"Circuit half-open for {self.name}, sending probe request")
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request"""
+        if self._state != self.CLOSED:
+            logger.info(f"✅ Circuit closed for {self.name}")
+            if self.state_store is not None:
+                self._store_call(self.state_store.delete, self._shared_key)
+        self._state = self.CLOSED
+        self._probe_started = None
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        """
+        Open the breaker after a rate limit.
+
+        Args:
+            retry_after: Provider-supplied wait in seconds (defaults to cooldown_seconds)
+        """
+        cooldown = retry_after if retry_after and retry_after > 0 else self.cooldown_seconds
+        self._state = self.OPEN
+        self._open_until = time.monotonic() + cooldown
+        self._probe_started = None
+        self._trips += 1
+        if self.state_store is not None:
+            self._store_call(self.state_store.set, self._shared_key, {"open_until": time.time() + cooldown}, cooldown)
+        logger.warning(f"Circuit open for {self.name} ({cooldown:.1f}s)")
+
+    def reset(self) -> None:
+        """Force the breaker closed"""
+        self._state = self.CLOSED
+        self._probe_started = None
+        if self.state_store is not None:
+            self._store_call(self.state_store.delete, self._shared_key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker state and trip count"""
+        return {
+            "state": self.state,
+            "trips": self._trips,
+            "retry_in": max(0.0, self._open_until - time.monotonic()) if self._state == self.OPEN else 0.0,
+        }
+
+    def _store_call(self, call: Callable[..., Any], *args: Any) -> None:
+        """Run a store call inline, or on the store thread when an event loop is running"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            call(*args)
+            return
+        future = loop.run_in_executor(_store_executor, call, *args)
+        future.add_done_callback(self._log_store_error)
+
+    def _log_store_error(self, future: "asyncio.Future") -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning(f"Circuit breaker store call failed for {self.name}: {future.exception()}")
+
+    def _adopt_shared_trip(self) -> None:
+        """Open the breaker if another process tripped it (re-checked at most once per interval)"""
+        if self.state_store is None or self._shared_check_pending:
+            return
+        now = time.monotonic()
+        if self._shared_checked is not None and now - self._shared_checked < self.SHARED_CHECK_INTERVAL:
+            return
+        self._shared_checked = now
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._apply_shared_trip(self.state_store.get(self._shared_key))
+            return
+        # Answer from what we know now; the fresh read applies when it lands
+        self._shared_check_pending = True
+        future = loop.run_in_executor(_store_executor, self.state_store.get, self._shared_key)
+        future.add_done_callback(self._on_shared_trip)
+
+    def _on_shared_trip(self, future: "asyncio.Future") -> None:
+        self._shared_check_pending = False
+        if future.cancelled():
+            return
+        if future.exception() is not None:
+            logger.warning(f"Circuit breaker store call failed for {self.name}: {future.exception()}")
+            return
+        self._apply_shared_trip(future.result())
+
+    def _apply_shared_trip(self, shared: Optional[Dict[str, Any]]) -> None:
+        if not shared:
+            return
+        remaining = shared["open_until"] - time.time()
+        open_until = time.monotonic() + remaining
+        if remaining > 0 and (self._state != self.OPEN or open_until > self._open_until + 0.5):
+            self._state = self.OPEN
+            self._open_until = open_until
+            self._probe_started = None
+
+    def _probe_in_flight(self) -> bool:
+        # A probe that never reported back (e.g. cancelled) is abandoned after one cooldown
+        return (
+            self._probe_started is not None
+            and time.monotonic() - self._probe_started < self.cooldown_seconds
+        )
+
+
+class LatencyWindow:
+    """Rolling window of request latencies with percentile lookups"""
+
+    def __init__(self, max_samples: int = 200, min_samples: int = 20):
+        """
+        Initialize the window.
+
+        Args:
+            max_samples: Number of most recent samples kept
+            min_samples: Samples required before percentiles are reported
+        """
+        self.min_samples = min_samples
+        self._samples: "deque[float]" = deque(maxlen=max(1, max_samples))
+
+    def record(self, seconds: float) -> None:
+        """Add one latency sample"""
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Get a latency percentile.
+
+        Args:
+            fraction: Percentile as a fraction (0.95 for p95)
+
+        Returns:
+            Latency in seconds, or None until min_samples have been recorded
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""State Store - In-process and multi-process implementations of the StateStore port
+
+Command history, circuit breakers, local bridge routing and extension install
+status used to live in module globals and instance attributes, so `serve.py`
+could not run more than one uvicorn worker: each worker saw its own history,
+retried a rate-limited model the others had already tripped, and could not
+reach a device whose WebSocket was held by another worker.
+
+- InMemoryStateStore: dictionaries behind a lock (single process, the default)
+- SQLiteStateStore: one SQLite file in WAL mode shared by every worker on the
+  host; writes that must be atomic (capped pushes, pops) run in
+  BEGIN IMMEDIATE transactions
+
+The backend is selected with STATE_BACKEND_URL ("memory://" or
+"sqlite:///path/to/state.db").
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.application.ports.state_store import StateStore
+
+logger = logging.getLogger(__name__)
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+class InMemoryStateStore(StateStore):
+    """
+    Process-local StateStore.
+
+    Values are stored JSON-encoded so both backends return equal copies
+    (never the caller's mutable object).
+    """
+
+    shared = False
+
+    def __init__(self):
+        """Initialize an empty store"""
+        self._lock = threading.Lock()
+        self._values: Dict[str, Tuple[str, Optional[float]]] = {}
+        self._lists: Dict[str, Deque[str]] = {}
+        self._hashes: Dict[str, Dict[str, str]] = {}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._values.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and time.time() >= expires_at:
+                del self._values[key]
+                return None
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        encoded = _dumps(value)
+        with self._lock:
+            self._values[key] = (encoded, time.time() + ttl if ttl is not None else None)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._values.pop(key, None)
+
+    def increment(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        now = time.time()
+        with self._lock:
+            item = self._values.get(key)
+            if item is None or (item[1] is not None and now >= item[1]):
+                value, expires_at = 0, now + ttl if ttl is not None else None
+            else:
+                value, expires_at = json.loads(item[0]), item[1]
+            value += amount
+            self._values[key] = (_dumps(value), expires_at)
+        return value
+
+    def list_push(self, key: str, value: Any, max_length: Optional[int] = None) -> None:
+        encoded = _dumps(value)
+        with self._lock:
+            items = self._lists.setdefault(key, deque())
+            items.append(encoded)
+            while max_length is not None and len(items) > max_length:
+                items.popleft()
+
+    def list_range(self, key: str, limit: Optional[int] = None) -> List[Any]:
+        with self._lock:
+            items = list(self._lists.get(key, ()))
+        newest = items[::-1] if limit is None else items[::-1][:max(0, limit)]
+        return [json.loads(item) for item in newest]
+
+    def list_pop_oldest(self, key: str) -> Optional[Any]:
+        with self._lock:
+            items = self._lists.get(key)
+            if not items:
+                return None
+            encoded = items.popleft()
+        return json.loads(encoded)
+
+    def hash_set(self, key: str, field: str, value: Any) -> None:
+        encoded = _dumps(value)
+        with self._lock:
+            self._hashes.setdefault(key, {})[field] = encoded
+
+    def hash_delete(self, key: str, field: str) -> None:
+        with self._lock:
+            fields = self._hashes.get(key)
+            if fields is not None:
+                fields.pop(field, None)
+
+    def hash_get_all(self, key: str) -> Dict[str, Any]:
+        with self._lock:
+            fields = dict(self._hashes.get(key, {}))
+        return {field: json.loads(value) for field, value in fields.items()}
+
+
+class SQLiteStateStore(StateStore):
+    """
+    StateStore shared by every process that opens the same SQLite file.
+
+    Each thread gets its own connection; WAL lets readers proceed while one
+    writer commits, and busy_timeout makes concurrent writers wait instead of
+    failing.
+    """
+
+    shared = True
+
+    # Expired keys are purged on every Nth set()
+    PURGE_EVERY = 100
+
+    def __init__(self, path: str, busy_timeout_ms: int = 5000):
+        """
+        Open (and create if needed) the store
+
+        Args:
+            path: SQLite database file
+            busy_timeout_ms: How long a writer waits for the lock
+        """
+        self.path = str(path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+        self._writes = 0
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+
+        connection = self._connection()
+        connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS state_values (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS ix_state_values_expires_at ON state_values (expires_at);
+            CREATE TABLE IF NOT EXISTS state_lists (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_state_lists_key_id ON state_lists (key, id);
+            CREATE TABLE IF NOT EXISTS state_hashes (
+                key TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (key, field)
+            );
+            """
+        )
+        logger.info(f"Shared state store: {self.path} (SQLite WAL)")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # isolation_level=None: autocommit, explicit BEGIN IMMEDIATE where atomicity matters
+            connection = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            self._local.connection = connection
+        return connection
+
+    def _transaction(self, statements: List[Tuple[str, tuple]]) -> None:
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            for sql, params in statements:
+                connection.execute(sql, params)
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._connection().execute(
+            "SELECT value FROM state_values WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        now = time.time()
+        self._connection().execute(
+            "INSERT INTO state_values (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+            (key, _dumps(value), now + ttl if ttl is not None else None),
+        )
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self._connection().execute("DELETE FROM state_values WHERE expires_at <= ?", (now,))
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM state_values WHERE key = ?", (key,))
+
+    def increment(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT value, expires_at FROM state_values WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (key, now),
+            ).fetchone()
+            if row is None:
+                value, expires_at = amount, now + ttl if ttl is not None else None
+            else:
+                value, expires_at = json.loads(row[0]) + amount, row[1]
+            connection.execute(
+                "INSERT INTO state_values (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+                (key, _dumps(value), expires_at),
+            )
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return value
+
+    def list_push(self, key: str, value: Any, max_length: Optional[int] = None) -> None:
+        statements = [("INSERT INTO state_lists (key, value) VALUES (?, ?)", (key, _dumps(value)))]
+        if max_length is not None:
+            statements.append((
+                "DELETE FROM state_lists WHERE key = ? AND id <= ("
+                "SELECT id FROM state_lists WHERE key = ? ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (key, key, max(0, max_length)),
+            ))
+        self._transaction(statements)
+
+    def list_range(self, key: str, limit: Optional[int] = None) -> List[Any]:
+        rows = self._connection().execute(
+            "SELECT value FROM state_lists WHERE key = ? ORDER BY id DESC LIMIT ?",
+            (key, -1 if limit is None else max(0, limit)),
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def list_pop_oldest(self, key: str) -> Optional[Any]:
+        connection = self._connection()
+        # Polled inboxes are usually empty: check without taking the write lock
+        if connection.execute("SELECT 1 FROM state_lists WHERE key = ? LIMIT 1", (key,)).fetchone() is None:
+            return None
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT id, value FROM state_lists WHERE key = ? ORDER BY id LIMIT 1", (key,)
+            ).fetchone()
+            if row is not None:
+                connection.execute("DELETE FROM state_lists WHERE id = ?", (row[0],))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return json.loads(row[1]) if row is not None else None
+
+    def hash_set(self, key: str, field: str, value: Any) -> None:
+        self._connection().execute(
+            "INSERT INTO state_hashes (key, field, value) VALUES (?, ?, ?) "
+            "ON CONFLICT(key, field) DO UPDATE SET value = excluded.value",
+            (key, field, _dumps(value)),
+        )
+
+    def hash_delete(self, key: str, field: str) -> None:
+        self._connection().execute("DELETE FROM state_hashes WHERE key = ? AND field = ?", (key, field))
+
+    def hash_get_all(self, key: str) -> Dict[str, Any]:
+        rows = self._connection().execute(
+            "SELECT field, value FROM state_hashes WHERE key = ?", (key,)
+        ).fetchall()
+        return {field: json.loads(value) for field, value in rows}
+
+
+def create_state_store(url: str) -> StateStore:
+    """
+    Build a StateStore from a backend URL
+
+    Args:
+        url: "memory://" or "sqlite:///path/to/state.db"
+
+    Returns:
+        The configured store
+
+    Raises:
+        ValueError: If the URL scheme is not supported
+    """
+    if not url or url == "memory://":
+        return InMemoryStateStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteStateStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported state backend URL: {url} (use memory:// or sqlite:///path)")
+
+
+_state_store: Optional[StateStore] = None
+_state_store_lock = threading.Lock()
+
+
+def get_state_store() -> StateStore:
+    """
+    Get the process-wide StateStore configured by STATE_BACKEND_URL
+
+    Returns:
+        The state store (created on first use)
+    """
+    global _state_store
+
+    if _state_store is None:
+        with _state_store_lock:
+            if _state_store is None:
+                from app.core.config import settings
+                _state_store = create_state_store(settings.state_backend_url)
+    return _state_store
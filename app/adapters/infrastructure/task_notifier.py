@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""Task Notifier - Wake distributed workers when a task is queued
+
+worker_pc.py used to sleep WORKER_POLL_INTERVAL between queue polls, adding up
+to that much latency to every distributed command and querying an idle queue
+forever. Workers now block on a wake-up signal and poll only as a slow,
+backing-off safety net:
+
+- TaskNotifier: version counter the API bumps on every /v1/task; GET
+  /v1/tasks/wait long-polls it (SQLite/dev deployments). With a shared
+  StateStore the counter lives in the store, so every API worker sees it
+- PostgresTaskListener: LISTEN on the channel SQLiteHistoryAdapter NOTIFYs
+  when it saves a pending command (PostgreSQL deployments)
+- HttpTaskWaiter: worker-side client of the long-poll endpoint
+- PollBackoff: safety-net poll delay that grows while the queue stays empty
+"""
+
+import asyncio
+import logging
+import select
+import time
+from typing import Any, Dict, Optional
+
+from app.application.ports.state_store import StateStore
+
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
+
+logger = logging.getLogger(__name__)
+
+# PostgreSQL NOTIFY channel for new pending commands
+TASK_CHANNEL = "jarvis_tasks"
+# StateStore counter shared by API workers
+VERSION_KEY = "tasks:version"
+
+
+class TaskNotifier:
+    """
+    Version counter with async waiters.
+
+    Each notify() bumps the version; wait(since) returns as soon as the version
+    differs from `since`, so a waiter never misses a task queued between two
+    long-polls. With a shared StateStore the version is global to all API
+    workers: waiters are woken at once by notifications from their own process
+    and see other workers' notifications within `shared_poll_interval`.
+    """
+
+    def __init__(self, state_store: Optional[StateStore] = None, shared_poll_interval: float = 0.5):
+        """
+        Initialize the notifier.
+
+        Args:
+            state_store: StateStore holding the version (used only if it is shared)
+            shared_poll_interval: Seconds between reads of the shared version while waiting
+        """
+        self._store = state_store if state_store is not None and state_store.shared else None
+        self.shared_poll_interval = shared_poll_interval
+        self.version = 0
+        self._changed: Optional[asyncio.Event] = None
+        self._stats = {"notifications": 0, "waits": 0, "woken": 0, "timeouts": 0}
+
+    def _event(self) -> asyncio.Event:
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+    async def _current_version(self) -> int:
+        if self._store is not None:
+            self.version = int(await asyncio.to_thread(self._store.get, VERSION_KEY) or 0)
+        return self.version
+
+    async def notify(self) -> int:
+        """
+        Signal that a task was queued
+
+        Returns:
+            The new version
+        """
+        if self._store is not None:
+            self.version = await asyncio.to_thread(self._store.increment, VERSION_KEY)
+        else:
+            self.version += 1
+        self._stats["notifications"] += 1
+        event, self._changed = self._changed, None
+        if event is not None:
+            event.set()
+        return self.version
+
+    async def wait(self, since: Optional[int], timeout: float) -> Dict[str, Any]:
+        """
+        Wait until the version moves past `since` or the timeout expires
+
+        Args:
+            since: Last version the caller saw (None returns immediately)
+            timeout: Maximum seconds to wait
+
+        Returns:
+            {"version": current version, "notified": whether it differs from since}
+        """
+        self._stats["waits"] += 1
+        version = await self._current_version()
+        if since is None or since != version:
+            return {"version": version, "notified": since is not None}
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                self._stats["timeouts"] += 1
+                return {"version": version, "notified": False}
+            step = remaining if self._store is None else min(remaining, self.shared_poll_interval)
+            try:
+                await asyncio.wait_for(self._event().wait(), timeout=step)
+            except asyncio.TimeoutError:
+                if self._store is None:
+                    continue
+            version = await self._current_version()
+            if version != since:
+                self._stats["woken"] += 1
+                return {"version": version, "notified": True}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get notification counters"""
+        return {**self._stats, "version": self.version, "shared": self._store is not None}
+
+
+class PollBackoff:
+    """Safety-net poll delay: doubles while idle, resets when work is found"""
+
+    def __init__(self, min_interval: float = 2.0, max_interval: float = 30.0):
+        """
+        Initialize the backoff.
+
+        Args:
+            min_interval: Delay after the queue had work
+            max_interval: Upper bound of the delay while idle
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self._current = min_interval
+
+    def reset(self) -> None:
+        """Work was found: poll again soon"""
+        self._current = self.min_interval
+
+    def next_delay(self) -> float:
+        """Return the delay before the next poll and grow it"""
+        delay = self._current
+        self._current = min(self.max_interval, self._current * 2)
+        return delay
+
+
+class PostgresTaskListener:
+    """
+    Blocking LISTEN on TASK_CHANNEL through a dedicated psycopg2 connection.
+    """
+
+    def __init__(self, engine):
+        """
+        Open the listening connection.
+
+        Args:
+            engine: SQLAlchemy engine of a PostgreSQL database
+        """
+        self._connection = engine.raw_connection()
+        self._connection.set_isolation_level(0)  # autocommit: notifications arrive immediately
+        cursor = self._connection.cursor()
+        cursor.execute(f"LISTEN {TASK_CHANNEL}")
+        cursor.close()
+        logger.info(f"Listening for new tasks on PostgreSQL channel '{TASK_CHANNEL}'")
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Block until a task is announced or the timeout expires
+
+        Returns:
+            True if at least one notification arrived
+        """
+        driver_connection = self._connection.driver_connection
+        if not driver_connection.notifies:
+            readable, _, _ = select.select([driver_connection], [], [], timeout)
+            if not readable:
+                return False
+            driver_connection.poll()
+        notified = bool(driver_connection.notifies)
+        driver_connection.notifies.clear()
+        return notified
+
+    def close(self) -> None:
+        """Close the listening connection"""
+        self._connection.close()
+
+
+class HttpTaskWaiter:
+    """
+    Long-polls GET /v1/tasks/wait on the API server.
+    """
+
+    def __init__(self, api_url: str, token: str, long_poll_seconds: float = 25.0):
+        """
+        Initialize the waiter.
+
+        Args:
+            api_url: Base URL of the API server (e.g. http://localhost:8000)
+            token: Bearer token for the API
+            long_poll_seconds: Maximum time the server holds one request
+        """
+        if not HAS_HTTPX:
+            raise RuntimeError("httpx is required for HTTP task notifications")
+        self.long_poll_seconds = long_poll_seconds
+        self._since: Optional[int] = None
+        self._client = httpx.Client(
+            base_url=api_url.rstrip("/"),
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=long_poll_seconds + 10,
+        )
+
+    def wait(self, timeout: float) -> bool:
+        """
+        Block until the API announces a task or the timeout expires
+
+        Returns:
+            True if a task was queued since the previous wait
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                response = self._client.get(
+                    "/v1/tasks/wait",
+                    params={
+                        "timeout": min(remaining, self.long_poll_seconds),
+                        **({"since": self._since} if self._since is not None else {}),
+                    },
+                )
+                response.raise_for_status()
+            except Exception as e:
+                logger.warning(f"Task long-poll failed ({e}); falling back to polling")
+                time.sleep(max(0.0, min(remaining, 5.0)))
+                return False
+            data = response.json()
+            first_wait = self._since is None
+            self._since = data["version"]
+            if first_wait:
+                # Baseline taken; the caller re-checks the queue before the next wait
+                return False
+            if data["notified"]:
+                return True
+
+    def close(self) -> None:
+        """Close the HTTP client"""
+        self._client.close()
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""Token Accounting - Cached token counting for prompt routing
+
+The AI Gateway counts prompt tokens on every request (context escalation,
+per-model budgets). Most of a prompt is stable - system instructions, the
+capability detector and Copilot context templates - so counts are memoized
+per message text and only new text is tokenized.
+
+- Memoized counts: bounded LRU keyed by a digest of the text
+- Upper bound: a byte-length bound that answers "is this below the threshold?"
+  without tokenizing at all
+- Batch API: tokenizes the uncached texts of many prompts in one call
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TokenCounter:
+    """
+    Token counter with a per-text memo and a cheap upper-bound check.
+
+    Thread-safe: the memo is guarded by a lock (counts may be requested from
+    executor threads as well as the event loop).
+    """
+
+    DEFAULT_MAX_ENTRIES = 4096
+
+    def __init__(self, tokenizer: Optional[Any] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the counter.
+
+        Args:
+            tokenizer: tiktoken Encoding (None uses the 1 token ≈ 4 characters approximation)
+            max_entries: Maximum number of memoized texts
+        """
+        self.tokenizer = tokenizer
+        self.max_entries = max(1, max_entries)
+        self._memo: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "tokens_encoded": 0,
+            "bound_skips": 0,
+            "exact_checks": 0,
+        }
+
+    def count(self, text: str) -> int:
+        """
+        Count tokens in a text, using the memo when the text was seen before.
+
+        Args:
+            text: Text to count tokens for
+
+        Returns:
+            Token count
+        """
+        if not text:
+            return 0
+        key = self._key(text)
+        cached = self._lookup(key)
+        if cached is not None:
+            return cached
+        tokens = self._encode_count(text)
+        self._store(key, tokens)
+        return tokens
+
+    def count_messages(self, messages: List[Dict[str, str]]) -> int:
+        """
+        Count tokens across a message list, one memo entry per message.
+
+        A stable system instruction is therefore tokenized once, no matter how
+        the rest of the conversation changes.
+
+        Args:
+            messages: List of message dicts with 'content'
+
+        Returns:
+            Total token count of the message contents
+        """
+        return sum(self.count(text) for text in _contents(messages))
+
+    def count_batch(self, texts: List[str]) -> List[int]:
+        """
+        Count tokens for many texts at once.
+
+        Uncached texts are deduplicated and tokenized in a single
+        encode_batch() call when the tokenizer supports it.
+
+        Args:
+            texts: Texts to score
+
+        Returns:
+            Token counts in the same order as texts
+        """
+        keys = [self._key(text) if text else None for text in texts]
+        counts: Dict[bytes, int] = {}
+        pending: "OrderedDict[bytes, str]" = OrderedDict()
+        for key, text in zip(keys, texts):
+            if key is None or key in counts or key in pending:
+                continue
+            cached = self._lookup(key)
+            if cached is not None:
+                counts[key] = cached
+            else:
+                pending[key] = text
+
+        if pending:
+            for key, tokens in zip(pending, self._encode_batch_counts(list(pending.values()))):
+                self._store(key, tokens)
+                counts[key] = tokens
+
+        return [counts[key] if key is not None else 0 for key in keys]
+
+    def upper_bound(self, text: str) -> int:
+        """
+        Cheap upper bound on the token count of a text, without tokenizing.
+
+        Byte-level BPE tokens cover at least one UTF-8 byte each, so the byte
+        length bounds the count (the approximation mode is exact already).
+
+        Args:
+            text: Text to bound
+
+        Returns:
+            Upper bound on the token count
+        """
+        if not text:
+            return 0
+        if self.tokenizer is None:
+            return len(text) // 4
+        return len(text.encode("utf-8"))
+
+    def exceeds(self, texts: Iterable[str], limit: int) -> bool:
+        """
+        Check whether the combined texts have more than limit tokens.
+
+        Texts whose upper bound is already within the limit are never tokenized.
+
+        Args:
+            texts: Texts that make up the prompt
+            limit: Token limit (e.g. AIGateway.TOKEN_THRESHOLD)
+
+        Returns:
+            True if the exact token count is above the limit
+        """
+        texts = [text for text in texts if text]
+        if sum(self.upper_bound(text) for text in texts) <= limit:
+            with self._lock:
+                self._stats["bound_skips"] += 1
+            return False
+        with self._lock:
+            self._stats["exact_checks"] += 1
+        return sum(self.count(text) for text in texts) > limit
+
+    def clear(self) -> None:
+        """Drop all memoized counts"""
+        with self._lock:
+            self._memo.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get memo and bound counters.
+
+        Returns:
+            Dict with hit/miss counters, hit rate, bound skips and memo size
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._memo)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["tokenizer"] = self.tokenizer is not None
+        return stats
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def _lookup(self, key: bytes) -> Optional[int]:
+        with self._lock:
+            tokens = self._memo.get(key)
+            if tokens is None:
+                self._stats["misses"] += 1
+                return None
+            self._memo.move_to_end(key)
+            self._stats["hits"] += 1
+            return tokens
+
+    def _store(self, key: bytes, tokens: int) -> None:
+        with self._lock:
+            self._memo[key] = tokens
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.max_entries:
+                self._memo.popitem(last=False)
+
+    def _encode_count(self, text: str) -> int:
+        if self.tokenizer is not None:
+            try:
+                tokens = len(self.tokenizer.encode(text))
+                with self._lock:
+                    self._stats["tokens_encoded"] += tokens
+                return tokens
+            except Exception as e:
+                logger.warning(f"Error counting tokens: {e}. Using character approximation.")
+        # Fallback: rough approximation (1 token ≈ 4 characters)
+        return len(text) // 4
+
+    def _encode_batch_counts(self, texts: List[str]) -> List[int]:
+        encode_batch = getattr(self.tokenizer, "encode_batch", None)
+        if encode_batch is None:
+            return [self._encode_count(text) for text in texts]
+        try:
+            counts = [len(tokens) for tokens in encode_batch(texts)]
+        except Exception as e:
+            logger.warning(f"Batch token counting failed: {e}. Counting one by one.")
+            return [self._encode_count(text) for text in texts]
+        with self._lock:
+            self._stats["tokens_encoded"] += sum(counts)
+        return counts
+
+
+def _contents(messages: List[Dict[str, str]]) -> List[str]:
+    """Non-empty message contents, in order"""
+    return [msg.get("content", "") for msg in messages if msg.get("content")]
@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""Token Cache - Bounded cache of verified JWT payloads
+
+Every protected request (including HUD telemetry pings and device heartbeats)
+used to decode and verify the HS256 JWT from scratch. Tokens are immutable, so
+once one verifies its payload can be reused until the token's own `exp`.
+
+- Entries are keyed by the SHA-256 of the token (raw tokens are never stored)
+- Entries expire at the token's `exp` claim and are evicted LRU beyond the limit
+- Revoked token hashes are remembered until their `exp`, so a revoked token is
+  rejected even after it was evicted or never cached
+- With a shared StateStore, revocations are published to it and every API
+  worker pulls the others' revocations in the background (within
+  `sync_interval`), so token checks never wait on the store
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.application.ports.state_store import StateStore
+
+logger = logging.getLogger(__name__)
+
+# StateStore hash of revoked token hashes -> expiry (epoch seconds)
+REVOKED_KEY = "auth:revoked"
+
+
+def hash_token(token: str) -> str:
+    """Return the cache key of a token"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class VerifiedTokenCache:
+    """
+    Thread-safe LRU of verified token payloads with explicit revocation.
+
+    Expiry times are wall-clock epoch seconds, as in the JWT `exp` claim.
+    """
+
+    DEFAULT_MAX_ENTRIES = 1024
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum cached tokens (0 disables caching; revocation
+                         still applies)
+        """
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "revocations": 0, "rejected": 0}
+        self._store: Optional[StateStore] = None
+        self._sync_thread: Optional[threading.Thread] = None
+        self._stop_sync = threading.Event()
+
+    def share_revocations(self, state_store: StateStore, sync_interval: float = 1.0) -> None:
+        """
+        Publish revocations to a shared StateStore and pull other workers' ones.
+
+        No-op for a process-local store; idempotent.
+
+        Args:
+            state_store: Store shared by the API workers
+            sync_interval: Seconds between background pulls of the shared revocations
+        """
+        if not state_store.shared or self._sync_thread is not None:
+            return
+        self._store = state_store
+        self.sync_revocations()
+        self._sync_thread = threading.Thread(
+            target=self._sync_loop, args=(sync_interval,), name="token-revocation-sync", daemon=True
+        )
+        self._sync_thread.start()
+
+    def _sync_loop(self, sync_interval: float) -> None:
+        while not self._stop_sync.wait(sync_interval):
+            try:
+                self.sync_revocations()
+            except Exception as e:
+                logger.warning(f"Could not sync token revocations: {e}")
+
+    def sync_revocations(self) -> None:
+        """Merge the shared store's unexpired revocations into the local set"""
+        if self._store is None:
+            return
+        now = time.time()
+        shared = self._store.hash_get_all(REVOKED_KEY)
+        with self._lock:
+            for key, expires_at in shared.items():
+                if now < expires_at:
+                    self._revoked[key] = float(expires_at)
+                    self._entries.pop(key, None)
+        for key in [key for key, expires_at in shared.items() if now >= expires_at]:
+            self._store.hash_delete(REVOKED_KEY, key)
+
+    def close(self) -> None:
+        """Stop the background revocation sync (share_revocations() may start it again)"""
+        self._stop_sync.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join()
+            self._sync_thread = None
+        self._stop_sync.clear()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the verified payload of a token.
+
+        Args:
+            token: Raw JWT
+
+        Returns:
+            A copy of the cached payload, or None on a miss
+        """
+        key = hash_token(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            expires_at, payload = entry
+            if now >= expires_at:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return dict(payload)
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        """
+        Cache the payload of a token that just passed verification.
+
+        Tokens without a numeric `exp` claim are not cached.
+
+        Args:
+            token: Raw JWT
+            payload: Verified claims
+        """
+        expires_at = payload.get("exp")
+        if self.max_entries == 0 or not isinstance(expires_at, (int, float)):
+            return
+        key = hash_token(token)
+        with self._lock:
+            if key in self._revoked:
+                return
+            self._entries[key] = (float(expires_at), dict(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def is_revoked(self, token: str) -> bool:
+        """Check whether a token was explicitly revoked (and has not expired yet)"""
+        if not self._revoked:
+            return False
+        key = hash_token(token)
+        with self._lock:
+            expires_at = self._revoked.get(key)
+            if expires_at is None:
+                return False
+            if time.time() >= expires_at:
+                # An expired token fails verification anyway
+                del self._revoked[key]
+                return False
+            self._stats["rejected"] += 1
+            return True
+
+    def revoke(self, token: str, expires_at: float) -> None:
+        """
+        Revoke a token until its expiry (blocks on the shared store, if any).
+
+        Args:
+            token: Raw JWT
+            expires_at: Epoch seconds after which the token is invalid anyway
+        """
+        key = hash_token(token)
+        now = time.time()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._revoked[key] = float(expires_at)
+            self._stats["revocations"] += 1
+            # Drop revocations that outlived their tokens
+            for stale in [k for k, exp in self._revoked.items() if now >= exp]:
+                del self._revoked[stale]
+        if self._store is not None:
+            self._store.hash_set(REVOKED_KEY, key, float(expires_at))
+
+    def clear(self) -> None:
+        """Drop all cached payloads (revocations are kept)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dict with hit/miss counters, hit rate, size and active revocations
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["size"] = len(self._entries)
+            stats["revoked"] = len(self._revoked)
+        stats["shared"] = self._store is not None
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""State Store Port - Interface for state shared between API workers"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+
+class StateStore(ABC):
+    """
+    Port (interface) for small pieces of shared runtime state.
+
+    Values must be JSON-serializable. Implementations expose a few
+    Redis-like primitives (keys with TTL, capped lists, hashes) so the same
+    service code runs with one process or several uvicorn workers.
+    """
+
+    #: True when other processes see the same state (multi-worker safe)
+    shared: bool = False
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Get a value
+
+        Args:
+            key: Key to read
+
+        Returns:
+            The value, or None if missing or expired
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Set a value
+
+        Args:
+            key: Key to write
+            value: JSON-serializable value
+            ttl: Seconds until the key expires (None keeps it forever)
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a key (no-op if missing)"""
+        pass
+
+    @abstractmethod
+    def increment(self, key: str, amount: int = 1, ttl: Optional[float] = None) -> int:
+        """
+        Atomically add to an integer counter (missing or expired counts as 0)
+
+        Args:
+            key: Counter key
+            amount: Value added
+            ttl: Seconds until a newly created counter expires (fixed window;
+                 incrementing an existing counter keeps its expiry)
+
+        Returns:
+            The new value
+        """
+        pass
+
+    @abstractmethod
+    def list_push(self, key: str, value: Any, max_length: Optional[int] = None) -> None:
+        """
+        Append a value to a list, keeping only the newest max_length items
+
+        Args:
+            key: List key
+            value: JSON-serializable value
+            max_length: Items kept (None keeps all)
+        """
+        pass
+
+    @abstractmethod
+    def list_range(self, key: str, limit: Optional[int] = None) -> List[Any]:
+        """
+        Get the newest items of a list, most recent first
+
+        Args:
+            key: List key
+            limit: Maximum items returned (None returns all)
+        """
+        pass
+
+    @abstractmethod
+    def list_pop_oldest(self, key: str) -> Optional[Any]:
+        """
+        Atomically remove and return the oldest item of a list
+
+        Returns:
+            The item, or None if the list is empty
+        """
+        pass
+
+    @abstractmethod
+    def hash_set(self, key: str, field: str, value: Any) -> None:
+        """Set one field of a hash"""
+        pass
+
+    @abstractmethod
+    def hash_delete(self, key: str, field: str) -> None:
+        """Remove one field of a hash (no-op if missing)"""
+        pass
+
+    @abstractmethod
+    def hash_get_all(self, key: str) -> Dict[str, Any]:
+        """Get every field of a hash"""
+        pass
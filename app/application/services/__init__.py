@@ -6,6 +6,7 @@ from .browser_manager import PersistentBrowserManager
 from .dependency_manager import DependencyManager
 from .device_service import DeviceService
 from .extension_manager import ExtensionManager
+from .mission_queue import MissionJobQueue
 from .task_runner import TaskRunner
 
 __all__ = [
@@ -13,6 +14,7 @@ __all__ = [
     "DependencyManager",
     "ExtensionManager",
     "DeviceService",
+    "MissionJobQueue",
     "TaskRunner",
     "PersistentBrowserManager",
 ]
@@ -2,14 +2,15 @@
 """Assistant Service - Main use case orchestrator"""
 
 import asyncio
+import inspect
 import logging
 import platform
 import sys
 from collections import deque
 from datetime import datetime
-from typing import Any, Deque, Dict, List, Optional, Tuple
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple
 
-from app.application.ports import ActionProvider, HistoryProvider, VoiceProvider, WebProvider
+from app.application.ports import ActionProvider, HistoryProvider, StateStore, VoiceProvider, WebProvider
 from app.application.services.dependency_manager import DependencyManager
 from app.domain.models import CommandType, Intent, Response
 from app.domain.services import CommandInterpreter, IntentProcessor
@@ -25,6 +26,8 @@ class AssistantService:
     
     # Constants for noise filtering
     MIN_RENDER_NOISE_THRESHOLD = 2  # Minimum Render noise patterns to trigger filtering
+    COMMAND_HISTORY_SIZE = 100
+    COMMAND_HISTORY_KEY = "assistant:command_history"
 
     def __init__(
         self,
@@ -39,6 +42,7 @@ class AssistantService:
         gemini_adapter: Optional[Any] = None,
         device_service: Optional[Any] = None,
         github_adapter: Optional[Any] = None,
+        state_store: Optional[StateStore] = None,
     ):
         """
         Initialize the assistant service with injected dependencies
@@ -55,6 +59,8 @@ class AssistantService:
             gemini_adapter: Optional Gemini adapter for conversational AI
             device_service: Optional device service for distributed orchestration
             github_adapter: Optional GitHub adapter for issue reporting
+            state_store: Optional shared state store; when given, the recent command
+                         history is kept there so every API worker sees the same session
         """
         self.voice = voice_provider
         self.action = action_provider
@@ -69,7 +75,8 @@ class AssistantService:
         self.github_adapter = github_adapter
         self.is_running = False
         # Command history tracking (max 100 commands)
-        self._command_history: Deque[Dict[str, Any]] = deque(maxlen=100)
+        self.state_store = state_store
+        self._command_history: Deque[Dict[str, Any]] = deque(maxlen=self.COMMAND_HISTORY_SIZE)
         
         # Log error if assistant is started without AI adapter
         if self.gemini_adapter is None:
@@ -202,6 +209,109 @@ class AssistantService:
             intent = self.interpreter.interpret(user_input)
         logger.info(f"Interpreted intent: {intent.command_type} with params: {intent.parameters}")
 
+        return await self._async_process_intent(user_input, intent, request_metadata)
+
+    async def async_stream_command(
+        self, user_input: str, request_metadata: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a command, streaming conversational replies as they are generated.
+
+        Actions are executed as in async_process_command and produce a single
+        "done" event. Conversational input is streamed as "delta" events: from the
+        classifying completion itself when the interpreter has interpret_stream,
+        otherwise from a separate stream_conversational_response call.
+
+        Args:
+            user_input: Raw user input
+            request_metadata: Optional metadata for context-aware routing
+
+        Yields:
+            {"type": "delta", "text": ...} events followed by one
+            {"type": "done", "success": ..., "message": ..., "error": ..., "data": ...} event
+        """
+        stream_reply = getattr(self.interpreter, "stream_conversational_response", None)
+        interpret_stream = getattr(self.interpreter, "interpret_stream", None)
+        if inspect.isasyncgenfunction(interpret_stream):
+            # One completion classifies and, for conversation, streams the reply
+            intent = None
+            async for item in interpret_stream(user_input):
+                if isinstance(item, Intent):
+                    intent = item
+                else:
+                    yield {"type": "delta", "text": item}
+        elif stream_reply is not None:
+            # The reply is streamed separately, so the interpreter must not answer inline
+            intent = await self.interpreter.interpret_async(user_input, allow_reply=False)
+        else:
+            response = await self.async_process_command(user_input, request_metadata)
+            yield self._build_done_event(response)
+            return
+        logger.info(f"Interpreted intent: {intent.command_type} with params: {intent.parameters}")
+
+        if intent.command_type != CommandType.UNKNOWN or stream_reply is None:
+            response = await self._async_process_intent(user_input, intent, request_metadata)
+            yield self._build_done_event(response)
+            return
+
+        logger.info("Unknown command detected, streaming conversational AI response")
+        parts = []
+        async for delta in stream_reply(user_input):
+            parts.append(delta)
+            yield {"type": "delta", "text": delta}
+
+        response = Response(
+            success=True,
+            message="".join(parts),
+            data={
+                "command_type": CommandType.CHAT.value,
+                "parameters": {"user_input": user_input},
+            }
+        )
+        await self._add_to_history_async(user_input, response)
+        yield self._build_done_event(response)
+
+    @staticmethod
+    def _build_done_event(response: Response) -> Dict[str, Any]:
+        """Build the final stream event for a processed command"""
+        return {
+            "type": "done",
+            "success": response.success,
+            "message": response.message,
+            "error": response.error,
+            "data": response.data,
+        }
+
+    async def _async_process_intent(
+        self,
+        user_input: str,
+        intent: Intent,
+        request_metadata: Optional[Dict[str, Any]] = None,
+    ) -> Response:
+        """
+        Handle an interpreted intent asynchronously (conversation or command execution).
+
+        Args:
+            user_input: Raw user input
+            intent: Interpreted intent
+            request_metadata: Optional metadata for context-aware routing
+
+        Returns:
+            Response object with execution result
+        """
+        # Combined mode: the interpreter already answered in the same completion
+        if intent.command_type == CommandType.CHAT and intent.parameters.get("response"):
+            response = Response(
+                success=True,
+                message=intent.parameters["response"],
+                data={
+                    "command_type": CommandType.CHAT.value,
+                    "parameters": {"user_input": user_input},
+                }
+            )
+            await self._add_to_history_async(user_input, response)
+            return response
+
         # Handle unknown commands with conversational AI if available
         if intent.command_type == CommandType.UNKNOWN:
             # Log debug information
@@ -226,20 +336,20 @@ class AssistantService:
                             "parameters": {"user_input": user_input},
                         }
                     )
-                    self._add_to_history(user_input, response)
+                    await self._add_to_history_async(user_input, response)
                     return response
                 except Exception as e:
                     logger.error(f"Error generating conversational response: {e}")
                     # Fall through to validation error
             
             # Fallback to validation error if no conversational AI or error occurred
-            return self._handle_validation_error(user_input, intent)
+            return await self._handle_validation_error_async(user_input, intent)
 
         # Validate the intent
         validation = self.processor.validate_intent(intent)
         if not validation.success:
             logger.warning(f"Invalid intent: {validation.message}")
-            return self._handle_validation_error(user_input, intent, validation)
+            return await self._handle_validation_error_async(user_input, intent, validation)
 
         # Create command
         command = self.processor.create_command(intent)
@@ -260,7 +370,7 @@ class AssistantService:
         if request_metadata:
             response.data["request_metadata"] = request_metadata
         
-        self._add_to_history(user_input, response)
+        await self._add_to_history_async(user_input, response)
         return response
 
     def _handle_validation_error(
@@ -277,6 +387,20 @@ class AssistantService:
         Returns:
             Response object with validation error
         """
+        validation = self._build_validation_error(intent, validation)
+        self._add_to_history(user_input, validation)
+        return validation
+
+    async def _handle_validation_error_async(
+        self, user_input: str, intent: Intent, validation: Optional[Response] = None
+    ) -> Response:
+        """Async version of _handle_validation_error (history written off the event loop)"""
+        validation = self._build_validation_error(intent, validation)
+        await self._add_to_history_async(user_input, validation)
+        return validation
+
+    def _build_validation_error(self, intent: Intent, validation: Optional[Response]) -> Response:
+        """Validation error response carrying the intent's command metadata"""
         if validation is None:
             validation = self.processor.validate_intent(intent)
         
@@ -285,7 +409,6 @@ class AssistantService:
             validation.data = {}
         validation.data["command_type"] = intent.command_type.value
         validation.data["parameters"] = intent.parameters
-        self._add_to_history(user_input, validation)
         return validation
 
     def _handle_wake_word(self, user_input: str) -> None:
@@ -466,10 +589,25 @@ class AssistantService:
         Returns:
             List of command history items
         """
+        if self.state_store is not None:
+            return self.state_store.list_range(self.COMMAND_HISTORY_KEY, limit)
         history_list = list(self._command_history)
         # Return most recent first
         return history_list[-limit:][::-1] if history_list else []
 
+    async def _add_to_history_async(self, command: str, response: Response) -> None:
+        """
+        Add a command to history from the async paths
+
+        The shared state store (SQLite for several API workers) and the history
+        provider write synchronously, so the write runs in a thread.
+
+        Args:
+            command: The command that was executed
+            response: The response from execution
+        """
+        await asyncio.to_thread(self._add_to_history, command, response)
+
     def _add_to_history(self, command: str, response: Response) -> None:
         """
         Add a command to history
@@ -484,7 +622,10 @@ class AssistantService:
             "success": response.success,
             "message": response.message,
         }
-        self._command_history.append(history_item)
+        if self.state_store is not None:
+            self.state_store.list_push(self.COMMAND_HISTORY_KEY, history_item, max_length=self.COMMAND_HISTORY_SIZE)
+        else:
+            self._command_history.append(history_item)
         logger.debug(f"Added to history: {command}")
 
         # Save to persistent storage if history provider is available
@@ -504,6 +645,11 @@ class AssistantService:
                 response_text=response.message,
             )
 
+            # Keep the interpreter's in-memory context in step with persisted history
+            record_interaction = getattr(self.interpreter, "record_interaction", None)
+            if callable(record_interaction):
+                record_interaction(command, command_type, response.success)
+
     async def _execute_command_async(self, command_type: CommandType, params: dict, request_metadata: Optional[Dict[str, Any]] = None) -> Response:
         """
         Execute a command asynchronously based on its type with device routing support
@@ -633,7 +779,7 @@ class AssistantService:
         """
         try:
             # Search through command history for the most recent error
-            for item in reversed(list(self._command_history)):
+            for item in self.get_command_history(limit=self.COMMAND_HISTORY_SIZE):
                 if not item.get("success", True):
                     error_msg = item.get("message", "")
                     if error_msg:
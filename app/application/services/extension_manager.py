@@ -5,7 +5,10 @@ import importlib
 import logging
 import subprocess
 import sys
-from typing import Dict, List, Optional, Set
+import time
+from typing import Any, Dict, List, Optional, Set
+
+from app.application.ports.state_store import StateStore
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +22,12 @@ class ExtensionManager:
     # Installation timeout in seconds (5 minutes)
     INSTALL_TIMEOUT = 300
 
+    # Install states reported by get_install_status
+    INSTALLING = "installing"
+    INSTALLED = "installed"
+    FAILED = "failed"
+    INSTALL_STATUS_KEY = "extensions:install_status"
+
     # Recommended libraries for data tasks
     RECOMMENDED_LIBRARIES: List[str] = ["pandas", "numpy", "matplotlib"]
 
@@ -38,15 +47,19 @@ class ExtensionManager:
         "sklearn": "scikit-learn",  # scikit-learn is imported as sklearn
     }
 
-    def __init__(self, use_uv: bool = True):
+    def __init__(self, use_uv: bool = True, state_store: Optional[StateStore] = None):
         """
         Initialize the extension manager
 
         Args:
             use_uv: Whether to use uv for package installation (default: True)
                    Falls back to pip if uv is not available
+            state_store: Optional shared store for install status, so every API worker
+                         sees (and does not repeat) installs started by another one
         """
         self._installed_capabilities: Set[str] = set()
+        self.state_store = state_store
+        self._install_status: Dict[str, Dict[str, Any]] = {}
         self._use_uv = use_uv and self._check_uv_available()
         if not self._use_uv and use_uv:
             logger.warning("uv not available, falling back to pip for package installation")
@@ -92,23 +105,60 @@ class ExtensionManager:
         if self._check_package_installed(package_name):
             logger.info(f"Package '{package_name}' is already installed, skipping redundant installation")
             self._installed_capabilities.add(package_name)
+            self._set_install_status(package_name, self.INSTALLED)
             return True
 
         # Install the package
         logger.info(f"Installing package '{install_name}' via {{'uv' if self._use_uv else 'pip'}}...")
+        self._set_install_status(package_name, self.INSTALLING)
         if self._install_package_impl(install_name):
             # Verify installation
+            importlib.invalidate_caches()
             if self._check_package_installed(package_name):
                 self._installed_capabilities.add(package_name)
+                self._set_install_status(package_name, self.INSTALLED)
                 logger.info(f" Successfully installed new skill (library): '{package_name}'")
                 return True
             else:
                 logger.error(f"Package '{install_name}' installed but module '{package_name}' still not importable")
+                self._set_install_status(package_name, self.FAILED)
                 return False
         else:
             logger.error(f"Failed to install '{install_name}'")
+            self._set_install_status(package_name, self.FAILED)
             return False
 
+    def _set_install_status(self, package_name: str, state: str) -> None:
+        """Record the install state of a package (shared when a state store is configured)"""
+        status = {"state": state, "updated_at": time.time()}
+        if self.state_store is not None:
+            self.state_store.hash_set(self.INSTALL_STATUS_KEY, package_name, status)
+        else:
+            self._install_status[package_name] = status
+
+    def get_install_status(self, package_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the last recorded install state of a package
+
+        Args:
+            package_name: Name of the package
+
+        Returns:
+            {"state": installing|installed|failed, "updated_at": epoch seconds},
+            or None if no install was attempted. An "installing" state older than
+            INSTALL_TIMEOUT is reported as failed (its worker died mid-install).
+        """
+        package_name = package_name.lower()
+        if self.state_store is not None:
+            status = self.state_store.hash_get_all(self.INSTALL_STATUS_KEY).get(package_name)
+        else:
+            status = self._install_status.get(package_name)
+        if status is None:
+            return None
+        if status["state"] == self.INSTALLING and time.time() - status["updated_at"] > self.INSTALL_TIMEOUT:
+            return {**status, "state": self.FAILED}
+        return dict(status)
+
     def _check_package_installed(self, module_name: str) -> bool:
         """
         Check if a package/module can be imported
@@ -186,7 +236,14 @@ class ExtensionManager:
             True if package is available, False otherwise
         """
         package_name = package_name.lower()
-        return self._check_package_installed(package_name)
+        if self._check_package_installed(package_name):
+            return True
+        # Installed by another worker: refresh the import system's path caches and retry
+        status = self.get_install_status(package_name) if self.state_store is not None else None
+        if status is not None and status["state"] == self.INSTALLED:
+            importlib.invalidate_caches()
+            return self._check_package_installed(package_name)
+        return False
 
     def get_installed_capabilities(self) -> Set[str]:
         """
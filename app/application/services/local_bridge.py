@@ -4,15 +4,29 @@ Local Bridge - WebSocket Service for Local PC Connection
 
 Enables JARVIS (running in the cloud/Render) to delegate GUI tasks to a local PC.
 The local PC connects via WebSocket and can execute PyAutoGUI commands.
+
+With a shared StateStore (several API workers), the device routing table lives
+in the store: a worker that does not hold a device's WebSocket queues the task
+in the device's inbox, the worker holding the socket relays it, and the result
+comes back through the store. The holding worker refreshes each route's
+heartbeat, so routes left behind by a crashed worker expire after ROUTE_TTL.
+Store calls run in a thread; the synchronous lookups answer from a routing
+snapshot that refresh_routes() renews.
 """
 
 import asyncio
 import json
 import logging
-from typing import Dict, Optional, Set
+import os
+import socket
+import time
+import uuid
+from typing import Any, Dict, Optional, Set
 from datetime import datetime
 from fastapi import WebSocket, WebSocketDisconnect
 
+from app.application.ports.state_store import StateStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,8 +38,28 @@ class LocalBridgeManager:
     or mobile-specific actions (camera, microphone, sensors) to connected devices.
     """
     
-    def __init__(self):
-        """Initialize the local bridge manager."""
+    # Shared state keys (used only with a shared StateStore)
+    ROUTES_KEY = "local_bridge:devices"
+    INBOX_KEY = "local_bridge:inbox:{device_id}"
+    RESULT_KEY = "local_bridge:result:{task_id}"
+    
+    TASK_TIMEOUT = 30.0
+    RELAY_INTERVAL = 0.1
+    # Routes are re-stamped every ROUTE_HEARTBEAT seconds and ignored after ROUTE_TTL
+    ROUTE_HEARTBEAT = 10.0
+    ROUTE_TTL = 30.0
+    # Seconds a routing snapshot is reused by refresh_routes()
+    ROUTES_CACHE_TTL = 1.0
+    
+    def __init__(self, state_store: Optional[StateStore] = None, worker_id: Optional[str] = None):
+        """
+        Initialize the local bridge manager.
+        
+        Args:
+            state_store: Optional StateStore; when it is shared, devices connected to
+                         other API workers are reachable from this one
+            worker_id: Identifier of this process in the routing table (default: host:pid)
+        """
         # Connected clients: {device_id: WebSocket}
         self.active_connections: Dict[str, WebSocket] = {}
         
@@ -38,6 +72,14 @@ class LocalBridgeManager:
         # Task results
         self.task_results: Dict[str, Dict] = {}
         
+        # Cross-worker routing
+        self.state_store = state_store if state_store is not None and state_store.shared else None
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._local_tasks: Set[str] = set()
+        self._relays: Dict[str, asyncio.Task] = {}
+        self._route_snapshot: Dict[str, Dict[str, Any]] = {}
+        self._routes_fetched: Optional[float] = None
+        
         logger.info("LocalBridgeManager initialized")
     
     async def connect(self, websocket: WebSocket, device_id: str, device_type: str = "desktop"):
@@ -54,6 +96,15 @@ class LocalBridgeManager:
         self.device_types[device_id] = device_type.lower()
         self.task_queues[device_id] = asyncio.Queue()
         
+        if self.state_store is not None:
+            route = {
+                "worker": self.worker_id,
+                "device_type": device_type.lower(),
+                "connected_at": datetime.now().isoformat(),
+            }
+            await self._stamp_route(device_id, route)
+            self._relays[device_id] = asyncio.create_task(self._relay_tasks(device_id, route))
+        
         logger.info(f"Device connected: {device_id} (type: {device_type})")
         
         # Send welcome message
@@ -63,7 +114,7 @@ class LocalBridgeManager:
             "timestamp": datetime.now().isoformat()
         })
     
-    def disconnect(self, device_id: str):
+    async def disconnect(self, device_id: str):
         """
         Handle disconnection of a device.
         
@@ -79,6 +130,17 @@ class LocalBridgeManager:
         if device_id in self.task_queues:
             del self.task_queues[device_id]
         
+        relay = self._relays.pop(device_id, None)
+        if relay is not None:
+            relay.cancel()
+        
+        # Only drop the route if it still points here (the device may have reconnected elsewhere)
+        if self.state_store is not None:
+            try:
+                await asyncio.to_thread(self._drop_own_route, device_id)
+            except Exception as e:
+                logger.error(f"Error dropping route of {device_id}: {e}")
+        
         logger.info(f"Device disconnected: {device_id}")
     
     def get_device_type(self, device_id: str) -> str:
@@ -91,7 +153,9 @@ class LocalBridgeManager:
         Returns:
             Device type (desktop, mobile, tablet) or 'unknown'
         """
-        return self.device_types.get(device_id, "unknown")
+        if device_id in self.device_types:
+            return self.device_types[device_id]
+        return self._routes().get(device_id, {}).get("device_type", "unknown")
     
     def is_mobile_device(self, device_id: str) -> bool:
         """
@@ -118,24 +182,22 @@ class LocalBridgeManager:
         Returns:
             Task result from the local PC
         """
+        task_id = f"{device_id}_{uuid.uuid4().hex}"
+        
         if device_id not in self.active_connections:
+            await self.refresh_routes()
+            if device_id in self._routes():
+                return await self._send_remote_task(device_id, task_id, task, api_key)
             return {
                 "success": False,
                 "error": f"Device {device_id} not connected"
             }
         
         websocket = self.active_connections[device_id]
-        task_id = f"{device_id}_{datetime.now().timestamp()}"
+        self._local_tasks.add(task_id)
         
         # Send task to local PC
-        task_message = {
-            "type": "task",
-            "task_id": task_id,
-            "action": task.get("action"),
-            "parameters": task.get("parameters", {}),
-            "api_key": api_key,  # Include API key for security verification
-            "timestamp": datetime.now().isoformat()
-        }
+        task_message = self._task_message(task_id, task, api_key)
         
         try:
             await websocket.send_json(task_message)
@@ -144,7 +206,7 @@ class LocalBridgeManager:
             # Wait for result (with timeout)
             result = await asyncio.wait_for(
                 self._wait_for_result(device_id, task_id),
-                timeout=30.0
+                timeout=self.TASK_TIMEOUT
             )
             
             return result
@@ -160,6 +222,95 @@ class LocalBridgeManager:
                 "success": False,
                 "error": str(e)
             }
+        finally:
+            self._local_tasks.discard(task_id)
+    
+    @staticmethod
+    def _task_message(task_id: str, task: Dict, api_key: Optional[str]) -> Dict[str, Any]:
+        return {
+            "type": "task",
+            "task_id": task_id,
+            "action": task.get("action"),
+            "parameters": task.get("parameters", {}),
+            "api_key": api_key,  # Include API key for security verification
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    async def _send_remote_task(self, device_id: str, task_id: str, task: Dict, api_key: Optional[str]) -> Dict:
+        """Queue a task for a device held by another worker and wait for its result"""
+        await asyncio.to_thread(
+            self.state_store.list_push,
+            self.INBOX_KEY.format(device_id=device_id),
+            self._task_message(task_id, task, api_key),
+        )
+        logger.info(f"Task queued for {device_id} on another worker: {task.get('action')}")
+        try:
+            return await asyncio.wait_for(self._wait_for_result(device_id, task_id), timeout=self.TASK_TIMEOUT)
+        except asyncio.TimeoutError:
+            return {
+                "success": False,
+                "error": "Task timeout - no response from local PC"
+            }
+    
+    async def _relay_tasks(self, device_id: str, route: Dict[str, Any]) -> None:
+        """Forward tasks queued by other workers to a device connected here and keep its route alive"""
+        inbox = self.INBOX_KEY.format(device_id=device_id)
+        stamped = time.time()
+        while True:
+            try:
+                if time.time() - stamped >= self.ROUTE_HEARTBEAT:
+                    await self._stamp_route(device_id, route)
+                    stamped = time.time()
+                message = await asyncio.to_thread(self.state_store.list_pop_oldest, inbox)
+                if message is None:
+                    await asyncio.sleep(self.RELAY_INTERVAL)
+                    continue
+                websocket = self.active_connections.get(device_id)
+                if websocket is None:
+                    return
+                await websocket.send_json(message)
+                logger.info(f"Relayed task to {device_id}: {message.get('action')}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error relaying task to {device_id}: {e}")
+                await asyncio.sleep(self.RELAY_INTERVAL)
+    
+    async def _stamp_route(self, device_id: str, route: Dict[str, Any]) -> None:
+        """Write the device's route with a fresh heartbeat"""
+        route["seen_at"] = time.time()
+        await asyncio.to_thread(self.state_store.hash_set, self.ROUTES_KEY, device_id, route)
+    
+    def _drop_own_route(self, device_id: str) -> None:
+        route = self.state_store.hash_get_all(self.ROUTES_KEY).get(device_id)
+        if route is not None and route.get("worker") == self.worker_id:
+            self.state_store.hash_delete(self.ROUTES_KEY, device_id)
+        self._route_snapshot.pop(device_id, None)
+    
+    def _fetch_routes(self) -> Dict[str, Dict[str, Any]]:
+        """Read the routing table, deleting routes whose worker stopped heartbeating"""
+        routes = self.state_store.hash_get_all(self.ROUTES_KEY)
+        cutoff = time.time() - self.ROUTE_TTL
+        for device_id, route in list(routes.items()):
+            if route.get("seen_at", 0) < cutoff:
+                logger.info(f"Dropping stale route of {device_id} (worker {route.get('worker')})")
+                self.state_store.hash_delete(self.ROUTES_KEY, device_id)
+                del routes[device_id]
+        return routes
+    
+    async def refresh_routes(self) -> None:
+        """Renew the routing snapshot used by the synchronous lookups (at most once per ROUTES_CACHE_TTL)"""
+        if self.state_store is None:
+            return
+        now = time.monotonic()
+        if self._routes_fetched is not None and now - self._routes_fetched < self.ROUTES_CACHE_TTL:
+            return
+        self._route_snapshot = await asyncio.to_thread(self._fetch_routes)
+        self._routes_fetched = time.monotonic()
+    
+    def _routes(self) -> Dict[str, Dict[str, Any]]:
+        """Devices connected to any worker, as of the last refresh_routes() (empty without a shared store)"""
+        return self._route_snapshot
     
     async def _wait_for_result(self, device_id: str, task_id: str) -> Dict:
         """
@@ -174,7 +325,13 @@ class LocalBridgeManager:
         """
         # This is a simplified version - in production, use asyncio.Event or similar
         # for better synchronization
+        result_key = self.RESULT_KEY.format(task_id=task_id)
         while task_id not in self.task_results:
+            if self.state_store is not None and task_id not in self._local_tasks:
+                result = await asyncio.to_thread(self.state_store.get, result_key)
+                if result is not None:
+                    await asyncio.to_thread(self.state_store.delete, result_key)
+                    return result
             await asyncio.sleep(0.1)
         
         result = self.task_results[task_id]
@@ -194,11 +351,18 @@ class LocalBridgeManager:
         if message_type == "task_result":
             # Store task result
             task_id = message.get("task_id")
-            self.task_results[task_id] = {
+            result = {
                 "success": message.get("success", False),
                 "result": message.get("result"),
                 "error": message.get("error")
             }
+            if self.state_store is not None and task_id not in self._local_tasks:
+                # Relayed task: the worker that queued it is waiting on the store
+                await asyncio.to_thread(
+                    self.state_store.set, self.RESULT_KEY.format(task_id=task_id), result, self.TASK_TIMEOUT * 2
+                )
+            else:
+                self.task_results[task_id] = result
             logger.info(f"Received task result from {device_id}: {task_id}")
         
         elif message_type == "heartbeat":
@@ -218,12 +382,14 @@ class LocalBridgeManager:
     
     def get_connected_devices(self) -> list:
         """
-        Get list of connected device IDs.
+        Get list of connected device IDs (on any worker).
         
         Returns:
             List of device IDs
         """
-        return list(self.active_connections.keys())
+        devices = list(self.active_connections.keys())
+        devices.extend(device_id for device_id in self._routes() if device_id not in self.active_connections)
+        return devices
     
     def is_device_connected(self, device_id: str) -> bool:
         """
@@ -235,23 +401,26 @@ class LocalBridgeManager:
         Returns:
             True if connected, False otherwise
         """
-        return device_id in self.active_connections
+        return device_id in self.active_connections or device_id in self._routes()
 
 
 # Global bridge manager instance
 _bridge_manager: Optional[LocalBridgeManager] = None
 
 
-def get_bridge_manager() -> LocalBridgeManager:
+def get_bridge_manager(state_store: Optional[StateStore] = None) -> LocalBridgeManager:
     """
     Get the global LocalBridgeManager instance.
     
+    Args:
+        state_store: StateStore used when the manager is created (ignored afterwards)
+    
     Returns:
         The bridge manager
     """
     global _bridge_manager
     
     if _bridge_manager is None:
-        _bridge_manager = LocalBridgeManager()
+        _bridge_manager = LocalBridgeManager(state_store=state_store)
     
     return _bridge_manager
@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""Mission Queue - Asynchronous job queue for serverless missions
+
+/v1/missions/execute used to build a TaskRunner and run the mission inline: a
+blocking subprocess.run with a default 300 s timeout inside an async handler,
+which froze the API worker for the whole mission.
+
+Missions are now submitted as jobs and a job id is returned immediately:
+
+- a bounded asyncio.Queue holds pending jobs (submissions beyond it are refused)
+- a fixed number of worker tasks run TaskRunner.execute_mission on a thread
+  pool of the same size, so the event loop never blocks on a subprocess
+- job status/results are kept for polling, and subscribers (WebSocket) receive
+  every status change
+- queue depth, in-flight count and wait/run times are exposed as metrics
+- with a shared StateStore, every status change is also written to it so any
+  API worker can answer polls for a job another worker runs
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from app.application.ports.state_store import StateStore
+from app.domain.models.mission import Mission, MissionResult
+
+logger = logging.getLogger(__name__)
+
+
+class MissionQueueFull(Exception):
+    """Raised when the mission queue cannot accept another job"""
+
+
+class JobStatus:
+    """Lifecycle states of a mission job"""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    TERMINAL = frozenset({SUCCEEDED, FAILED})
+
+
+@dataclass
+class MissionJob:
+    """A submitted mission and its execution state"""
+
+    job_id: str
+    mission: Mission
+    submitted_by: Optional[str] = None
+    status: str = JobStatus.QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[MissionResult] = None
+    error: Optional[str] = None
+
+    @property
+    def wait_seconds(self) -> Optional[float]:
+        """Time spent in the queue (None while still queued)"""
+        return self.started_at - self.submitted_at if self.started_at is not None else None
+
+    @property
+    def run_seconds(self) -> Optional[float]:
+        """Time spent executing (None until finished)"""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def is_finished(self) -> bool:
+        return self.status in JobStatus.TERMINAL
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the job to a JSON-friendly dictionary"""
+        return {
+            "job_id": self.job_id,
+            "mission_id": self.mission.mission_id,
+            "status": self.status,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "wait_seconds": self.wait_seconds,
+            "run_seconds": self.run_seconds,
+            "error": self.error,
+            "result": self.result.to_dict() if self.result is not None else None,
+        }
+
+
+class MissionJobQueue:
+    """
+    Bounded mission queue served by a fixed pool of workers.
+
+    Must be used from a single event loop; workers start on the first submit
+    (or an explicit start()) and stop with shutdown().
+    """
+
+    # StateStore key prefix of published job states
+    JOB_KEY = "missions:job:"
+
+    def __init__(
+        self,
+        runner_factory: Callable[[], Any],
+        workers: int = 2,
+        max_queue_size: int = 100,
+        max_finished_jobs: int = 500,
+        state_store: Optional[StateStore] = None,
+        shared_job_ttl: float = 3600.0,
+    ):
+        """
+        Initialize the queue.
+
+        Args:
+            runner_factory: Builds the TaskRunner used by a worker (called once
+                            per worker, so runners are never shared across threads)
+            workers: Missions executed concurrently (minimum 1)
+            max_queue_size: Jobs waiting before submissions are refused (minimum 1)
+            max_finished_jobs: Finished jobs kept for polling (oldest dropped first)
+            state_store: StateStore publishing job states to other API workers
+                         (used only if it is shared)
+            shared_job_ttl: Seconds a published job state is kept after its last change
+        """
+        self.runner_factory = runner_factory
+        self.workers = max(1, workers)
+        self.max_queue_size = max(1, max_queue_size)
+        self.max_finished_jobs = max(1, max_finished_jobs)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._jobs: "OrderedDict[str, MissionJob]" = OrderedDict()
+        self._subscribers: Dict[str, List[asyncio.Queue]] = {}
+        self._running = 0
+        self._stats = {"submitted": 0, "rejected": 0, "succeeded": 0, "failed": 0}
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+        self._total_run_seconds = 0.0
+        self._store = state_store if state_store is not None and state_store.shared else None
+        self.shared_job_ttl = shared_job_ttl
+        self._share_lock: Optional[asyncio.Lock] = None
+        self._share_tasks: Set[asyncio.Task] = set()
+
+    # Lifecycle
+
+    def start(self) -> None:
+        """Start the worker tasks (idempotent)"""
+        if self._worker_tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="jarvis-mission")
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(index), name=f"mission-worker-{index}")
+            for index in range(self.workers)
+        ]
+        logger.info(f"Mission queue started with {self.workers} workers (queue size {self.max_queue_size})")
+
+    async def shutdown(self) -> None:
+        """
+        Cancel the workers and fail the jobs they will not finish.
+
+        Jobs still queued, and running jobs whose results are now dropped
+        (their subprocesses finish on their threads), are marked failed, so
+        clients polling them (here or through the shared store) stop waiting.
+        """
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._queue.get_nowait()
+                self._queue.task_done()
+        for job in [job for job in self._jobs.values() if not job.is_finished]:
+            started = job.status == JobStatus.RUNNING
+            self._finish(job, None, "Server shut down while the job was running" if started
+                         else "Server shut down before the job started")
+        self._running = 0
+        await asyncio.gather(*self._share_tasks, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    # Submission and lookup
+
+    def submit(self, mission: Mission, submitted_by: Optional[str] = None) -> MissionJob:
+        """
+        Enqueue a mission.
+
+        Args:
+            mission: Mission to execute
+            submitted_by: Username of the submitter (for logs)
+
+        Returns:
+            The queued job
+
+        Raises:
+            MissionQueueFull: If max_queue_size jobs are already waiting
+        """
+        self.start()
+        job = MissionJob(job_id=uuid.uuid4().hex, mission=mission, submitted_by=submitted_by)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._stats["rejected"] += 1
+            raise MissionQueueFull(f"Mission queue is full ({self.max_queue_size} jobs waiting)")
+
+        self._jobs[job.job_id] = job
+        self._publish(job)
+        self._stats["submitted"] += 1
+        self._prune_finished()
+        logger.info(f"Mission {mission.mission_id} queued as job {job.job_id} (depth {self._queue.qsize()})")
+        return job
+
+    def get_job(self, job_id: str) -> Optional[MissionJob]:
+        """Look up a job by id"""
+        return self._jobs.get(job_id)
+
+    async def get_shared_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the last published state of a job run by another API worker
+
+        Returns:
+            The job's dictionary (as MissionJob.to_dict()), or None if unknown
+        """
+        if self._store is None:
+            return None
+        return await asyncio.to_thread(self._store.get, self.JOB_KEY + job_id)
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """1-based position of a queued job (None if not queued)"""
+        position = 0
+        for job in self._jobs.values():
+            if job.status == JobStatus.QUEUED:
+                position += 1
+                if job.job_id == job_id:
+                    return position
+        return None
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """
+        Receive status changes of a job.
+
+        Returns:
+            Queue that gets the job's dictionary on every status change
+        """
+        updates: asyncio.Queue = asyncio.Queue()
+        self._subscribers.setdefault(job_id, []).append(updates)
+        return updates
+
+    def unsubscribe(self, job_id: str, updates: asyncio.Queue) -> None:
+        """Stop receiving status changes of a job"""
+        subscribers = self._subscribers.get(job_id, [])
+        if updates in subscribers:
+            subscribers.remove(updates)
+        if not subscribers:
+            self._subscribers.pop(job_id, None)
+
+    # Metrics
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue counters.
+
+        Returns:
+            Dict with depth, in-flight jobs, outcome counts and wait/run times
+        """
+        started = self._stats["succeeded"] + self._stats["failed"] + self._running
+        finished = self._stats["succeeded"] + self._stats["failed"]
+        stats: Dict[str, Any] = dict(self._stats)
+        stats.update({
+            "workers": self.workers,
+            "max_queue_size": self.max_queue_size,
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "running": self._running,
+            "avg_wait_ms": (self._total_wait_seconds / started * 1000) if started else 0.0,
+            "max_wait_ms": self._max_wait_seconds * 1000,
+            "avg_run_ms": (self._total_run_seconds / finished * 1000) if finished else 0.0,
+        })
+        return stats
+
+    # Internals
+
+    async def _worker(self, index: int) -> None:
+        """Execute queued jobs one at a time"""
+        runner = None
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            try:
+                if runner is None:
+                    runner = await loop.run_in_executor(self._executor, self.runner_factory)
+                await self._run_job(job, runner, loop)
+            except Exception as e:
+                # _run_job records mission errors; this only guards the worker itself
+                logger.error(f"Mission worker {index} failed on job {job.job_id}: {e}", exc_info=True)
+                if not job.is_finished:
+                    self._finish(job, None, str(e))
+            finally:
+                self._queue.task_done()
+
+    async def _run_job(self, job: MissionJob, runner: Any, loop: asyncio.AbstractEventLoop) -> None:
+        job.status = JobStatus.RUNNING
+        job.started_at = time.time()
+        self._running += 1
+        self._total_wait_seconds += job.wait_seconds
+        self._max_wait_seconds = max(self._max_wait_seconds, job.wait_seconds)
+        self._publish(job)
+        try:
+            result = await loop.run_in_executor(self._executor, runner.execute_mission, job.mission)
+        except Exception as e:
+            logger.error(f"Mission {job.mission.mission_id} (job {job.job_id}) raised: {e}", exc_info=True)
+            self._running -= 1
+            self._finish(job, None, str(e))
+            return
+        self._running -= 1
+        self._finish(job, result, result.error)
+
+    def _finish(self, job: MissionJob, result: Optional[MissionResult], error: Optional[str]) -> None:
+        job.finished_at = time.time()
+        job.result = result
+        job.error = error
+        succeeded = result is not None and result.success
+        job.status = JobStatus.SUCCEEDED if succeeded else JobStatus.FAILED
+        self._stats["succeeded" if succeeded else "failed"] += 1
+        if job.run_seconds is not None:
+            self._total_run_seconds += job.run_seconds
+        logger.info(f"Job {job.job_id} ({job.mission.mission_id}) {job.status} in {job.run_seconds or 0:.2f}s")
+        self._publish(job)
+        self._prune_finished()
+
+    def _publish(self, job: MissionJob) -> None:
+        """Push the job's state to its subscribers (and the shared store)"""
+        payload = job.to_dict()
+        for updates in self._subscribers.get(job.job_id, []):
+            updates.put_nowait(payload)
+        if self._store is not None:
+            task = asyncio.get_running_loop().create_task(self._share(job))
+            self._share_tasks.add(task)
+            task.add_done_callback(self._share_tasks.discard)
+
+    async def _share(self, job: MissionJob) -> None:
+        """Write the job's current state to the store (writes are serialized, newest last)"""
+        if self._share_lock is None:
+            self._share_lock = asyncio.Lock()
+        async with self._share_lock:
+            try:
+                await asyncio.to_thread(
+                    self._store.set, self.JOB_KEY + job.job_id, job.to_dict(), self.shared_job_ttl
+                )
+            except Exception as e:
+                logger.warning(f"Could not publish mission job {job.job_id}: {e}")
+
+    def _prune_finished(self) -> None:
+        """Forget the oldest finished jobs beyond max_finished_jobs"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.is_finished]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
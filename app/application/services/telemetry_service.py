@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+"""Telemetry Service - Buffered ingestion and downsampled history of device telemetry
+
+/v1/telemetry used to log the payload and drop it. Writing one row per ping
+from every device would turn telemetry into the busiest write path of the
+database, so ingestion is staged:
+
+- record() appends to an in-memory ring buffer per device (no I/O on the request path)
+- flush() swaps the buffers out and bulk-inserts them into a compact raw table,
+  merging 1m and 1h rollups in the same transaction
+- apply_retention() deletes raw samples and rollups past their retention
+- history() reads rollups only, so queries never scan raw samples
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert
+from sqlmodel import Session, select
+
+from app.domain.models.telemetry import TelemetryRollup, TelemetrySample
+
+logger = logging.getLogger(__name__)
+
+# Rollup resolutions and their bucket width
+RESOLUTIONS: Dict[str, timedelta] = {
+    "1m": timedelta(minutes=1),
+    "1h": timedelta(hours=1),
+}
+
+
+def bucket_start(at: datetime, resolution: str) -> datetime:
+    """Truncate a timestamp to the start of its rollup bucket"""
+    if resolution == "1m":
+        return at.replace(second=0, microsecond=0)
+    if resolution == "1h":
+        return at.replace(minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown telemetry resolution: {resolution}")
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TelemetryService:
+    """
+    Buffered telemetry ingestion with time-series rollups.
+
+    record() is called from the event loop; flush(), apply_retention() and
+    history() block on the database and are meant for the DB executor.
+    """
+
+    DEFAULT_BUFFER_SIZE = 120
+    DEFAULT_MAX_DEVICES = 1000
+
+    def __init__(
+        self,
+        engine,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        flush_interval: float = 10.0,
+        raw_retention_hours: float = 24,
+        minute_retention_days: float = 7,
+        hour_retention_days: float = 365,
+        retention_interval: float = 600.0,
+        max_devices: int = DEFAULT_MAX_DEVICES,
+    ):
+        """
+        Initialize the TelemetryService
+
+        Args:
+            engine: SQLModel engine for database operations
+            buffer_size: Samples buffered per device between flushes (oldest dropped first)
+            flush_interval: Seconds between bulk inserts
+            raw_retention_hours: Hours raw samples are kept
+            minute_retention_days: Days 1m rollups are kept
+            hour_retention_days: Days 1h rollups are kept
+            retention_interval: Seconds between retention passes
+            max_devices: Devices buffered per flush (new ones are rejected beyond it)
+                         and devices whose latest sample is kept
+        """
+        self.engine = engine
+        self.buffer_size = max(1, buffer_size)
+        self.flush_interval = max(0.1, flush_interval)
+        self.retention = {
+            "raw": timedelta(hours=raw_retention_hours),
+            "1m": timedelta(days=minute_retention_days),
+            "1h": timedelta(days=hour_retention_days),
+        }
+        self.retention_interval = retention_interval
+        self.max_devices = max(1, max_devices)
+
+        self._lock = threading.Lock()
+        self._buffers: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._latest: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._run_blocking: Optional[Callable[..., Awaitable[Any]]] = None
+        self._last_retention = 0.0
+        self._stats = {
+            "received": 0,
+            "dropped": 0,
+            "rejected_devices": 0,
+            "flushed": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "last_flush_ms": 0.0,
+        }
+
+    # Ingestion
+
+    @staticmethod
+    def parse_sample(data: Dict[str, Any], recorded_at: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Extract the stored fields from a telemetry payload.
+
+        The server receive time is used (client clocks are not trusted).
+
+        Args:
+            data: Telemetry payload ({"battery": {"level", "charging"}, "location": {"latitude", "longitude"}})
+            recorded_at: Sample time (default: now)
+
+        Returns:
+            Sample dictionary with recorded_at, battery_level, charging, lat and lon
+        """
+        battery = data.get("battery") or {}
+        location = data.get("location") or {}
+        charging = battery.get("charging") if isinstance(battery, dict) else None
+        return {
+            "recorded_at": recorded_at or datetime.now(),
+            "battery_level": _as_float(battery.get("level")) if isinstance(battery, dict) else None,
+            "charging": bool(charging) if charging is not None else None,
+            "lat": _as_float(location.get("latitude", location.get("lat"))) if isinstance(location, dict) else None,
+            "lon": _as_float(location.get("longitude", location.get("lon"))) if isinstance(location, dict) else None,
+        }
+
+    def record(self, device_key: str, data: Dict[str, Any], recorded_at: Optional[datetime] = None) -> bool:
+        """
+        Buffer a telemetry sample for the next flush.
+
+        Args:
+            device_key: Device identifier
+            data: Telemetry payload
+            recorded_at: Sample time (default: now)
+
+        Returns:
+            False if the sample was rejected because max_devices are already buffered
+        """
+        sample = self.parse_sample(data, recorded_at)
+        with self._lock:
+            buffer = self._buffers.get(device_key)
+            if buffer is None:
+                if len(self._buffers) >= self.max_devices:
+                    self._stats["rejected_devices"] += 1
+                    return False
+                buffer = self._buffers[device_key] = deque(maxlen=self.buffer_size)
+            if len(buffer) == self.buffer_size:
+                self._stats["dropped"] += 1
+            buffer.append(sample)
+            self._latest[device_key] = sample
+            self._latest.move_to_end(device_key)
+            while len(self._latest) > self.max_devices:
+                self._latest.popitem(last=False)
+            self._stats["received"] += 1
+        return True
+
+    def latest(self, device_key: str) -> Optional[Dict[str, Any]]:
+        """Most recent sample received from a device since startup (None if unknown)"""
+        with self._lock:
+            sample = self._latest.get(device_key)
+            return dict(sample) if sample is not None else None
+
+    # Persistence
+
+    def flush(self) -> int:
+        """
+        Bulk-insert buffered samples and merge them into the rollups.
+
+        On failure the samples are put back in front of the buffers (still
+        bounded by buffer_size) for the next attempt.
+
+        Returns:
+            Number of samples written
+        """
+        with self._lock:
+            batches, self._buffers = self._buffers, {}
+        rows = [
+            {"device_key": device_key, **sample}
+            for device_key, samples in batches.items()
+            for sample in samples
+        ]
+        if not rows:
+            return 0
+
+        start = time.monotonic()
+        try:
+            with Session(self.engine) as session:
+                session.execute(insert(TelemetrySample), rows)
+                self._merge_rollups(session, rows)
+                session.commit()
+        except Exception as e:
+            logger.error(f"Error flushing {len(rows)} telemetry samples: {e}")
+            self._stats["failed_flushes"] += 1
+            self._requeue(batches)
+            return 0
+
+        self._stats["flushes"] += 1
+        self._stats["flushed"] += len(rows)
+        self._stats["last_flush_ms"] = (time.monotonic() - start) * 1000
+        return len(rows)
+
+    def _requeue(self, batches: Dict[str, Deque[Dict[str, Any]]]) -> None:
+        with self._lock:
+            for device_key, samples in batches.items():
+                newer = self._buffers.get(device_key, ())
+                self._buffers[device_key] = deque([*samples, *newer], maxlen=self.buffer_size)
+
+    def _merge_rollups(self, session: Session, rows: List[Dict[str, Any]]) -> None:
+        """Fold samples into their 1m/1h buckets, updating buckets that already exist"""
+        aggregates: Dict[Tuple[str, str, datetime], Dict[str, Any]] = {}
+        for row in sorted(rows, key=lambda r: r["recorded_at"]):
+            for resolution in RESOLUTIONS:
+                key = (row["device_key"], resolution, bucket_start(row["recorded_at"], resolution))
+                bucket = aggregates.setdefault(key, {
+                    "sample_count": 0, "battery_count": 0, "battery_sum": 0.0,
+                    "battery_min": None, "battery_max": None,
+                    "charging": None, "lat": None, "lon": None,
+                })
+                self._fold(bucket, row)
+
+        device_keys = {key[0] for key in aggregates}
+        for resolution in RESOLUTIONS:
+            starts = {key[2] for key in aggregates if key[1] == resolution}
+            existing = {
+                (rollup.device_key, rollup.resolution, rollup.bucket_start): rollup
+                for rollup in session.exec(
+                    select(TelemetryRollup).where(
+                        TelemetryRollup.resolution == resolution,
+                        TelemetryRollup.device_key.in_(device_keys),
+                        TelemetryRollup.bucket_start.in_(starts),
+                    )
+                )
+            }
+            for key, bucket in aggregates.items():
+                if key[1] != resolution:
+                    continue
+                rollup = existing.get(key)
+                if rollup is None:
+                    session.add(TelemetryRollup(
+                        device_key=key[0], resolution=key[1], bucket_start=key[2], **bucket
+                    ))
+                    continue
+                rollup.sample_count += bucket["sample_count"]
+                rollup.battery_count += bucket["battery_count"]
+                rollup.battery_sum += bucket["battery_sum"]
+                for field in ("battery_min", "battery_max"):
+                    pick = min if field == "battery_min" else max
+                    values = [v for v in (getattr(rollup, field), bucket[field]) if v is not None]
+                    setattr(rollup, field, pick(values) if values else None)
+                for field in ("charging", "lat", "lon"):
+                    if bucket[field] is not None:
+                        setattr(rollup, field, bucket[field])
+                rollup.last_recorded_at = max(rollup.last_recorded_at, bucket["last_recorded_at"])
+                session.add(rollup)
+
+    @staticmethod
+    def _fold(bucket: Dict[str, Any], row: Dict[str, Any]) -> None:
+        bucket["sample_count"] += 1
+        level = row["battery_level"]
+        if level is not None:
+            bucket["battery_count"] += 1
+            bucket["battery_sum"] += level
+            bucket["battery_min"] = level if bucket["battery_min"] is None else min(bucket["battery_min"], level)
+            bucket["battery_max"] = level if bucket["battery_max"] is None else max(bucket["battery_max"], level)
+        for field in ("charging", "lat", "lon"):
+            if row[field] is not None:
+                bucket[field] = row[field]
+        bucket["last_recorded_at"] = row["recorded_at"]
+
+    def apply_retention(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Delete raw samples and rollups older than their retention.
+
+        Returns:
+            Rows deleted per table/resolution
+        """
+        now = now or datetime.now()
+        deleted = {}
+        with Session(self.engine) as session:
+            result = session.execute(
+                delete(TelemetrySample).where(TelemetrySample.recorded_at < now - self.retention["raw"])
+            )
+            deleted["raw"] = result.rowcount
+            for resolution in RESOLUTIONS:
+                result = session.execute(
+                    delete(TelemetryRollup).where(
+                        TelemetryRollup.resolution == resolution,
+                        TelemetryRollup.bucket_start < now - self.retention[resolution],
+                    )
+                )
+                deleted[resolution] = result.rowcount
+            session.commit()
+        if any(deleted.values()):
+            logger.info(f"Telemetry retention removed {deleted}")
+        return deleted
+
+    # Queries
+
+    def history(
+        self,
+        device_key: str,
+        resolution: str = "1m",
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: int = 500,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get downsampled telemetry of a device, oldest bucket first.
+
+        Samples still buffered (at most flush_interval old) are not included.
+
+        Args:
+            device_key: Device identifier
+            resolution: Rollup resolution (1m or 1h)
+            since: Earliest bucket start (inclusive)
+            until: Latest bucket start (exclusive)
+            limit: Maximum buckets returned (the most recent ones)
+
+        Returns:
+            List of bucket dictionaries
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown telemetry resolution: {resolution}")
+
+        statement = select(TelemetryRollup).where(
+            TelemetryRollup.device_key == device_key,
+            TelemetryRollup.resolution == resolution,
+        )
+        if since is not None:
+            statement = statement.where(TelemetryRollup.bucket_start >= since)
+        if until is not None:
+            statement = statement.where(TelemetryRollup.bucket_start < until)
+        statement = statement.order_by(TelemetryRollup.bucket_start.desc()).limit(limit)
+
+        with Session(self.engine) as session:
+            rollups = list(session.exec(statement))
+
+        return [
+            {
+                "bucket_start": rollup.bucket_start.isoformat(),
+                "samples": rollup.sample_count,
+                "battery_avg": rollup.battery_sum / rollup.battery_count if rollup.battery_count else None,
+                "battery_min": rollup.battery_min,
+                "battery_max": rollup.battery_max,
+                "charging": rollup.charging,
+                "lat": rollup.lat,
+                "lon": rollup.lon,
+            }
+            for rollup in reversed(rollups)
+        ]
+
+    # Background flushing
+
+    def start(self, run_blocking: Optional[Callable[..., Awaitable[Any]]] = None) -> None:
+        """
+        Start the periodic flush task (idempotent; needs a running event loop).
+
+        Args:
+            run_blocking: Coroutine function running a blocking callable off the
+                          loop (e.g. DatabaseExecutor.run); defaults to asyncio.to_thread
+        """
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._run_blocking = run_blocking or asyncio.to_thread
+        self._flush_task = asyncio.create_task(self._flush_loop(), name="telemetry-flush")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self._run_blocking(self.flush)
+            if time.monotonic() - self._last_retention >= self.retention_interval:
+                self._last_retention = time.monotonic()
+                try:
+                    await self._run_blocking(self.apply_retention)
+                except Exception as e:
+                    logger.error(f"Error applying telemetry retention: {e}")
+
+    async def shutdown(self) -> None:
+        """Stop the flush task and write what is still buffered"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        await (self._run_blocking or asyncio.to_thread)(self.flush)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get ingestion counters.
+
+        Returns:
+            Dict with buffered samples, drops and flush counts/latency
+        """
+        with self._lock:
+            buffered = sum(len(buffer) for buffer in self._buffers.values())
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["devices"] = len(self._latest)
+        stats["buffered"] = buffered
+        return stats
@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional
 
 from sqlmodel import Session, select
 
+from app.core.pagination import keyset_condition
 from app.domain.models.thought_log import InteractionStatus, ThoughtLog
 
 logger = logging.getLogger(__name__)
@@ -158,24 +159,33 @@ class ThoughtLogService:
     def get_session_thoughts(
         self,
         session_id: str,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
     ) -> List[ThoughtLog]:
         """
-        Get all thought logs for a specific session
+        Get all thought logs for a specific session, oldest first
         
         Args:
             session_id: Session identifier
             limit: Optional limit on number of logs
+            cursor: Continue after the log this cursor points to (see app.core.pagination)
             
         Returns:
             List of thought logs
+            
+        Raises:
+            ValueError: If the cursor is malformed
         """
+        conditions = [ThoughtLog.session_id == session_id]
+        if cursor:
+            conditions.append(keyset_condition(ThoughtLog.created_at, ThoughtLog.id, cursor, descending=False))
+        
         try:
             with Session(self.engine) as session_db:
                 statement = (
                     select(ThoughtLog)
-                    .where(ThoughtLog.session_id == session_id)
-                    .order_by(ThoughtLog.created_at.asc())
+                    .where(*conditions)
+                    .order_by(ThoughtLog.created_at.asc(), ThoughtLog.id.asc())
                 )
                 
                 if limit:
@@ -290,28 +300,47 @@ class ThoughtLogService:
     def get_recent_thoughts(
         self,
         status: Optional[InteractionStatus] = None,
-        limit: int = 50
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
     ) -> List[ThoughtLog]:
         """
-        Get recent thought logs, optionally filtered by status
+        Get recent thought logs, newest first, optionally filtered by status and time
         
         Args:
             status: Optional filter by interaction status
             limit: Maximum number of logs to return
+            cursor: Continue after the log this cursor points to (see app.core.pagination)
+            since: Only logs created at or after this time
+            until: Only logs created before this time
             
         Returns:
             List of recent thought logs
+            
+        Raises:
+            ValueError: If the cursor is malformed
         """
+        conditions = []
+        if status:
+            conditions.append(
+                ThoughtLog.status == (status.value if isinstance(status, InteractionStatus) else status)
+            )
+        if cursor:
+            conditions.append(keyset_condition(ThoughtLog.created_at, ThoughtLog.id, cursor))
+        if since:
+            conditions.append(ThoughtLog.created_at >= since)
+        if until:
+            conditions.append(ThoughtLog.created_at < until)
+        
         try:
             with Session(self.engine) as session:
-                statement = select(ThoughtLog).order_by(ThoughtLog.created_at.desc())
-                
-                if status:
-                    statement = statement.where(
-                        ThoughtLog.status == (status.value if isinstance(status, InteractionStatus) else status)
-                    )
-                
-                statement = statement.limit(limit)
+                statement = (
+                    select(ThoughtLog)
+                    .where(*conditions)
+                    .order_by(ThoughtLog.created_at.desc(), ThoughtLog.id.desc())
+                    .limit(limit)
+                )
                 
                 return session.exec(statement).all()
                 
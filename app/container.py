@@ -112,11 +112,12 @@ from app.domain.gears.cap_001_core import execute as cap_001_exec
 from app.adapters.infrastructure import DummyVoiceProvider, LLMCommandAdapter, SQLiteHistoryAdapter
 from app.adapters.infrastructure.github_adapter import GitHubAdapter
 from app.adapters.infrastructure.reward_adapter import RewardAdapter
+from app.adapters.infrastructure.state_store import get_state_store
 try:
     from app.adapters.infrastructure import GatewayLLMCommandAdapter
 except ImportError:
     GatewayLLMCommandAdapter = None
-from app.application.ports import ActionProvider, HistoryProvider, VoiceProvider, WebProvider
+from app.application.ports import ActionProvider, HistoryProvider, StateStore, VoiceProvider, WebProvider
 from app.application.services import AssistantService, DependencyManager, ExtensionManager
 from app.application.services.evolution_loop import EvolutionLoopService
 from app.core.config import settings
@@ -282,6 +283,11 @@ class Container:
             self._web_provider = WebAdapter(self.action_provider)
         return self._web_provider
 
+    @property
+    def state_store(self) -> StateStore:
+        """Get the state store shared by API workers (STATE_BACKEND_URL)"""
+        return get_state_store()
+
     @property
     def history_provider(self) -> HistoryProvider:
         """Get or create history provider"""
@@ -296,7 +302,12 @@ class Container:
             
             self._history_provider = SQLiteHistoryAdapter(
                 db_path=self.db_path,
-                database_url=database_url
+                database_url=database_url,
+                write_behind=settings.history_write_behind,
+                batch_size=settings.history_batch_size,
+                flush_interval=settings.history_flush_interval_seconds,
+                max_queue_size=settings.history_queue_size,
+                engine_profile=settings.db_engine_profile,
             )
         return self._history_provider
 
@@ -317,6 +328,7 @@ class Container:
                         wake_word=self.wake_word,
                         history_provider=self.history_provider,
                         use_llm=self.use_llm,
+                        state_store=self.state_store,
                     )
                     logger.info("✓ GatewayLLMCommandAdapter criado com sucesso")
                     return self._llm_command_adapter
@@ -368,7 +380,7 @@ class Container:
         """Get or create extension manager"""
         if self._extension_manager is None:
             logger.info("Creating ExtensionManager")
-            self._extension_manager = ExtensionManager()
+            self._extension_manager = ExtensionManager(state_store=self.state_store)
         return self._extension_manager
 
     @property
@@ -443,6 +455,7 @@ class Container:
                 wake_word=self.wake_word,
                 gemini_adapter=gemini_adapter,
                 github_adapter=self.github_adapter,
+                state_store=self.state_store,
             )
         return self._assistant_service
 
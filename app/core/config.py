@@ -51,9 +51,86 @@ class Settings(BaseSettings):
     secret_key: str = "your-secret-key-change-this-in-production-minimum-32-characters"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # Verified JWTs cached per process until their expiry (0 disables the cache)
+    token_cache_size: int = 1024
+    # bcrypt runs on a dedicated pool; logins beyond the pending limit get a 503
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 32
+    # Failed logins allowed per username / client IP within the window (then 429)
+    login_max_failures_per_user: int = 5
+    login_max_failures_per_ip: int = 20
+    login_failure_window_seconds: int = 300
+    # Peers whose X-Forwarded-For / X-Forwarded-Proto headers are trusted (comma-separated
+    # IPs or networks, "*" for any); the forwarded client IP is then used by the login limiter
+    forwarded_allow_ips: str = "127.0.0.1,::1"
 
     # Database Settings
     database_url: str = "sqlite:///jarvis.db"
+    # Connection tuning for the shared engine: "auto", "dev-sqlite", "edge-sqlite",
+    # "cloud-postgres-pooled", "cloud-postgres" (direct connections only, not PgBouncer)
+    # or "default" (see app/adapters/infrastructure/engine_profiles.py)
+    db_engine_profile: str = "auto"
+    # Threads for blocking database calls made from async routes
+    # (keep at or below the engine's connection pool size)
+    db_executor_workers: int = 8
+    # Command interactions are queued and inserted in batches by a background writer
+    history_write_behind: bool = True
+    history_batch_size: int = 100
+    history_flush_interval_seconds: float = 1.0
+    # Queued interactions before callers block (and then write directly)
+    history_queue_size: int = 10000
+    # Longest a worker's GET /v1/tasks/wait long-poll is held
+    task_wait_max_seconds: float = 30.0
+
+    # Mission Queue Settings
+    # Missions executed concurrently, jobs allowed to wait, finished jobs kept for polling
+    mission_workers: int = 2
+    mission_queue_size: int = 100
+    mission_job_retention: int = 500
+
+    # API Response Settings
+    # Serialize responses with orjson when it is installed (stdlib encoder otherwise)
+    fast_json_responses: bool = True
+    # Gzip responses larger than this many bytes (0 disables compression)
+    gzip_minimum_size: int = 1024
+    # Device/thought lists longer than this are streamed item by item
+    stream_list_threshold: int = 500
+
+    # Telemetry Ingestion Settings
+    # Samples buffered per device between bulk inserts (oldest dropped first)
+    telemetry_buffer_size: int = 120
+    telemetry_flush_interval_seconds: float = 10.0
+    # Retention of raw samples and of the 1m/1h rollups history queries read
+    telemetry_raw_retention_hours: float = 24
+    telemetry_minute_retention_days: float = 7
+    telemetry_hour_retention_days: float = 365
+
+    # HUD Push Stream Settings (/v1/hud/stream)
+    # Seconds between refreshes of each pushed topic (only while a HUD is connected)
+    hud_status_refresh_seconds: float = 10.0
+    hud_devices_refresh_seconds: float = 30.0
+    hud_evolution_refresh_seconds: float = 60.0
+    # Messages buffered per HUD before it is resynchronized with fresh snapshots
+    hud_client_queue_size: int = 100
+    # Seconds between keepalive pings on an idle stream
+    hud_ping_interval_seconds: float = 25.0
+
+    # Health Check Settings
+    # /health serves a cached database/RLS inspection refreshed in the background
+    health_refresh_interval_seconds: float = 30.0
+    # A report older than this is refreshed by the request that finds it
+    health_cache_ttl_seconds: float = 90.0
+    # An inspection taking longer is abandoned; /health serves the last report marked stale
+    health_inspection_timeout_seconds: float = 5.0
+    # /health/ready fails with 503 if SELECT 1 takes longer than this
+    health_ready_timeout_seconds: float = 2.0
+
+    # Multi-Worker Settings
+    # Shared state (command history, circuit breakers, bridge routing, install status):
+    # "memory://" (single process) or "sqlite:///path/to/state.db" (shared by all workers)
+    state_backend_url: str = "memory://"
+    # uvicorn worker processes started by serve.py (>1 requires a shared state backend)
+    api_workers: int = 1
 
     model_config = SettingsConfigDict(
         env_file=".env",
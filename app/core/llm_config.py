@@ -64,6 +64,53 @@ class LLMConfig:
         "0.7"
     ))
     
+    # Fast-path gating for LLM command interpretation
+    # When True, exact-match and keyword hits (confidence 1.0) skip the LLM call
+    COMMAND_FAST_PATH = os.getenv(
+        "JARVIS_COMMAND_FAST_PATH",
+        "true"
+    ).lower() == "true"
+    
+    # Maximum number of normalized commands memoized by the LLM interpreter
+    # Repeated commands are served from this memo instead of a new LLM call
+    COMMAND_MEMO_SIZE = int(os.getenv(
+        "JARVIS_COMMAND_MEMO_SIZE",
+        "256"
+    ))
+    
+    # Local intent router (TF-IDF n-gram nearest neighbours) between keywords and the LLM
+    # Paraphrased commands above the similarity threshold are answered without an LLM call
+    COMMAND_ROUTER = os.getenv(
+        "JARVIS_COMMAND_ROUTER",
+        "true"
+    ).lower() == "true"
+    
+    # Minimum cosine similarity for the local router to accept a command
+    COMMAND_ROUTER_THRESHOLD = float(os.getenv(
+        "JARVIS_COMMAND_ROUTER_THRESHOLD",
+        "0.75"
+    ))
+    
+    # Number of nearest examples that vote on the routed command type
+    COMMAND_ROUTER_TOP_K = int(os.getenv(
+        "JARVIS_COMMAND_ROUTER_TOP_K",
+        "5"
+    ))
+    
+    # Recent interactions read from history to train the router at startup
+    COMMAND_ROUTER_TRAINING_LIMIT = int(os.getenv(
+        "JARVIS_COMMAND_ROUTER_TRAINING_LIMIT",
+        "1000"
+    ))
+    
+    # Single round-trip mode for conversational input
+    # When True, one completion either classifies the command or returns the chat reply,
+    # avoiding a second LLM call for CHAT/UNKNOWN commands
+    COMBINED_CHAT_RESPONSE = os.getenv(
+        "JARVIS_COMBINED_CHAT_RESPONSE",
+        "true"
+    ).lower() == "true"
+    
     # Maximum number of capabilities to scan in a single batch
     # This helps manage LLM API costs and processing time
     MAX_CAPABILITIES_PER_SCAN = int(os.getenv(
@@ -82,6 +129,11 @@ class LLMConfig:
             "capability_llm_provider": cls.CAPABILITY_LLM_PROVIDER,
             "min_command_confidence": cls.MIN_COMMAND_CONFIDENCE,
             "min_capability_confidence": cls.MIN_CAPABILITY_CONFIDENCE,
+            "command_fast_path": cls.COMMAND_FAST_PATH,
+            "command_memo_size": cls.COMMAND_MEMO_SIZE,
+            "command_router": cls.COMMAND_ROUTER,
+            "command_router_threshold": cls.COMMAND_ROUTER_THRESHOLD,
+            "combined_chat_response": cls.COMBINED_CHAT_RESPONSE,
         }
     
     @classmethod
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Keyset (cursor) pagination helpers
+
+OFFSET pagination rescans every skipped row, so page N of a large table costs
+O(N). Keyset pagination continues from the (timestamp, id) of the last row of
+the previous page, which an index on (timestamp, id) seeks to directly: every
+page costs the same however deep it is.
+
+Cursors are opaque URL-safe strings encoding that (timestamp, id) pair.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, Tuple
+
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """
+    Build the cursor that continues after a row
+
+    Args:
+        timestamp: Sort timestamp of the last row returned
+        row_id: Primary key of the last row returned (tie-breaker)
+
+    Returns:
+        Opaque cursor string
+    """
+    raw = f"{timestamp.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Parse a cursor built by encode_cursor
+
+    Args:
+        cursor: Opaque cursor string
+
+    Returns:
+        (timestamp, id) of the row the next page continues after
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, row_id = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8").rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_condition(timestamp_column: Any, id_column: Any, cursor: str, descending: bool = True) -> Any:
+    """
+    Build the WHERE clause selecting rows after a cursor
+
+    Args:
+        timestamp_column: Sort column
+        id_column: Primary key column (tie-breaker within equal timestamps)
+        cursor: Cursor of the last row of the previous page
+        descending: Whether the query is ordered newest first
+
+    Returns:
+        SQLAlchemy boolean expression
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    timestamp, row_id = decode_cursor(cursor)
+    if descending:
+        return or_(timestamp_column < timestamp, and_(timestamp_column == timestamp, id_column < row_id))
+    return or_(timestamp_column > timestamp, and_(timestamp_column == timestamp, id_column > row_id))
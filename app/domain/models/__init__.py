@@ -5,6 +5,7 @@ from .command import Command, CommandType, Intent, Response
 from .device import Capability, CommandResult, Device
 from .evolution_reward import EvolutionReward
 from .mission import Mission, MissionResult
+from .telemetry import TelemetryRollup, TelemetrySample
 from .thought_log import InteractionStatus, ThoughtLog
 
 __all__ = [
@@ -18,6 +19,8 @@ __all__ = [
     "EvolutionReward",
     "Mission",
     "MissionResult",
+    "TelemetrySample",
+    "TelemetryRollup",
     "ThoughtLog",
     "InteractionStatus",
 ]
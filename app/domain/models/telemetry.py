@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Telemetry models for device battery/location history"""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Index, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+
+class TelemetrySample(SQLModel, table=True):
+    """
+    SQLModel table for raw telemetry samples.
+    Written in bulk by TelemetryService and kept only for a short retention window;
+    history queries read TelemetryRollup instead.
+    """
+
+    __tablename__ = "telemetry_samples"
+    __table_args__ = (Index("ix_telemetry_samples_device_time", "device_key", "recorded_at"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    device_key: str = Field(nullable=False)  # Device id, or "<user>:<device_type>" for HUD clients
+    recorded_at: datetime = Field(nullable=False, index=True)
+    battery_level: Optional[float] = Field(default=None, nullable=True)
+    charging: Optional[bool] = Field(default=None, nullable=True)
+    lat: Optional[float] = Field(default=None, nullable=True)
+    lon: Optional[float] = Field(default=None, nullable=True)
+
+
+class TelemetryRollup(SQLModel, table=True):
+    """
+    SQLModel table for downsampled telemetry (one row per device, resolution and bucket).
+    Battery sums are stored so buckets can be merged across flushes.
+    """
+
+    __tablename__ = "telemetry_rollups"
+    __table_args__ = (
+        UniqueConstraint("device_key", "resolution", "bucket_start", name="uq_telemetry_rollup_bucket"),
+        Index("ix_telemetry_rollups_resolution_time", "resolution", "bucket_start"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    device_key: str = Field(nullable=False)
+    resolution: str = Field(nullable=False)  # 1m, 1h
+    bucket_start: datetime = Field(nullable=False)
+    sample_count: int = Field(default=0, nullable=False)
+    battery_count: int = Field(default=0, nullable=False)  # Samples that carried a battery level
+    battery_sum: float = Field(default=0.0, nullable=False)
+    battery_min: Optional[float] = Field(default=None, nullable=True)
+    battery_max: Optional[float] = Field(default=None, nullable=True)
+    charging: Optional[bool] = Field(default=None, nullable=True)  # Last known state in the bucket
+    lat: Optional[float] = Field(default=None, nullable=True)  # Last known position in the bucket
+    lon: Optional[float] = Field(default=None, nullable=True)
+    last_recorded_at: datetime = Field(nullable=False)
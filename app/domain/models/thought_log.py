@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
@@ -23,6 +24,12 @@ class ThoughtLog(SQLModel, table=True):
     """
 
     __tablename__ = "thought_logs"
+    __table_args__ = (
+        # Keyset pagination: recent thoughts, optionally by status, and a session's thoughts
+        Index("ix_thought_logs_created_at_id", "created_at", "id"),
+        Index("ix_thought_logs_status_created_at", "status", "created_at", "id"),
+        Index("ix_thought_logs_session_created_at", "session_id", "created_at", "id"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     mission_id: str = Field(nullable=False, index=True)  # Links related thoughts to same mission
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+"""Intent Router - Local nearest-neighbour command classification
+
+Middle tier between keyword matching and an LLM call. Labelled example
+utterances ("carrier phrases" such as "pode digitar" or "vai para o site") are
+embedded as TF-IDF vectors over accent-folded character n-grams, so Portuguese
+inflections and paraphrases ("digita", "escreve aí", "aperta a tecla") land
+next to the examples they resemble.
+
+A command is routed by scoring its leading word spans against the index with
+cosine similarity: the best-matching span is the command phrase and the rest
+of the input is the command parameter. The top-k neighbours vote on the
+command type and the match is only accepted above a confidence threshold.
+
+The index can be extended from the interactions history, using each successful
+command's stored parameters to recover the phrase that carried it.
+"""
+
+import logging
+import math
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.domain.models import CommandType
+
+# NumPy is optional: without it the router is disabled and commands go to the LLM
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    np = None
+    HAS_NUMPY = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RouteMatch:
+    """Result of routing a command through the local index"""
+
+    command_type: CommandType
+    confidence: float
+    parameter: str = ""
+    example: str = ""
+
+
+class IntentRouter:
+    """
+    TF-IDF character n-gram index of labelled utterances with cosine top-k lookup.
+
+    Routes only actionable command types; conversational input is left to the LLM.
+    """
+
+    # Command types that take a free-text parameter after the command phrase
+    PARAMETERIZED_TYPES = {
+        CommandType.TYPE_TEXT,
+        CommandType.PRESS_KEY,
+        CommandType.OPEN_URL,
+        CommandType.SEARCH_ON_PAGE,
+        CommandType.REPORT_ISSUE,
+    }
+
+    # Built-in carrier phrases (the parameter follows the phrase)
+    DEFAULT_EXAMPLES: Dict[CommandType, List[str]] = {
+        CommandType.TYPE_TEXT: [
+            "escreve", "escreva aí", "digita", "digitar", "pode digitar",
+            "pode escrever", "escreve pra mim", "digita pra mim", "redija", "datilografe",
+        ],
+        CommandType.PRESS_KEY: [
+            "aperta", "aperta a tecla", "aperte a tecla", "pressiona", "pressionar", "pressiona a tecla",
+            "tecla", "clica na tecla", "pode apertar", "bate o",
+        ],
+        CommandType.OPEN_BROWSER: [
+            "abre o chrome", "abrir o chrome", "abre o browser", "abre o firefox", "abrir o firefox",
+            "quero navegar na web", "liga a internet", "abre a web", "inicia o navegador",
+        ],
+        CommandType.OPEN_URL: [
+            "abre o site", "abra o site", "vai para o site", "vai para", "entra no site",
+            "acessa o site", "acesse o site", "acessa", "acesse", "entre no site",
+            "navega até", "navegue até", "visita o site", "carrega o site",
+        ],
+        CommandType.SEARCH_ON_PAGE: [
+            "clica no", "clica na", "clique no", "clique em", "procura por", "procure por",
+            "busca na página", "encontra na página", "localiza", "acha na tela",
+        ],
+        CommandType.REPORT_ISSUE: [
+            "reporta o problema", "reporta um bug", "abre uma issue", "abra um chamado",
+            "registra um bug", "relata o erro", "cria uma issue sobre",
+        ],
+    }
+
+    # Connectives dropped between the command phrase and its parameter
+    PARAMETER_STOPWORDS = {
+        "o", "a", "os", "as", "do", "da", "de", "no", "na", "em", "por", "pelo",
+        "pela", "para", "pra", "um", "uma", "que", "ai", "aí",
+    }
+
+    DEFAULT_THRESHOLD = 0.75
+    DEFAULT_TOP_K = 5
+
+    # Similarity margin within which a longer command phrase is preferred
+    SPAN_TOLERANCE = 0.1
+
+    def __init__(
+        self,
+        examples: Optional[Dict[CommandType, List[str]]] = None,
+        threshold: float = DEFAULT_THRESHOLD,
+        top_k: int = DEFAULT_TOP_K,
+        ngram_range: Tuple[int, int] = (3, 5),
+        max_phrase_words: int = 6,
+    ):
+        """
+        Initialize the router and build its index.
+
+        Args:
+            examples: Carrier phrases per command type (defaults to DEFAULT_EXAMPLES)
+            threshold: Minimum cosine similarity to accept a route
+            top_k: Number of nearest examples that vote on the command type
+            ngram_range: Character n-gram sizes (inclusive)
+            max_phrase_words: Longest command phrase considered
+        """
+        self.threshold = threshold
+        self.top_k = max(1, top_k)
+        self.ngram_range = ngram_range
+        self.max_phrase_words = max(1, max_phrase_words)
+
+        self._examples: List[Tuple[str, CommandType]] = []
+        self._seen: set = set()
+        self._vocabulary: Dict[str, int] = {}
+        self._idf = None
+        self._max_idf = 1.0
+        self._matrix = None
+        self._example_words = None
+        self._stats = {"routed": 0, "rejected": 0, "trained_examples": 0}
+
+        for command_type, phrases in (examples or self.DEFAULT_EXAMPLES).items():
+            self.add_examples((phrase, command_type) for phrase in phrases)
+        self.fit()
+
+    @property
+    def available(self) -> bool:
+        """Whether the router can answer (NumPy installed and index built)"""
+        return HAS_NUMPY and self._matrix is not None
+
+    def add_examples(self, examples: Iterable[Tuple[str, CommandType]]) -> int:
+        """
+        Add labelled phrases (call fit() afterwards to rebuild the index).
+
+        Args:
+            examples: (phrase, command_type) pairs
+
+        Returns:
+            Number of new phrases added
+        """
+        added = 0
+        for phrase, command_type in examples:
+            normalized = self._normalize(phrase)
+            if not normalized or (normalized, command_type) in self._seen:
+                continue
+            self._seen.add((normalized, command_type))
+            self._examples.append((normalized, command_type))
+            added += 1
+        return added
+
+    def fit(self) -> None:
+        """Build the TF-IDF matrix over all examples"""
+        if not HAS_NUMPY:
+            logger.warning("NumPy not installed. Local intent router disabled.")
+            return
+        if not self._examples:
+            self._matrix = None
+            return
+
+        features = [self._ngram_counts(phrase) for phrase, _ in self._examples]
+        vocabulary: Dict[str, int] = {}
+        document_frequency: Dict[str, int] = {}
+        for counts in features:
+            for gram in counts:
+                if gram not in vocabulary:
+                    vocabulary[gram] = len(vocabulary)
+                document_frequency[gram] = document_frequency.get(gram, 0) + 1
+
+        total = len(features)
+        idf = np.zeros(len(vocabulary), dtype=np.float32)
+        for gram, index in vocabulary.items():
+            idf[index] = math.log((1 + total) / (1 + document_frequency[gram])) + 1.0
+
+        matrix = np.zeros((total, len(vocabulary)), dtype=np.float32)
+        for row, counts in enumerate(features):
+            for gram, count in counts.items():
+                matrix[row, vocabulary[gram]] = count
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+
+        self._vocabulary = vocabulary
+        self._idf = idf
+        self._max_idf = math.log(1 + total) + 1.0
+        self._matrix = matrix / norms
+        self._example_words = np.array(
+            [len(phrase.split()) for phrase, _ in self._examples], dtype=np.int32
+        )
+
+    def train_from_history(self, history_provider: Any, limit: int = 1000) -> int:
+        """
+        Extend the index with successful commands from the interactions history.
+
+        For commands with a parameter, the stored parameter value is removed from
+        the input to recover the carrier phrase; inputs where it cannot be found
+        are skipped.
+
+        Args:
+            history_provider: HistoryProvider to read interactions from
+            limit: Maximum number of recent interactions to read
+
+        Returns:
+            Number of new examples added
+        """
+        try:
+            history = history_provider.get_recent_history(limit=limit)
+        except Exception as e:
+            logger.warning(f"Could not load history to train the intent router: {e}")
+            return 0
+
+        examples = []
+        for item in history or []:
+            example = self._example_from_interaction(item)
+            if example is not None:
+                examples.append(example)
+
+        added = self.add_examples(examples)
+        if added:
+            self.fit()
+            self._stats["trained_examples"] += added
+            logger.info(f"Intent router trained with {added} examples from history")
+        return added
+
+    def route(self, command: str) -> Optional[RouteMatch]:
+        """
+        Route a normalized command to a command type.
+
+        Args:
+            command: Command text (wake word already removed)
+
+        Returns:
+            RouteMatch above the confidence threshold, or None
+        """
+        if not self.available:
+            return None
+
+        words = command.split()
+        if not words:
+            return None
+
+        # Candidate command phrases: leading word spans, plus the whole command
+        spans = list(range(1, min(len(words), self.max_phrase_words) + 1))
+        if len(words) not in spans:
+            spans.append(len(words))
+        queries = np.stack([self._vectorize(" ".join(words[:span])) for span in spans])
+        similarities = queries @ self._matrix.T
+        # A phrase never matches a longer example ("abra o" is not "abra o site")
+        similarities[np.array(spans)[:, None] < self._example_words[None, :]] = 0.0
+
+        # Best span; near-ties go to the longer phrase so inflected variants
+        # ("escreva pra mim" vs "escreve pra mim") keep their full phrase
+        best_scores = similarities.max(axis=1)
+        cutoff = float(best_scores.max()) - self.SPAN_TOLERANCE
+        best_span_index = max(i for i in range(len(spans)) if best_scores[i] >= cutoff)
+        row = similarities[best_span_index]
+
+        # Top-k neighbours vote on the command type, weighted by similarity
+        top = np.argsort(row)[::-1][: self.top_k]
+        votes: Dict[CommandType, float] = {}
+        for index in top:
+            if row[index] > 0:
+                command_type = self._examples[index][1]
+                votes[command_type] = votes.get(command_type, 0.0) + float(row[index])
+        if not votes:
+            self._stats["rejected"] += 1
+            return None
+
+        command_type = max(votes, key=votes.get)
+        best_index = max(
+            (index for index in top if self._examples[index][1] == command_type),
+            key=lambda index: row[index],
+        )
+        confidence = float(row[best_index])
+        parameter = self._extract_parameter(words[spans[best_span_index]:])
+
+        if confidence < self.threshold or (
+            command_type in self.PARAMETERIZED_TYPES and not parameter
+        ):
+            self._stats["rejected"] += 1
+            return None
+
+        self._stats["routed"] += 1
+        return RouteMatch(
+            command_type=command_type,
+            confidence=min(1.0, confidence),
+            parameter=parameter,
+            example=self._examples[best_index][0],
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get router counters.
+
+        Returns:
+            Dict with routed/rejected counts, index size and threshold
+        """
+        return {
+            **self._stats,
+            "available": self.available,
+            "examples": len(self._examples),
+            "features": len(self._vocabulary),
+            "threshold": self.threshold,
+        }
+
+    def _example_from_interaction(self, item: Dict[str, Any]) -> Optional[Tuple[str, CommandType]]:
+        """Derive a (carrier phrase, command type) example from a history item"""
+        if not item.get("success"):
+            return None
+        try:
+            command_type = CommandType(item.get("command_type"))
+        except ValueError:
+            return None
+        if command_type in (CommandType.CHAT, CommandType.UNKNOWN):
+            return None
+
+        phrase = self._normalize(item.get("user_input", ""))
+        if command_type in self.PARAMETERIZED_TYPES:
+            values = [
+                self._normalize(re.sub(r"^https?://", "", value))
+                for key, value in (item.get("parameters") or {}).items()
+                if key != "context" and isinstance(value, str)
+            ]
+            value = next((value for value in values if value and value in phrase), None)
+            if value is None:
+                return None
+            # Keep only the phrase that precedes the parameter
+            phrase = phrase[: phrase.find(value)].strip()
+            words = phrase.split()
+            while words and words[-1] in self.PARAMETER_STOPWORDS:
+                words.pop()
+            phrase = " ".join(words)
+
+        if not phrase or len(phrase.split()) > self.max_phrase_words:
+            return None
+        return phrase, command_type
+
+    def _extract_parameter(self, words: List[str]) -> str:
+        """Join the words after the command phrase, dropping leading connectives"""
+        start = 0
+        while start < len(words) - 1 and self._fold(words[start]) in self.PARAMETER_STOPWORDS:
+            start += 1
+        return " ".join(words[start:]).strip()
+
+    def _vectorize(self, text: str):
+        """
+        L2-normalized TF-IDF vector of a phrase over the index vocabulary.
+
+        N-grams unseen in the index still count towards the norm (at the
+        highest IDF), so words that are not part of any example lower the
+        similarity instead of being ignored.
+        """
+        vector = np.zeros(len(self._vocabulary), dtype=np.float32)
+        unseen_weight = 0.0
+        for gram, count in self._ngram_counts(self._normalize(text)).items():
+            index = self._vocabulary.get(gram)
+            if index is not None:
+                vector[index] = count * self._idf[index]
+            else:
+                unseen_weight += (count * self._max_idf) ** 2
+        norm = math.sqrt(float(vector @ vector) + unseen_weight)
+        return vector / norm if norm else vector
+
+    def _ngram_counts(self, text: str) -> Dict[str, int]:
+        """Character n-grams within word boundaries, plus whole words"""
+        counts: Dict[str, int] = {}
+        low, high = self.ngram_range
+        for word in text.split():
+            counts[word] = counts.get(word, 0) + 1
+            padded = f" {word} "
+            for size in range(low, high + 1):
+                for start in range(max(1, len(padded) - size + 1)):
+                    gram = padded[start:start + size]
+                    counts[gram] = counts.get(gram, 0) + 1
+        return counts
+
+    @staticmethod
+    def _fold(word: str) -> str:
+        """Lowercase and strip accents"""
+        decomposed = unicodedata.normalize("NFKD", word.lower())
+        return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+    @classmethod
+    def _normalize(cls, text: str) -> str:
+        """Accent-folded, lowercase text with punctuation collapsed to spaces"""
+        return re.sub(r"[^\w./:-]+", " ", cls._fold(text)).strip()
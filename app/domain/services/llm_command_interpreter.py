@@ -3,17 +3,44 @@
 
 This interpreter replaces keyword-based pattern matching with LLM-based understanding,
 providing more accurate and flexible command interpretation.
+
+Interpretation runs as a tiered pipeline so that only ambiguous inputs reach the LLM:
+1. Exact match: known parameterless phrases ("internet", "abrir navegador")
+2. Keyword: CommandInterpreter hits with confidence 1.0
+3. Memo: bounded LRU of normalized command -> Intent from previous LLM calls
+4. Router: local TF-IDF nearest-neighbour match over labelled utterances
+   (paraphrases the keyword matcher misses, e.g. "digita", "vai para o site")
+5. LLM: AI Gateway classification
+
+When a conversation instruction is supplied, the LLM tier runs in combined mode:
+a single completion either classifies an action or returns the chat reply
+(as a CHAT intent with a "response" parameter), so conversational input costs
+one round-trip instead of two. interpret_stream() does the same over a streamed
+completion: the classification comes first, then the reply is yielded as it
+is generated.
 """
 
 import asyncio
+import dataclasses
+import json
 import logging
-from typing import Optional
+import re
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple, Union
 from app.domain.models import CommandType, Intent
+from app.domain.services.intent_router import IntentRouter
 from app.adapters.infrastructure.ai_gateway import LLMProvider
 from app.core.llm_config import LLMConfig
 
 logger = logging.getLogger(__name__)
 
+# Combined-mode instruction, or an async callable that builds it on demand
+ConversationInstruction = Union[str, Callable[[], Awaitable[str]]]
+
+
+class _UnusableLLMReply(Exception):
+    """The LLM answered, but not with a confident, parseable classification"""
+
 
 class LLMCommandInterpreter:
     """
@@ -22,13 +49,36 @@ class LLMCommandInterpreter:
     than keyword matching.
     """
 
-    def __init__(self, wake_word: str = "xerife", ai_gateway=None):
+    # Exact-match tier: parameterless commands recognized without any parsing
+    EXACT_COMMANDS: Dict[str, CommandType] = {
+        "internet": CommandType.OPEN_BROWSER,
+        "navegador": CommandType.OPEN_BROWSER,
+        "abrir navegador": CommandType.OPEN_BROWSER,
+        "abrir o navegador": CommandType.OPEN_BROWSER,
+        "abra o navegador": CommandType.OPEN_BROWSER,
+        "abrir internet": CommandType.OPEN_BROWSER,
+        "abrir a internet": CommandType.OPEN_BROWSER,
+    }
+
+    def __init__(
+        self,
+        wake_word: str = "xerife",
+        ai_gateway=None,
+        enable_fast_path: Optional[bool] = None,
+        memo_size: Optional[int] = None,
+        intent_router: Optional[IntentRouter] = None,
+        enable_router: Optional[bool] = None,
+    ):
         """
         Initialize the LLM command interpreter
 
         Args:
             wake_word: The wake word to filter out from commands
             ai_gateway: AI Gateway instance for LLM integration
+            enable_fast_path: Skip the LLM on exact/keyword hits (defaults to LLMConfig.COMMAND_FAST_PATH)
+            memo_size: Maximum memoized commands, 0 disables (defaults to LLMConfig.COMMAND_MEMO_SIZE)
+            intent_router: Local intent router (defaults to one built from LLMConfig)
+            enable_router: Use the local router tier (defaults to LLMConfig.COMMAND_ROUTER when the fast path is on)
         """
         self.wake_word = wake_word
         self.ai_gateway = ai_gateway
@@ -39,38 +89,230 @@ class LLMCommandInterpreter:
         self._min_confidence = LLMConfig.MIN_COMMAND_CONFIDENCE
         self._forced_provider = self._resolve_provider(LLMConfig.COMMAND_LLM_PROVIDER)
         
+        # Tiered pipeline configuration
+        self._fast_path_enabled = (
+            LLMConfig.COMMAND_FAST_PATH if enable_fast_path is None else enable_fast_path
+        )
+        self._memo_size = max(0, LLMConfig.COMMAND_MEMO_SIZE if memo_size is None else memo_size)
+        self._intent_memo: "OrderedDict[str, Intent]" = OrderedDict()
+        
+        # Local router tier, a fast path like exact/keyword (disabled when NumPy is unavailable)
+        if enable_router is None:
+            enable_router = self._fast_path_enabled and LLMConfig.COMMAND_ROUTER
+        self._router: Optional[IntentRouter] = None
+        if enable_router:
+            self._router = intent_router or IntentRouter(
+                threshold=LLMConfig.COMMAND_ROUTER_THRESHOLD,
+                top_k=LLMConfig.COMMAND_ROUTER_TOP_K,
+            )
+            if not self._router.available:
+                self._router = None
+        
+        self._tier_hits: Dict[str, int] = {
+            "exact": 0,
+            "keyword": 0,
+            "memo": 0,
+            "router": 0,
+            "llm": 0,
+            "fallback": 0,
+        }
+        self._combined_replies = 0
+        
         if not self.ai_gateway:
             logger.warning("No AI Gateway provided, will use keyword-based fallback")
 
-    async def interpret_async(self, raw_input: str) -> Intent:
+    # Streamed replies must open with the classification within this many characters
+    MAX_STREAM_HEADER_CHARS = 2000
+
+    async def interpret_async(
+        self, raw_input: str, conversation_instruction: Optional[ConversationInstruction] = None
+    ) -> Intent:
         """
         Interpret a raw text command into a structured Intent using LLM
         
         Args:
             raw_input: Raw text from voice or text input
+            conversation_instruction: Optional persona/context instruction, or an async
+                callable building it (only awaited if the LLM tier is reached). When
+                given, conversational input is answered in the same completion and
+                returned as a CHAT intent with the reply in parameters["response"]
             
         Returns:
             Intent object with command type and parameters
         """
-        # Normalize input
-        command = raw_input.lower().strip()
+        raw_input, command = self._strip_wake_word(raw_input)
+        local_intent = self._local_interpret(raw_input, command, bool(conversation_instruction))
+        if local_intent is not None:
+            return local_intent
+        memo_key = self._normalize_for_memo(command)
+        
+        # Use AI Gateway for intent classification if available
+        if self.ai_gateway:
+            try:
+                intent = await self._llm_interpret(raw_input, command, conversation_instruction)
+                self._tier_hits["llm"] += 1
+                if "response" in intent.parameters:
+                    # Replies depend on conversation context and are never memoized
+                    self._combined_replies += 1
+                else:
+                    self._memoize_intent(memo_key, intent)
+                return intent
+            except _UnusableLLMReply as e:
+                # Not memoized: a transient bad reply must not pin the command to the fallback
+                logger.warning(f"{e}. Using fallback.")
+            except Exception as e:
+                logger.error(f"LLM interpretation failed: {e}. Using fallback.", exc_info=True)
+        
+        return self._fallback_tier(raw_input, command)
 
-        # Remove wake word if present
+    async def interpret_stream(
+        self, raw_input: str, conversation_instruction: ConversationInstruction
+    ) -> AsyncIterator[Union[str, Intent]]:
+        """
+        Interpret a command, streaming a conversational reply from the same completion
+        
+        The local tiers run first. Otherwise a single streamed completion opens
+        with the classification; for conversational input the reply that
+        follows is yielded as it arrives, for actions the stream is closed.
+        
+        Args:
+            raw_input: Raw text from voice or text input
+            conversation_instruction: Persona/context instruction, or an async
+                callable building it (only awaited if the LLM tier is reached)
+            
+        Yields:
+            Reply text deltas (conversational input only), then the Intent: a CHAT
+            intent with the full reply in parameters["response"], or an action
+        """
+        stream_completion = getattr(self.ai_gateway, "stream_completion", None)
+        if stream_completion is None:
+            yield await self.interpret_async(raw_input, conversation_instruction)
+            return
+        
+        raw_input, command = self._strip_wake_word(raw_input)
+        local_intent = self._local_interpret(raw_input, command, True)
+        if local_intent is not None:
+            yield local_intent
+            return
+        
+        if callable(conversation_instruction):
+            conversation_instruction = await conversation_instruction()
+        messages = [
+            {"role": "system", "content": self._get_system_instruction()},
+            {"role": "system", "content": conversation_instruction},
+            {"role": "user", "content": self._build_streaming_prompt(command)},
+        ]
+        
+        buffer = ""
+        intent = None
+        parts = []
+        stream = stream_completion(messages=messages, force_provider=self._forced_provider)
+        try:
+            async for event in stream:
+                if event["type"] != "delta":
+                    continue
+                if intent is not None:
+                    parts.append(event["text"])
+                    yield event["text"]
+                    continue
+                buffer += event["text"]
+                header = self._split_stream_header(buffer)
+                if header is None:
+                    if len(buffer) > self.MAX_STREAM_HEADER_CHARS:
+                        raise _UnusableLLMReply("Streamed reply did not open with a classification")
+                    continue
+                header_text, reply = header
+                intent = self._parse_llm_response(header_text, raw_input, command)
+                self._tier_hits["llm"] += 1
+                if "response" in intent.parameters:
+                    # The model put the reply inside the JSON (non-streaming format)
+                    self._combined_replies += 1
+                    yield intent.parameters["response"]
+                    yield intent
+                    return
+                if not self._is_conversational(intent):
+                    self._memoize_intent(self._normalize_for_memo(command), intent)
+                    yield intent
+                    return
+                reply = reply.lstrip()
+                if reply:
+                    parts.append(reply)
+                    yield reply
+        except _UnusableLLMReply as e:
+            logger.warning(f"{e}. Using fallback.")
+            yield self._fallback_tier(raw_input, command)
+            return
+        except Exception as e:
+            if intent is None:
+                logger.error(f"Streamed LLM interpretation failed: {e}. Using fallback.", exc_info=True)
+                yield self._fallback_tier(raw_input, command)
+                return
+            # Text already reached the caller: finish with what was streamed
+            logger.error(f"Streamed LLM reply interrupted: {e}")
+        finally:
+            await stream.aclose()
+        
+        if intent is None:
+            logger.warning("Streamed reply ended before a classification. Using fallback.")
+            yield self._fallback_tier(raw_input, command)
+            return
+        
+        reply = "".join(parts).strip().removesuffix("```").strip()
+        if not reply:
+            # The caller generates the reply separately
+            yield intent
+            return
+        self._combined_replies += 1
+        yield Intent(
+            command_type=CommandType.CHAT,
+            parameters={"response": reply, "user_input": raw_input},
+            raw_input=raw_input,
+            confidence=intent.confidence,
+        )
+
+    def _strip_wake_word(self, raw_input: str) -> Tuple[str, str]:
+        """Return the input without the wake word and its normalized command text"""
+        command = raw_input.lower().strip()
         if self.wake_word in command:
             command = command.replace(self.wake_word, "").strip()
             raw_input_lower = raw_input.lower()
             wake_pos = raw_input_lower.find(self.wake_word)
             if wake_pos != -1:
                 raw_input = raw_input[wake_pos + len(self.wake_word):].strip()
+        return raw_input, command
 
-        # Use AI Gateway for intent classification if available
+    def _local_interpret(self, raw_input: str, command: str, combined: bool) -> Optional[Intent]:
+        """
+        Run the tiers that need no LLM call (exact, keyword, memo, router)
+
+        Args:
+            raw_input: Input with the wake word removed
+            command: Normalized command text
+            combined: Whether the LLM tier would also answer conversational input
+
+        Returns:
+            Intent from the first tier that resolves the command, or None
+        """
+        # Fast path: exact-match and keyword hits never reach the LLM
+        if self._fast_path_enabled or not self.ai_gateway:
+            fast_intent = self._fast_path_interpret(raw_input, command)
+            if fast_intent is not None:
+                return fast_intent
+        
         if self.ai_gateway:
-            try:
-                return await self._llm_interpret(raw_input, command)
-            except Exception as e:
-                logger.error(f"LLM interpretation failed: {e}. Using fallback.", exc_info=True)
+            memoized = self._get_memoized_intent(self._normalize_for_memo(command), raw_input)
+            # Memoized conversational intents carry no reply; in combined mode
+            # asking the LLM once is cheaper than classifying and replying separately
+            if memoized is not None and not (combined and self._is_conversational(memoized)):
+                self._tier_hits["memo"] += 1
+                return memoized
         
-        # Fallback to keyword-based interpretation
+        # Router tier: paraphrases close to a labelled example skip the LLM
+        return self._route_interpret(raw_input, command)
+
+    def _fallback_tier(self, raw_input: str, command: str) -> Intent:
+        """Keyword-based interpretation after the LLM tier failed or was unavailable"""
+        self._tier_hits["fallback"] += 1
         if self._fallback_interpreter:
             return self._fallback_interpreter.interpret(raw_input)
         
@@ -82,6 +324,28 @@ class LLMCommandInterpreter:
             confidence=0.5,
         )
 
+    @staticmethod
+    def _split_stream_header(buffer: str) -> Optional[Tuple[str, str]]:
+        """
+        Split a streamed reply into its classification JSON and the text after it
+
+        Returns:
+            (JSON text, rest of the buffer), or None until the JSON object is complete
+        """
+        start = buffer.find("{")
+        if start == -1:
+            return None
+        try:
+            _, end = json.JSONDecoder().raw_decode(buffer, start)
+        except json.JSONDecodeError:
+            return None
+        rest = buffer[end:]
+        # Tolerate the classification wrapped in a ```json fence
+        stripped = rest.lstrip()
+        if stripped.startswith("```"):
+            rest = stripped[3:]
+        return buffer[start:end], rest
+
     def interpret(self, raw_input: str) -> Intent:
         """
         Synchronous version that uses fallback interpreter
@@ -118,24 +382,186 @@ class LLMCommandInterpreter:
             confidence=0.5,
         )
 
-    async def _llm_interpret(self, raw_input: str, normalized_command: str) -> Intent:
+    def get_tier_stats(self) -> Dict[str, int]:
+        """
+        Get per-tier hit counters for the interpretation pipeline
+
+        Returns:
+            Dict with hits per tier, total interpretations and LLM calls avoided
+        """
+        stats = dict(self._tier_hits)
+        stats["total"] = sum(self._tier_hits.values())
+        stats["llm_calls_avoided"] = stats["exact"] + stats["keyword"] + stats["memo"] + stats["router"]
+        stats["memo_size"] = len(self._intent_memo)
+        stats["combined_replies"] = self._combined_replies
+        return stats
+
+    def clear_memo(self) -> None:
+        """Clear memoized intents (e.g. after changing the classification prompt)"""
+        self._intent_memo.clear()
+
+    def train_router_from_history(self, history_provider: Any, limit: Optional[int] = None) -> int:
+        """
+        Extend the local router with successful commands from the interactions history
+
+        Args:
+            history_provider: HistoryProvider to read interactions from
+            limit: Maximum interactions to read (defaults to LLMConfig.COMMAND_ROUTER_TRAINING_LIMIT)
+
+        Returns:
+            Number of new router examples (0 when the router is disabled)
+        """
+        if self._router is None:
+            return 0
+        return self._router.train_from_history(
+            history_provider,
+            limit=LLMConfig.COMMAND_ROUTER_TRAINING_LIMIT if limit is None else limit,
+        )
+
+    def get_router_stats(self) -> Dict[str, Any]:
+        """
+        Get local router counters
+
+        Returns:
+            Router stats, or {"enabled": False} when the router tier is off
+        """
+        if self._router is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._router.get_stats()}
+
+    def _route_interpret(self, raw_input: str, normalized_command: str) -> Optional[Intent]:
+        """
+        Resolve a paraphrased command through the local router
+
+        Args:
+            raw_input: Input with the wake word removed
+            normalized_command: Normalized command text
+
+        Returns:
+            Intent for a confident route, or None to continue to the LLM
+        """
+        if self._router is None:
+            return None
+        match = self._router.route(normalized_command)
+        if match is None:
+            return None
+
+        parameter = match.parameter
+        if match.command_type == CommandType.REPORT_ISSUE:
+            # Keep the original casing of the issue description (as the keyword tier does)
+            position = raw_input.lower().rfind(parameter)
+            if position != -1:
+                parameter = raw_input[position:position + len(parameter)]
+
+        self._tier_hits["router"] += 1
+        return Intent(
+            command_type=match.command_type,
+            parameters=self._fallback_interpreter._build_parameters(
+                match.command_type, parameter, normalized_command
+            ),
+            raw_input=raw_input,
+            confidence=match.confidence,
+        )
+
+    def _fast_path_interpret(self, raw_input: str, normalized_command: str) -> Optional[Intent]:
+        """
+        Resolve unambiguous commands without an LLM call
+
+        Args:
+            raw_input: Input with the wake word removed
+            normalized_command: Normalized command text
+
+        Returns:
+            Intent for exact/keyword hits, or None if the command is ambiguous
+        """
+        exact_type = self.EXACT_COMMANDS.get(self._normalize_for_memo(normalized_command))
+        if exact_type is not None:
+            self._tier_hits["exact"] += 1
+            return Intent(
+                command_type=exact_type,
+                parameters={},
+                raw_input=raw_input,
+                confidence=1.0,
+            )
+
+        if self._fallback_interpreter:
+            keyword_intent = self._fallback_interpreter.interpret(raw_input)
+            if (
+                keyword_intent.command_type != CommandType.UNKNOWN
+                and keyword_intent.confidence >= 1.0
+            ):
+                self._tier_hits["keyword"] += 1
+                return keyword_intent
+
+        return None
+
+    @staticmethod
+    def _is_conversational(intent: Intent) -> bool:
+        """Check whether an intent should be answered conversationally"""
+        return intent.command_type in (CommandType.CHAT, CommandType.UNKNOWN)
+
+    @staticmethod
+    def _normalize_for_memo(command: str) -> str:
+        """Normalize a command for memo/exact lookups (case, whitespace, end punctuation)"""
+        command = re.sub(r"\s+", " ", command.lower()).strip()
+        return command.rstrip(".!?").strip()
+
+    def _get_memoized_intent(self, memo_key: str, raw_input: str) -> Optional[Intent]:
+        """Return a copy of the memoized intent for this command, if any"""
+        if not self._memo_size or not memo_key:
+            return None
+        intent = self._intent_memo.get(memo_key)
+        if intent is None:
+            return None
+        self._intent_memo.move_to_end(memo_key)
+        return dataclasses.replace(
+            intent,
+            parameters=dict(intent.parameters),
+            raw_input=raw_input,
+        )
+
+    def _memoize_intent(self, memo_key: str, intent: Intent) -> None:
+        """Store an LLM-classified intent, evicting the least recently used entry"""
+        if not self._memo_size or not memo_key:
+            return
+        self._intent_memo[memo_key] = dataclasses.replace(intent, parameters=dict(intent.parameters))
+        self._intent_memo.move_to_end(memo_key)
+        while len(self._intent_memo) > self._memo_size:
+            self._intent_memo.popitem(last=False)
+
+    async def _llm_interpret(
+        self,
+        raw_input: str,
+        normalized_command: str,
+        conversation_instruction: Optional[ConversationInstruction] = None,
+    ) -> Intent:
         """
         Use LLM to interpret command with high accuracy
         
         Args:
             raw_input: Original raw input
             normalized_command: Normalized command text
+            conversation_instruction: Optional persona/context for combined mode
             
         Returns:
             Intent object classified by LLM
+            
+        Raises:
+            _UnusableLLMReply: If the reply is empty, unparseable or not confident enough
         """
+        if callable(conversation_instruction):
+            conversation_instruction = await conversation_instruction()
+        
         # Build prompt for LLM to classify command
-        classification_prompt = self._build_classification_prompt(normalized_command)
+        combined = bool(conversation_instruction)
+        classification_prompt = self._build_classification_prompt(normalized_command, combined)
         
         messages = [
             {"role": "system", "content": self._get_system_instruction()},
-            {"role": "user", "content": classification_prompt}
         ]
+        if combined:
+            messages.append({"role": "system", "content": conversation_instruction})
+        messages.append({"role": "user", "content": classification_prompt})
         
         # Get LLM response
         result = await self.ai_gateway.generate_completion(
@@ -148,14 +574,15 @@ class LLMCommandInterpreter:
         # Parse response to extract intent
         response_text = self._extract_response_text(result)
         if not response_text:
-            logger.warning("Empty response from LLM, using fallback")
-            return self._fallback_interpretation(raw_input)
+            raise _UnusableLLMReply("Empty response from LLM")
         
         # Parse LLM response into Intent
         return self._parse_llm_response(response_text, raw_input, normalized_command)
 
-    def _build_classification_prompt(self, command: str) -> str:
-        """Build classification prompt for LLM"""
+    def _build_classification_prompt(self, command: str, combined: bool = False) -> str:
+        """Build classification prompt for LLM (combined mode also asks for the chat reply)"""
+        if combined:
+            return self._build_combined_prompt(command)
         return f"""Classifique o seguinte comando e extraia os parâmetros:
 
 Comando: "{command}"
@@ -183,6 +610,69 @@ Exemplos de parâmetros:
 - OPEN_URL: {{"url": "url completa"}}
 - SEARCH_ON_PAGE: {{"search_text": "texto a buscar"}}
 - REPORT_ISSUE: {{"issue_description": "descrição", "context": "contexto"}}
+"""
+
+    def _build_combined_prompt(self, command: str) -> str:
+        """Build prompt that classifies the command or answers it in a single completion"""
+        return f"""Classifique o seguinte comando e extraia os parâmetros. Se for conversa, responda ao usuário:
+
+Comando: "{command}"
+
+Tipos de comando disponíveis:
+- TYPE_TEXT: digitar texto (ex: "escreva olá", "digite meu nome")
+- PRESS_KEY: pressionar tecla (ex: "aperte enter", "pressione F5")
+- OPEN_BROWSER: abrir navegador (ex: "internet", "abrir navegador")
+- OPEN_URL: abrir site (ex: "site google.com", "abrir youtube")
+- SEARCH_ON_PAGE: buscar na página (ex: "procurar login", "clicar em botão")
+- REPORT_ISSUE: reportar problema (ex: "reportar bug", "criar issue")
+- CHAT: conversa, pergunta ou pedido que não é uma ação (ex: "bom dia", "quem é você?")
+
+Responda APENAS em formato JSON:
+{{
+  "command_type": "TIPO_DO_COMANDO",
+  "parameters": {{"chave": "valor"}},
+  "confidence": 0.0-1.0,
+  "reasoning": "breve explicação",
+  "response": "resposta ao usuário (apenas para CHAT)"
+}}
+
+Exemplos de parâmetros:
+- TYPE_TEXT: {{"text": "texto a digitar"}}
+- PRESS_KEY: {{"key": "nome da tecla"}}
+- OPEN_URL: {{"url": "url completa"}}
+- SEARCH_ON_PAGE: {{"search_text": "texto a buscar"}}
+- REPORT_ISSUE: {{"issue_description": "descrição", "context": "contexto"}}
+- CHAT: {{}} (a resposta vai no campo "response", seguindo a personalidade indicada)
+"""
+
+    def _build_streaming_prompt(self, command: str) -> str:
+        """Build prompt whose classification line precedes a streamed chat reply"""
+        return f"""Classifique o seguinte comando e extraia os parâmetros. Se for conversa, responda ao usuário:
+
+Comando: "{command}"
+
+Tipos de comando disponíveis:
+- TYPE_TEXT: digitar texto (ex: "escreva olá", "digite meu nome")
+- PRESS_KEY: pressionar tecla (ex: "aperte enter", "pressione F5")
+- OPEN_BROWSER: abrir navegador (ex: "internet", "abrir navegador")
+- OPEN_URL: abrir site (ex: "site google.com", "abrir youtube")
+- SEARCH_ON_PAGE: buscar na página (ex: "procurar login", "clicar em botão")
+- REPORT_ISSUE: reportar problema (ex: "reportar bug", "criar issue")
+- CHAT: conversa, pergunta ou pedido que não é uma ação (ex: "bom dia", "quem é você?")
+
+Formato da resposta:
+1. Primeira linha: APENAS um JSON em uma única linha, sem markdown:
+{{"command_type": "TIPO_DO_COMANDO", "parameters": {{"chave": "valor"}}, "confidence": 0.0-1.0}}
+2. Apenas para CHAT: a partir da segunda linha, a resposta ao usuário em texto puro,
+seguindo a personalidade indicada. Para os demais tipos, não escreva nada após o JSON.
+
+Exemplos de parâmetros:
+- TYPE_TEXT: {{"text": "texto a digitar"}}
+- PRESS_KEY: {{"key": "nome da tecla"}}
+- OPEN_URL: {{"url": "url completa"}}
+- SEARCH_ON_PAGE: {{"search_text": "texto a buscar"}}
+- REPORT_ISSUE: {{"issue_description": "descrição", "context": "contexto"}}
+- CHAT: {{}}
 """
 
     def _get_system_instruction(self) -> str:
@@ -193,6 +683,8 @@ Seja preciso e confiante. Se não tiver certeza, use confidence < 0.7."""
 
     def _extract_response_text(self, result: dict) -> Optional[str]:
         """Extract response text from AI Gateway result"""
+        if not isinstance(result, dict):
+            return None
         provider = result.get("provider")
         response = result.get("response")
         
@@ -218,7 +710,12 @@ Seja preciso e confiante. Se não tiver certeza, use confidence < 0.7."""
         raw_input: str, 
         normalized_command: str
     ) -> Intent:
-        """Parse LLM JSON response into Intent"""
+        """
+        Parse LLM JSON response into Intent
+        
+        Raises:
+            _UnusableLLMReply: If the reply is not a confident, valid classification
+        """
         import json
         
         try:
@@ -235,11 +732,10 @@ Seja preciso e confiante. Se não tiver certeza, use confidence < 0.7."""
             # Map string command type to enum
             command_type_raw = data.get("command_type", "UNKNOWN")
             if not isinstance(command_type_raw, str):
-                logger.warning(
+                raise _UnusableLLMReply(
                     "Command type from LLM must be a string, got "
                     f"{type(command_type_raw).__name__}"
                 )
-                return self._fallback_interpretation(raw_input)
             
             command_type_str = command_type_raw.upper()
             try:
@@ -252,15 +748,26 @@ Seja preciso e confiante. Se não tiver certeza, use confidence < 0.7."""
             confidence = float(data.get("confidence", 0.7))
             
             if confidence < self._min_confidence:
-                logger.warning(
-                    f"LLM confidence {confidence:.2f} below minimum "
-                    f"{self._min_confidence:.2f}. Using fallback."
+                raise _UnusableLLMReply(
+                    f"LLM confidence {confidence:.2f} below minimum {self._min_confidence:.2f}"
                 )
-                return self._fallback_interpretation(raw_input)
             
             logger.info(f"LLM classified as {command_type} with {confidence:.2f} confidence")
             logger.debug(f"LLM reasoning: {data.get('reasoning', 'N/A')}")
             
+            reply = data.get("response")
+            if command_type in (CommandType.CHAT, CommandType.UNKNOWN):
+                if isinstance(reply, str) and reply.strip():
+                    return Intent(
+                        command_type=CommandType.CHAT,
+                        parameters={"response": reply.strip(), "user_input": raw_input},
+                        raw_input=raw_input,
+                        confidence=confidence,
+                    )
+                # Without a reply the caller must generate one separately
+                command_type = CommandType.UNKNOWN
+                parameters = parameters or {"raw_command": normalized_command}
+            
             return Intent(
                 command_type=command_type,
                 parameters=parameters,
@@ -269,9 +776,8 @@ Seja preciso e confiante. Se não tiver certeza, use confidence < 0.7."""
             )
             
         except (json.JSONDecodeError, ValueError) as e:
-            logger.error(f"Failed to parse LLM response: {e}")
             logger.error(f"Response was: {response_text}")
-            return self._fallback_interpretation(raw_input)
+            raise _UnusableLLMReply(f"Failed to parse LLM response: {e}") from e
 
     def _fallback_interpretation(self, raw_input: str) -> Intent:
         """Fallback when LLM fails"""
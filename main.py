@@ -35,7 +35,13 @@ def start_cloud():
     
     port = int(os.getenv("PORT", 8000))
     print(f"🚀 Jarvis Online na Nuvem - Porta {port}")
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        proxy_headers=True,
+        forwarded_allow_ips=settings.forwarded_allow_ips,
+    )
 
 if __name__ == "__main__":
     if os.getenv("PORT"):
@@ -0,0 +1,26 @@
+-- Migration: Claim queue columns for interactions
+-- Description: Lets several workers lease pending commands without claiming the same row
+-- Version: 003
+-- Date: 2026-10-16
+--
+-- The API applies the same changes on startup (SQLiteHistoryAdapter); this script
+-- is for databases managed by hand (e.g., Supabase).
+
+ALTER TABLE interactions ADD COLUMN IF NOT EXISTS claimed_by VARCHAR;
+ALTER TABLE interactions ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP;
+ALTER TABLE interactions ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0;
+
+-- Older versions logged executed interactions with the default status 'pending'.
+-- Only queued commands have neither a success flag nor a response: close the rest
+-- before workers start claiming, or they would replay the whole history.
+UPDATE interactions
+SET status = CASE WHEN success THEN 'completed' ELSE 'failed' END,
+    processed_at = COALESCE(processed_at, timestamp)
+WHERE status = 'pending' AND (success OR response_text <> '');
+
+-- Serves claim_batch(): status = 'pending' (or expired 'processing') ORDER BY timestamp
+CREATE INDEX IF NOT EXISTS ix_interactions_status_timestamp ON interactions(status, timestamp);
+
+COMMENT ON COLUMN interactions.claimed_by IS 'Worker holding the lease on a processing command';
+COMMENT ON COLUMN interactions.lease_expires_at IS 'When an unfinished command becomes claimable again';
+COMMENT ON COLUMN interactions.attempts IS 'Number of times the command was claimed';
@@ -0,0 +1,20 @@
+-- Migration: Keyset pagination indexes for history and thought logs
+-- Description: Lets history and thought-log listings seek to a page instead of scanning
+-- Version: 004
+-- Date: 2026-10-16
+--
+-- The API creates the same indexes on startup (SQLiteHistoryAdapter); this script
+-- is for databases managed by hand (e.g., Supabase). Pages are ordered by
+-- (timestamp, id), so every index ends with the id tie-breaker.
+
+-- Serves get_recent_history(): ORDER BY timestamp DESC, id DESC [WHERE timestamp range]
+CREATE INDEX IF NOT EXISTS ix_interactions_timestamp_id ON interactions(timestamp, id);
+-- Serves get_recent_history(command_type=...)
+CREATE INDEX IF NOT EXISTS ix_interactions_command_type_timestamp ON interactions(command_type, timestamp, id);
+
+-- Serves get_recent_thoughts(): ORDER BY created_at DESC, id DESC
+CREATE INDEX IF NOT EXISTS ix_thought_logs_created_at_id ON thought_logs(created_at, id);
+-- Serves get_recent_thoughts(status=...)
+CREATE INDEX IF NOT EXISTS ix_thought_logs_status_created_at ON thought_logs(status, created_at, id);
+-- Serves get_session_thoughts(): WHERE session_id = ... ORDER BY created_at, id
+CREATE INDEX IF NOT EXISTS ix_thought_logs_session_created_at ON thought_logs(session_id, created_at, id);
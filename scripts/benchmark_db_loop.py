@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Concurrency benchmark for database calls made from async handlers.
+
+Runs N concurrent "requests" that each call SQLiteHistoryAdapter, while a
+heartbeat task measures how late the event loop wakes it up (loop lag):
+
+- before: the adapter is called directly from the coroutine (blocks the loop)
+- after: the call goes through AsyncDatabaseProxy on a DatabaseExecutor
+
+Each query is padded with --query-latency-ms of blocking sleep to simulate a
+remote Postgres round-trip on top of the local SQLite work.
+
+Usage:
+    python scripts/benchmark_db_loop.py [--requests 50] [--query-latency-ms 20] [--workers 8]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.adapters.infrastructure.db_executor import AsyncDatabaseProxy, DatabaseExecutor  # noqa: E402
+from app.adapters.infrastructure.sqlite_history_adapter import SQLiteHistoryAdapter  # noqa: E402
+
+HEARTBEAT_SECONDS = 0.005
+
+
+class SlowHistoryAdapter(SQLiteHistoryAdapter):
+    """History adapter with simulated network latency per query"""
+
+    def __init__(self, db_path: str, latency_seconds: float):
+        super().__init__(db_path=db_path)
+        self.latency_seconds = latency_seconds
+
+    def get_recent_history(self, limit: int = 10):
+        time.sleep(self.latency_seconds)
+        return super().get_recent_history(limit=limit)
+
+
+async def heartbeat(lags: list, stop: asyncio.Event) -> None:
+    """Record how late each scheduled wake-up is"""
+    while not stop.is_set():
+        expected = time.perf_counter() + HEARTBEAT_SECONDS
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run_scenario(handler, requests: int) -> dict:
+    """Run concurrent handlers and collect wall time and loop lag"""
+    lags: list = []
+    stop = asyncio.Event()
+    monitor = asyncio.create_task(heartbeat(lags, stop))
+    await asyncio.sleep(HEARTBEAT_SECONDS * 2)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handler() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await monitor
+    lags.sort()
+    return {
+        "elapsed_ms": elapsed * 1000,
+        "max_lag_ms": lags[-1] * 1000 if lags else 0.0,
+        "p95_lag_ms": lags[int(0.95 * (len(lags) - 1))] * 1000 if lags else 0.0,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        adapter = SlowHistoryAdapter(
+            os.path.join(tmp_dir, "benchmark.db"), args.query_latency_ms / 1000
+        )
+        for index in range(20):
+            adapter.save_interaction(
+                user_input=f"comando {index}",
+                command_type="type_text",
+                parameters={"text": str(index)},
+                success=True,
+                response_text="ok",
+            )
+
+        executor = DatabaseExecutor(max_workers=args.workers)
+        history = AsyncDatabaseProxy(adapter, executor)
+
+        async def blocking_handler():
+            adapter.get_recent_history(limit=5)
+
+        async def executor_handler():
+            await history.get_recent_history(limit=5)
+
+        before = await run_scenario(blocking_handler, args.requests)
+        after = await run_scenario(executor_handler, args.requests)
+        executor.shutdown()
+
+    print(f"Requests: {args.requests}, query latency: {args.query_latency_ms} ms, workers: {args.workers}")
+    for label, result in (("Before (blocking on loop)", before), ("After  (DatabaseExecutor)", after)):
+        print(
+            f"{label}: total {result['elapsed_ms']:8.1f} ms | "
+            f"loop lag p95 {result['p95_lag_ms']:7.1f} ms, max {result['max_lag_ms']:7.1f} ms"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--query-latency-ms", type=float, default=20.0)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Serialization and payload-size benchmark for large API responses.
+
+Builds a synthetic /v1/thoughts/mission/{id} payload (thought logs with long
+problem/solution texts) and compares:
+
+- serialization time: stdlib encoder (JSONResponse) vs dumps_json (orjson
+  when installed)
+- payload size: raw JSON vs gzip at the level used by SelectiveGZipMiddleware
+- time to first chunk: full document vs stream_json_list
+
+Usage:
+    python scripts/benchmark_json_responses.py [--logs 2000] [--iterations 20]
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.adapters.infrastructure.json_responses import (  # noqa: E402
+    HAS_ORJSON,
+    _iter_json_list,
+    _stdlib_dumps,
+    dumps_json,
+)
+
+GZIP_LEVEL = 6
+
+
+def build_logs(count: int) -> list:
+    """Synthetic thought logs shaped like ThoughtLogResponse"""
+    now = datetime.now().isoformat()
+    return [
+        {
+            "id": index,
+            "mission_id": f"mission-{index // 50}",
+            "session_id": f"session-{index // 10}",
+            "status": "internal_monologue",
+            "thought_process": f"Analisando falha {index}: verificando dependências e logs do worker. " * 4,
+            "problem_description": f"Teste test_module_{index % 37} falhou com AssertionError",
+            "solution_attempt": "Ajustar importação e repetir a execução do pipeline de CI",
+            "success": index % 3 == 0,
+            "error_message": None if index % 3 == 0 else "AssertionError: expected 200, got 500",
+            "retry_count": index % 4,
+            "requires_human": index % 11 == 0,
+            "escalation_reason": None,
+            "created_at": now,
+        }
+        for index in range(count)
+    ]
+
+
+def time_it(func, iterations: int) -> float:
+    """Average wall time of func() in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) * 1000 / iterations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logs", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    logs = build_logs(args.logs)
+    payload = {"logs": logs, "total": len(logs)}
+
+    stdlib_ms = time_it(lambda: _stdlib_dumps(payload), args.iterations)
+    fast_ms = time_it(lambda: dumps_json(payload), args.iterations)
+    raw = dumps_json(payload)
+    gzip_ms = time_it(lambda: gzip.compress(raw, compresslevel=GZIP_LEVEL), args.iterations)
+    compressed = gzip.compress(raw, compresslevel=GZIP_LEVEL)
+
+    def first_chunk() -> bytes:
+        chunks = _iter_json_list({"total": len(logs)}, "logs", logs, lambda item: item, 100)
+        next(chunks)
+        return next(chunks)
+
+    first_chunk_ms = time_it(first_chunk, args.iterations)
+
+    print(f"Thought logs: {args.logs}, iterations: {args.iterations}, orjson: {'yes' if HAS_ORJSON else 'no'}")
+    print(f"Serialize (stdlib json):   {stdlib_ms:8.2f} ms")
+    print(f"Serialize (dumps_json):    {fast_ms:8.2f} ms  ({stdlib_ms / max(fast_ms, 1e-9):.1f}x)")
+    print(f"Gzip level {GZIP_LEVEL}:              {gzip_ms:8.2f} ms")
+    print(f"Payload raw:               {len(raw) / 1024:8.1f} KiB")
+    print(f"Payload gzip:              {len(compressed) / 1024:8.1f} KiB  ({len(raw) / len(compressed):.1f}x smaller)")
+    print(f"First chunk (streamed):    {first_chunk_ms:8.2f} ms  vs full document {fast_ms:.2f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
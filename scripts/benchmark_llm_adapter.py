@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Microbenchmark for LLMCommandAdapter per-call overhead.
+
+Compares the work done around each Gemini call before and after request
+templates and the rolling context buffer:
+
+- before: build Tool + GenerateContentConfig and query the last 3 commands
+  from history on every call
+- after: reuse the adapter's templates and read context from the buffer
+
+The Gemini client is never called, so only local overhead is measured.
+
+Usage:
+    python scripts/benchmark_llm_adapter.py [--iterations 2000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google import genai  # noqa: E402
+
+from app.adapters.infrastructure.gemini_adapter import LLMCommandAdapter  # noqa: E402
+from app.adapters.infrastructure.sqlite_history_adapter import SQLiteHistoryAdapter  # noqa: E402
+
+
+def build_adapter(db_path: str) -> LLMCommandAdapter:
+    """Create an adapter backed by a populated SQLite history"""
+    history = SQLiteHistoryAdapter(db_path=db_path)
+    for index in range(50):
+        history.save_interaction(
+            user_input=f"escreva teste {index}",
+            command_type="type_text",
+            parameters={"text": f"teste {index}"},
+            success=index % 5 != 0,
+            response_text="ok",
+        )
+    with patch.object(genai, "Client"):
+        return LLMCommandAdapter(api_key="benchmark", history_provider=history)
+
+
+def legacy_call_overhead(adapter: LLMCommandAdapter) -> None:
+    """Per-call work of the previous implementation"""
+    recent_history = adapter.history_provider.get_recent_history(limit=3)
+    context_lines = ["Contexto (últimos comandos executados):"]
+    for item in reversed(recent_history):
+        status = "sucesso" if item.get("success", False) else "falhou"
+        context_lines.append(
+            f"- '{item.get('user_input', '')}' -> {item.get('command_type', 'unknown')} ({status})"
+        )
+    "\n".join(context_lines)
+    tools = [genai.types.Tool(function_declarations=adapter.functions)]
+    genai.types.GenerateContentConfig(system_instruction=adapter.system_instruction, tools=tools)
+
+
+def template_call_overhead(adapter: LLMCommandAdapter) -> None:
+    """Per-call work with templates and the rolling context buffer"""
+    adapter._build_context_message()
+    adapter.command_config  # noqa: B018
+
+
+def measure(func, adapter: LLMCommandAdapter, iterations: int) -> float:
+    """Return the mean time per call in microseconds"""
+    func(adapter)  # warm-up (also seeds the context buffer)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(adapter)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        adapter = build_adapter(os.path.join(tmp_dir, "benchmark.db"))
+        before = measure(legacy_call_overhead, adapter, args.iterations)
+        after = measure(template_call_overhead, adapter, args.iterations)
+
+    print(f"Iterations: {args.iterations}")
+    print(f"Before (rebuild templates + history query): {before:10.1f} µs/call")
+    print(f"After  (precompiled templates + buffer):    {after:10.1f} µs/call")
+    print(f"Speedup: {before / after:.0f}x" if after else "Speedup: n/a")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
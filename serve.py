@@ -13,8 +13,10 @@ import os
 import sys
 
 import uvicorn
+from fastapi import FastAPI
 
 from app.adapters.infrastructure import create_api_server
+from app.adapters.infrastructure.state_store import get_state_store
 from app.container import create_edge_container
 from app.core.config import settings
 
@@ -31,15 +33,11 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main() -> None:
+def create_app() -> FastAPI:
     """
-    Main entry point for API server.
-    Initializes the assistant service and starts the FastAPI server.
+    Build the assistant service and the FastAPI application.
+    Used directly by main() and as the uvicorn factory in each worker process.
     """
-    logger.info("Starting Jarvis Assistant API Server (Headless Mode)")
-    logger.info(f"Wake word: {settings.wake_word}")
-    logger.info(f"Language: {settings.language}")
-
     # Headless safety: Set environment variables to prevent GUI windows
     # This prevents PyAutoGUI and other libraries from showing error dialogs
     os.environ["DISPLAY"] = os.environ.get("DISPLAY", "")
@@ -84,7 +82,17 @@ def main() -> None:
         logger.warning(f"Could not check action availability: {e}")
 
     # Create FastAPI application
-    app = create_api_server(assistant, extension_manager)
+    return create_api_server(assistant, extension_manager)
+
+
+def main() -> None:
+    """
+    Main entry point for API server.
+    Initializes the assistant service and starts the FastAPI server.
+    """
+    logger.info("Starting Jarvis Assistant API Server (Headless Mode)")
+    logger.info(f"Wake word: {settings.wake_word}")
+    logger.info(f"Language: {settings.language}")
 
     # Get server configuration from environment
     # Render uses PORT, but support API_PORT for backward compatibility
@@ -94,13 +102,40 @@ def main() -> None:
     logger.info(f"Starting server on {host}:{port}")
     logger.info(f"API Documentation available at http://localhost:{port}/docs")
 
+    # Several workers only make sense when they share state
+    workers = max(1, settings.api_workers)
+    if workers > 1 and not get_state_store().shared:
+        logger.warning(
+            f"API_WORKERS={workers} requires a shared STATE_BACKEND_URL "
+            "(e.g. sqlite:///data/state.db) - starting a single worker"
+        )
+        workers = 1
+
+    if workers > 1:
+        logger.info(f"Starting {workers} workers (state backend: {settings.state_backend_url})")
+        uvicorn.run(
+            "serve:create_app",
+            factory=True,
+            workers=workers,
+            host=host,
+            port=port,
+            log_level="info",
+            access_log=True,
+            proxy_headers=True,
+            forwarded_allow_ips=settings.forwarded_allow_ips,
+        )
+        return
+
     # Start uvicorn server
     uvicorn.run(
-        app,
+        create_app(),
         host=host,
         port=port,
         log_level="info",
         access_log=True,
+        # Client IPs (login limiter, logs) come from X-Forwarded-For sent by trusted proxies
+        proxy_headers=True,
+        forwarded_allow_ips=settings.forwarded_allow_ips,
     )
 
 
@@ -0,0 +1,1176 @@
+// Authentication management
+const AUTH_TOKEN_KEY = 'jarvis_auth_token';
+const AUTH_USER_KEY = 'jarvis_auth_user';
+const TOKEN_EXPIRY_KEY = 'jarvis_token_expiry';
+const ACTIVITY_TIMEOUT = 30 * 60 * 1000; // 30 minutes
+let lastActivity = Date.now();
+let activityCheckInterval;
+
+// UI Elements
+const loginModal = document.getElementById('loginModal');
+const mainInterface = document.getElementById('mainInterface');
+const loginForm = document.getElementById('loginForm');
+const loginError = document.getElementById('loginError');
+const userDisplay = document.getElementById('userDisplay');
+const logoutBtn = document.getElementById('logoutBtn');
+const terminal = document.getElementById('terminal');
+const commandInput = document.getElementById('commandInput');
+const sendButton = document.getElementById('sendButton');
+const voiceButton = document.getElementById('voiceButton');
+const loading = document.getElementById('loading');
+const passwordToggle = document.getElementById('passwordToggle');
+const passwordInput = document.getElementById('password');
+
+// Voice recognition - V.A.S. (Voice Activated System)
+let recognition = null;
+let isRecording = false;
+let vasState = 'listening'; // 'muted', 'listening' (wake word detection), 'transcribing'
+let silenceTimer = null;
+const SILENCE_TIMEOUT = 3000; // 3 seconds
+// Wake word detection works with Portuguese pronunciation since lang='pt-BR'
+// Both app name (jarvis) and user-configured wake word (e.g., xerife) are supported
+const WAKE_WORDS = ['jarvis']; // Will be updated with configured wake_word from /v1/status
+let lastSpeechTime = Date.now();
+let resultIndex = 0; // Track the last processed result index to avoid echo
+
+// Voice synthesis
+function speak(text) {
+    if ('speechSynthesis' in window) {
+        // Cancel any ongoing speech
+        window.speechSynthesis.cancel();
+
+        const utterance = new SpeechSynthesisUtterance(text);
+        utterance.lang = 'pt-BR'; // Portuguese Brazilian
+        utterance.rate = 1.0;
+        utterance.pitch = 1.0;
+        utterance.volume = 1.0;
+
+        window.speechSynthesis.speak(utterance);
+    }
+}
+
+// Queue speech without interrupting what is already being spoken
+function speakQueued(text) {
+    if ('speechSynthesis' in window && text.trim()) {
+        const utterance = new SpeechSynthesisUtterance(text);
+        utterance.lang = 'pt-BR';
+        utterance.rate = 1.0;
+        utterance.pitch = 1.0;
+        utterance.volume = 1.0;
+        window.speechSynthesis.speak(utterance);
+    }
+}
+
+// Split streamed text into complete sentences and the unfinished remainder
+function splitSentences(text) {
+    const sentences = [];
+    const pattern = /[^.!?\n]+[.!?\n]+(\s+|$)/g;
+    let lastIndex = 0;
+    let match;
+    while ((match = pattern.exec(text)) !== null) {
+        sentences.push(match[0]);
+        lastIndex = pattern.lastIndex;
+    }
+    return { sentences, rest: text.slice(lastIndex) };
+}
+
+// Generate time-based greeting
+function getGreeting() {
+    const hour = new Date().getHours();
+    let timeGreeting;
+
+    if (hour >= 5 && hour < 12) {
+        timeGreeting = 'Bom dia';
+    } else if (hour >= 12 && hour < 18) {
+        timeGreeting = 'Boa tarde';
+    } else {
+        timeGreeting = 'Boa noite';
+    }
+
+    const welcomeMessages = [
+        'Bem-vindo de volta',
+        'É bom ter você de volta',
+        'Prazer em vê-lo novamente',
+        'Sistemas online e prontos'
+    ];
+
+    const randomWelcome = welcomeMessages[Math.floor(Math.random() * welcomeMessages.length)];
+
+    return `${timeGreeting}. ${randomWelcome}.`;
+}
+
+// Initialize Web Speech API for V.A.S.
+if ('webkitSpeechRecognition' in window || 'SpeechRecognition' in window) {
+    const SpeechRecognition = window.SpeechRecognition || window.webkitSpeechRecognition;
+    recognition = new SpeechRecognition();
+    recognition.continuous = true; // Continuous mode for wake word detection
+    recognition.interimResults = true; // Get interim results for real-time transcription
+    recognition.lang = 'pt-BR'; // Portuguese Brazilian
+
+    recognition.onresult = (event) => {
+        // Process only new results to avoid echo
+        for (let i = resultIndex; i < event.results.length; i++) {
+            const result = event.results[i];
+            const transcript = result[0].transcript.trim().toLowerCase();
+
+            lastSpeechTime = Date.now();
+
+            if (vasState === 'listening') {
+                // Wake word detection mode - check for any wake word
+                const detectedWakeWord = WAKE_WORDS.find(word => transcript.includes(word));
+                if (detectedWakeWord) {
+                    // Wake word detected! Switch to transcribing mode
+                    vasState = 'transcribing';
+                    updateVoiceButtonState();
+                    commandInput.classList.add('voice-active');
+                    addMessage(`Wake word "${detectedWakeWord}" detected. Transcribing...`, 'system');
+                    // Clear the wake word from input and reset result index
+                    commandInput.value = '';
+                    resultIndex = event.results.length; // Skip all results up to this point
+                    break; // Exit loop after detecting wake word
+                }
+            } else if (vasState === 'transcribing') {
+                // Transcription mode - write to input box
+                if (result.isFinal) {
+                    // Final result - append to input
+                    const currentValue = commandInput.value;
+                    const newText = result[0].transcript.trim();
+                    commandInput.value = currentValue ? currentValue + ' ' + newText : newText;
+                    resultIndex = i + 1; // Mark this result as processed
+                }
+            }
+        }
+
+        // Reset silence timer when speech is detected (outside loop)
+        if (silenceTimer) {
+            clearTimeout(silenceTimer);
+        }
+
+        // Start silence detection for transcribing state (outside loop to avoid multiple timers)
+        if (vasState === 'transcribing') {
+            silenceTimer = setTimeout(() => {
+                handleSilence();
+            }, SILENCE_TIMEOUT);
+
+            // Visual feedback during speech
+            commandInput.classList.add('voice-active');
+        }
+    };
+
+    recognition.onerror = (event) => {
+        console.error('Speech recognition error:', event.error);
+
+        // Don't show error message for 'no-speech' - it's expected during listening
+        if (event.error !== 'no-speech') {
+            addMessage(`Voice error: ${event.error}`, 'system');
+        }
+
+        // Reset state on certain errors
+        if (event.error === 'not-allowed' || event.error === 'service-not-allowed') {
+            vasState = 'muted';
+            isRecording = false;
+            updateVoiceButtonState();
+            addMessage('Microphone access denied. Please allow microphone permissions.', 'system');
+        }
+    };
+
+    recognition.onend = () => {
+        // Only stop if we're in muted state, otherwise restart for continuous listening
+        if (vasState === 'listening' && isRecording) {
+            // Restart for continuous wake word detection
+            try {
+                recognition.start();
+            } catch (e) {
+                // Ignore if already started; log other errors
+                if (e.name !== 'InvalidStateError') {
+                    console.error('Recognition restart error:', e);
+                }
+            }
+        } else if (vasState === 'transcribing' && isRecording) {
+            // Keep transcribing until manually stopped or silence detected
+            try {
+                recognition.start();
+            } catch (e) {
+                // Ignore if already started; log other errors
+                if (e.name !== 'InvalidStateError') {
+                    console.error('Recognition restart error:', e);
+                }
+            }
+        } else {
+            isRecording = false;
+            updateVoiceButtonState();
+        }
+    };
+
+    recognition.onstart = () => {
+        isRecording = true;
+    };
+} else {
+    // Browser doesn't support Speech API - show fallback message
+    addMessage('Comando de voz indisponível neste ambiente', 'system');
+    voiceButton.style.display = 'none';
+}
+
+// Handle silence detection
+function handleSilence() {
+    if (vasState === 'transcribing') {
+        // Silence detected - return to wake word listening mode
+        vasState = 'listening';
+        updateVoiceButtonState();
+        commandInput.classList.remove('voice-active');
+        addMessage('Silence detected. Returning to wake word mode...', 'system');
+        // Reset result index for clean state
+        resultIndex = 0;
+    }
+}
+
+// Update voice button visual state
+function updateVoiceButtonState() {
+    // Remove all state classes
+    voiceButton.classList.remove('muted', 'listening', 'transcribing', 'recording');
+
+    // Add current state class
+    voiceButton.classList.add(vasState);
+
+    // Update button icon/text based on state
+    if (vasState === 'muted') {
+        voiceButton.innerHTML = '🔇';
+        voiceButton.title = 'Microphone Off - Click to enable wake word detection';
+    } else if (vasState === 'listening') {
+        voiceButton.innerHTML = '🎤';
+        const wakeWordsDisplay = WAKE_WORDS.join('" or "');
+        voiceButton.title = `Listening for wake word "${wakeWordsDisplay}" - Click to mute`;
+    } else if (vasState === 'transcribing') {
+        voiceButton.innerHTML = '🔴';
+        voiceButton.title = 'Transcribing - Click to stop';
+    }
+}
+
+// Check authentication on load
+function checkAuth() {
+    const token = localStorage.getItem(AUTH_TOKEN_KEY);
+    const expiry = localStorage.getItem(TOKEN_EXPIRY_KEY);
+
+    if (token && expiry && Date.now() < parseInt(expiry)) {
+        const user = localStorage.getItem(AUTH_USER_KEY);
+        showMainInterface(user);
+        startActivityMonitoring();
+        return true;
+    } else {
+        logout();
+        return false;
+    }
+}
+
+// Login function
+async function login(username, password) {
+    try {
+        const formData = new URLSearchParams();
+        formData.append('username', username);
+        formData.append('password', password);
+
+        const response = await fetch('/token', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/x-www-form-urlencoded',
+            },
+            body: formData
+        });
+
+        if (!response.ok) {
+            throw new Error('Invalid credentials');
+        }
+
+        const data = await response.json();
+
+        // Store token and expiry (24 hours)
+        localStorage.setItem(AUTH_TOKEN_KEY, data.access_token);
+        localStorage.setItem(AUTH_USER_KEY, username);
+        localStorage.setItem(TOKEN_EXPIRY_KEY, Date.now() + (24 * 60 * 60 * 1000));
+
+        showMainInterface(username);
+        startActivityMonitoring();
+    } catch (error) {
+        loginError.textContent = 'Authentication failed. Please check your credentials.';
+        throw error;
+    }
+}
+
+// Logout function
+function logout() {
+    // Revoke the token server-side; the local session ends either way
+    const token = localStorage.getItem(AUTH_TOKEN_KEY);
+    if (token) {
+        fetch('/token/revoke', {
+            method: 'POST',
+            headers: { 'Authorization': `Bearer ${token}` }
+        }).catch(() => {});
+    }
+    
+    localStorage.removeItem(AUTH_TOKEN_KEY);
+    localStorage.removeItem(AUTH_USER_KEY);
+    localStorage.removeItem(TOKEN_EXPIRY_KEY);
+
+    disconnectHudStream();
+
+    if (activityCheckInterval) {
+        clearInterval(activityCheckInterval);
+    }
+
+    loginModal.classList.add('active');
+    mainInterface.classList.add('hidden');
+    loginError.textContent = '';
+}
+
+// Show main interface
+async function showMainInterface(username) {
+    userDisplay.textContent = `User: ${username}`;
+    loginModal.classList.remove('active');
+    mainInterface.classList.remove('hidden');
+
+    // Fetch wake word from status endpoint and add it to WAKE_WORDS (non-blocking)
+    fetchWakeWord();
+
+    // Greet the user when HUD opens
+    const greeting = getGreeting();
+    addMessage(greeting, 'jarvis');
+    speak(greeting);
+}
+
+// Fetch configured wake word from backend
+async function fetchWakeWord() {
+    try {
+        const token = localStorage.getItem(AUTH_TOKEN_KEY);
+        const response = await fetch('/v1/status', {
+            method: 'GET',
+            headers: {
+                'Authorization': `Bearer ${token}`
+            }
+        });
+
+        if (response.ok) {
+            const data = await response.json();
+            if (data.wake_word && !WAKE_WORDS.includes(data.wake_word)) {
+                WAKE_WORDS.push(data.wake_word);
+                console.log(`Wake words configured: ${WAKE_WORDS.join(', ')}`);
+            }
+        }
+    } catch (error) {
+        console.error('Error fetching wake word:', error);
+        // Continue with default wake words if fetch fails
+    }
+}
+
+// Activity monitoring
+function updateActivity() {
+    lastActivity = Date.now();
+}
+
+function checkActivity() {
+    const token = localStorage.getItem(AUTH_TOKEN_KEY);
+    if (!token) return;
+
+    const timeSinceActivity = Date.now() - lastActivity;
+    if (timeSinceActivity > ACTIVITY_TIMEOUT) {
+        addMessage('Session expired due to inactivity', 'system');
+        setTimeout(() => logout(), 2000);
+    }
+}
+
+function startActivityMonitoring() {
+    // Update activity on user interaction
+    ['mousedown', 'keydown', 'scroll', 'touchstart'].forEach(event => {
+        document.addEventListener(event, updateActivity);
+    });
+
+    // Check activity every minute
+    activityCheckInterval = setInterval(checkActivity, 60000);
+}
+
+// Login form handler
+loginForm.addEventListener('submit', async (e) => {
+    e.preventDefault();
+    loginError.textContent = '';
+
+    const username = document.getElementById('username').value;
+    const password = document.getElementById('password').value;
+
+    try {
+        await login(username, password);
+    } catch (error) {
+        console.error('Login error:', error);
+    }
+});
+
+// Password toggle handler
+if (passwordToggle) {
+    passwordToggle.addEventListener('click', () => {
+        if (passwordInput.type === 'password') {
+            passwordInput.type = 'text';
+            passwordToggle.textContent = '🙈';
+        } else {
+            passwordInput.type = 'password';
+            passwordToggle.textContent = '👁️';
+        }
+    });
+}
+
+// Logout handler
+logoutBtn.addEventListener('click', logout);
+
+// Voice button handler for V.A.S.
+if (voiceButton) {
+    voiceButton.addEventListener('click', () => {
+        if (!recognition) {
+            addMessage('Voice recognition not supported in this browser', 'system');
+            return;
+        }
+
+        if (vasState === 'muted') {
+            // Start wake word listening mode
+            vasState = 'listening';
+            resultIndex = 0; // Reset result index for clean state
+            try {
+                recognition.start();
+                updateVoiceButtonState();
+                addMessage('Wake word detection active. Say "Jarvis" to start transcribing.', 'system');
+            } catch (e) {
+                console.error('Failed to start recognition:', e);
+                vasState = 'muted';
+                updateVoiceButtonState();
+            }
+        } else if (vasState === 'listening') {
+            // Stop and mute
+            vasState = 'muted';
+            resultIndex = 0; // Reset result index for clean state
+            try {
+                recognition.stop();
+            } catch (e) {
+                // Ignore if already stopped; log other errors
+                if (e.name !== 'InvalidStateError') {
+                    console.error('Recognition stop error:', e);
+                }
+            }
+            isRecording = false;
+            updateVoiceButtonState();
+            addMessage('Voice detection disabled.', 'system');
+        } else if (vasState === 'transcribing') {
+            // Stop transcribing and return to listening mode
+            vasState = 'listening';
+            resultIndex = 0; // Reset result index for clean state
+            commandInput.classList.remove('voice-active');
+            if (silenceTimer) {
+                clearTimeout(silenceTimer);
+                silenceTimer = null;
+            }
+            updateVoiceButtonState();
+            addMessage('Transcription stopped. Back to wake word mode.', 'system');
+        }
+    });
+
+    // Initialize button state
+    updateVoiceButtonState();
+}
+
+// Add message to terminal
+function addMessage(text, type = 'system') {
+    const messageDiv = document.createElement('div');
+    messageDiv.className = `message ${type}`;
+
+    const label = document.createElement('div');
+    label.className = 'message-label';
+    label.textContent = type === 'user' ? 'User' : type === 'system' ? 'System' : 'J.A.R.V.I.S.';
+
+    const content = document.createElement('div');
+    content.textContent = text;
+
+    messageDiv.appendChild(label);
+    messageDiv.appendChild(content);
+    terminal.appendChild(messageDiv);
+
+    // Keep only the last 2 messages for better mobile readability
+    const messages = terminal.querySelectorAll('.message');
+    if (messages.length > 2) {
+        // Remove oldest messages, keeping only last 2 regardless of sender
+        for (let i = 0; i < messages.length - 2; i++) {
+            messages[i].remove();
+        }
+    }
+
+    // Returned so streamed replies can be updated in place
+    return content;
+}
+
+// Read Server-Sent Events from /v1/message/stream.
+// Deltas are rendered as they arrive and each complete sentence is spoken
+// immediately, so TTS starts on the first sentence instead of the last token.
+async function readMessageStream(response) {
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let replyText = '';
+    let unspoken = '';
+    let replyContent = null;
+    let doneEvent = {};
+
+    window.speechSynthesis && window.speechSynthesis.cancel();
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const raw of events) {
+            if (!raw.startsWith('data: ')) continue;
+            const event = JSON.parse(raw.slice(6));
+            if (event.type === 'delta') {
+                replyText += event.text;
+                if (!replyContent) {
+                    replyContent = addMessage('', 'system');
+                }
+                replyContent.textContent = replyText;
+
+                const { sentences, rest } = splitSentences(unspoken + event.text);
+                sentences.forEach(speakQueued);
+                unspoken = rest;
+            } else if (event.type === 'done') {
+                doneEvent = event;
+            }
+        }
+    }
+
+    if (replyContent) {
+        speakQueued(unspoken);
+        if (doneEvent.response) {
+            replyContent.textContent = doneEvent.response;
+        }
+    }
+    return { ...doneEvent, streamed: replyContent !== null };
+}
+
+// Send command function
+async function sendCommand() {
+    const command = commandInput.value.trim();
+    if (!command) return;
+
+    const token = localStorage.getItem(AUTH_TOKEN_KEY);
+    if (!token) {
+        logout();
+        return;
+    }
+
+    // Add user message
+    addMessage(command, 'user');
+
+    // Clear input
+    commandInput.value = '';
+
+    // Disable button and show loading
+    sendButton.disabled = true;
+    loading.classList.add('active');
+
+    try {
+        const response = await fetch('/v1/message/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Authorization': `Bearer ${token}`
+            },
+            body: JSON.stringify({
+                text: command
+            })
+        });
+
+        if (!response.ok) {
+            if (response.status === 401) {
+                addMessage('Session expired. Please login again.', 'system');
+                setTimeout(() => logout(), 2000);
+                return;
+            }
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        const data = await readMessageStream(response);
+
+        // Extract and display the response field
+        if (data.response) {
+            if (!data.streamed) {
+                addMessage(data.response, 'system');
+                // Speak the response aloud
+                speak(data.response);
+            }
+        } else if (data.error) {
+            addMessage(`Error: ${data.error}`, 'system');
+        } else {
+            addMessage('Command executed successfully', 'system');
+        }
+
+        updateActivity();
+    } catch (error) {
+        addMessage(`Error: ${error.message}`, 'system');
+        console.error('Error:', error);
+    } finally {
+        // Re-enable button and hide loading
+        sendButton.disabled = false;
+        loading.classList.remove('active');
+    }
+}
+
+// Send on button click
+sendButton.addEventListener('click', sendCommand);
+
+// Send on Enter key (Shift+Enter for new line in textarea)
+commandInput.addEventListener('keydown', (e) => {
+    if (e.key === 'Enter' && !e.shiftKey) {
+        e.preventDefault(); // Prevent new line
+        sendCommand();
+    }
+    // Shift+Enter will create a new line (default behavior)
+});
+
+// Initialize app
+checkAuth();
+
+// ============================================
+// Mobile Edge Node Telemetry System
+// ============================================
+
+// Configuration constants
+const BATTERY_LOW_THRESHOLD = 15; // Percentage - triggers power-saving mode
+const TELEMETRY_INTERVAL_MS = 30000; // 30 seconds
+const GPS_CACHE_MAX_AGE_MS = 300000; // 5 minutes
+const SIGNIFICANT_DISPLACEMENT_METERS = 100; // Performance requirement: update map only if position changes > 100m
+
+let batteryLevel = 100;
+let batteryCharging = false;
+let currentLocation = null;
+let lastMapLocation = null; // Track last location where map was updated
+let deviceType = detectDeviceType();
+let telemetryInterval = null;
+let leafletMap = null; // Leaflet map instance
+let mapMarker = null; // Map marker instance
+
+// Detect device type using user agent
+// Maps various mobile/tablet user agents to device categories
+function detectDeviceType() {
+    const ua = navigator.userAgent.toLowerCase();
+    // Tablet detection: iPads, Android tablets, Surface tablets, etc.
+    if (/(tablet|ipad|playbook|silk)|(android(?!.*mobi))/i.test(ua)) {
+        return 'Tablet';
+    }
+    // Mobile detection: smartphones, feature phones
+    if (/mobile|iphone|ipod|android|blackberry|opera mini|opera mobi|skyfire|maemo|windows phone|palm|iemobile|symbian|symbianos|fennec/i.test(ua)) {
+        return 'Mobile';
+    }
+    return 'Desktop';
+}
+
+// Update device type display
+document.getElementById('deviceType').textContent = deviceType;
+
+// Initialize Battery API
+async function initBatteryMonitoring() {
+    if ('getBattery' in navigator) {
+        try {
+            const battery = await navigator.getBattery();
+
+            // Update battery level
+            function updateBatteryStatus() {
+                batteryLevel = Math.round(battery.level * 100);
+                batteryCharging = battery.charging;
+
+                const batteryValue = document.getElementById('batteryValue');
+                const batteryTelemetry = document.getElementById('batteryTelemetry');
+
+                batteryValue.textContent = `${batteryLevel}% ${batteryCharging ? '⚡' : ''}`;
+
+                // Low battery warning (uses BATTERY_LOW_THRESHOLD constant)
+                if (batteryLevel < BATTERY_LOW_THRESHOLD && !batteryCharging) {
+                    batteryTelemetry.classList.add('battery-low');
+                    checkBatteryEmergency();
+                } else {
+                    batteryTelemetry.classList.remove('battery-low');
+                }
+            }
+
+            // Initial update
+            updateBatteryStatus();
+
+            // Listen for changes
+            battery.addEventListener('levelchange', updateBatteryStatus);
+            battery.addEventListener('chargingchange', updateBatteryStatus);
+
+        } catch (error) {
+            console.error('Battery API error:', error);
+            document.getElementById('batteryValue').textContent = 'N/A';
+        }
+    } else {
+        document.getElementById('batteryValue').textContent = 'N/A';
+    }
+}
+
+// Calculate distance between two coordinates using Haversine formula
+function calculateDistance(lat1, lon1, lat2, lon2) {
+    const R = 6371e3; // Earth's radius in meters
+    const φ1 = lat1 * Math.PI / 180;
+    const φ2 = lat2 * Math.PI / 180;
+    const Δφ = (lat2 - lat1) * Math.PI / 180;
+    const Δλ = (lon2 - lon1) * Math.PI / 180;
+
+    // Cache sine calculations for efficiency
+    const sinHalfDeltaPhi = Math.sin(Δφ/2);
+    const sinHalfDeltaLambda = Math.sin(Δλ/2);
+
+    const a = sinHalfDeltaPhi * sinHalfDeltaPhi +
+              Math.cos(φ1) * Math.cos(φ2) *
+              sinHalfDeltaLambda * sinHalfDeltaLambda;
+    const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1-a));
+
+    return R * c; // Distance in meters
+}
+
+// Update the spatial orientation module with map and geocoding
+async function updateSpatialOrientation(latitude, longitude) {
+    const panel = document.getElementById('spatialOrientationPanel');
+    const mapContainer = document.getElementById('mapContainer');
+    const locationName = document.getElementById('locationName');
+
+    // Check if we should update the map (significant displacement or first time)
+    if (lastMapLocation) {
+        const distance = calculateDistance(
+            lastMapLocation.latitude,
+            lastMapLocation.longitude,
+            latitude,
+            longitude
+        );
+
+        // Only update if displacement is significant
+        if (distance < SIGNIFICANT_DISPLACEMENT_METERS) {
+            console.log(`Displacement: ${distance.toFixed(2)}m - Skipping map update`);
+            return;
+        }
+
+        console.log(`Significant displacement: ${distance.toFixed(2)}m - Updating map`);
+    }
+
+    // Update last map location
+    lastMapLocation = { latitude, longitude };
+
+    // Initialize Leaflet map if not already initialized
+    if (!leafletMap) {
+        leafletMap = L.map('map', {
+            zoomControl: true,
+            attributionControl: true,
+            dragging: false,
+            scrollWheelZoom: false,
+            doubleClickZoom: false,
+            boxZoom: false,
+            keyboard: false,
+            tap: false
+        }).setView([latitude, longitude], 16);
+
+        // Add OpenStreetMap tiles with dark mode styling
+        L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+            attribution: '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors',
+            maxZoom: 19,
+        }).addTo(leafletMap);
+
+        // Create a custom icon for the marker
+        const customIcon = L.divIcon({
+            className: 'custom-marker',
+            html: '<div style="background-color: #00ff88; width: 20px; height: 20px; border-radius: 50%; border: 3px solid #00d4ff; box-shadow: 0 0 10px rgba(0, 255, 136, 0.6);"></div>',
+            iconSize: [20, 20],
+            iconAnchor: [10, 10]
+        });
+
+        // Add marker
+        mapMarker = L.marker([latitude, longitude], { icon: customIcon }).addTo(leafletMap);
+    } else {
+        // Update map view and marker position
+        leafletMap.setView([latitude, longitude], 16);
+        mapMarker.setLatLng([latitude, longitude]);
+    }
+
+    // Make map clickable - redirect to Google Maps
+    mapContainer.onclick = () => {
+        const googleMapsUrl = `https://www.google.com/maps?q=${latitude},${longitude}`;
+        window.open(googleMapsUrl, '_blank');
+    };
+
+    // Fetch location name using Nominatim (OSM) Reverse Geocoding
+    try {
+        const nominatimUrl = `https://nominatim.openstreetmap.org/reverse?format=json&lat=${latitude}&lon=${longitude}&zoom=18&addressdetails=1`;
+        const response = await fetch(nominatimUrl, {
+            headers: {
+                'User-Agent': 'JARVIS-HUD/1.0 (https://github.com/TheDrack/Jarvis_Xerife)'
+            }
+        });
+        const data = await response.json();
+
+        if (data && data.address) {
+            const address = data.address;
+
+            // Extract neighborhood, suburb, or locality
+            const neighborhood = address.neighbourhood || address.suburb || address.quarter || '';
+            const locality = address.city || address.town || address.village || address.municipality || '';
+            const establishment = address.amenity || address.building || '';
+
+            // Display location name with clear logic
+            const primaryLocation = establishment || neighborhood || locality || 'Localização atual';
+
+            // Determine secondary location
+            let secondaryLocation = '';
+            if (establishment && neighborhood) {
+                secondaryLocation = neighborhood;
+            } else if (establishment && locality) {
+                secondaryLocation = locality;
+            } else if (neighborhood && locality) {
+                secondaryLocation = locality;
+            }
+
+            locationName.innerHTML = `
+                <div class="primary">${primaryLocation}</div>
+                ${secondaryLocation ? `<div class="secondary">${secondaryLocation}</div>` : ''}
+            `;
+        } else {
+            locationName.innerHTML = `
+                <div class="primary">Localização: ${latitude.toFixed(4)}, ${longitude.toFixed(4)}</div>
+            `;
+        }
+    } catch (error) {
+        console.error('Nominatim geocoding error:', error);
+        locationName.innerHTML = `
+            <div class="primary">Localização: ${latitude.toFixed(4)}, ${longitude.toFixed(4)}</div>
+        `;
+    }
+
+    // Show the panel
+    panel.classList.add('visible');
+}
+
+// Initialize Geolocation with spatial orientation module
+function initGeolocation() {
+    if ('geolocation' in navigator) {
+        navigator.geolocation.getCurrentPosition(
+            (position) => {
+                currentLocation = {
+                    latitude: position.coords.latitude,
+                    longitude: position.coords.longitude,
+                    accuracy: position.coords.accuracy
+                };
+
+                const lat = position.coords.latitude.toFixed(4);
+                const lon = position.coords.longitude.toFixed(4);
+                document.getElementById('locationValue').textContent = `${lat}, ${lon}`;
+
+                // Update spatial orientation module
+                updateSpatialOrientation(position.coords.latitude, position.coords.longitude);
+            },
+            (error) => {
+                console.error('Geolocation error:', error);
+                document.getElementById('locationValue').textContent = 'Denied';
+                // Keep spatial orientation panel hidden if location is denied
+            },
+            {
+                enableHighAccuracy: false, // Low accuracy to save battery on all devices
+                timeout: 10000,
+                maximumAge: GPS_CACHE_MAX_AGE_MS
+            }
+        );
+
+        // Watch for location changes and update spatial orientation
+        navigator.geolocation.watchPosition(
+            (position) => {
+                currentLocation = {
+                    latitude: position.coords.latitude,
+                    longitude: position.coords.longitude,
+                    accuracy: position.coords.accuracy
+                };
+
+                const lat = position.coords.latitude.toFixed(4);
+                const lon = position.coords.longitude.toFixed(4);
+                document.getElementById('locationValue').textContent = `${lat}, ${lon}`;
+
+                // Update spatial orientation (will only update map if displacement > 50m)
+                updateSpatialOrientation(position.coords.latitude, position.coords.longitude);
+            },
+            (error) => {
+                console.error('Geolocation watch error:', error);
+            },
+            {
+                enableHighAccuracy: false,
+                timeout: 10000,
+                maximumAge: GPS_CACHE_MAX_AGE_MS
+            }
+        );
+    } else {
+        document.getElementById('locationValue').textContent = 'N/A';
+    }
+}
+
+// Send telemetry to JARVIS
+async function sendTelemetry() {
+    const token = localStorage.getItem(AUTH_TOKEN_KEY);
+    if (!token) return;
+
+    const telemetryData = {
+        device_type: deviceType,
+        battery: {
+            level: batteryLevel,
+            charging: batteryCharging
+        },
+        location: currentLocation,
+        timestamp: new Date().toISOString()
+    };
+
+    // Reuse the HUD stream when it is open (no extra request or token check)
+    if (hudSocket && hudSocket.readyState === WebSocket.OPEN) {
+        hudSocket.send(JSON.stringify({ type: 'telemetry', data: telemetryData }));
+        return;
+    }
+
+    try {
+        await fetch('/v1/telemetry', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Authorization': `Bearer ${token}`
+            },
+            body: JSON.stringify(telemetryData)
+        });
+    } catch (error) {
+        console.error('Telemetry error:', error);
+    }
+}
+
+// Battery Emergency - Suggest power saving
+async function checkBatteryEmergency() {
+    if (batteryLevel < BATTERY_LOW_THRESHOLD && !batteryCharging) {
+        const message = `⚠️ ALERTA: Bateria baixa (${batteryLevel}%). Sugerindo modo de economia de energia.`;
+        addMessage(message, 'system');
+
+        // Auto-suggest power saving to JARVIS
+        const token = localStorage.getItem(AUTH_TOKEN_KEY);
+        if (token) {
+            try {
+                await fetch('/v1/message', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                        'Authorization': `Bearer ${token}`
+                    },
+                    body: JSON.stringify({
+                        text: `Bateria crítica (${batteryLevel}%). Ative modo economia.`,
+                        priority: 'high',
+                        source: 'mobile_telemetry'
+                    })
+                });
+            } catch (error) {
+                console.error('Failed to send battery alert:', error);
+            }
+        }
+    }
+}
+
+// Evolution tracking
+function renderEvolutionStatus(data) {
+    const evolutionStatus = document.getElementById('evolutionStatus');
+    const pluginCount = document.getElementById('pluginCount');
+
+    // Display roadmap completion percentage
+    if (data.completion_percentage !== undefined) {
+        evolutionStatus.innerHTML = `
+            <div><strong>${data.completion_percentage.toFixed(1)}%</strong></div>
+            <div style="margin-top: 5px; font-size: 0.85em;">
+                ✅ ${data.completed || 0} | 🔄 ${data.in_progress || 0} | 📋 ${data.planned || 0}
+            </div>
+        `;
+    } else if (data.error) {
+        evolutionStatus.innerHTML = `
+            <div>❌ Erro</div>
+            <div style="margin-top: 5px; font-size: 0.85em;">${data.error}</div>
+        `;
+    }
+
+    // Update plugin count if available (keeping backward compatibility)
+    if (data.plugin_count !== undefined && pluginCount) {
+        pluginCount.textContent = data.plugin_count;
+    }
+}
+
+// Polling fallback, used only while the HUD stream is unavailable
+async function updateEvolutionStatus() {
+    const token = localStorage.getItem(AUTH_TOKEN_KEY);
+    if (!token) return;
+
+    try {
+        // Fetch roadmap progress from JARVIS
+        const response = await fetch('/v1/roadmap/progress', {
+            method: 'GET',
+            headers: {
+                'Authorization': `Bearer ${token}`
+            }
+        });
+
+        if (response.ok) {
+            renderEvolutionStatus(await response.json());
+        }
+    } catch (error) {
+        console.error('Evolution status error:', error);
+    }
+}
+
+// ============================================
+// HUD Push Stream
+// ============================================
+
+// The server pushes status, devices, evolution and command results over one
+// WebSocket (snapshot on connect, then diffs); polling is only a fallback
+const HUD_STREAM_INITIAL_BACKOFF_MS = 1000;
+const HUD_STREAM_MAX_BACKOFF_MS = 30000;
+const WS_POLICY_VIOLATION = 1008; // Token rejected, expired or revoked
+
+let hudSocket = null;
+let hudReconnectDelay = HUD_STREAM_INITIAL_BACKOFF_MS;
+let hudReconnectTimer = null;
+let hudPollingInterval = null;
+const hudState = {};
+
+function connectHudStream() {
+    const token = localStorage.getItem(AUTH_TOKEN_KEY);
+    if (!token) return;
+    if (!('WebSocket' in window)) {
+        startHudPolling();
+        return;
+    }
+    if (hudSocket && hudSocket.readyState <= WebSocket.OPEN) return;
+
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    const socket = new WebSocket(
+        `${protocol}//${window.location.host}/v1/hud/stream?token=${encodeURIComponent(token)}`
+    );
+    hudSocket = socket;
+
+    socket.onopen = () => {
+        hudReconnectDelay = HUD_STREAM_INITIAL_BACKOFF_MS;
+        stopHudPolling();
+        sendTelemetry();
+    };
+
+    socket.onmessage = (event) => {
+        try {
+            handleHudMessage(JSON.parse(event.data));
+        } catch (error) {
+            console.error('HUD stream message error:', error);
+        }
+    };
+
+    socket.onclose = (event) => {
+        if (hudSocket === socket) hudSocket = null;
+        // Logged out, or the token is no longer accepted: do not retry with it
+        if (!localStorage.getItem(AUTH_TOKEN_KEY) || event.code === WS_POLICY_VIOLATION) return;
+
+        startHudPolling();
+        hudReconnectTimer = setTimeout(connectHudStream, hudReconnectDelay);
+        hudReconnectDelay = Math.min(hudReconnectDelay * 2, HUD_STREAM_MAX_BACKOFF_MS);
+    };
+}
+
+function disconnectHudStream() {
+    if (hudReconnectTimer) {
+        clearTimeout(hudReconnectTimer);
+        hudReconnectTimer = null;
+    }
+    if (hudSocket) {
+        hudSocket.close();
+        hudSocket = null;
+    }
+    stopHudPolling();
+}
+
+function startHudPolling() {
+    if (hudPollingInterval) return;
+    updateEvolutionStatus();
+    hudPollingInterval = setInterval(updateEvolutionStatus, TELEMETRY_INTERVAL_MS);
+}
+
+function stopHudPolling() {
+    if (hudPollingInterval) {
+        clearInterval(hudPollingInterval);
+        hudPollingInterval = null;
+    }
+}
+
+function handleHudMessage(message) {
+    switch (message.type) {
+        case 'snapshot':
+            hudState[message.topic] = message.state;
+            renderHudTopic(message.topic);
+            break;
+        case 'diff': {
+            const state = hudState[message.topic] || {};
+            Object.assign(state, message.changes);
+            message.removed.forEach((key) => delete state[key]);
+            hudState[message.topic] = state;
+            renderHudTopic(message.topic);
+            break;
+        }
+        case 'event':
+            handleHudEvent(message.topic, message.data);
+            break;
+        // 'resync' is followed by fresh snapshots; 'ping' only keeps the connection alive
+    }
+}
+
+function renderHudTopic(topic) {
+    const state = hudState[topic];
+    if (topic === 'evolution') {
+        renderEvolutionStatus(state);
+    } else if (topic === 'status' && state.wake_word && !WAKE_WORDS.includes(state.wake_word)) {
+        WAKE_WORDS.push(state.wake_word);
+    }
+}
+
+function handleHudEvent(topic, data) {
+    if (topic === 'commands') {
+        const icon = data.success ? '✅' : '❌';
+        addMessage(`${icon} Comando #${data.command_id}: ${data.message || (data.success ? 'concluído' : 'falhou')}`, 'system');
+    }
+}
+
+// Start telemetry monitoring
+function startTelemetryMonitoring() {
+    // Initialize monitors
+    initBatteryMonitoring();
+    initGeolocation();
+
+    // Send telemetry at configured interval (TELEMETRY_INTERVAL_MS); evolution
+    // status is pushed by the HUD stream instead of polled
+    telemetryInterval = setInterval(sendTelemetry, TELEMETRY_INTERVAL_MS);
+
+    connectHudStream();
+}
+
+// Start telemetry when authenticated
+if (checkAuth()) {
+    startTelemetryMonitoring();
+}
+
+// ============================================
+// PWA Service Worker Registration
+// ============================================
+
+// Register service worker for PWA functionality (served from / so its scope covers the HUD)
+if ('serviceWorker' in navigator) {
+    window.addEventListener('load', () => {
+        navigator.serviceWorker.register('/sw.js')
+            .then((registration) => {
+                console.log('Service Worker registered successfully:', registration.scope);
+            })
+            .catch((error) => {
+                console.error('Service Worker registration failed:', error);
+            });
+    });
+}
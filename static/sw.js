@@ -2,12 +2,18 @@
 // Enhanced service worker for PWA functionality with offline support
 // This enables the HUD to be installed as a Progressive Web App
 
-const CACHE_NAME = 'jarvis-strategic-hud-v1';
+// The API server serves this file at /sw.js and replaces the object below with
+// the content-hashed HUD build (see app/adapters/infrastructure/hud_assets.py)
+const HUD_BUILD = {"version": "dev", "assets": []};
+
+const CACHE_NAME = 'jarvis-strategic-hud-' + HUD_BUILD.version;
+const HUD_ASSET_PREFIX = '/hud/assets/';
 const urlsToCache = [
   '/',
   '/static/manifest.json',
   '/static/icon-192.png',
   '/static/icon-512.png',
+  ...HUD_BUILD.assets,
 ];
 
 // Install event - cache essential resources
@@ -59,6 +65,23 @@ self.addEventListener('fetch', (event) => {
     return;
   }
   
+  // Hashed HUD assets never change under the same URL - serve them cache first
+  const url = new URL(event.request.url);
+  if (url.origin === self.location.origin && url.pathname.startsWith(HUD_ASSET_PREFIX)) {
+    event.respondWith(
+      caches.match(event.request).then((cachedResponse) => {
+        return cachedResponse || fetch(event.request).then((response) => {
+          if (response && response.status === 200) {
+            const responseToCache = response.clone();
+            caches.open(CACHE_NAME).then((cache) => cache.put(event.request, responseToCache));
+          }
+          return response;
+        });
+      })
+    );
+    return;
+  }
+  
   event.respondWith(
     fetch(event.request)
       .then((response) => {
@@ -1,13 +1,17 @@
 # -*- coding: utf-8 -*-
 """Tests for API Server"""
 
+import re
+import time
 from unittest.mock import Mock, AsyncMock, ANY
 
 import pytest
 from fastapi.testclient import TestClient
 
 from app.adapters.infrastructure import create_api_server
+from app.adapters.infrastructure.api_server import auth_adapter
 from app.application.services import AssistantService
+from app.core.config import settings
 from app.domain.models import Response
 
 
@@ -51,23 +55,63 @@ class TestAPIServer:
         assert "text/html" in response.headers["content-type"]
         # Verify it contains key elements of the Stark Industries interface
         assert "J.A.R.V.I.S." in response.text
-        assert "/v1/message" in response.text  # Now uses message endpoint
         assert "<!DOCTYPE html>" in response.text
         # Verify new features
         assert "loginModal" in response.text
         assert "voiceButton" in response.text
-        assert "SpeechRecognition" in response.text
-        assert "logout" in response.text.lower()
         # Verify password toggle
         assert "passwordToggle" in response.text
-        # Verify voice synthesis
-        assert "speechSynthesis" in response.text
         # Verify reactor loading animation
         assert "reactor" in response.text
+
+        # The HUD script is a content-hashed asset referenced from the page
+        script_url = re.search(r'src="(/hud/assets/hud\.[0-9a-f]+\.js)"', response.text).group(1)
+        script = test_client.get(script_url)
+        assert script.status_code == 200
+        assert "/v1/message" in script.text  # Now uses message endpoint
+        assert "SpeechRecognition" in script.text
+        assert "logout" in script.text.lower()
+        # Verify voice synthesis
+        assert "speechSynthesis" in script.text
         # Verify wake word support - should include WAKE_WORDS array and fetchWakeWord function
-        assert "WAKE_WORDS" in response.text
-        assert "fetchWakeWord" in response.text
-        assert "const WAKE_WORDS = ['jarvis']" in response.text
+        assert "WAKE_WORDS" in script.text
+        assert "fetchWakeWord" in script.text
+        assert "const WAKE_WORDS = ['jarvis']" in script.text
+
+    def test_root_get_caching(self, client):
+        """Test the HUD page is compressed, revalidated by ETag and its assets are immutable"""
+        test_client, service = client
+
+        response = test_client.get("/", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["cache-control"] == "no-cache"
+        assert response.headers["etag"]
+
+        revalidated = test_client.get("/", headers={"If-None-Match": response.headers["etag"]})
+        assert revalidated.status_code == 304
+        assert len(revalidated.content) == 0
+
+        style_url = re.search(r'href="(/hud/assets/hud\.[0-9a-f]+\.css)"', response.text).group(1)
+        style = test_client.get(style_url)
+        assert style.status_code == 200
+        assert "immutable" in style.headers["cache-control"]
+        assert "text/css" in style.headers["content-type"]
+
+        assert test_client.get("/hud/assets/hud.000000000000.js").status_code == 404
+
+    def test_service_worker_precaches_hud_build(self, client):
+        """Test /sw.js lists the content-hashed HUD assets"""
+        test_client, service = client
+
+        page = test_client.get("/")
+        response = test_client.get("/sw.js")
+
+        assert response.status_code == 200
+        assert "javascript" in response.headers["content-type"]
+        script_url = re.search(r'src="(/hud/assets/hud\.[0-9a-f]+\.js)"', page.text).group(1)
+        assert script_url in response.text
+        assert '"version": "dev"' not in response.text
     
     def test_root_head(self, client):
         """Test root HEAD endpoint for monitoring"""
@@ -79,6 +123,100 @@ class TestAPIServer:
         # HEAD requests should not return a body per HTTP specification
         assert len(response.content) == 0
     
+    def test_revoke_token(self, client):
+        """Test a revoked token can no longer access protected endpoints"""
+        test_client, service = client
+        # A token of its own, so revoking it cannot affect other tests' tokens
+        token = auth_adapter.create_access_token({"sub": "admin", "jti": "test-revoke-token"})
+        headers = {"Authorization": f"Bearer {token}"}
+
+        assert test_client.get("/v1/devices", headers=headers).status_code == 200
+
+        response = test_client.post("/token/revoke", headers=headers)
+
+        assert response.status_code == 204
+        assert test_client.get("/v1/devices", headers=headers).status_code == 401
+
+    def test_execute_mission_returns_job(self, client, auth_token):
+        """Test missions are queued and their result is available by polling"""
+        test_client, _ = client
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        # Keep one event loop alive for the queue workers across requests
+        with test_client:
+            response = test_client.post(
+                "/v1/missions/execute",
+                json={"mission_id": "mission-1", "code": "print('hello')"},
+                headers=headers,
+            )
+
+            assert response.status_code == 202
+            job = response.json()
+            assert job["mission_id"] == "mission-1"
+            assert job["status"] in ("queued", "running", "succeeded")
+
+            for _ in range(100):
+                job = test_client.get(f"/v1/missions/jobs/{job['job_id']}", headers=headers).json()
+                if job["status"] in ("succeeded", "failed"):
+                    break
+                time.sleep(0.1)
+            assert job["status"] == "succeeded"
+            assert "hello" in job["result"]["stdout"]
+
+            stats = test_client.get("/v1/missions/queue", headers=headers).json()
+            assert stats["submitted"] == 1
+            assert test_client.get("/v1/missions/jobs/unknown", headers=headers).status_code == 404
+
+    def test_hud_stream_pushes_snapshots_and_telemetry(self, client, auth_token):
+        """Test the HUD stream sends topic snapshots and acknowledges telemetry"""
+        test_client, _ = client
+
+        with test_client.websocket_connect(f"/v1/hud/stream?token={auth_token}&topics=status") as websocket:
+            message = websocket.receive_json()
+            assert message["type"] in ("snapshot", "diff")
+            assert message["topic"] == "status"
+            state = message.get("state") or message["changes"]
+            assert state["wake_word"] == "xerife"
+
+            websocket.send_json({"type": "telemetry", "data": {"battery": {"level": 5, "charging": False}}})
+            ack = websocket.receive_json()
+            assert ack["type"] == "event"
+            assert ack["topic"] == "telemetry"
+            assert ack["data"]["priority"] == "high"
+
+    def test_telemetry_history_reads_rollups(self, client, auth_token):
+        """Test telemetry is buffered, flushed in bulk and queried from rollups"""
+        test_client, _ = client
+        headers = {"Authorization": f"Bearer {auth_token}"}
+        device_key = f"admin:probe-{time.time_ns()}"
+
+        with test_client:
+            response = test_client.post(
+                "/v1/telemetry",
+                json={"device_id": device_key, "battery": {"level": 42, "charging": False}},
+                headers=headers,
+            )
+            assert response.status_code == 200
+
+            history = test_client.get(f"/v1/telemetry/{device_key}/history", headers=headers).json()
+            assert history["points"] == []
+            assert history["latest"]["battery_level"] == 42
+
+            test_client.app.state.telemetry_service.flush()
+            history = test_client.get(f"/v1/telemetry/{device_key}/history", headers=headers).json()
+            assert history["points"][0]["battery_avg"] == 42
+
+            response = test_client.get(f"/v1/telemetry/{device_key}/history?resolution=1d", headers=headers)
+            assert response.status_code == 400
+
+    def test_hud_stream_rejects_invalid_token(self, client):
+        """Test the HUD stream closes connections without a valid token"""
+        test_client, _ = client
+
+        with pytest.raises(Exception):
+            with test_client.websocket_connect("/v1/hud/stream?token=invalid") as websocket:
+                websocket.receive_json()
+
     def test_health_check(self, client):
         """Test health check endpoint"""
         test_client, service = client
@@ -99,6 +237,34 @@ class TestAPIServer:
         if data["database"]["type"] == "sqlite":
             assert data["security"]["rls_enabled"] == "n/a"
             assert "note" in data["security"]
+        # Authentication and telemetry counters are only served to authenticated callers
+        assert "auth" not in data
+        assert "telemetry" not in data
+
+    def test_shutdown_stops_revocation_sync(self, mock_assistant_service, monkeypatch):
+        """The lifespan shutdown closes the token cache's revocation sync"""
+        close = Mock()
+        monkeypatch.setattr(auth_adapter.token_cache, "close", close)
+        app = create_api_server(mock_assistant_service)
+
+        with TestClient(app):
+            close.assert_not_called()
+
+        close.assert_called_once()
+
+    def test_metrics_require_auth(self, client, auth_token):
+        """Test auth counters are served by the protected metrics endpoint"""
+        test_client, _ = client
+
+        assert test_client.get("/v1/metrics").status_code == 401
+
+        response = test_client.get("/v1/metrics", headers={"Authorization": f"Bearer {auth_token}"})
+
+        assert response.status_code == 200
+        auth = response.json()["auth"]
+        assert "hit_rate" in auth["token_cache"]
+        assert "blocked" in auth["login_limiter"]
+        assert "telemetry" in response.json()
 
     def test_login_success(self, client):
         """Test successful login"""
@@ -138,6 +304,25 @@ class TestAPIServer:
         assert response.status_code == 401
         assert "Incorrect username or password" in response.json()["detail"]
 
+    def test_login_throttled_after_repeated_failures(self, client):
+        """Test repeated failures for a username are rejected before bcrypt runs"""
+        test_client, _ = client
+
+        for _ in range(settings.login_max_failures_per_user):
+            response = test_client.post(
+                "/token",
+                data={"username": "throttled", "password": "wrongpassword"},
+            )
+            assert response.status_code == 401
+
+        response = test_client.post(
+            "/token",
+            data={"username": "throttled", "password": "wrongpassword"},
+        )
+
+        assert response.status_code == 429
+        assert int(response.headers["retry-after"]) > 0
+
     def test_execute_command_without_auth(self, client):
         """Test execute endpoint requires authentication"""
         test_client, _ = client
@@ -325,6 +510,29 @@ class TestAPIServer:
         assert response.status_code == 200
         service.get_command_history.assert_called_once_with(limit=50)
 
+    def test_interaction_history_pagination(self, client, auth_token):
+        """Test paginated history endpoints require auth and reject bad cursors"""
+        test_client, _ = client
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        assert test_client.get("/v1/history/interactions").status_code == 401
+
+        response = test_client.get("/v1/history/interactions?limit=5", headers=headers)
+        assert response.status_code == 200
+        assert "items" in response.json()
+        assert "next_cursor" in response.json()
+
+        response = test_client.get("/v1/history/interactions?cursor=garbage", headers=headers)
+        assert response.status_code == 400
+
+        response = test_client.get("/v1/thoughts/recent?cursor=garbage", headers=headers)
+        assert response.status_code == 400
+
+        response = test_client.get("/v1/thoughts/session/unknown-session", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["logs"] == []
+        assert response.json()["next_cursor"] is None
+
     def test_api_documentation(self, client):
         """Test that API documentation is available"""
         test_client, _ = client
@@ -374,6 +582,29 @@ class TestAPIServer:
         assert data["status"] == "pending"
         assert "Task created successfully" in data["message"]
 
+    def test_create_task_wakes_waiting_workers(self, client, auth_token):
+        """A task created through /v1/task moves the /v1/tasks/wait version"""
+        test_client, service = client
+        from app.domain.models import CommandType, Intent
+
+        service.interpreter.interpret.return_value = Intent(
+            command_type=CommandType.TYPE_TEXT,
+            parameters={"text": "hello"},
+            raw_input="digite hello",
+        )
+        headers = {"Authorization": f"Bearer {auth_token}"}
+
+        baseline = test_client.get("/v1/tasks/wait", headers=headers).json()
+        assert baseline["notified"] is False
+
+        idle = test_client.get(f"/v1/tasks/wait?since={baseline['version']}&timeout=0.01", headers=headers).json()
+        assert idle == {"version": baseline["version"], "notified": False}
+
+        test_client.post("/v1/task", json={"command": "digite hello"}, headers=headers)
+
+        woken = test_client.get(f"/v1/tasks/wait?since={baseline['version']}&timeout=5", headers=headers).json()
+        assert woken == {"version": baseline["version"] + 1, "notified": True}
+
     def test_create_task_empty_command(self, client, auth_token):
         """Test task creation with empty command"""
         test_client, _ = client
@@ -403,6 +634,54 @@ class TestAPIServer:
         assert response.status_code == 500
         assert "Internal server error" in response.json()["detail"]
 
+    def test_stream_message_sse(self, client, auth_token):
+        """Test streaming message endpoint emits SSE deltas and a final done event"""
+        import json
+
+        test_client, service = client
+
+        async def fake_stream(text, request_metadata=None):
+            yield {"type": "delta", "text": "Bom dia"}
+            yield {"type": "delta", "text": ", senhor."}
+            yield {
+                "type": "done",
+                "success": True,
+                "message": "Bom dia, senhor.",
+                "error": None,
+                "data": {"command_type": "chat"},
+            }
+
+        service.async_stream_command = fake_stream
+
+        response = test_client.post(
+            "/v1/message/stream",
+            json={"text": "bom dia"},
+            headers={"Authorization": f"Bearer {auth_token}"},
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = [
+            json.loads(line[len("data: "):])
+            for line in response.text.split("\n\n")
+            if line.startswith("data: ")
+        ]
+        assert [e["text"] for e in events if e["type"] == "delta"] == ["Bom dia", ", senhor."]
+        assert events[-1] == {
+            "type": "done",
+            "success": True,
+            "response": "Bom dia, senhor.",
+            "error": None,
+        }
+
+    def test_stream_message_without_auth(self, client):
+        """Test streaming message endpoint requires authentication"""
+        test_client, _ = client
+
+        response = test_client.post("/v1/message/stream", json={"text": "bom dia"})
+
+        assert response.status_code == 401
+
 
 class TestJarvisDispatchEndpoint:
     """Test cases for Jarvis repository_dispatch endpoint"""
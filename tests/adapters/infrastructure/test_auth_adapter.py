@@ -139,3 +139,35 @@ class TestUserAuthentication:
         assert user is not None
         assert "password" not in user
         assert "hashed_password" not in user
+
+
+class TestTokenCache:
+    """Tests for the verified-token cache and revocation"""
+
+    def test_second_verification_is_cached(self, auth_adapter):
+        """A token is decoded once and then served from the cache"""
+        token = auth_adapter.create_access_token({"sub": "testuser"})
+
+        first = auth_adapter.verify_token(token)
+        second = auth_adapter.verify_token(token)
+
+        assert first == second
+        stats = auth_adapter.token_cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_invalid_tokens_are_not_cached(self, auth_adapter):
+        """Failed verifications never populate the cache"""
+        assert auth_adapter.verify_token("invalid.token.here") is None
+        assert len(auth_adapter.token_cache) == 0
+
+    def test_revoked_token_is_rejected(self, auth_adapter):
+        """Revocation applies even to tokens that are already cached"""
+        token = auth_adapter.create_access_token({"sub": "testuser"})
+        assert auth_adapter.verify_token(token) is not None
+
+        auth_adapter.revoke_token(token)
+
+        assert auth_adapter.verify_token(token) is None
+        other = auth_adapter.create_access_token({"sub": "otheruser"}, expires_delta=5)
+        assert auth_adapter.verify_token(other) is not None
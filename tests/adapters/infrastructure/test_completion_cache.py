@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""Tests for the AI Gateway completion cache"""
+
+import json
+import sqlite3
+import time
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.adapters.infrastructure.ai_gateway import AIGateway, LLMProvider
+from app.adapters.infrastructure.completion_cache import CompletionCache, build_cache_key
+
+
+class TestBuildCacheKey:
+    """Test cases for cache key generation"""
+
+    def test_same_request_same_key(self):
+        """Identical requests produce identical keys"""
+        messages = [{"role": "user", "content": "status"}]
+        assert build_cache_key("groq", "m", messages) == build_cache_key("groq", "m", list(messages))
+
+    def test_key_depends_on_provider_model_and_messages(self):
+        """Provider, model and messages all participate in the key"""
+        messages = [{"role": "user", "content": "status"}]
+        base = build_cache_key("groq", "m1", messages)
+        assert base != build_cache_key("gemini", "m1", messages)
+        assert base != build_cache_key("groq", "m2", messages)
+        assert base != build_cache_key("groq", "m1", [{"role": "user", "content": "other"}])
+
+    def test_key_depends_on_functions(self):
+        """Function declarations participate in the key"""
+        messages = [{"role": "user", "content": "status"}]
+        func = Mock()
+        func.name = "open_url"
+        func.description = "Open a URL"
+        func.parameters = None
+        assert build_cache_key("groq", "m", messages) != build_cache_key("groq", "m", messages, [func])
+
+
+class TestCompletionCache:
+    """Test cases for CompletionCache"""
+
+    def test_miss_then_hit(self):
+        """A stored entry is returned on the next lookup"""
+        cache = CompletionCache()
+        assert cache.get("k") is None
+        cache.set("k", {"provider": "groq"})
+        assert cache.get("k") == {"provider": "groq"}
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["memory_hits"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_ttl_expiry(self):
+        """Entries expire after their TTL"""
+        cache = CompletionCache()
+        cache.set("k", {"provider": "groq"}, ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("k") is None
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_non_positive_ttl_is_not_stored(self):
+        """A TTL of zero disables storage for that call"""
+        cache = CompletionCache()
+        cache.set("k", {"provider": "groq"}, ttl=0)
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted first"""
+        cache = CompletionCache(max_entries=2)
+        cache.set("a", {"v": 1})
+        cache.set("b", {"v": 2})
+        cache.get("a")  # 'a' becomes most recently used
+        cache.set("c", {"v": 3})
+
+        assert cache.get("b") is None
+        assert cache.get("a") == {"v": 1}
+        assert cache.get("c") == {"v": 3}
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_disk_tier_survives_new_instance(self, tmp_path):
+        """Entries in the SQLite tier are visible to a fresh cache instance"""
+        db_path = str(tmp_path / "cache.db")
+        CompletionCache(db_path=db_path).set("k", {"provider": "gemini", "model": "x"})
+
+        other = CompletionCache(db_path=db_path)
+        assert other.get("k") == {"provider": "gemini", "model": "x"}
+        assert other.get_stats()["disk_hits"] == 1
+        # Promoted into memory tier
+        assert other.get("k") is not None
+        assert other.get_stats()["memory_hits"] == 1
+
+    def test_disk_tier_skips_unserializable_results(self, tmp_path):
+        """Results that cannot be stored as JSON stay in memory only"""
+        db_path = str(tmp_path / "cache.db")
+        cache = CompletionCache(db_path=db_path)
+        cache.set("k", {"response": lambda: None})
+
+        assert cache.get("k") is not None
+        assert CompletionCache(db_path=db_path).get("k") is None
+
+    def test_disk_tier_stores_json_and_rebuilds_sdk_models(self, tmp_path):
+        """SDK response models round-trip through the JSON disk tier"""
+        from groq.types.chat import ChatCompletion
+
+        db_path = str(tmp_path / "cache.db")
+        response = ChatCompletion.model_validate({
+            "id": "c1",
+            "object": "chat.completion",
+            "created": 1,
+            "model": "m",
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "oi"}}],
+        })
+        CompletionCache(db_path=db_path).set("k", {"provider": "groq", "model": "m", "response": response})
+
+        with sqlite3.connect(db_path) as conn:
+            payload = conn.execute("SELECT payload FROM completion_cache").fetchone()[0]
+        assert json.loads(payload)["model"] == "m"
+        cached = CompletionCache(db_path=db_path).get("k")
+        assert isinstance(cached["response"], ChatCompletion)
+        assert cached["response"].choices[0].message.content == "oi"
+
+    def test_disk_promotion_keeps_remaining_ttl(self, tmp_path):
+        """An entry promoted from disk expires when its disk entry would have"""
+        db_path = str(tmp_path / "cache.db")
+        CompletionCache(db_path=db_path).set("k", {"v": 1}, ttl=0.2)
+        time.sleep(0.1)
+
+        other = CompletionCache(db_path=db_path, default_ttl=300)
+        assert other.get("k") == {"v": 1}
+        time.sleep(0.15)
+        assert other.get("k") is None
+
+    @pytest.mark.anyio
+    async def test_async_access_uses_both_tiers(self, tmp_path):
+        """aset()/aget() reach the disk tier from a coroutine"""
+        db_path = str(tmp_path / "cache.db")
+        await CompletionCache(db_path=db_path).aset("k", {"v": 1})
+
+        other = CompletionCache(db_path=db_path)
+        assert await other.aget("k") == {"v": 1}
+        assert await other.aget("missing") is None
+        assert other.get_stats()["disk_hits"] == 1
+
+    def test_clear(self, tmp_path):
+        """Clear empties both tiers"""
+        cache = CompletionCache(db_path=str(tmp_path / "cache.db"))
+        cache.set("k", {"v": 1})
+        cache.clear()
+        assert cache.get("k") is None
+
+    def test_from_env_disabled(self, monkeypatch):
+        """Caching can be disabled via environment"""
+        monkeypatch.setenv("JARVIS_LLM_CACHE_ENABLED", "false")
+        assert CompletionCache.from_env() is None
+
+    def test_from_env_settings(self, monkeypatch):
+        """Cache size and TTL come from environment"""
+        monkeypatch.setenv("JARVIS_LLM_CACHE_ENABLED", "true")
+        monkeypatch.setenv("JARVIS_LLM_CACHE_MAX_ENTRIES", "7")
+        monkeypatch.setenv("JARVIS_LLM_CACHE_TTL", "12.5")
+        cache = CompletionCache.from_env()
+        assert cache.max_entries == 7
+        assert cache.default_ttl == 12.5
+
+
+class TestAIGatewayCompletionCache:
+    """Test cases for AI Gateway cache integration"""
+
+    @pytest.fixture
+    def gateway(self):
+        """Create a gateway with a mocked Groq client and a fresh cache"""
+        gateway = AIGateway(
+            groq_api_key="test_groq_key",
+            gemini_api_key=None,
+            completion_cache=CompletionCache(),
+        )
+        gateway.groq_client = Mock()
+        gateway.groq_client.chat.completions.create.return_value = Mock()
+        return gateway
+
+    @pytest.mark.anyio
+    async def test_repeated_prompt_served_from_cache(self, gateway):
+        """Second identical request does not reach the provider"""
+        messages = [{"role": "user", "content": "status"}]
+
+        first = await gateway.generate_completion(messages)
+        second = await gateway.generate_completion(messages)
+
+        assert gateway.groq_client.chat.completions.create.call_count == 1
+        assert "cached" not in first
+        assert second["cached"] is True
+        assert second["provider"] == LLMProvider.GROQ.value
+        assert gateway.get_cache_stats()["hits"] == 1
+
+    @pytest.mark.anyio
+    async def test_bypass_cache(self, gateway):
+        """bypass_cache forces a provider call"""
+        messages = [{"role": "user", "content": "status"}]
+
+        await gateway.generate_completion(messages)
+        await gateway.generate_completion(messages, bypass_cache=True)
+
+        assert gateway.groq_client.chat.completions.create.call_count == 2
+        assert gateway.get_cache_stats()["bypassed"] == 1
+
+    @pytest.mark.anyio
+    async def test_zero_ttl_not_cached(self, gateway):
+        """cache_ttl=0 prevents the result from being stored"""
+        messages = [{"role": "user", "content": "status"}]
+
+        await gateway.generate_completion(messages, cache_ttl=0)
+        await gateway.generate_completion(messages)
+
+        assert gateway.groq_client.chat.completions.create.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_gear_change_changes_key(self, gateway):
+        """A request served in a different gear is not answered from the other gear's entry"""
+        messages = [{"role": "user", "content": "status"}]
+
+        await gateway.generate_completion(messages)
+        gateway._shift_to_low_gear()
+        await gateway.generate_completion(messages)
+
+        assert gateway.groq_client.chat.completions.create.call_count == 2
+
+    @pytest.mark.anyio
+    async def test_fallback_answer_keyed_on_answering_model(self, gateway):
+        """A reply from a fallback model is not served as the requested model's"""
+        messages = [{"role": "user", "content": "status"}]
+        requested = gateway._get_model_for_provider(LLMProvider.GROQ)
+        gateway._generate_with_fallbacks = AsyncMock(
+            return_value={"provider": LLMProvider.GEMINI.value, "model": "fallback-model", "response": "ok"}
+        )
+
+        await gateway.generate_completion(messages)
+        await gateway.generate_completion(messages)
+
+        assert gateway._generate_with_fallbacks.await_count == 2
+        assert gateway.completion_cache.get(build_cache_key("groq", requested, messages)) is None
+        assert gateway.completion_cache.get(build_cache_key("gemini", "fallback-model", messages)) is not None
+
+    @pytest.mark.anyio
+    async def test_errors_are_not_cached(self, gateway):
+        """Failed completions are not stored"""
+        gateway.enable_auto_repair = False
+        gateway.groq_client.chat.completions.create.side_effect = Exception("boom")
+        messages = [{"role": "user", "content": "status"}]
+
+        with pytest.raises(Exception):
+            await gateway.generate_completion(messages)
+
+        assert len(gateway.completion_cache) == 0
+
+    def test_cache_disabled(self):
+        """enable_cache=False disables caching entirely"""
+        gateway = AIGateway(groq_api_key=None, gemini_api_key=None, enable_cache=False)
+        assert gateway.completion_cache is None
+        assert gateway.get_cache_stats() == {"enabled": False}
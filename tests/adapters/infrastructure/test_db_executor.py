@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""Tests for the bounded database executor"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.adapters.infrastructure.db_executor import AsyncDatabaseProxy, DatabaseExecutor
+from app.adapters.infrastructure.sqlite_history_adapter import SQLiteHistoryAdapter
+
+
+@pytest.fixture
+def executor():
+    """Create an executor and release its threads afterwards"""
+    db_executor = DatabaseExecutor(max_workers=2)
+    yield db_executor
+    db_executor.shutdown()
+
+
+class TestDatabaseExecutor:
+    """Test cases for DatabaseExecutor"""
+
+    @pytest.mark.anyio
+    async def test_run_returns_value(self, executor):
+        """Blocking calls run off the loop and return their value"""
+        caller = threading.get_ident()
+
+        result = await executor.run(lambda a, b=0: (a + b, threading.get_ident()), 1, b=2)
+
+        assert result[0] == 3
+        assert result[1] != caller
+        assert executor.get_stats()["completed"] == 1
+
+    @pytest.mark.anyio
+    async def test_run_propagates_exceptions(self, executor):
+        """Errors raised by the blocking call reach the awaiting coroutine"""
+        def fail():
+            raise ValueError("db down")
+
+        with pytest.raises(ValueError, match="db down"):
+            await executor.run(fail)
+        assert executor.get_stats()["errors"] == 1
+
+    @pytest.mark.anyio
+    async def test_bounds_concurrent_calls(self, executor):
+        """No more than max_workers calls hold a database session at once"""
+        lock = threading.Lock()
+        running = 0
+        peak = 0
+
+        def query():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+
+        await asyncio.gather(*(executor.run(query) for _ in range(6)))
+
+        assert peak == 2
+        stats = executor.get_stats()
+        assert stats["completed"] == 6
+        assert stats["max_in_flight"] == 6
+        assert stats["avg_wait_ms"] > 0
+
+    @pytest.mark.anyio
+    async def test_slow_query_does_not_stall_loop(self, executor):
+        """The event loop keeps serving other work while a query blocks"""
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task = asyncio.create_task(ticker())
+        await executor.run(time.sleep, 0.1)
+        task.cancel()
+
+        assert ticks >= 5
+
+
+class TestAsyncDatabaseProxy:
+    """Test cases for AsyncDatabaseProxy"""
+
+    @pytest.mark.anyio
+    async def test_wraps_adapter_methods(self, executor, tmp_path):
+        """Adapter methods keep their signature and become awaitable"""
+        adapter = SQLiteHistoryAdapter(db_path=str(tmp_path / "proxy.db"))
+        history = AsyncDatabaseProxy(adapter, executor)
+
+        task_id = await history.save_pending_command(
+            user_input="escreva oi", command_type="type_text", parameters={"text": "oi"}
+        )
+        pending = await history.get_next_pending_command()
+
+        assert pending["id"] == task_id
+        assert history.engine is adapter.engine
+        assert history.target is adapter
+        assert history.save_pending_command is history.save_pending_command
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""Tests for the database engine profiles"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import text
+
+from app.adapters.infrastructure.engine_profiles import (
+    PROFILES,
+    _apply_session_settings,
+    _engine_options,
+    _postgres_session_settings,
+    create_tuned_engine,
+    resolve_profile,
+)
+from app.adapters.infrastructure.sqlite_history_adapter import SQLiteHistoryAdapter
+
+
+def test_auto_profile_follows_the_database():
+    assert resolve_profile("auto", "sqlite:///jarvis.db").name == "dev-sqlite"
+    assert resolve_profile(None, "postgresql+psycopg2://u:p@host/db").name == "cloud-postgres-pooled"
+    assert resolve_profile("Edge-SQLite", "sqlite:///jarvis.db").name == "edge-sqlite"
+    with pytest.raises(ValueError):
+        resolve_profile("turbo", "sqlite:///jarvis.db")
+
+
+def test_sqlite_pragmas_are_applied(tmp_path):
+    engine = create_tuned_engine(f"sqlite:///{tmp_path / 'tuned.db'}", PROFILES["edge-sqlite"])
+
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 15000
+    assert engine.pool.size() == 10
+
+
+def test_postgres_options():
+    options = _engine_options(PROFILES["cloud-postgres"], "postgresql+psycopg2://u:p@host/db")
+
+    assert options["pool_pre_ping"] is True
+    assert options["pool_recycle"] == 1800
+    # No libpq startup options: PgBouncer rejects them
+    assert options["connect_args"] == {"connect_timeout": 10}
+
+
+def test_postgres_timeouts_are_set_per_session():
+    connection = MagicMock(autocommit=False)
+
+    _apply_session_settings(connection, _postgres_session_settings(PROFILES["cloud-postgres"]))
+
+    executed = [call.args[0] for call in connection.cursor.return_value.execute.call_args_list]
+    assert executed == [
+        "SET statement_timeout = 15000",
+        "SET idle_in_transaction_session_timeout = 60000",
+    ]
+    assert connection.autocommit is False
+
+
+def test_pooled_profile_sets_nothing_on_the_session():
+    assert _postgres_session_settings(PROFILES["cloud-postgres-pooled"]) == []
+
+
+def test_in_memory_sqlite_skips_pool_sizing():
+    assert "pool_size" not in _engine_options(PROFILES["dev-sqlite"], "sqlite:///:memory:")
+
+
+def test_adapter_uses_profile(tmp_path):
+    adapter = SQLiteHistoryAdapter(
+        database_url=f"sqlite:///{tmp_path / 'history.db'}", write_behind=False, engine_profile="dev-sqlite"
+    )
+
+    adapter.save_interaction("escreva oi", "type_text", {}, True, "ok")
+
+    assert adapter.engine_profile.name == "dev-sqlite"
+    assert len(adapter.get_recent_history()) == 1
+    with adapter.engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""Tests for the Gateway LLM Adapter's conversation context buffer"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.adapters.infrastructure.gateway_llm_adapter import GatewayLLMCommandAdapter
+
+
+@pytest.fixture
+def history_provider():
+    provider = MagicMock()
+    provider.get_recent_history.return_value = [
+        {"user_input": "aperte enter", "command_type": "press_key", "success": True},
+        {"user_input": "escreva oi", "command_type": "type_text", "success": True},
+    ]
+    return provider
+
+
+@pytest.fixture
+def gateway_adapter(history_provider):
+    # Other tests reload app.core.llm_config with LLM interpretation disabled
+    with patch.dict("os.environ", {"GROQ_API_KEY": "test_groq_key", "GOOGLE_API_KEY": "test_gemini_key"}), \
+            patch("app.core.llm_config.LLMConfig.USE_LLM_COMMAND_INTERPRETATION", True), \
+            patch("app.adapters.infrastructure.gateway_llm_adapter.GitHubAdapter"):
+        return GatewayLLMCommandAdapter(use_llm=False, history_provider=history_provider)
+
+
+@pytest.mark.anyio
+async def test_fast_path_commands_do_not_query_history(gateway_adapter, history_provider):
+    history_provider.get_recent_history.reset_mock()
+
+    intent = await gateway_adapter.interpret_async("escreva ola mundo")
+
+    assert intent.parameters.get("text") == "ola mundo"
+    history_provider.get_recent_history.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_context_is_seeded_once_then_buffered(gateway_adapter, history_provider):
+    history_provider.get_recent_history.reset_mock()
+
+    first = await gateway_adapter._conversation_instruction_async()
+    gateway_adapter.record_interaction("abra o navegador", "open_url", False)
+    second = await gateway_adapter._conversation_instruction_async()
+
+    history_provider.get_recent_history.assert_called_once()
+    assert "'escreva oi' -> type_text" in first
+    lines = second.splitlines()[-3:]
+    assert lines == [
+        "- 'escreva oi' -> type_text (sucesso)",
+        "- 'aperte enter' -> press_key (sucesso)",
+        "- 'abra o navegador' -> open_url (falhou)",
+    ]
+
+
+@pytest.mark.anyio
+async def test_concurrent_first_requests_seed_once(gateway_adapter, history_provider):
+    import asyncio
+    import time
+
+    history = history_provider.get_recent_history.return_value
+    history_provider.get_recent_history.reset_mock()
+    history_provider.get_recent_history.side_effect = lambda limit: time.sleep(0.05) or history
+
+    first, second = await asyncio.gather(
+        gateway_adapter._conversation_instruction_async(),
+        gateway_adapter._conversation_instruction_async(),
+    )
+
+    history_provider.get_recent_history.assert_called_once()
+    assert first == second
+    assert second.count("'escreva oi' -> type_text") == 1
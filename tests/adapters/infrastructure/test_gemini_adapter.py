@@ -560,3 +560,90 @@ class TestLLMCommandAdapter:
                 Exception("503 error"), "Test error details"
             )
             # No assertion needed, just verify it doesn't crash
+
+    def test_request_templates_built_once(self, mock_genai):
+        """Tool and GenerateContentConfig are built at construction and reused"""
+        from app.adapters.infrastructure import LLMCommandAdapter
+
+        mock_genai_module, mock_client = mock_genai
+        mock_client.models.generate_content.return_value = Mock(candidates=[])
+
+        adapter = LLMCommandAdapter(api_key="test_key", wake_word="xerife")
+        adapter._interpret_sync("escreva teste")
+        adapter._interpret_sync("abrir navegador")
+
+        assert mock_genai_module.types.Tool.call_count == 1
+        assert mock_genai_module.types.GenerateContentConfig.call_count == 2
+        configs = [
+            call.kwargs["config"] for call in mock_client.models.generate_content.call_args_list
+        ]
+        assert configs == [adapter.command_config, adapter.command_config]
+
+    def test_context_buffer_queries_history_once(self, mock_genai):
+        """History is read once; later context comes from record_interaction()"""
+        from app.adapters.infrastructure import LLMCommandAdapter
+
+        history = Mock()
+        history.get_recent_history.return_value = [
+            {"user_input": "abrir navegador", "command_type": "open_browser", "success": True},
+        ]
+        adapter = LLMCommandAdapter(
+            api_key="test_key", wake_word="xerife", history_provider=history
+        )
+
+        first = adapter._build_context_message()
+        adapter.record_interaction("escreva oi", "type_text", False)
+        second = adapter._build_context_message()
+
+        history.get_recent_history.assert_called_once_with(limit=3)
+        assert "'abrir navegador' -> open_browser (sucesso)" in first
+        assert second.splitlines()[-1] == "- 'escreva oi' -> type_text (falhou)"
+
+    def test_context_buffer_keeps_commands_recorded_before_seeding(self, mock_genai):
+        """Seeding merges history in front of already recorded commands"""
+        from app.adapters.infrastructure import LLMCommandAdapter
+
+        history = Mock()
+        history.get_recent_history.return_value = [
+            {"user_input": "abrir navegador", "command_type": "open_browser", "success": True},
+        ]
+        adapter = LLMCommandAdapter(
+            api_key="test_key", wake_word="xerife", history_provider=history
+        )
+
+        adapter.record_interaction("escreva oi", "type_text", True)
+        lines = adapter._build_context_message().splitlines()[1:]
+
+        assert lines == [
+            "- 'abrir navegador' -> open_browser (sucesso)",
+            "- 'escreva oi' -> type_text (sucesso)",
+        ]
+
+    def test_context_buffer_is_bounded(self, mock_genai):
+        """Only the last CONTEXT_SIZE interactions are kept"""
+        from app.adapters.infrastructure import LLMCommandAdapter
+
+        adapter = LLMCommandAdapter(api_key="test_key", wake_word="xerife")
+        for index in range(5):
+            adapter.record_interaction(f"cmd {index}", "type_text", True)
+
+        lines = adapter._build_context_message().splitlines()[1:]
+        assert lines == [f"- 'cmd {index}' -> type_text (sucesso)" for index in (2, 3, 4)]
+
+    @pytest.mark.anyio
+    async def test_interpret_async_seeds_context_off_loop(self, mock_genai):
+        """The async path seeds the buffer once and reuses it"""
+        from app.adapters.infrastructure import LLMCommandAdapter
+
+        mock_genai_module, mock_client = mock_genai
+        mock_client.models.generate_content.return_value = Mock(candidates=[])
+        history = Mock()
+        history.get_recent_history.return_value = []
+        adapter = LLMCommandAdapter(
+            api_key="test_key", wake_word="xerife", history_provider=history
+        )
+
+        await adapter.interpret_async("escreva teste")
+        await adapter.interpret_async("abrir navegador")
+
+        history.get_recent_history.assert_called_once()
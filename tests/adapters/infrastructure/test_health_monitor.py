@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""Tests for the cached health monitor"""
+
+import asyncio
+
+import pytest
+
+from app.adapters.infrastructure.health_monitor import HealthMonitor
+
+
+class CountingInspection:
+    """Inspection coroutine that counts its runs"""
+
+    def __init__(self, delay: float = 0.0):
+        self.calls = 0
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"status": "healthy", "run": self.calls}
+
+
+class TestHealthMonitor:
+    """Test cases for HealthMonitor"""
+
+    @pytest.mark.anyio
+    async def test_report_is_cached_until_ttl(self):
+        inspect = CountingInspection()
+        monitor = HealthMonitor(inspect, ttl=60)
+
+        first = await monitor.get()
+        second = await monitor.get()
+
+        assert inspect.calls == 1
+        assert first["run"] == second["run"] == 1
+        assert monitor.get_stats()["hits"] == 1
+
+    @pytest.mark.anyio
+    async def test_expired_report_is_refreshed(self):
+        inspect = CountingInspection()
+        monitor = HealthMonitor(inspect, ttl=0.01)
+
+        await monitor.get()
+        await asyncio.sleep(0.02)
+        report = await monitor.get()
+
+        assert report["run"] == 2
+
+    @pytest.mark.anyio
+    async def test_concurrent_requests_share_one_inspection(self):
+        inspect = CountingInspection(delay=0.05)
+        monitor = HealthMonitor(inspect, ttl=60)
+
+        reports = await asyncio.gather(*(monitor.get() for _ in range(5)))
+
+        assert inspect.calls == 1
+        assert {report["run"] for report in reports} == {1}
+
+    @pytest.mark.anyio
+    async def test_failing_inspection_reports_unhealthy(self):
+        async def broken():
+            raise RuntimeError("boom")
+
+        monitor = HealthMonitor(broken)
+        report = await monitor.get()
+
+        assert report["status"] == "unhealthy"
+        assert report["error"] == "boom"
+        assert monitor.get_stats()["failures"] == 1
+
+    @pytest.mark.anyio
+    async def test_background_refresh(self):
+        inspect = CountingInspection()
+        monitor = HealthMonitor(inspect, ttl=60, refresh_interval=0.01)
+
+        monitor.start()
+        await asyncio.sleep(0.05)
+        await monitor.shutdown()
+
+        assert inspect.calls >= 2
+        assert monitor.get_stats()["running"] is False
+
+    @pytest.mark.anyio
+    async def test_hung_inspection_serves_last_report_as_stale(self):
+        inspect = CountingInspection()
+        monitor = HealthMonitor(inspect, ttl=0.01, timeout=0.05)
+        await monitor.get()
+        await asyncio.sleep(0.02)
+        inspect.delay = 10
+
+        reports = await asyncio.wait_for(asyncio.gather(*(monitor.get() for _ in range(3))), timeout=1)
+
+        # One abandoned inspection; the callers queued behind it reuse its outcome
+        assert inspect.calls == 2
+        assert all(report["stale"] is True and report["run"] == 1 for report in reports)
+        assert monitor.get_stats()["timeouts"] == 1
+
+    @pytest.mark.anyio
+    async def test_hung_first_inspection_reports_unhealthy(self):
+        monitor = HealthMonitor(CountingInspection(delay=10), timeout=0.05)
+
+        report = await asyncio.wait_for(monitor.get(), timeout=1)
+
+        assert report["status"] == "unhealthy"
+        assert "timed out" in report["error"]
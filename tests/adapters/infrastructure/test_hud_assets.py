@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""Tests for the prebuilt Strategic HUD bundle"""
+
+import gzip
+import json
+
+import pytest
+
+from app.adapters.infrastructure.hud_assets import (
+    ASSET_URL_PREFIX,
+    HudAssetBundle,
+    SW_BUILD_PLACEHOLDER,
+    StaticAsset,
+)
+
+
+@pytest.fixture
+def hud_dir(tmp_path):
+    """Create a minimal HUD source tree (static/hud + static/sw.js)"""
+    source = tmp_path / "hud"
+    source.mkdir()
+    (source / "index.html").write_text(
+        '<link rel="stylesheet" href="{{ asset:hud.css }}">\n<script src="{{ asset:hud.js }}"></script>\n'
+    )
+    (source / "hud.css").write_text("body { color: #00d4ff; }\n" * 100)
+    (source / "hud.js").write_text("console.log('jarvis');\n" * 100)
+    (tmp_path / "sw.js").write_text(f"const HUD_BUILD = {SW_BUILD_PLACEHOLDER};\n")
+    return source
+
+
+class TestHudAssetBundle:
+    """Test cases for HudAssetBundle.build"""
+
+    def test_assets_are_named_by_content_hash(self, hud_dir):
+        """Hashed names change with the content and are referenced from index.html"""
+        bundle = HudAssetBundle.build(hud_dir)
+        index = bundle.index.body.decode()
+
+        for url in bundle.precache_urls():
+            assert url.startswith(ASSET_URL_PREFIX)
+            assert url in index
+        assert "{{" not in index
+
+        (hud_dir / "hud.js").write_text("console.log('updated');\n")
+        rebuilt = HudAssetBundle.build(hud_dir)
+        assert rebuilt.version != bundle.version
+        assert set(rebuilt.assets) != set(bundle.assets)
+
+    def test_service_worker_receives_manifest(self, hud_dir):
+        """The sw.js placeholder is replaced with the build version and asset URLs"""
+        bundle = HudAssetBundle.build(hud_dir)
+        body = bundle.service_worker.body.decode()
+
+        manifest = json.loads(body[body.index("{"):body.rindex("}") + 1])
+        assert manifest == {"version": bundle.version, "assets": bundle.precache_urls()}
+
+    def test_unknown_asset_reference_fails_build(self, hud_dir):
+        """A typo in index.html is caught at startup, not by a broken page"""
+        (hud_dir / "index.html").write_text('<script src="{{ asset:missing.js }}"></script>')
+
+        with pytest.raises(KeyError):
+            HudAssetBundle.build(hud_dir)
+
+
+class TestStaticAsset:
+    """Test cases for StaticAsset responses"""
+
+    @pytest.fixture
+    def asset(self):
+        return StaticAsset(name="hud.abc.js", body=b"console.log(1);\n" * 200, content_type="application/javascript", immutable=True)
+
+    def test_gzip_variant_is_precompressed(self, asset):
+        """Clients accepting gzip get the precompressed body"""
+        status_code, body, headers = asset.respond(accept_encoding="gzip, deflate")
+
+        assert status_code == 200
+        assert headers["Content-Encoding"] == "gzip"
+        assert gzip.decompress(body) == asset.body
+        assert headers["Vary"] == "Accept-Encoding"
+        assert "immutable" in headers["Cache-Control"]
+
+    def test_identity_when_encoding_not_accepted(self, asset):
+        """Without a usable Accept-Encoding the raw body is sent"""
+        for header in ("", "identity", "gzip;q=0"):
+            status_code, body, headers = asset.respond(accept_encoding=header)
+            assert body == asset.body
+            assert "Content-Encoding" not in headers
+
+    def test_not_modified_for_any_representation(self, asset):
+        """If-None-Match with the identity or encoded ETag yields an empty 304"""
+        _, _, plain = asset.respond()
+        _, _, encoded = asset.respond(accept_encoding="gzip")
+        assert plain["ETag"] != encoded["ETag"]
+
+        for etag in (plain["ETag"], encoded["ETag"], f"W/{plain['ETag']}"):
+            status_code, body, _ = asset.respond(accept_encoding="gzip", if_none_match=etag)
+            assert status_code == 304
+            assert body == b""
+
+        assert asset.respond(if_none_match='"stale"')[0] == 200
+
+    def test_small_bodies_are_not_compressed(self):
+        """Tiny assets skip compression"""
+        asset = StaticAsset(name="tiny.js", body=b"x", content_type="application/javascript")
+
+        assert asset.encodings == {}
+        assert asset.respond(accept_encoding="gzip")[1] == b"x"
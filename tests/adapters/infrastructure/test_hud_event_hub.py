@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""Tests for the HUD event hub"""
+
+import asyncio
+
+import pytest
+
+from app.adapters.infrastructure.hud_event_hub import RESYNC, HudEventHub, diff_state
+
+
+def drain(subscriber):
+    """Return every message currently queued for a subscriber"""
+    messages = []
+    while not subscriber.queue.empty():
+        messages.append(subscriber.queue.get_nowait())
+    return messages
+
+
+class TestDiffState:
+    """Test cases for diff_state"""
+
+    def test_reports_changed_and_removed_keys(self):
+        diff = diff_state({"a": 1, "b": 2, "c": 3}, {"a": 1, "b": 5, "d": None})
+
+        assert diff == {"changes": {"b": 5, "d": None}, "removed": ["c"]}
+
+    def test_identical_states_have_no_diff(self):
+        assert diff_state({"a": {"x": 1}}, {"a": {"x": 1}}) is None
+
+
+class TestHudEventHub:
+    """Test cases for HudEventHub"""
+
+    @pytest.mark.anyio
+    async def test_subscribe_sends_snapshot_then_diffs(self):
+        """New subscribers get the current state, then only changes"""
+        hub = HudEventHub()
+        hub.publish("status", {"is_active": False, "wake_word": "xerife"})
+        subscriber = hub.subscribe(["status", "commands"])
+
+        hub.update("status", {"is_active": True})
+        hub.emit("commands", {"command_id": 7})
+        messages = drain(subscriber)
+
+        assert messages[0]["type"] == "snapshot"
+        assert messages[0]["state"] == {"is_active": False, "wake_word": "xerife"}
+        assert messages[1]["type"] == "diff"
+        assert messages[1]["changes"] == {"is_active": True}
+        assert messages[2] == {**messages[2], "type": "event", "topic": "commands", "data": {"command_id": 7}}
+
+    @pytest.mark.anyio
+    async def test_unchanged_state_is_not_pushed(self):
+        """Publishing an identical state sends nothing"""
+        hub = HudEventHub()
+        subscriber = hub.subscribe(["status"])
+
+        assert hub.publish("status", {"is_active": True}) is True
+        assert hub.publish("status", {"is_active": True}) is False
+
+        assert len(drain(subscriber)) == 1
+        assert hub.get_stats()["suppressed"] == 1
+
+    @pytest.mark.anyio
+    async def test_slow_subscriber_is_resynchronized(self):
+        """A full queue is replaced by a single resync marker"""
+        hub = HudEventHub(queue_size=2)
+        subscriber = hub.subscribe(["commands"])
+
+        for index in range(3):
+            hub.emit("commands", {"command_id": index})
+
+        assert drain(subscriber) == [RESYNC]
+        assert subscriber.dropped == 2
+        assert hub.get_stats()["resyncs"] == 1
+
+    @pytest.mark.anyio
+    async def test_sources_run_only_while_subscribed(self):
+        """A topic's source is refreshed for its subscribers and stopped without them"""
+        hub = HudEventHub()
+        calls = []
+
+        async def refresh():
+            calls.append(1)
+            return {"completion_percentage": 50.0}
+
+        hub.register_source("evolution", refresh, interval=60)
+        assert hub.get_stats()["active_sources"] == []
+
+        subscriber = hub.subscribe(["evolution"])
+        await asyncio.sleep(0.01)
+
+        assert calls == [1]
+        assert drain(subscriber)[0]["changes"] == {"completion_percentage": 50.0}
+        assert hub.get_stats()["active_sources"] == ["evolution"]
+
+        hub.unsubscribe(subscriber)
+        await asyncio.sleep(0)
+        assert hub.get_stats()["active_sources"] == []
+        await hub.shutdown()
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Tests for fast JSON responses, selective gzip and streamed lists"""
+
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.adapters.infrastructure.json_responses import (
+    FastJSONResponse,
+    SelectiveGZipMiddleware,
+    _iter_json_list,
+    _stdlib_dumps,
+    dumps_json,
+    stream_json_list,
+)
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+@pytest.fixture
+def client():
+    """App with the fast response class, selective gzip and a streamed route"""
+    app = FastAPI(default_response_class=FastJSONResponse)
+    app.add_middleware(SelectiveGZipMiddleware, minimum_size=100, exclude_paths=("/raw",))
+
+    @app.get("/big")
+    async def big():
+        return {"items": [{"id": i, "name": "jarvis"} for i in range(200)]}
+
+    @app.get("/raw")
+    async def raw():
+        return {"items": [{"id": i, "name": "jarvis"} for i in range(200)]}
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        items = [Item(id=i, name=f"item-{i}") for i in range(25)]
+        return stream_json_list({"total": len(items)}, "items", items, chunk_items=10)
+
+    return TestClient(app)
+
+
+class TestDumpsJson:
+    """Test cases for dumps_json"""
+
+    def test_matches_stdlib_document(self):
+        """The fast encoder produces the same document as the stdlib encoder"""
+        content = {"name": "Jarvis ção", "values": [1, 2.5, None, True], "nested": {"a": "b"}}
+
+        assert json.loads(dumps_json(content)) == json.loads(_stdlib_dumps(content))
+
+    def test_response_class_renders_bytes(self):
+        """FastJSONResponse renders JSON bytes with the JSON media type"""
+        response = FastJSONResponse({"total": 1})
+
+        assert json.loads(response.body) == {"total": 1}
+        assert response.media_type == "application/json"
+
+
+class TestSelectiveGZip:
+    """Test cases for SelectiveGZipMiddleware"""
+
+    def test_large_responses_are_compressed(self, client):
+        response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()["items"]) == 200
+
+    def test_small_responses_are_not_compressed(self, client):
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+
+    def test_excluded_paths_are_not_compressed(self, client):
+        response = client.get("/raw", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert len(response.json()["items"]) == 200
+
+
+class TestStreamJsonList:
+    """Test cases for stream_json_list"""
+
+    def test_streamed_document_is_valid_json(self, client):
+        """Chunks join into the same document as a regular response"""
+        response = client.get("/stream")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert data["total"] == 25
+        assert [item["id"] for item in data["items"]] == list(range(25))
+        assert data["items"][0] == {"id": 0, "name": "item-0"}
+
+    @pytest.mark.parametrize("count", [0, 1, 10, 11])
+    def test_chunk_boundaries(self, count):
+        """Empty lists and exact chunk multiples produce valid JSON"""
+        body = b"".join(_iter_json_list({"total": count}, "logs", range(count), lambda i: {"i": i}, 10))
+
+        assert json.loads(body) == {"total": count, "logs": [{"i": i} for i in range(count)]}
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Tests for the password hashing pool and login attempt limiter"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.adapters.infrastructure.password_hashing import (
+    HashingQueueFull,
+    LoginAttemptLimiter,
+    PasswordHashingPool,
+)
+from app.adapters.infrastructure.state_store import SQLiteStateStore
+
+
+@pytest.fixture
+def pool():
+    """Create a single-thread pool and release it afterwards"""
+    hashing_pool = PasswordHashingPool(max_workers=1, max_pending=2)
+    yield hashing_pool
+    hashing_pool.shutdown()
+
+
+class TestPasswordHashingPool:
+    """Test cases for PasswordHashingPool"""
+
+    @pytest.mark.anyio
+    async def test_runs_off_the_loop(self, pool):
+        """Hashing runs on a pool thread and returns its value"""
+        caller = threading.get_ident()
+
+        result = await pool.run(lambda password: (password[::-1], threading.get_ident()), "admin123")
+
+        assert result[0] == "321nimda"
+        assert result[1] != caller
+        assert pool.get_stats()["completed"] == 1
+
+    @pytest.mark.anyio
+    async def test_rejects_when_queue_is_full(self, pool):
+        """Jobs beyond max_pending fail fast instead of queueing"""
+        release = threading.Event()
+        running = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(HashingQueueFull):
+            await pool.run(lambda: None)
+
+        release.set()
+        await asyncio.gather(*running)
+        assert pool.get_stats()["rejected"] == 1
+        assert pool.get_stats()["pending"] == 0
+
+
+class TestLoginAttemptLimiter:
+    """Test cases for LoginAttemptLimiter"""
+
+    def test_blocks_username_after_max_failures(self):
+        limiter = LoginAttemptLimiter(max_failures_per_username=3, max_failures_per_ip=100)
+        for _ in range(3):
+            assert limiter.check("admin", "10.0.0.1") is None
+            limiter.record_failure("admin", "10.0.0.1")
+
+        retry_after = limiter.check("Admin", "10.0.0.2")
+
+        assert retry_after is not None and retry_after > 0
+        assert limiter.check("other", "10.0.0.1") is None
+        assert limiter.get_stats()["blocked"] == 1
+
+    def test_blocks_ip_across_usernames(self):
+        limiter = LoginAttemptLimiter(max_failures_per_username=100, max_failures_per_ip=2)
+        limiter.record_failure("alice", "10.0.0.1")
+        limiter.record_failure("bob", "10.0.0.1")
+
+        assert limiter.check("carol", "10.0.0.1") is not None
+        assert limiter.check("carol", "10.0.0.2") is None
+
+    def test_success_clears_username_failures(self):
+        limiter = LoginAttemptLimiter(max_failures_per_username=2, max_failures_per_ip=100)
+        limiter.record_failure("admin", "10.0.0.1")
+
+        limiter.record_success("admin")
+        limiter.record_failure("admin", "10.0.0.1")
+
+        assert limiter.check("admin", "10.0.0.1") is None
+
+    def test_failures_expire_with_window(self):
+        limiter = LoginAttemptLimiter(max_failures_per_username=1, window_seconds=0.05)
+        limiter.record_failure("admin")
+        assert limiter.check("admin") is not None
+
+        time.sleep(0.06)
+
+        assert limiter.check("admin") is None
+        assert limiter.get_stats()["tracked_keys"] == 0
+
+    def test_in_flight_attempts_count_against_limit(self):
+        """Concurrent attempts cannot all pass before their failures are recorded"""
+        limiter = LoginAttemptLimiter(max_failures_per_username=2, max_failures_per_ip=100)
+
+        assert limiter.acquire("admin", "10.0.0.1") is None
+        assert limiter.acquire("admin", "10.0.0.2") is None
+        assert limiter.acquire("admin", "10.0.0.3") is not None
+        assert limiter.get_stats()["in_flight"] == 2
+
+        limiter.record_success("admin")
+        limiter.release("admin", "10.0.0.1")
+        assert limiter.acquire("admin", "10.0.0.3") is None
+
+    def test_in_flight_attempts_shared_across_workers(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        worker_a = LoginAttemptLimiter(max_failures_per_username=1, state_store=SQLiteStateStore(path))
+        worker_b = LoginAttemptLimiter(max_failures_per_username=1, state_store=SQLiteStateStore(path))
+
+        assert worker_a.acquire("admin") is None
+        assert worker_b.acquire("admin") is not None
+
+        worker_a.release("admin")
+        assert worker_b.acquire("admin") is None
+
+    def test_tracked_keys_are_bounded(self):
+        limiter = LoginAttemptLimiter(max_keys=4)
+        for index in range(10):
+            limiter.record_failure(f"user-{index}", f"10.0.0.{index}")
+
+        assert limiter.get_stats()["tracked_keys"] == 4
+
+    def test_shared_store_counts_failures_across_workers(self, tmp_path):
+        """Failures recorded on one API worker block the username on the others"""
+        path = str(tmp_path / "state.db")
+        worker_a = LoginAttemptLimiter(max_failures_per_username=2, state_store=SQLiteStateStore(path))
+        worker_b = LoginAttemptLimiter(max_failures_per_username=2, state_store=SQLiteStateStore(path))
+
+        worker_a.record_failure("admin", "10.0.0.1")
+        worker_b.record_failure("admin", "10.0.0.2")
+
+        assert worker_a.check("admin", "10.0.0.3") is not None
+        worker_b.record_success("admin")
+        assert worker_a.check("admin", "10.0.0.3") is None
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""Tests for per-provider concurrency limits"""
+
+import asyncio
+import time
+
+import pytest
+
+from app.adapters.infrastructure.provider_limits import (
+    CircuitBreaker,
+    ConcurrencyLimiter,
+    LatencyWindow,
+    ModelBudget,
+    parse_reset_duration,
+)
+from app.adapters.infrastructure.state_store import SQLiteStateStore
+
+
+class TestConcurrencyLimiter:
+    """Test cases for ConcurrencyLimiter"""
+
+    @pytest.mark.anyio
+    async def test_limits_in_flight_requests(self):
+        """No more than max_concurrency blocks run at once"""
+        limiter = ConcurrencyLimiter("groq", max_concurrency=2)
+        running = 0
+        peak = 0
+
+        async def request():
+            nonlocal running, peak
+            async with limiter.slot():
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(request() for _ in range(6)))
+
+        assert peak == 2
+        stats = limiter.get_stats()
+        assert stats["acquired"] == 6
+        assert stats["in_flight"] == 0
+        assert stats["waiting"] == 0
+
+    @pytest.mark.anyio
+    async def test_records_queue_depth(self):
+        """Waiting requests are reported as queue depth"""
+        limiter = ConcurrencyLimiter("gemini", max_concurrency=1)
+        release = asyncio.Event()
+
+        async def holder():
+            async with limiter.slot():
+                await release.wait()
+
+        async def waiter():
+            async with limiter.slot():
+                pass
+
+        tasks = [asyncio.create_task(holder())] + [asyncio.create_task(waiter()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+
+        stats = limiter.get_stats()
+        assert stats["in_flight"] == 1
+        assert stats["waiting"] == 3
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert limiter.get_stats()["max_waiting"] == 3
+
+    @pytest.mark.anyio
+    async def test_slot_released_on_error(self):
+        """Errors inside the block release the slot"""
+        limiter = ConcurrencyLimiter("groq", max_concurrency=1)
+
+        with pytest.raises(RuntimeError):
+            async with limiter.slot():
+                raise RuntimeError("boom")
+
+        async with limiter.slot():
+            assert limiter.get_stats()["in_flight"] == 1
+
+
+class TestParseResetDuration:
+    """Test cases for rate limit duration parsing"""
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [("12", 12.0), ("7.66s", 7.66), ("2m59.56s", 179.56), ("120ms", 0.12), ("1h2m", 3720.0)],
+    )
+    def test_valid_durations(self, value, expected):
+        """Plain seconds and Go-style durations are parsed"""
+        assert parse_reset_duration(value) == pytest.approx(expected)
+
+    def test_invalid_duration(self):
+        """Unparseable values return None"""
+        assert parse_reset_duration("soon") is None
+        assert parse_reset_duration(None) is None
+
+
+class TestModelBudget:
+    """Test cases for ModelBudget"""
+
+    def test_unknown_budget_has_capacity(self):
+        """Without observed headers the budget never blocks"""
+        assert ModelBudget("m").has_capacity(100000)
+
+    def test_dispatch_consumes_budget(self):
+        """Dispatched requests reduce the remaining budget until headers correct it"""
+        budget = ModelBudget("m", reserve_requests=0)
+        budget.update_from_headers({
+            "x-ratelimit-remaining-requests": "2",
+            "x-ratelimit-remaining-tokens": "500",
+        })
+
+        budget.record_dispatch(300)
+        assert budget.has_capacity(200)
+        assert not budget.has_capacity(201)
+
+        budget.record_dispatch(0)
+        assert not budget.has_capacity(0)
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker"""
+
+    def test_open_blocks_until_cooldown(self):
+        """An open breaker rejects requests until the cooldown expires"""
+        breaker = CircuitBreaker("m", cooldown_seconds=30)
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow_request()
+
+    def test_half_open_admits_single_probe(self):
+        """After the cooldown exactly one probe is admitted"""
+        breaker = CircuitBreaker("m", cooldown_seconds=30)
+        breaker.record_failure(retry_after=0.01)
+        time.sleep(0.02)
+
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        assert not breaker.is_available()
+
+    def test_probe_success_closes(self):
+        """A successful probe closes the breaker"""
+        breaker = CircuitBreaker("m")
+        breaker.record_failure(retry_after=0.01)
+        time.sleep(0.02)
+        breaker.allow_request()
+        breaker.record_success()
+
+        assert breaker.state == CircuitBreaker.CLOSED
+        assert breaker.allow_request()
+
+    def test_probe_failure_reopens(self):
+        """A rate-limited probe opens the breaker again"""
+        breaker = CircuitBreaker("m", cooldown_seconds=30)
+        breaker.record_failure(retry_after=0.01)
+        time.sleep(0.02)
+        breaker.allow_request()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.get_stats()["trips"] == 2
+
+    def test_trip_is_shared_through_state_store(self, tmp_path):
+        """A trip recorded by one worker opens the breaker in another"""
+        path = str(tmp_path / "state.db")
+        worker_a = CircuitBreaker("m", cooldown_seconds=30, state_store=SQLiteStateStore(path))
+        worker_b = CircuitBreaker("m", cooldown_seconds=30, state_store=SQLiteStateStore(path))
+
+        worker_a.record_failure()
+
+        assert worker_b.state == CircuitBreaker.OPEN
+        assert not worker_b.allow_request()
+
+        worker_a.reset()
+        worker_b.record_success()
+        assert CircuitBreaker("m", state_store=SQLiteStateStore(path)).state == CircuitBreaker.CLOSED
+
+    def test_shared_state_read_is_cached(self, tmp_path):
+        """The shared trip is re-read at most once per SHARED_CHECK_INTERVAL"""
+        path = str(tmp_path / "state.db")
+        worker_a = CircuitBreaker("m", cooldown_seconds=30, state_store=SQLiteStateStore(path))
+        worker_b = CircuitBreaker("m", cooldown_seconds=30, state_store=SQLiteStateStore(path))
+        assert worker_b.state == CircuitBreaker.CLOSED
+
+        worker_a.record_failure()
+        assert worker_b.state == CircuitBreaker.CLOSED
+
+        worker_b._shared_checked -= CircuitBreaker.SHARED_CHECK_INTERVAL
+        assert worker_b.state == CircuitBreaker.OPEN
+
+    @pytest.mark.anyio
+    async def test_shared_state_io_runs_off_loop(self, tmp_path):
+        """On the event loop, store reads and writes land in the background"""
+        path = str(tmp_path / "state.db")
+        worker_a = CircuitBreaker("m", cooldown_seconds=30, state_store=SQLiteStateStore(path))
+        worker_b = CircuitBreaker("m", cooldown_seconds=30, state_store=SQLiteStateStore(path))
+
+        worker_a.record_failure()
+        for _ in range(100):
+            if worker_b.state == CircuitBreaker.OPEN:
+                break
+            worker_b._shared_checked = None
+            await asyncio.sleep(0.01)
+
+        assert worker_b.state == CircuitBreaker.OPEN
+
+
+class TestLatencyWindow:
+    """Test cases for LatencyWindow"""
+
+    def test_percentile_requires_min_samples(self):
+        """No percentile is reported until enough samples exist"""
+        window = LatencyWindow(min_samples=3)
+        window.record(0.1)
+        window.record(0.2)
+        assert window.percentile(0.95) is None
+
+        window.record(0.3)
+        assert window.percentile(0.95) == 0.3
+
+    def test_window_keeps_recent_samples(self):
+        """Old samples fall out of the window"""
+        window = LatencyWindow(max_samples=2, min_samples=1)
+        for latency in (5.0, 0.1, 0.2):
+            window.record(latency)
+
+        assert len(window) == 2
+        assert window.percentile(0.95) == 0.2
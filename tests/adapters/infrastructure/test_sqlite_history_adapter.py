@@ -1,9 +1,15 @@
 # -*- coding: utf-8 -*-
 """Tests for SQLite History Adapter"""
 
+import sqlite3
+import threading
+import time
 from datetime import datetime
+from unittest.mock import patch
 
 import pytest
+import sqlalchemy
+from sqlmodel import Session, select
 
 from app.adapters.infrastructure.sqlite_history_adapter import (
     Interaction,
@@ -371,3 +377,272 @@ class TestSQLiteHistoryAdapter:
         pending = adapter.get_next_pending_command()
         assert pending is None
 
+
+
+class TestWriteBehindHistory:
+    """Test cases for write-behind interaction logging"""
+
+    @pytest.fixture
+    def adapter(self, tmp_path):
+        """Create a write-behind adapter on a file database (shared by the writer thread)"""
+        adapter = SQLiteHistoryAdapter(
+            database_url=f"sqlite:///{tmp_path / 'history.db'}",
+            write_behind=True,
+            batch_size=10,
+            flush_interval=0.05,
+        )
+        yield adapter
+        adapter.close()
+
+    @staticmethod
+    def save(adapter, index):
+        adapter.save_interaction(
+            user_input=f"command {index}",
+            command_type="type_text",
+            parameters={"index": index},
+            success=True,
+            response_text="ok",
+            timestamp=datetime(2024, 1, 1, 12, 0, index),
+        )
+
+    def test_interactions_are_written_in_batches(self, adapter):
+        for index in range(25):
+            self.save(adapter, index)
+
+        history = adapter.get_recent_history(limit=30)
+
+        assert len(history) == 25
+        assert history[0]["parameters"] == {"index": 24}
+        stats = adapter.get_write_stats()
+        assert stats["written"] == 25
+        assert stats["batches"] < 25
+        assert stats["pending"] == 0
+
+    def test_read_after_write_does_not_wait_for_flush_interval(self, tmp_path):
+        adapter = SQLiteHistoryAdapter(
+            database_url=f"sqlite:///{tmp_path / 'history.db'}", write_behind=True, flush_interval=5.0
+        )
+        try:
+            self.save(adapter, 0)
+            time.sleep(0.05)  # writer is now holding a partial batch
+            started = time.monotonic()
+            history = adapter.get_recent_history(limit=5)
+            elapsed = time.monotonic() - started
+        finally:
+            adapter.close()
+
+        assert len(history) == 1
+        assert elapsed < 1.0
+
+    def test_close_flushes_queue(self, tmp_path):
+        adapter = SQLiteHistoryAdapter(
+            database_url=f"sqlite:///{tmp_path / 'history.db'}",
+            write_behind=True,
+            flush_interval=60,
+        )
+        self.save(adapter, 1)
+        adapter.close()
+
+        reader = SQLiteHistoryAdapter(database_url=adapter.database_url)
+        assert len(reader.get_recent_history()) == 1
+
+        # Writes after close go straight to the database
+        self.save(adapter, 2)
+        assert len(reader.get_recent_history()) == 2
+
+    def test_full_queue_falls_back_to_direct_write(self, tmp_path):
+        adapter = SQLiteHistoryAdapter(
+            database_url=f"sqlite:///{tmp_path / 'history.db'}",
+            write_behind=True,
+            batch_size=1,
+            max_queue_size=1,
+            enqueue_timeout=0.01,
+        )
+        release_writer = threading.Event()
+        insert_rows = adapter._insert_rows
+
+        def slow_writer_insert(rows):
+            if threading.current_thread().name == "history-writer":
+                release_writer.wait(5)
+            insert_rows(rows)
+
+        with patch.object(adapter, "_insert_rows", side_effect=slow_writer_insert):
+            self.save(adapter, 1)  # taken by the (blocked) writer
+            time.sleep(0.05)
+            self.save(adapter, 2)  # fills the queue
+            self.save(adapter, 3)  # times out and is written directly
+
+            assert adapter.get_write_stats()["direct_writes"] == 1
+            release_writer.set()
+            adapter.close()
+
+        assert len(adapter.get_recent_history(limit=10)) == 3
+
+    def test_in_memory_database_writes_directly(self):
+        adapter = SQLiteHistoryAdapter(database_url="sqlite:///:memory:", write_behind=True)
+
+        assert adapter.write_behind is False
+        self.save(adapter, 1)
+        assert len(adapter.get_recent_history()) == 1
+
+
+class TestClaimQueue:
+    """Test cases for leasing pending commands to workers"""
+
+    @pytest.fixture
+    def database_url(self, tmp_path):
+        return f"sqlite:///{tmp_path / 'queue.db'}"
+
+    @pytest.fixture
+    def adapter(self, database_url):
+        return SQLiteHistoryAdapter(database_url=database_url)
+
+    @staticmethod
+    def enqueue(adapter, count):
+        return [
+            adapter.save_pending_command(user_input=f"task {index}", command_type="type_text", parameters={})
+            for index in range(count)
+        ]
+
+    def test_claim_batch_leases_oldest_first(self, adapter):
+        ids = self.enqueue(adapter, 3)
+
+        claimed = adapter.claim_batch(2, "worker-a")
+
+        assert [command["id"] for command in claimed] == ids[:2]
+        assert claimed[0]["attempts"] == 1
+        assert [command["id"] for command in adapter.claim_batch(5, "worker-b")] == ids[2:]
+        assert adapter.claim_batch(5, "worker-c") == []
+
+    def test_concurrent_workers_never_share_a_command(self, database_url):
+        self.enqueue(SQLiteHistoryAdapter(database_url=database_url), 40)
+        workers = [SQLiteHistoryAdapter(database_url=database_url) for _ in range(4)]
+        claimed = {index: [] for index in range(4)}
+
+        def drain(index):
+            while True:
+                batch = workers[index].claim_batch(3, f"worker-{index}")
+                if not batch:
+                    return
+                claimed[index].extend(command["id"] for command in batch)
+
+        threads = [threading.Thread(target=drain, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        all_ids = [command_id for ids in claimed.values() for command_id in ids]
+        assert len(all_ids) == 40
+        assert len(set(all_ids)) == 40
+
+    def test_expired_lease_is_redelivered(self, adapter):
+        command_id = self.enqueue(adapter, 1)[0]
+        adapter.claim_batch(1, "worker-a", lease_seconds=0)
+        time.sleep(0.01)
+
+        redelivered = adapter.claim_batch(1, "worker-b")
+
+        assert redelivered[0]["id"] == command_id
+        assert redelivered[0]["attempts"] == 2
+        # The first worker lost the lease and cannot record a result
+        assert adapter.update_command_status(command_id, "completed", True, worker_id="worker-a") is False
+        assert adapter.update_command_status(command_id, "completed", True, worker_id="worker-b") is True
+        assert adapter.claim_batch(1, "worker-c") == []
+
+    def test_renew_lease_keeps_command(self, adapter):
+        command_id = self.enqueue(adapter, 1)[0]
+        adapter.claim_batch(1, "worker-a", lease_seconds=0)
+
+        assert adapter.renew_lease(command_id, "worker-a", lease_seconds=60) is True
+        assert adapter.renew_lease(command_id, "worker-b") is False
+        assert adapter.claim_batch(1, "worker-b") == []
+
+    def test_command_fails_after_max_attempts(self, adapter):
+        self.enqueue(adapter, 1)
+        adapter.claim_batch(1, "worker-a", lease_seconds=0, max_attempts=1)
+        time.sleep(0.01)
+
+        assert adapter.claim_batch(1, "worker-b", max_attempts=1) == []
+        with Session(adapter.engine) as session:
+            interaction = session.exec(select(Interaction)).one()
+        assert interaction.status == "failed"
+
+    def test_logged_interactions_are_not_claimable(self, adapter):
+        adapter.save_interaction("escreva oi", "type_text", {}, True, "ok")
+
+        assert adapter.claim_batch(5, "worker-a") == []
+
+    def test_old_table_is_upgraded(self, tmp_path):
+        path = tmp_path / "old.db"
+        connection = sqlite3.connect(path)
+        connection.execute(
+            "CREATE TABLE interactions (id INTEGER PRIMARY KEY, timestamp DATETIME NOT NULL, "
+            "user_input VARCHAR NOT NULL, command_type VARCHAR NOT NULL, parameters VARCHAR NOT NULL, "
+            "success BOOLEAN NOT NULL, response_text VARCHAR NOT NULL, status VARCHAR NOT NULL, "
+            "processed_at DATETIME)"
+        )
+        connection.execute(
+            "INSERT INTO interactions VALUES (1, '2024-01-01 00:00:00', 'old task', 'type_text', '{}', 0, '', "
+            "'pending', NULL)"
+        )
+        # Executed interaction logged by the old save_interaction (default status)
+        connection.execute(
+            "INSERT INTO interactions VALUES (2, '2023-12-31 00:00:00', 'escreva oi', 'type_text', '{}', 1, "
+            "'ok', 'pending', NULL)"
+        )
+        connection.commit()
+        connection.close()
+
+        adapter = SQLiteHistoryAdapter(database_url=f"sqlite:///{path}")
+
+        assert [command["user_input"] for command in adapter.claim_batch(5, "worker-a")] == ["old task"]
+        with Session(adapter.engine) as session:
+            assert session.get(Interaction, 2).status == "completed"
+        indexes = {index["name"] for index in sqlalchemy.inspect(adapter.engine).get_indexes("interactions")}
+        assert "ix_interactions_status_timestamp" in indexes
+
+
+class TestHistoryPagination:
+    """Test cases for keyset-paginated, filtered history"""
+
+    @pytest.fixture
+    def adapter(self):
+        adapter = SQLiteHistoryAdapter(database_url="sqlite:///:memory:")
+        same_second = datetime(2024, 1, 1, 12, 0, 0)
+        for index in range(5):
+            # Equal timestamps: the id tie-breaker must keep pages disjoint
+            adapter.save_interaction(
+                f"cmd {index}", "type_text" if index % 2 else "open_url", {}, True, "ok", timestamp=same_second
+            )
+        adapter.save_interaction("late", "open_url", {}, True, "ok", timestamp=datetime(2024, 1, 2))
+        return adapter
+
+    def test_pages_cover_every_row_once(self, adapter):
+        from app.core.pagination import encode_cursor
+
+        seen, cursor = [], None
+        while True:
+            page = adapter.get_recent_history(limit=2, cursor=cursor)
+            seen.extend(item["user_input"] for item in page)
+            if len(page) < 2:
+                break
+            cursor = encode_cursor(datetime.fromisoformat(page[-1]["timestamp"]), page[-1]["id"])
+
+        assert seen == ["late", "cmd 4", "cmd 3", "cmd 2", "cmd 1", "cmd 0"]
+
+    def test_filters(self, adapter):
+        by_type = adapter.get_recent_history(command_type="type_text")
+        in_range = adapter.get_recent_history(since=datetime(2024, 1, 1, 13), until=datetime(2024, 1, 3))
+
+        assert [item["user_input"] for item in by_type] == ["cmd 3", "cmd 1"]
+        assert [item["user_input"] for item in in_range] == ["late"]
+
+    def test_invalid_cursor_raises(self, adapter):
+        with pytest.raises(ValueError):
+            adapter.get_recent_history(cursor="not-a-cursor")
+
+    def test_indexes_exist(self, adapter):
+        indexes = {index["name"] for index in sqlalchemy.inspect(adapter.engine).get_indexes("interactions")}
+
+        assert {"ix_interactions_timestamp_id", "ix_interactions_command_type_timestamp"} <= indexes
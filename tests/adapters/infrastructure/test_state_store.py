@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Tests for the StateStore backends shared between API workers"""
+
+import time
+
+import pytest
+
+from app.adapters.infrastructure.state_store import (
+    InMemoryStateStore,
+    SQLiteStateStore,
+    create_state_store,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Each test runs against both backends"""
+    if request.param == "memory":
+        return InMemoryStateStore()
+    return SQLiteStateStore(str(tmp_path / "state.db"))
+
+
+def test_values_and_ttl(store):
+    store.set("a", {"x": 1})
+    store.set("b", 1, ttl=0.01)
+
+    assert store.get("a") == {"x": 1}
+    assert store.get("missing") is None
+    time.sleep(0.02)
+    assert store.get("b") is None
+
+    store.delete("a")
+    assert store.get("a") is None
+
+
+def test_increment(store):
+    assert store.increment("count") == 1
+    assert store.increment("count", 2) == 3
+    assert store.get("count") == 3
+
+    store.increment("window", ttl=0.01)
+    time.sleep(0.02)
+    assert store.increment("window", ttl=10) == 1
+
+
+def test_capped_list_newest_first(store):
+    for index in range(5):
+        store.list_push("history", index, max_length=3)
+
+    assert store.list_range("history") == [4, 3, 2]
+    assert store.list_range("history", limit=2) == [4, 3]
+
+
+def test_list_pop_oldest(store):
+    store.list_push("inbox", "first")
+    store.list_push("inbox", "second")
+
+    assert store.list_pop_oldest("inbox") == "first"
+    assert store.list_pop_oldest("inbox") == "second"
+    assert store.list_pop_oldest("inbox") is None
+
+
+def test_hashes(store):
+    store.hash_set("routes", "pc", {"worker": "w1"})
+    store.hash_set("routes", "phone", {"worker": "w2"})
+    store.hash_delete("routes", "pc")
+
+    assert store.hash_get_all("routes") == {"phone": {"worker": "w2"}}
+    assert store.hash_get_all("other") == {}
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    """Two stores on the same file behave like two workers"""
+    path = str(tmp_path / "state.db")
+    worker_a = SQLiteStateStore(path)
+    worker_b = SQLiteStateStore(path)
+
+    worker_a.list_push("history", {"command": "hello"}, max_length=10)
+    worker_a.hash_set("routes", "pc", {"worker": "a"})
+
+    assert worker_a.shared is True
+    assert worker_b.list_range("history") == [{"command": "hello"}]
+    assert worker_b.hash_get_all("routes") == {"pc": {"worker": "a"}}
+    assert worker_b.list_pop_oldest("history") == {"command": "hello"}
+    assert worker_a.list_range("history") == []
+
+
+def test_create_state_store(tmp_path):
+    assert isinstance(create_state_store("memory://"), InMemoryStateStore)
+    assert isinstance(create_state_store(f"sqlite:///{tmp_path / 'state.db'}"), SQLiteStateStore)
+    with pytest.raises(ValueError):
+        create_state_store("redis://localhost")
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Tests for worker task notifications"""
+
+import asyncio
+
+import pytest
+
+from app.adapters.infrastructure.state_store import SQLiteStateStore
+from app.adapters.infrastructure.task_notifier import PollBackoff, TaskNotifier
+
+
+class TestTaskNotifier:
+    """Test cases for TaskNotifier"""
+
+    @pytest.mark.anyio
+    async def test_waiter_is_woken_by_notify(self):
+        notifier = TaskNotifier()
+        waiter = asyncio.create_task(notifier.wait(0, timeout=5))
+        await asyncio.sleep(0.01)
+
+        await notifier.notify()
+
+        assert await waiter == {"version": 1, "notified": True}
+        assert notifier.get_stats()["woken"] == 1
+
+    @pytest.mark.anyio
+    async def test_wait_times_out_without_tasks(self):
+        notifier = TaskNotifier()
+
+        assert await notifier.wait(0, timeout=0.01) == {"version": 0, "notified": False}
+        assert notifier.get_stats()["timeouts"] == 1
+
+    @pytest.mark.anyio
+    async def test_task_queued_between_waits_is_not_missed(self):
+        """A stale `since` returns immediately"""
+        notifier = TaskNotifier()
+        await notifier.notify()
+
+        assert await notifier.wait(0, timeout=5) == {"version": 1, "notified": True}
+
+    @pytest.mark.anyio
+    async def test_first_wait_returns_current_version(self):
+        notifier = TaskNotifier()
+        await notifier.notify()
+
+        assert await notifier.wait(None, timeout=5) == {"version": 1, "notified": False}
+
+
+    @pytest.mark.anyio
+    async def test_shared_version_wakes_other_workers(self, tmp_path):
+        """A task created on one API worker wakes a long-poll held by another"""
+        path = str(tmp_path / "state.db")
+        worker_a = TaskNotifier(SQLiteStateStore(path), shared_poll_interval=0.01)
+        worker_b = TaskNotifier(SQLiteStateStore(path), shared_poll_interval=0.01)
+        baseline = await worker_b.wait(None, timeout=1)
+        waiter = asyncio.create_task(worker_b.wait(baseline["version"], timeout=5))
+        await asyncio.sleep(0.05)
+
+        await worker_a.notify()
+
+        assert await waiter == {"version": 1, "notified": True}
+        assert await worker_a.wait(1, timeout=0.01) == {"version": 1, "notified": False}
+
+
+class TestPollBackoff:
+    """Test cases for PollBackoff"""
+
+    def test_delay_grows_until_reset(self):
+        backoff = PollBackoff(min_interval=1, max_interval=5)
+
+        assert [backoff.next_delay() for _ in range(5)] == [1, 2, 4, 5, 5]
+        backoff.reset()
+        assert backoff.next_delay() == 1
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+"""Tests for cached token accounting"""
+
+from app.adapters.infrastructure.ai_gateway import AIGateway, GroqGear, LLMProvider
+from app.adapters.infrastructure.token_accounting import TokenCounter
+
+
+class FakeTokenizer:
+    """Whitespace tokenizer that records what it was asked to encode"""
+
+    def __init__(self):
+        self.encoded = []
+        self.batches = []
+
+    def encode(self, text):
+        self.encoded.append(text)
+        return text.split()
+
+    def encode_batch(self, texts):
+        self.batches.append(list(texts))
+        return [text.split() for text in texts]
+
+
+class TestTokenCounter:
+    """Test cases for TokenCounter"""
+
+    def test_counts_are_memoized(self):
+        """A text is tokenized once and then served from the memo"""
+        tokenizer = FakeTokenizer()
+        counter = TokenCounter(tokenizer)
+
+        assert counter.count("one two three") == 3
+        assert counter.count("one two three") == 3
+
+        assert tokenizer.encoded == ["one two three"]
+        stats = counter.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["tokens_encoded"] == 3
+
+    def test_count_messages_memoizes_each_message(self):
+        """A stable system instruction is not re-tokenized when the user text changes"""
+        tokenizer = FakeTokenizer()
+        counter = TokenCounter(tokenizer)
+        system = {"role": "system", "content": "you are jarvis"}
+
+        assert counter.count_messages([system, {"role": "user", "content": "abrir navegador"}]) == 5
+        assert counter.count_messages([system, {"role": "user", "content": "status"}]) == 4
+
+        assert tokenizer.encoded.count("you are jarvis") == 1
+
+    def test_memo_is_bounded(self):
+        """The least recently used count is evicted first"""
+        counter = TokenCounter(FakeTokenizer(), max_entries=2)
+        for text in ("a", "b", "c"):
+            counter.count(text)
+
+        assert counter.get_stats()["size"] == 2
+
+    def test_exceeds_skips_tokenization_below_bound(self):
+        """Texts whose byte length is within the limit are never tokenized"""
+        tokenizer = FakeTokenizer()
+        counter = TokenCounter(tokenizer)
+
+        assert counter.exceeds(["short prompt"], limit=100) is False
+        assert tokenizer.encoded == []
+        assert counter.get_stats()["bound_skips"] == 1
+
+    def test_exceeds_falls_back_to_exact_count(self):
+        """Texts above the bound are counted exactly"""
+        tokenizer = FakeTokenizer()
+        counter = TokenCounter(tokenizer)
+        text = "word " * 30  # 150 bytes, 30 tokens
+
+        assert counter.exceeds([text], limit=100) is False
+        assert counter.exceeds([text, text, text, text], limit=100) is True
+        assert counter.get_stats()["exact_checks"] == 2
+        assert tokenizer.encoded == [text]
+
+    def test_upper_bound_counts_utf8_bytes(self):
+        """Multi-byte characters raise the bound"""
+        counter = TokenCounter(FakeTokenizer())
+        assert counter.upper_bound("ação") == len("ação".encode("utf-8"))
+
+    def test_count_batch_encodes_uncached_texts_once(self):
+        """Batch scoring tokenizes only new, distinct texts in one call"""
+        tokenizer = FakeTokenizer()
+        counter = TokenCounter(tokenizer)
+        counter.count("cached text")
+
+        counts = counter.count_batch(["cached text", "new one", "", "new one", "x y z"])
+
+        assert counts == [2, 2, 0, 2, 3]
+        assert tokenizer.batches == [["new one", "x y z"]]
+
+    def test_approximation_without_tokenizer(self):
+        """Without a tokenizer counts use the 1 token ≈ 4 characters rule"""
+        counter = TokenCounter(None)
+        assert counter.count("a" * 40) == 10
+        assert counter.count_batch(["a" * 8]) == [2]
+        assert counter.upper_bound("a" * 40) == 10
+
+
+class TestAIGatewayTokenAccounting:
+    """Test cases for AI Gateway token accounting integration"""
+
+    def _gateway(self, tokenizer):
+        gateway = AIGateway(groq_api_key="test_groq_key", gemini_api_key="test_gemini_key", enable_cache=False)
+        gateway.token_counter = TokenCounter(tokenizer)
+        return gateway
+
+    def test_small_payload_routes_without_tokenizing(self):
+        """Payloads clearly below TOKEN_THRESHOLD are routed on the upper bound"""
+        tokenizer = FakeTokenizer()
+        gateway = self._gateway(tokenizer)
+        messages = [{"role": "user", "content": "status"}]
+
+        provider = gateway.select_provider(payload="status", messages=messages)
+
+        assert provider == LLMProvider.GROQ
+        assert tokenizer.encoded == []
+
+    def test_large_payload_escalates_with_exact_count(self):
+        """Payloads above the bound are counted and escalated when over the threshold"""
+        tokenizer = FakeTokenizer()
+        gateway = self._gateway(tokenizer)
+        content = "token " * (AIGateway.TOKEN_THRESHOLD + 1)
+        messages = [{"role": "user", "content": content}]
+
+        provider = gateway.select_provider(payload=content, messages=messages)
+
+        assert provider == LLMProvider.GEMINI
+        assert tokenizer.encoded == [content]
+
+    def test_count_tokens_batch(self):
+        """The gateway exposes batch scoring and counters"""
+        gateway = self._gateway(FakeTokenizer())
+
+        assert gateway.count_tokens_batch(["a b", "c"]) == [2, 1]
+        assert gateway.get_token_stats()["misses"] == 2
+
+    def test_budget_estimate_waits_for_token_limits(self):
+        """Request estimates are only tokenized once a tokens/min limit is known"""
+        tokenizer = FakeTokenizer()
+        gateway = self._gateway(tokenizer)
+        messages = [{"role": "user", "content": "abrir o navegador"}]
+
+        assert gateway._estimate_request_tokens(messages) == 0
+        assert tokenizer.encoded == []
+
+        gateway._groq_budgets[GroqGear.HIGH_GEAR].update_from_headers({
+            "x-ratelimit-limit-tokens": "6000",
+            "x-ratelimit-remaining-tokens": "5000",
+        })
+        assert gateway._estimate_request_tokens(messages) == 3
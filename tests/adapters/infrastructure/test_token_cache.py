@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""Tests for the verified-JWT cache"""
+
+import time
+
+from app.adapters.infrastructure.state_store import SQLiteStateStore
+from app.adapters.infrastructure.token_cache import VerifiedTokenCache
+
+
+def _payload(ttl: float = 60.0) -> dict:
+    return {"sub": "admin", "exp": time.time() + ttl}
+
+
+class TestVerifiedTokenCache:
+    """Test cases for VerifiedTokenCache"""
+
+    def test_hit_after_put(self):
+        """A verified token is served from the cache and counted as a hit"""
+        cache = VerifiedTokenCache(max_entries=4)
+        assert cache.get("token-a") is None
+
+        cache.put("token-a", _payload())
+
+        assert cache.get("token-a")["sub"] == "admin"
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_returns_copies(self):
+        """Callers cannot mutate the cached payload"""
+        cache = VerifiedTokenCache()
+        cache.put("token-a", _payload())
+
+        cache.get("token-a")["sub"] = "intruder"
+
+        assert cache.get("token-a")["sub"] == "admin"
+
+    def test_entry_expires_with_token(self):
+        """Entries are dropped once the token's exp has passed"""
+        cache = VerifiedTokenCache()
+        cache.put("token-a", _payload(ttl=-1))
+
+        assert cache.get("token-a") is None
+        assert cache.get_stats()["expired"] == 1
+        assert len(cache) == 0
+
+    def test_tokens_without_exp_are_not_cached(self):
+        cache = VerifiedTokenCache()
+        cache.put("token-a", {"sub": "admin"})
+
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """The least recently used token is evicted beyond max_entries"""
+        cache = VerifiedTokenCache(max_entries=2)
+        cache.put("token-a", _payload())
+        cache.put("token-b", _payload())
+        cache.get("token-a")
+
+        cache.put("token-c", _payload())
+
+        assert cache.get("token-b") is None
+        assert cache.get("token-a") is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_revocation(self):
+        """Revoked tokens are dropped, rejected and never re-cached"""
+        cache = VerifiedTokenCache()
+        payload = _payload()
+        cache.put("token-a", payload)
+
+        cache.revoke("token-a", payload["exp"])
+        cache.put("token-a", payload)
+
+        assert cache.is_revoked("token-a")
+        assert cache.get("token-a") is None
+        assert not cache.is_revoked("token-b")
+
+    def test_revocation_expires_with_token(self):
+        cache = VerifiedTokenCache()
+        cache.revoke("token-a", time.time() - 1)
+
+        assert not cache.is_revoked("token-a")
+        assert cache.get_stats()["revoked"] == 0
+
+    def test_disabled_cache_still_revokes(self):
+        cache = VerifiedTokenCache(max_entries=0)
+        cache.put("token-a", _payload())
+        cache.revoke("token-a", time.time() + 60)
+
+        assert len(cache) == 0
+        assert cache.is_revoked("token-a")
+
+    def test_revocation_shared_across_workers(self, tmp_path):
+        """A token revoked on one API worker is rejected by the others"""
+        path = str(tmp_path / "state.db")
+        worker_a, worker_b = VerifiedTokenCache(), VerifiedTokenCache()
+        worker_a.share_revocations(SQLiteStateStore(path), sync_interval=60)
+        worker_b.share_revocations(SQLiteStateStore(path), sync_interval=60)
+        payload = _payload()
+        worker_b.put("token-a", payload)
+
+        worker_a.revoke("token-a", payload["exp"])
+        worker_b.sync_revocations()
+
+        assert worker_b.is_revoked("token-a")
+        assert worker_b.get("token-a") is None
+        assert worker_b.get_stats()["shared"] is True
+        worker_a.close()
+        worker_b.close()
+
+    def test_sync_can_restart_after_close(self, tmp_path):
+        """A closed cache shared again (a new app in the same process) syncs again"""
+        cache = VerifiedTokenCache()
+        cache.share_revocations(SQLiteStateStore(str(tmp_path / "state.db")), sync_interval=60)
+        cache.close()
+
+        cache.share_revocations(SQLiteStateStore(str(tmp_path / "state.db")), sync_interval=60)
+
+        assert cache._sync_thread is not None and cache._sync_thread.is_alive()
+        cache.close()
+        assert cache._sync_thread is None
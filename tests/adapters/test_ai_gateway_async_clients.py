@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Tests for AI Gateway native async clients and concurrency limits"""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.adapters.infrastructure.ai_gateway import AIGateway, LLMProvider
+
+
+class TestAsyncClients:
+    """Test cases for native async provider clients"""
+
+    @pytest.fixture
+    def gateway(self):
+        """Create a gateway whose Groq calls go through a mocked async client"""
+        gateway = AIGateway(
+            groq_api_key=None,
+            gemini_api_key=None,
+            enable_cache=False,
+            groq_max_concurrency=2,
+        )
+        gateway.groq_client = Mock()
+        gateway.groq_async_client = Mock()
+        return gateway
+
+    def test_real_clients_use_async_surface(self):
+        """Gateways with API keys create native async clients"""
+        gateway = AIGateway(groq_api_key="test_groq_key", gemini_api_key=None, enable_cache=False)
+
+        assert gateway.groq_async_client is not None
+        assert gateway.get_concurrency_stats()["groq"]["async_client"] is True
+
+    def test_assigning_sync_client_disables_async_client(self):
+        """A directly assigned sync client is used through the executor"""
+        gateway = AIGateway(groq_api_key="test_groq_key", gemini_api_key=None, enable_cache=False)
+        gateway.groq_client = Mock()
+
+        assert gateway.groq_async_client is None
+
+    def test_async_clients_can_be_disabled(self):
+        """use_async_clients=False keeps the executor path"""
+        gateway = AIGateway(
+            groq_api_key="test_groq_key",
+            gemini_api_key=None,
+            enable_cache=False,
+            use_async_clients=False,
+        )
+
+        assert gateway.groq_client is not None
+        assert gateway.groq_async_client is None
+
+    @pytest.mark.anyio
+    async def test_completion_awaits_async_client(self, gateway):
+        """Completions are awaited on the async client, not run in the executor"""
+        gateway.groq_async_client.chat.completions.create = AsyncMock(return_value=Mock())
+
+        result = await gateway.generate_completion([{"role": "user", "content": "oi"}])
+
+        assert result["provider"] == LLMProvider.GROQ.value
+        gateway.groq_async_client.chat.completions.create.assert_awaited_once()
+        gateway.groq_client.chat.completions.create.assert_not_called()
+
+    @pytest.mark.anyio
+    async def test_concurrency_limit_queues_requests(self, gateway):
+        """Requests beyond the provider limit wait for a slot"""
+        running = 0
+        peak = 0
+
+        async def slow_create(**kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return Mock()
+
+        gateway.groq_async_client.chat.completions.create = slow_create
+
+        await asyncio.gather(*(
+            gateway.generate_completion([{"role": "user", "content": f"msg {i}"}])
+            for i in range(5)
+        ))
+
+        assert peak == 2
+        stats = gateway.get_concurrency_stats()["groq"]
+        assert stats["limit"] == 2
+        assert stats["acquired"] == 5
+        assert stats["max_waiting"] >= 1
@@ -129,24 +129,49 @@ class TestGroqGearsSystem:
         
         assert result["provider"] == LLMProvider.GROQ.value
         assert result["model"] == "llama-3.1-8b-instant"
-        assert result["gear"] == GroqGear.HIGH_GEAR.value  # Shifts back after success
+        assert result["gear"] == GroqGear.LOW_GEAR.value
+        # High Gear stays open until its cooldown expires
+        assert gateway.current_groq_gear == GroqGear.LOW_GEAR
 
     @pytest.mark.anyio
     async def test_auto_shift_back_to_high_gear_after_success(self, gateway_with_gears):
-        """Test that gateway automatically shifts back to High Gear after successful Low Gear completion"""
+        """Test that a half-open probe shifts back to High Gear after the cooldown"""
+        import asyncio
+        
         gateway = gateway_with_gears
         
-        # Shift to Low Gear
-        gateway._shift_to_low_gear()
+        # Shift to Low Gear with a short cooldown
+        gateway._shift_to_low_gear(cooldown=0.01)
         assert gateway.current_groq_gear == GroqGear.LOW_GEAR
+        await asyncio.sleep(0.02)
         
-        # Make a successful completion
+        # The next request probes High Gear
         messages = [{"role": "user", "content": "Test message"}]
-        await gateway._generate_with_groq(messages)
+        result = await gateway._generate_with_groq(messages)
         
-        # Should have shifted back to High Gear
+        # Probe succeeded: High Gear circuit closed again
+        assert result["gear"] == GroqGear.HIGH_GEAR.value
         assert gateway.current_groq_gear == GroqGear.HIGH_GEAR
 
+    @pytest.mark.anyio
+    async def test_failed_probe_reopens_high_gear(self, gateway_with_gears):
+        """Test that a rate-limited probe keeps traffic on Low Gear"""
+        import asyncio
+        
+        gateway = gateway_with_gears
+        gateway._shift_to_low_gear(cooldown=0.01)
+        await asyncio.sleep(0.02)
+        
+        gateway.groq_client.chat.completions.create.side_effect = [
+            Exception("Rate limit exceeded"),
+            gateway.groq_client.chat.completions.create.return_value,
+        ]
+        
+        result = await gateway.generate_completion([{"role": "user", "content": "Test message"}])
+        
+        assert result["gear"] == GroqGear.LOW_GEAR.value
+        assert gateway.get_scheduler_stats()["llama-3.3-70b-versatile"]["circuit"]["state"] == "open"
+
     @pytest.mark.anyio
     async def test_rate_limit_triggers_low_gear(self, gateway_with_gears):
         """Test that rate limit in High Gear triggers Low Gear"""
@@ -177,8 +202,9 @@ class TestGroqGearsSystem:
         
         # Should have used Low Gear after High Gear failed
         assert result["provider"] == LLMProvider.GROQ.value
-        # Should have shifted back to High Gear after success
-        assert gateway.current_groq_gear == GroqGear.HIGH_GEAR
+        assert result["gear"] == GroqGear.LOW_GEAR.value
+        # High Gear circuit stays open, so new requests go straight to Low Gear
+        assert gateway.current_groq_gear == GroqGear.LOW_GEAR
 
     @pytest.mark.anyio
     async def test_rate_limit_in_both_gears_triggers_gemini(self, gateway_with_gears):
@@ -196,6 +222,94 @@ class TestGroqGearsSystem:
         assert "fallback_from" in result
         assert result["fallback_from"] == LLMProvider.GROQ.value
 
+    @pytest.mark.anyio
+    async def test_concurrent_requests_do_not_share_gear(self, gateway_with_gears):
+        """Test that each request keeps the gear it was dispatched with"""
+        import asyncio
+        
+        gateway = gateway_with_gears
+        started = asyncio.Event()
+        release = asyncio.Event()
+        
+        async def slow_create(**kwargs):
+            started.set()
+            await release.wait()
+            return Mock()
+        
+        gateway.groq_async_client = Mock()
+        gateway.groq_async_client.chat.completions.create = slow_create
+        messages = [{"role": "user", "content": "Test message"}]
+        
+        in_flight = asyncio.create_task(gateway._generate_with_groq(messages))
+        await started.wait()
+        # Another request trips High Gear while the first one is still running
+        gateway._shift_to_low_gear()
+        release.set()
+        result = await in_flight
+        
+        assert result["gear"] == GroqGear.HIGH_GEAR.value
+        assert result["model"] == "llama-3.3-70b-versatile"
+
+
+class TestProactiveScheduling:
+    """Test cases for budget-based routing before rate limits are hit"""
+
+    @pytest.fixture
+    def gateway(self):
+        """Create a gateway with mocked Groq and Gemini clients"""
+        gateway = AIGateway(
+            groq_api_key="test_groq_key",
+            gemini_api_key="test_gemini_key",
+            groq_high_gear_model="llama-3.3-70b-versatile",
+            groq_low_gear_model="llama-3.1-8b-instant",
+            enable_cache=False,
+        )
+        gateway.groq_client = Mock()
+        gateway.gemini_client = Mock()
+        return gateway
+
+    @staticmethod
+    def _headers(remaining_requests, remaining_tokens):
+        return {
+            "x-ratelimit-limit-requests": "30",
+            "x-ratelimit-remaining-requests": str(remaining_requests),
+            "x-ratelimit-reset-requests": "2m",
+            "x-ratelimit-limit-tokens": "6000",
+            "x-ratelimit-remaining-tokens": str(remaining_tokens),
+            "x-ratelimit-reset-tokens": "1m",
+        }
+
+    def _observe(self, gateway, model, headers):
+        response = Mock()
+        response.request.content = ('{"model": "%s"}' % model).encode()
+        response.headers = headers
+        gateway._observe_groq_response(response)
+
+    @pytest.mark.anyio
+    async def test_exhausted_high_gear_budget_routes_to_low_gear(self, gateway):
+        """Test that High Gear is skipped before its request budget runs out"""
+        self._observe(gateway, "llama-3.3-70b-versatile", self._headers(1, 5000))
+
+        result = await gateway.generate_completion([{"role": "user", "content": "oi"}])
+
+        assert result["gear"] == GroqGear.LOW_GEAR.value
+        assert gateway.groq_client.chat.completions.create.call_count == 1
+
+    def test_exhausted_groq_budgets_route_to_gemini(self, gateway):
+        """Test that Gemini is selected when no Groq gear can take the request"""
+        self._observe(gateway, "llama-3.3-70b-versatile", self._headers(20, 0))
+        self._observe(gateway, "llama-3.1-8b-instant", self._headers(20, 0))
+
+        assert gateway.select_provider("uma pergunta") == LLMProvider.GEMINI
+
+    def test_budget_refills_over_time(self, gateway):
+        """Test that a drained budget is restored by the refill rate"""
+        budget = gateway._groq_budgets[GroqGear.HIGH_GEAR]
+        self._observe(gateway, "llama-3.3-70b-versatile", self._headers(20, 0))
+        budget.tokens._updated -= 30  # pretend 30 seconds passed
+
+        assert budget.tokens.available() == pytest.approx(3000, rel=0.01)
+
 
 class TestAutoRepairSystem:
     """Test cases for Auto-Repair System"""
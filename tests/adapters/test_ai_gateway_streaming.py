@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""Tests for AI Gateway streaming completions"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from app.adapters.infrastructure.ai_gateway import AIGateway, GroqGear, LLMProvider
+
+
+def _groq_chunk(text):
+    """Build a Groq-style streaming chunk"""
+    chunk = Mock()
+    chunk.choices = [Mock(delta=Mock(content=text))]
+    return chunk
+
+
+def _gemini_chunk(text):
+    """Build a Gemini-style streaming chunk"""
+    chunk = Mock()
+    chunk.text = text
+    return chunk
+
+
+async def _collect(stream):
+    """Collect all events from an async stream"""
+    return [event async for event in stream]
+
+
+class TestStreamCompletion:
+    """Test cases for AIGateway.stream_completion"""
+
+    @pytest.fixture
+    def gateway(self):
+        """Create a gateway with mocked Groq and Gemini clients"""
+        gateway = AIGateway(
+            groq_api_key="test_groq_key",
+            gemini_api_key="test_gemini_key",
+            groq_high_gear_model="llama-3.3-70b-versatile",
+            groq_low_gear_model="llama-3.1-8b-instant",
+            enable_cache=False,
+        )
+        gateway.enable_auto_repair = False
+        gateway.groq_client = Mock()
+        gateway.groq_client.chat.completions.create.return_value = iter(
+            [_groq_chunk("Olá"), _groq_chunk(None), _groq_chunk(", senhor.")]
+        )
+        gateway.gemini_client = Mock()
+        gateway.gemini_client.models.generate_content_stream.return_value = iter(
+            [_gemini_chunk("Resposta "), _gemini_chunk("do Gemini.")]
+        )
+        return gateway
+
+    @pytest.mark.anyio
+    async def test_groq_stream_yields_deltas_then_done(self, gateway):
+        """Groq chunks are forwarded as deltas and summarized in a done event"""
+        events = await _collect(gateway.stream_completion([{"role": "user", "content": "oi"}]))
+
+        assert [e["text"] for e in events if e["type"] == "delta"] == ["Olá", ", senhor."]
+        done = events[-1]
+        assert done["type"] == "done"
+        assert done["text"] == "Olá, senhor."
+        assert done["provider"] == LLMProvider.GROQ.value
+        assert done["gear"] == GroqGear.HIGH_GEAR.value
+        call_kwargs = gateway.groq_client.chat.completions.create.call_args.kwargs
+        assert call_kwargs["stream"] is True
+
+    @pytest.mark.anyio
+    async def test_gemini_stream(self, gateway):
+        """Gemini streams through generate_content_stream"""
+        events = await _collect(
+            gateway.stream_completion(
+                [{"role": "user", "content": "oi"}], force_provider=LLMProvider.GEMINI
+            )
+        )
+
+        assert events[-1]["text"] == "Resposta do Gemini."
+        assert events[-1]["provider"] == LLMProvider.GEMINI.value
+
+    @pytest.mark.anyio
+    async def test_rate_limit_shifts_to_low_gear(self, gateway):
+        """A rate limit before the first delta retries the stream in Low Gear"""
+        gateway.groq_client.chat.completions.create.side_effect = [
+            Exception("Rate limit exceeded (429)"),
+            iter([_groq_chunk("Baixa")]),
+        ]
+
+        events = await _collect(gateway.stream_completion([{"role": "user", "content": "oi"}]))
+
+        assert events[-1]["text"] == "Baixa"
+        assert events[-1]["gear"] == GroqGear.LOW_GEAR.value
+        models = [c.kwargs["model"] for c in gateway.groq_client.chat.completions.create.call_args_list]
+        assert models == ["llama-3.3-70b-versatile", "llama-3.1-8b-instant"]
+        # High Gear stays tripped until its half-open probe
+        assert gateway.current_groq_gear == GroqGear.LOW_GEAR
+
+    @pytest.mark.anyio
+    async def test_both_gears_rate_limited_fire_cannon_shot(self, gateway):
+        """Low Gear rate limit escalates the stream to Gemini"""
+        gateway.groq_client.chat.completions.create.side_effect = Exception("429 Too Many Requests")
+
+        events = await _collect(gateway.stream_completion([{"role": "user", "content": "oi"}]))
+
+        assert events[-1]["provider"] == LLMProvider.GEMINI.value
+        assert events[-1]["fallback_from"] == LLMProvider.GROQ.value
+
+    @pytest.mark.anyio
+    async def test_error_after_first_delta_is_raised(self, gateway):
+        """Once text was emitted the stream does not switch providers"""
+        def broken_stream():
+            yield _groq_chunk("Olá")
+            raise Exception("Rate limit exceeded")
+
+        gateway.groq_client.chat.completions.create.return_value = broken_stream()
+
+        received = []
+        with pytest.raises(Exception, match="Rate limit"):
+            async for event in gateway.stream_completion([{"role": "user", "content": "oi"}]):
+                received.append(event)
+
+        assert [e["text"] for e in received] == ["Olá"]
+        gateway.gemini_client.models.generate_content_stream.assert_not_called()
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+"""Tests for AI Gateway hedged requests and single-flight coalescing"""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from app.adapters.infrastructure.ai_gateway import AIGateway, GroqGear, LLMProvider
+
+
+def _gateway(**kwargs):
+    """Create a gateway whose Groq calls go through a mocked async client"""
+    gateway = AIGateway(
+        groq_api_key=None,
+        gemini_api_key=None,
+        groq_high_gear_model="high-model",
+        groq_low_gear_model="low-model",
+        enable_cache=False,
+        **kwargs,
+    )
+    gateway.groq_client = Mock()
+    gateway.groq_async_client = Mock()
+    return gateway
+
+
+class TestSingleFlight:
+    """Test cases for coalescing identical in-flight prompts"""
+
+    @pytest.mark.anyio
+    async def test_identical_prompts_share_one_call(self):
+        """Concurrent identical prompts reach the provider once"""
+        gateway = _gateway(enable_single_flight=True)
+        calls = 0
+
+        async def slow_create(**kwargs):
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return Mock()
+
+        gateway.groq_async_client.chat.completions.create = slow_create
+        messages = [{"role": "user", "content": "status"}]
+
+        results = await asyncio.gather(*(gateway.generate_completion(messages) for _ in range(3)))
+
+        assert calls == 1
+        assert sum(1 for result in results if result.get("coalesced")) == 2
+        assert all(result["provider"] == LLMProvider.GROQ.value for result in results)
+        stats = gateway.get_single_flight_stats()
+        assert stats["leaders"] == 1
+        assert stats["coalesced"] == 2
+        assert stats["in_flight"] == 0
+
+    @pytest.mark.anyio
+    async def test_followers_receive_leader_error(self):
+        """A failing shared call fails every joined request"""
+        gateway = _gateway(enable_single_flight=True)
+        gateway.enable_auto_repair = False
+
+        async def failing_create(**kwargs):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        gateway.groq_async_client.chat.completions.create = failing_create
+        messages = [{"role": "user", "content": "status"}]
+
+        results = await asyncio.gather(
+            *(gateway.generate_completion(messages) for _ in range(2)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert gateway.get_single_flight_stats()["in_flight"] == 0
+
+    @pytest.mark.anyio
+    async def test_cancelled_leader_does_not_cancel_followers(self):
+        """Followers still get the result when the first caller goes away"""
+        gateway = _gateway(enable_single_flight=True)
+        release = asyncio.Event()
+
+        async def slow_create(**kwargs):
+            await release.wait()
+            return Mock()
+
+        gateway.groq_async_client.chat.completions.create = slow_create
+        messages = [{"role": "user", "content": "status"}]
+
+        leader = asyncio.create_task(gateway.generate_completion(messages))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(gateway.generate_completion(messages))
+        await asyncio.sleep(0)
+        leader.cancel()
+        release.set()
+
+        result = await follower
+        assert result["coalesced"] is True
+
+    @pytest.mark.anyio
+    async def test_bypass_cache_and_disabled_skip_coalescing(self):
+        """bypass_cache and enable_single_flight=False issue separate calls"""
+        for gateway, kwargs in (
+            (_gateway(enable_single_flight=True), {"bypass_cache": True}),
+            (_gateway(enable_single_flight=False), {}),
+        ):
+            calls = 0
+
+            async def slow_create(**kwargs):
+                nonlocal calls
+                calls += 1
+                await asyncio.sleep(0.01)
+                return Mock()
+
+            gateway.groq_async_client.chat.completions.create = slow_create
+            messages = [{"role": "user", "content": "status"}]
+
+            await asyncio.gather(*(gateway.generate_completion(messages, **kwargs) for _ in range(2)))
+
+            assert calls == 2
+
+
+class TestHedging:
+    """Test cases for hedging slow High Gear requests with Low Gear"""
+
+    @staticmethod
+    def _create_with_delays(delays):
+        """Build a create() whose latency depends on the requested model"""
+        calls = []
+
+        async def create(**kwargs):
+            calls.append(kwargs["model"])
+            await asyncio.sleep(delays[kwargs["model"]])
+            return Mock(model=kwargs["model"])
+
+        return create, calls
+
+    @pytest.mark.anyio
+    async def test_slow_high_gear_is_hedged(self):
+        """Low Gear answers first and the High Gear call is cancelled"""
+        gateway = _gateway(enable_hedging=True, hedge_delay_seconds=0.01, enable_single_flight=False)
+        create, calls = self._create_with_delays({"high-model": 1.0, "low-model": 0.0})
+        gateway.groq_async_client.chat.completions.create = create
+
+        result = await asyncio.wait_for(
+            gateway.generate_completion([{"role": "user", "content": "status"}]), timeout=0.5
+        )
+
+        assert calls == ["high-model", "low-model"]
+        assert result["gear"] == GroqGear.LOW_GEAR.value
+        assert result["hedged"] is True
+        stats = gateway.get_hedging_stats()
+        assert stats["fired"] == 1
+        assert stats["hedge_wins"] == 1
+        assert stats["primary_wins"] == 0
+        assert gateway.get_concurrency_stats()["groq"]["in_flight"] == 0
+
+    @pytest.mark.anyio
+    async def test_fast_high_gear_is_not_hedged(self):
+        """Requests faster than the hedge delay make a single call"""
+        gateway = _gateway(enable_hedging=True, hedge_delay_seconds=0.5, enable_single_flight=False)
+        create, calls = self._create_with_delays({"high-model": 0.0, "low-model": 0.0})
+        gateway.groq_async_client.chat.completions.create = create
+
+        result = await gateway.generate_completion([{"role": "user", "content": "status"}])
+
+        assert calls == ["high-model"]
+        assert result["gear"] == GroqGear.HIGH_GEAR.value
+        assert "hedged" not in result
+        stats = gateway.get_hedging_stats()
+        assert stats["fired"] == 0
+        assert stats["primary_wins"] == 1
+
+    @pytest.mark.anyio
+    async def test_failed_hedge_waits_for_primary(self):
+        """A failing hedge does not fail the request while High Gear can still answer"""
+        gateway = _gateway(enable_hedging=True, hedge_delay_seconds=0.01, enable_single_flight=False)
+
+        async def create(**kwargs):
+            if kwargs["model"] == "low-model":
+                raise RuntimeError("low gear down")
+            await asyncio.sleep(0.05)
+            return Mock()
+
+        gateway.groq_async_client.chat.completions.create = create
+
+        result = await gateway.generate_completion([{"role": "user", "content": "status"}])
+
+        assert result["gear"] == GroqGear.HIGH_GEAR.value
+        assert gateway.get_hedging_stats()["primary_wins"] == 1
+
+    @pytest.mark.anyio
+    async def test_hedge_answering_for_failed_primary_is_a_rescue(self):
+        """A hedge that answers after High Gear failed is counted apart from latency wins"""
+        gateway = _gateway(enable_hedging=True, hedge_delay_seconds=0.01, enable_single_flight=False)
+
+        async def create(**kwargs):
+            if kwargs["model"] == "high-model":
+                await asyncio.sleep(0.02)
+                raise RuntimeError("high gear down")
+            await asyncio.sleep(0.05)
+            return Mock()
+
+        gateway.groq_async_client.chat.completions.create = create
+
+        result = await gateway.generate_completion([{"role": "user", "content": "status"}])
+
+        assert result["hedged"] is True
+        stats = gateway.get_hedging_stats()
+        assert (stats["hedge_rescues"], stats["hedge_wins"], stats["primary_wins"]) == (1, 0, 0)
+
+    @pytest.mark.anyio
+    async def test_primary_error_before_hedge_is_not_a_win(self):
+        """High Gear failing inside the hedge delay is not counted as a primary win"""
+        gateway = _gateway(enable_hedging=True, hedge_delay_seconds=0.5, enable_single_flight=False)
+
+        async def create(**kwargs):
+            raise RuntimeError("high gear down")
+
+        gateway.groq_async_client.chat.completions.create = create
+
+        with pytest.raises(Exception):
+            await gateway._generate_with_groq_hedged([{"role": "user", "content": "status"}])
+
+        assert gateway.get_hedging_stats()["primary_wins"] == 0
+
+    @pytest.mark.anyio
+    async def test_low_gear_requests_are_not_hedged(self):
+        """Requests already routed to Low Gear have nothing to hedge against"""
+        gateway = _gateway(enable_hedging=True, hedge_delay_seconds=0.0, enable_single_flight=False)
+        create, calls = self._create_with_delays({"high-model": 0.0, "low-model": 0.02})
+        gateway.groq_async_client.chat.completions.create = create
+        gateway._shift_to_low_gear()
+
+        await gateway.generate_completion([{"role": "user", "content": "status"}])
+
+        assert calls == ["low-model"]
+        assert gateway.get_hedging_stats()["hedged"] == 0
+
+    @pytest.mark.anyio
+    async def test_delay_follows_observed_p95(self):
+        """Without a fixed delay the hedge waits for the High Gear p95"""
+        gateway = _gateway(enable_hedging=True, enable_single_flight=False)
+        assert gateway._get_hedge_delay() == AIGateway.DEFAULT_HEDGE_DELAY_SECONDS
+
+        for latency in [0.1] * 19 + [0.4]:
+            gateway._high_gear_latency.record(latency)
+
+        assert gateway._get_hedge_delay() == pytest.approx(0.4)
+        assert gateway.get_hedging_stats()["latency_samples"] == 20
+
+    def test_hedging_settings_from_env(self, monkeypatch):
+        """Hedging and single-flight settings come from environment"""
+        monkeypatch.setenv("JARVIS_LLM_HEDGING", "true")
+        monkeypatch.setenv("JARVIS_LLM_HEDGE_DELAY_MS", "250")
+        monkeypatch.setenv("JARVIS_LLM_SINGLE_FLIGHT", "false")
+
+        gateway = AIGateway(groq_api_key=None, gemini_api_key=None, enable_cache=False)
+
+        assert gateway.enable_hedging is True
+        assert gateway.hedge_delay_seconds == 0.25
+        assert gateway.enable_single_flight is False
@@ -5,6 +5,7 @@ from unittest.mock import Mock
 
 import pytest
 
+from app.adapters.infrastructure.state_store import InMemoryStateStore
 from app.application.ports import ActionProvider, VoiceProvider, WebProvider
 from app.application.services import AssistantService, DependencyManager
 from app.domain.services import CommandInterpreter, IntentProcessor
@@ -133,6 +134,29 @@ class TestAssistantService:
         assert "timestamp" in history[0]
         assert "message" in history[0]
 
+    def test_persisted_history_feeds_interpreter_context(self, mock_ports):
+        """Interpreters with a context buffer are told about persisted interactions"""
+        voice, action, web = mock_ports
+        interpreter = CommandInterpreter(wake_word="test")
+        interpreter.record_interaction = Mock()
+        history = Mock()
+        service = AssistantService(
+            voice_provider=voice,
+            action_provider=action,
+            web_provider=web,
+            command_interpreter=interpreter,
+            intent_processor=IntentProcessor(),
+            history_provider=history,
+            wake_word="test",
+        )
+
+        service.process_command("escreva hello")
+
+        history.save_interaction.assert_called_once()
+        interpreter.record_interaction.assert_called_once_with(
+            "escreva hello", history.save_interaction.call_args.kwargs["command_type"], True
+        )
+
     def test_command_history_limit(self, service, mock_ports):
         """Test that history respects limit parameter"""
         _, action, _ = mock_ports
@@ -162,6 +186,59 @@ class TestAssistantService:
         assert history[0]["command"] == "invalid command"
         assert history[0]["success"] is False
 
+    def test_command_history_shared_through_state_store(self, mock_ports):
+        """Services built on the same state store see each other's history"""
+        voice, action, web = mock_ports
+        store = InMemoryStateStore()
+
+        def build():
+            return AssistantService(
+                voice_provider=voice,
+                action_provider=action,
+                web_provider=web,
+                command_interpreter=CommandInterpreter(wake_word="test"),
+                intent_processor=IntentProcessor(),
+                wake_word="test",
+                state_store=store,
+            )
+
+        worker_a, worker_b = build(), build()
+        worker_a.process_command("escreva from a")
+
+        history = worker_b.get_command_history(limit=5)
+        assert len(history) == 1
+        assert history[0]["command"] == "escreva from a"
+
+    @pytest.mark.anyio
+    async def test_async_command_writes_shared_history_off_the_loop(self, mock_ports):
+        """The async path pushes to the state store from a worker thread"""
+        import threading
+
+        voice, action, web = mock_ports
+        store = InMemoryStateStore()
+        push_threads = []
+        original_push = store.list_push
+
+        def recording_push(*args, **kwargs):
+            push_threads.append(threading.current_thread())
+            return original_push(*args, **kwargs)
+
+        store.list_push = recording_push
+        service = AssistantService(
+            voice_provider=voice,
+            action_provider=action,
+            web_provider=web,
+            command_interpreter=CommandInterpreter(wake_word="test"),
+            intent_processor=IntentProcessor(),
+            wake_word="test",
+            state_store=store,
+        )
+
+        await service.async_process_command("invalid command")
+
+        assert push_threads and threading.main_thread() not in push_threads
+        assert service.get_command_history(limit=1)[0]["command"] == "invalid command"
+
     def test_dependency_manager_auto_created(self, service):
         """Test that dependency manager is auto-created if not provided"""
         assert service.dependency_manager is not None
@@ -308,3 +385,85 @@ class TestAssistantServiceWithLLM:
         assert len(history) == 1
         assert history[0]["command"] == "oi, tudo bem?"
         assert history[0]["success"] is True
+
+    @pytest.mark.anyio
+    async def test_combined_chat_reply_skips_second_call(self, service_with_llm, mock_llm_interpreter):
+        """Test that a CHAT intent carrying a reply is answered without a second LLM call"""
+        from unittest.mock import AsyncMock
+        from app.domain.models import CommandType, Intent
+
+        mock_llm_interpreter.interpret_async = AsyncMock(
+            return_value=Intent(
+                command_type=CommandType.CHAT,
+                parameters={"response": "Bom dia, senhor.", "user_input": "bom dia"},
+                raw_input="bom dia",
+                confidence=0.9,
+            )
+        )
+        mock_llm_interpreter.generate_conversational_response = AsyncMock()
+
+        response = await service_with_llm.async_process_command("bom dia")
+
+        mock_llm_interpreter.generate_conversational_response.assert_not_called()
+        assert response.success is True
+        assert response.message == "Bom dia, senhor."
+        assert response.data["command_type"] == "chat"
+        assert service_with_llm.get_command_history(limit=1)[0]["command"] == "bom dia"
+
+    @pytest.mark.anyio
+    async def test_stream_command_streams_chat_reply(self, service_with_llm, mock_llm_interpreter):
+        """Test that unknown commands stream the conversational reply as deltas"""
+        from unittest.mock import AsyncMock
+        from app.domain.models import CommandType, Intent
+
+        mock_llm_interpreter.interpret_async = AsyncMock(
+            return_value=Intent(
+                command_type=CommandType.UNKNOWN,
+                parameters={"raw_command": "bom dia"},
+                raw_input="bom dia",
+                confidence=0.5,
+            )
+        )
+
+        async def stream_reply(user_input):
+            yield "Bom dia"
+            yield ", senhor."
+
+        mock_llm_interpreter.stream_conversational_response = stream_reply
+
+        events = [event async for event in service_with_llm.async_stream_command("bom dia")]
+
+        mock_llm_interpreter.interpret_async.assert_awaited_once_with("bom dia", allow_reply=False)
+        assert [e["text"] for e in events if e["type"] == "delta"] == ["Bom dia", ", senhor."]
+        assert events[-1]["type"] == "done"
+        assert events[-1]["message"] == "Bom dia, senhor."
+        assert events[-1]["data"]["command_type"] == "chat"
+        assert service_with_llm.get_command_history(limit=1)[0]["success"] is True
+
+    @pytest.mark.anyio
+    async def test_stream_command_uses_single_combined_stream(self, service_with_llm, mock_llm_interpreter):
+        """Test an interpreter with interpret_stream answers chat from the classifying completion"""
+        from unittest.mock import AsyncMock
+        from app.domain.models import CommandType, Intent
+
+        async def interpret_stream(user_input):
+            yield "Bom dia"
+            yield ", senhor."
+            yield Intent(
+                command_type=CommandType.CHAT,
+                parameters={"response": "Bom dia, senhor.", "user_input": user_input},
+                raw_input=user_input,
+                confidence=0.9,
+            )
+
+        mock_llm_interpreter.interpret_stream = interpret_stream
+        mock_llm_interpreter.interpret_async = AsyncMock()
+        mock_llm_interpreter.stream_conversational_response = AsyncMock()
+
+        events = [event async for event in service_with_llm.async_stream_command("bom dia")]
+
+        mock_llm_interpreter.interpret_async.assert_not_called()
+        mock_llm_interpreter.stream_conversational_response.assert_not_called()
+        assert [e["text"] for e in events if e["type"] == "delta"] == ["Bom dia", ", senhor."]
+        assert events[-1]["message"] == "Bom dia, senhor."
+        assert events[-1]["data"]["command_type"] == "chat"
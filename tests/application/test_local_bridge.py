@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""Tests for the local bridge routing table shared between API workers"""
+
+import time
+
+import pytest
+
+from app.adapters.infrastructure.state_store import SQLiteStateStore
+from app.application.services.local_bridge import LocalBridgeManager
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SQLiteStateStore(str(tmp_path / "state.db"))
+
+
+class TestLocalBridgeRoutes:
+    """Test cases for cross-worker device routes"""
+
+    @pytest.mark.anyio
+    async def test_routes_without_heartbeat_expire(self, store):
+        """A route whose worker stopped heartbeating (e.g. crashed) is dropped"""
+        now = time.time()
+        store.hash_set(
+            LocalBridgeManager.ROUTES_KEY, "live_pc", {"worker": "w1", "device_type": "desktop", "seen_at": now}
+        )
+        store.hash_set(
+            LocalBridgeManager.ROUTES_KEY,
+            "crashed_pc",
+            {"worker": "w2", "device_type": "desktop", "seen_at": now - LocalBridgeManager.ROUTE_TTL - 1},
+        )
+        bridge = LocalBridgeManager(state_store=store, worker_id="w3")
+
+        await bridge.refresh_routes()
+
+        assert bridge.is_device_connected("live_pc")
+        assert not bridge.is_device_connected("crashed_pc")
+        assert bridge.get_connected_devices() == ["live_pc"]
+        assert "crashed_pc" not in store.hash_get_all(LocalBridgeManager.ROUTES_KEY)
+
+    @pytest.mark.anyio
+    async def test_lookups_answer_from_snapshot(self, store):
+        """Synchronous lookups never query the store; refresh_routes() renews them"""
+        bridge = LocalBridgeManager(state_store=store, worker_id="w1")
+        await bridge.refresh_routes()
+
+        store.hash_set(
+            LocalBridgeManager.ROUTES_KEY, "phone", {"worker": "w2", "device_type": "mobile", "seen_at": time.time()}
+        )
+        assert not bridge.is_device_connected("phone")
+
+        bridge._routes_fetched = None
+        await bridge.refresh_routes()
+        assert bridge.is_device_connected("phone")
+        assert bridge.is_mobile_device("phone")
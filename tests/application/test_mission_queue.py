@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""Tests for the asynchronous mission job queue"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.adapters.infrastructure.state_store import SQLiteStateStore
+from app.application.services.mission_queue import (
+    JobStatus,
+    MissionJobQueue,
+    MissionQueueFull,
+)
+from app.domain.models.mission import Mission, MissionResult
+
+
+class FakeRunner:
+    """TaskRunner stand-in that records the executing thread"""
+
+    def __init__(self, release: threading.Event = None):
+        self.release = release
+        self.threads = []
+
+    def execute_mission(self, mission: Mission) -> MissionResult:
+        self.threads.append(threading.get_ident())
+        if self.release is not None:
+            self.release.wait(timeout=5)
+        if mission.code == "raise":
+            raise RuntimeError("runner crashed")
+        return MissionResult(mission.mission_id, mission.code != "fail", stdout="ok")
+
+
+async def wait_finished(queue: MissionJobQueue, job_id: str) -> None:
+    for _ in range(500):
+        if queue.get_job(job_id).is_finished:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+class TestMissionJobQueue:
+    """Test cases for MissionJobQueue"""
+
+    @pytest.mark.anyio
+    async def test_submit_returns_immediately_and_runs_off_loop(self):
+        """Submission returns a queued job; the mission runs on a worker thread"""
+        runner = FakeRunner()
+        queue = MissionJobQueue(runner_factory=lambda: runner, workers=1)
+
+        job = queue.submit(Mission(mission_id="m1", code="print(1)"), submitted_by="admin")
+
+        assert job.status == JobStatus.QUEUED
+        await wait_finished(queue, job.job_id)
+        assert job.status == JobStatus.SUCCEEDED
+        assert job.result.stdout == "ok"
+        assert job.wait_seconds is not None and job.run_seconds is not None
+        assert runner.threads[0] != threading.get_ident()
+        await queue.shutdown()
+
+    @pytest.mark.anyio
+    async def test_failures_are_recorded(self):
+        """Unsuccessful results and runner exceptions mark the job as failed"""
+        queue = MissionJobQueue(runner_factory=FakeRunner, workers=2)
+
+        failed = queue.submit(Mission(mission_id="m1", code="fail"))
+        crashed = queue.submit(Mission(mission_id="m2", code="raise"))
+        await wait_finished(queue, failed.job_id)
+        await wait_finished(queue, crashed.job_id)
+
+        assert failed.status == JobStatus.FAILED
+        assert crashed.status == JobStatus.FAILED
+        assert "runner crashed" in crashed.error
+        assert queue.get_stats()["failed"] == 2
+        await queue.shutdown()
+
+    @pytest.mark.anyio
+    async def test_queue_full_and_metrics(self):
+        """Submissions beyond the queue size are refused; depth is reported"""
+        release = threading.Event()
+        runner = FakeRunner(release)
+        queue = MissionJobQueue(runner_factory=lambda: runner, workers=1, max_queue_size=1)
+
+        running = queue.submit(Mission(mission_id="m1", code="print(1)"))
+        for _ in range(100):
+            if running.status == JobStatus.RUNNING:
+                break
+            await asyncio.sleep(0.01)
+        waiting = queue.submit(Mission(mission_id="m2", code="print(2)"))
+
+        with pytest.raises(MissionQueueFull):
+            queue.submit(Mission(mission_id="m3", code="print(3)"))
+
+        stats = queue.get_stats()
+        assert stats["depth"] == 1
+        assert stats["running"] == 1
+        assert stats["rejected"] == 1
+        assert queue.queue_position(waiting.job_id) == 1
+
+        release.set()
+        await wait_finished(queue, waiting.job_id)
+        assert queue.get_stats()["succeeded"] == 2
+        await queue.shutdown()
+
+    @pytest.mark.anyio
+    async def test_subscribers_receive_status_changes(self):
+        """Subscribers get the running and finished states"""
+        release = threading.Event()
+        queue = MissionJobQueue(runner_factory=lambda: FakeRunner(release), workers=1)
+        job = queue.submit(Mission(mission_id="m1", code="print(1)"))
+        updates = queue.subscribe(job.job_id)
+
+        first = await asyncio.wait_for(updates.get(), timeout=2)
+        release.set()
+        second = await asyncio.wait_for(updates.get(), timeout=2)
+
+        assert first["status"] == JobStatus.RUNNING
+        assert second["status"] == JobStatus.SUCCEEDED
+        assert second["result"]["stdout"] == "ok"
+        queue.unsubscribe(job.job_id, updates)
+        await queue.shutdown()
+
+    @pytest.mark.anyio
+    async def test_finished_jobs_are_pruned(self):
+        """Only the most recent finished jobs are kept for polling"""
+        queue = MissionJobQueue(runner_factory=FakeRunner, workers=1, max_finished_jobs=2)
+
+        jobs = [queue.submit(Mission(mission_id=f"m{i}", code="print(1)")) for i in range(4)]
+        await wait_finished(queue, jobs[-1].job_id)
+        queue.submit(Mission(mission_id="m5", code="print(1)"))
+
+        assert queue.get_job(jobs[0].job_id) is None
+        assert queue.get_job(jobs[-1].job_id) is not None
+        await queue.shutdown()
+
+    @pytest.mark.anyio
+    async def test_job_status_shared_across_workers(self, tmp_path):
+        """Another API worker can look up a job through the shared store"""
+        path = str(tmp_path / "state.db")
+        queue = MissionJobQueue(runner_factory=FakeRunner, workers=1, state_store=SQLiteStateStore(path))
+        other = MissionJobQueue(runner_factory=FakeRunner, workers=1, state_store=SQLiteStateStore(path))
+
+        job = queue.submit(Mission(mission_id="m1", code="print(1)"))
+        await wait_finished(queue, job.job_id)
+        await queue.shutdown()
+
+        shared = await other.get_shared_job(job.job_id)
+        assert other.get_job(job.job_id) is None
+        assert shared["status"] == JobStatus.SUCCEEDED
+        assert shared["result"]["stdout"] == "ok"
+        assert await other.get_shared_job("unknown") is None
+
+    @pytest.mark.anyio
+    async def test_shutdown_fails_unfinished_jobs(self, tmp_path):
+        """Jobs the workers will not finish are failed, here and in the shared store"""
+        release = threading.Event()
+        store = SQLiteStateStore(str(tmp_path / "state.db"))
+        queue = MissionJobQueue(runner_factory=lambda: FakeRunner(release), workers=1, state_store=store)
+        running = queue.submit(Mission(mission_id="m1", code="print(1)"))
+        for _ in range(100):
+            if running.status == JobStatus.RUNNING:
+                break
+            await asyncio.sleep(0.01)
+        waiting = queue.submit(Mission(mission_id="m2", code="print(2)"))
+
+        await queue.shutdown()
+        release.set()
+
+        assert running.status == waiting.status == JobStatus.FAILED
+        assert "while the job was running" in running.error
+        assert "before the job started" in waiting.error
+        shared = await queue.get_shared_job(waiting.job_id)
+        assert shared["status"] == JobStatus.FAILED
+        assert queue.get_stats()["depth"] == 0
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""Tests for buffered telemetry ingestion and rollups"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.application.services.telemetry_service import TelemetryService, bucket_start
+from app.domain.models.telemetry import TelemetryRollup, TelemetrySample
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+@pytest.fixture
+def engine():
+    """Create an in-memory SQLite engine for testing"""
+    engine = create_engine("sqlite:///:memory:")
+    SQLModel.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def service(engine):
+    """Create a TelemetryService with a small ring buffer"""
+    return TelemetryService(engine=engine, buffer_size=3)
+
+
+def battery(level, charging=False):
+    return {"battery": {"level": level, "charging": charging}}
+
+
+def test_bucket_start_truncates():
+    at = datetime(2026, 1, 1, 12, 34, 56, 789)
+
+    assert bucket_start(at, "1m") == datetime(2026, 1, 1, 12, 34)
+    assert bucket_start(at, "1h") == datetime(2026, 1, 1, 12, 0)
+    with pytest.raises(ValueError):
+        bucket_start(at, "1d")
+
+
+def test_record_buffers_without_writing(service, engine):
+    """Samples stay in memory until flush"""
+    service.record("phone", {**battery(80), "location": {"latitude": -23.5, "longitude": -46.6}}, T0)
+
+    with Session(engine) as session:
+        assert session.exec(select(TelemetrySample)).all() == []
+    assert service.latest("phone")["lat"] == -23.5
+    assert service.get_stats()["buffered"] == 1
+
+
+def test_ring_buffer_drops_oldest(service):
+    """A device's buffer keeps only the newest buffer_size samples"""
+    for index in range(5):
+        service.record("phone", battery(index), T0 + timedelta(seconds=index))
+
+    assert service.get_stats()["dropped"] == 2
+    assert service.flush() == 3
+
+
+def test_flush_writes_samples_and_rollups(service, engine):
+    """One flush bulk-inserts raw samples and builds 1m/1h buckets"""
+    service.record("phone", battery(80), T0)
+    service.record("phone", battery(70), T0 + timedelta(seconds=30))
+    service.record("phone", battery(60, charging=True), T0 + timedelta(minutes=1))
+
+    assert service.flush() == 3
+    assert service.get_stats()["buffered"] == 0
+
+    minutes = service.history("phone", "1m")
+    assert [point["samples"] for point in minutes] == [2, 1]
+    assert minutes[0]["battery_avg"] == 75
+    assert minutes[0]["battery_min"] == 70 and minutes[0]["battery_max"] == 80
+    assert minutes[1]["charging"] is True
+
+    hours = service.history("phone", "1h")
+    assert len(hours) == 1
+    assert hours[0]["samples"] == 3
+    assert hours[0]["battery_avg"] == 70
+
+
+def test_rollups_merge_across_flushes(service, engine):
+    """Buckets already written are updated, not duplicated"""
+    service.record("phone", battery(90), T0)
+    service.flush()
+    service.record("phone", battery(50), T0 + timedelta(seconds=10))
+    service.flush()
+
+    with Session(engine) as session:
+        rollups = session.exec(select(TelemetryRollup).where(TelemetryRollup.resolution == "1m")).all()
+    assert len(rollups) == 1
+    assert rollups[0].sample_count == 2
+    assert rollups[0].battery_min == 50 and rollups[0].battery_max == 90
+    assert service.history("phone", "1m")[0]["battery_avg"] == 70
+
+
+def test_history_filters_and_limits(service):
+    for minute in range(5):
+        service.record("phone", battery(100 - minute), T0 + timedelta(minutes=minute))
+    service.record("tablet", battery(10), T0)
+    service.flush()
+
+    points = service.history("phone", "1m", since=T0 + timedelta(minutes=1), limit=2)
+
+    assert [point["bucket_start"] for point in points] == [
+        (T0 + timedelta(minutes=3)).isoformat(),
+        (T0 + timedelta(minutes=4)).isoformat(),
+    ]
+    assert len(service.history("tablet", "1m")) == 1
+
+
+def test_retention_removes_old_rows(engine):
+    service = TelemetryService(engine=engine, raw_retention_hours=1, minute_retention_days=1, hour_retention_days=30)
+    service.record("phone", battery(50), T0)
+    service.flush()
+
+    deleted = service.apply_retention(now=T0 + timedelta(days=2))
+
+    assert deleted == {"raw": 1, "1m": 1, "1h": 0}
+    assert service.history("phone", "1m") == []
+    assert len(service.history("phone", "1h")) == 1
+
+
+def test_failed_flush_requeues_samples(service, engine):
+    service.record("phone", battery(50), T0)
+    SQLModel.metadata.drop_all(engine)
+
+    assert service.flush() == 0
+    assert service.get_stats()["failed_flushes"] == 1
+    assert service.get_stats()["buffered"] == 1
+
+    SQLModel.metadata.create_all(engine)
+    assert service.flush() == 1
@@ -309,6 +309,33 @@ def test_get_recent_thoughts(thought_log_service):
     assert all(t.status == InteractionStatus.INTERNAL_MONOLOGUE.value for t in internal_thoughts)
 
 
+def test_thought_pagination_with_cursor(thought_log_service):
+    """Keyset pages are disjoint and follow each listing's order"""
+    from app.core.pagination import encode_cursor
+    
+    for index in range(5):
+        thought_log_service.create_thought(
+            mission_id=f"page_{index}",
+            session_id="session_pages",
+            thought_process=f"Thought {index}",
+        )
+    
+    first = thought_log_service.get_session_thoughts("session_pages", limit=3)
+    rest = thought_log_service.get_session_thoughts(
+        "session_pages", limit=3, cursor=encode_cursor(first[-1].created_at, first[-1].id)
+    )
+    assert [t.mission_id for t in first + rest] == [f"page_{index}" for index in range(5)]
+    
+    newest = thought_log_service.get_recent_thoughts(limit=2)
+    older = thought_log_service.get_recent_thoughts(
+        limit=10, cursor=encode_cursor(newest[-1].created_at, newest[-1].id)
+    )
+    assert [t.mission_id for t in newest + older] == [f"page_{index}" for index in reversed(range(5))]
+    
+    with pytest.raises(ValueError):
+        thought_log_service.get_recent_thoughts(cursor="garbage")
+
+
 def test_successful_attempt_resets_retry_count(thought_log_service):
     """Test that successful attempts show retry_count as 0"""
     mission_id = "test_mission_9"
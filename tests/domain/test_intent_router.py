@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Tests for Domain layer - Intent Router"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from app.domain.models import CommandType
+from app.domain.services.intent_router import HAS_NUMPY, IntentRouter
+
+pytestmark = pytest.mark.skipif(not HAS_NUMPY, reason="NumPy not installed")
+
+
+class TestIntentRouter:
+    """Test cases for the local TF-IDF intent router"""
+
+    @pytest.fixture
+    def router(self):
+        """Create a router with the default examples"""
+        return IntentRouter()
+
+    @pytest.mark.parametrize(
+        "command, command_type, parameter",
+        [
+            ("digita bom dia", CommandType.TYPE_TEXT, "bom dia"),
+            ("escreva pra mim oi", CommandType.TYPE_TEXT, "oi"),
+            ("aperta enter", CommandType.PRESS_KEY, "enter"),
+            ("entre no site g1.com", CommandType.OPEN_URL, "g1.com"),
+            ("vai para youtube.com", CommandType.OPEN_URL, "youtube.com"),
+            ("clica no botão enviar", CommandType.SEARCH_ON_PAGE, "botão enviar"),
+        ],
+    )
+    def test_routes_paraphrases(self, router, command, command_type, parameter):
+        """Test Portuguese paraphrases route to the right type and parameter"""
+        match = router.route(command)
+
+        assert match is not None
+        assert match.command_type == command_type
+        assert match.parameter == parameter
+        assert match.confidence >= router.threshold
+
+    def test_routes_accent_and_inflection_variants(self, router):
+        """Test unaccented and inflected forms still match"""
+        assert router.route("navegue ate github.com").command_type == CommandType.OPEN_URL
+        assert router.route("abrir o firefox").command_type == CommandType.OPEN_BROWSER
+
+    @pytest.mark.parametrize(
+        "command",
+        ["qual a previsão do tempo", "bom dia", "abra o bloco de notas"],
+    )
+    def test_rejects_chat_and_ambiguous_input(self, router, command):
+        """Test chat and ambiguous commands are left for the LLM"""
+        assert router.route(command) is None
+
+    def test_rejects_parameterized_type_without_parameter(self, router):
+        """Test a bare command phrase without its parameter is not routed"""
+        assert router.route("digita") is None
+
+    def test_threshold_controls_acceptance(self):
+        """Test a stricter threshold rejects approximate matches"""
+        strict = IntentRouter(threshold=0.99)
+
+        assert strict.route("escreva pra mim oi") is None
+        assert strict.get_stats()["rejected"] == 1
+
+    def test_train_from_history(self):
+        """Test successful history items extend the index with their carrier phrase"""
+        router = IntentRouter(examples={CommandType.TYPE_TEXT: ["digita"]})
+        history = Mock()
+        history.get_recent_history.return_value = [
+            {
+                "user_input": "manda no terminal ls -la",
+                "command_type": "type_text",
+                "parameters": {"text": "ls -la"},
+                "success": True,
+            },
+            {
+                "user_input": "toca uma música",
+                "command_type": "unknown",
+                "parameters": {},
+                "success": False,
+            },
+        ]
+
+        added = router.train_from_history(history, limit=50)
+        match = router.route("manda no terminal pwd")
+
+        history.get_recent_history.assert_called_once_with(limit=50)
+        assert added == 1
+        assert match.command_type == CommandType.TYPE_TEXT
+        assert match.parameter == "pwd"
+        assert router.get_stats()["trained_examples"] == 1
+
+    def test_train_from_history_tolerates_errors(self, router):
+        """Test a failing history provider leaves the router usable"""
+        history = Mock()
+        history.get_recent_history.side_effect = Exception("db down")
+
+        assert router.train_from_history(history) == 0
+        assert router.route("digita oi").command_type == CommandType.TYPE_TEXT
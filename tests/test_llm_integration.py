@@ -21,8 +21,25 @@ class TestLLMCommandInterpreter:
     
     @pytest.fixture
     def interpreter(self, mock_ai_gateway):
-        """Create LLM command interpreter with mock gateway"""
-        return LLMCommandInterpreter(wake_word="xerife", ai_gateway=mock_ai_gateway)
+        """Create LLM command interpreter with mock gateway (LLM tier only)"""
+        return LLMCommandInterpreter(
+            wake_word="xerife", ai_gateway=mock_ai_gateway, enable_fast_path=False
+        )
+    
+    @pytest.fixture
+    def fast_interpreter(self, mock_ai_gateway):
+        """Create LLM command interpreter with fast path and memo enabled"""
+        return LLMCommandInterpreter(
+            wake_word="xerife", ai_gateway=mock_ai_gateway, enable_fast_path=True, memo_size=2
+        )
+    
+    @staticmethod
+    def _llm_response(content):
+        """Build a mocked Groq-style gateway response"""
+        return {
+            "provider": "groq",
+            "response": MagicMock(choices=[MagicMock(message=MagicMock(content=content))]),
+        }
     
     @pytest.mark.asyncio
     async def test_llm_interpret_type_text_command(self, interpreter, mock_ai_gateway):
@@ -109,10 +126,13 @@ class TestLLMCommandInterpreter:
         assert intent.command_type == CommandType.TYPE_TEXT
         assert intent.parameters.get("text") == "teste"
     
-    def test_synchronous_interpret_uses_fallback(self, interpreter):
+    def test_synchronous_interpret_uses_fallback(self, interpreter, mock_ai_gateway):
         """Test that synchronous interpret uses fallback"""
         intent = interpreter.interpret("xerife escreva hello")
         
+        # The unconfigured gateway reply is not a result dict, so it is unusable
+        mock_ai_gateway.generate_completion.assert_awaited_once()
+        
         # Should use fallback (keyword-based)
         assert intent.command_type == CommandType.TYPE_TEXT
         assert intent.parameters.get("text") == "hello"
@@ -128,6 +148,231 @@ class TestLLMCommandInterpreter:
         assert interpreter.is_cancel_command("cancelar")
         assert interpreter.is_cancel_command("parar")
         assert not interpreter.is_cancel_command("escreva algo")
+    
+    @pytest.mark.asyncio
+    async def test_exact_match_skips_llm(self, fast_interpreter, mock_ai_gateway):
+        """Test exact-match commands never reach the gateway"""
+        intent = await fast_interpreter.interpret_async("Xerife abrir o navegador!")
+        
+        assert intent.command_type == CommandType.OPEN_BROWSER
+        assert not mock_ai_gateway.generate_completion.called
+        assert fast_interpreter.get_tier_stats()["exact"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_keyword_hit_skips_llm(self, fast_interpreter, mock_ai_gateway):
+        """Test unambiguous keyword commands never reach the gateway"""
+        intent = await fast_interpreter.interpret_async("xerife escreva hello world")
+        
+        assert intent.command_type == CommandType.TYPE_TEXT
+        assert intent.parameters["text"] == "hello world"
+        assert not mock_ai_gateway.generate_completion.called
+        assert fast_interpreter.get_tier_stats()["keyword"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_paraphrase_routed_locally(self, fast_interpreter, mock_ai_gateway):
+        """Test paraphrases missed by the keyword matcher are answered by the router"""
+        intent = await fast_interpreter.interpret_async("xerife vai para g1.com")
+        
+        assert intent.command_type == CommandType.OPEN_URL
+        assert intent.parameters["url"] == "https://g1.com"
+        assert not mock_ai_gateway.generate_completion.called
+        stats = fast_interpreter.get_tier_stats()
+        assert stats["router"] == 1
+        assert stats["llm_calls_avoided"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_router_disabled_asks_llm(self, mock_ai_gateway):
+        """Test disabling the router sends paraphrases to the gateway"""
+        interpreter = LLMCommandInterpreter(
+            wake_word="xerife", ai_gateway=mock_ai_gateway, enable_fast_path=True, enable_router=False
+        )
+        mock_ai_gateway.generate_completion.return_value = self._llm_response(
+            '{"command_type": "OPEN_URL", "parameters": {"url": "https://g1.com"}, "confidence": 0.95}'
+        )
+        
+        await interpreter.interpret_async("xerife vai para g1.com")
+        
+        assert mock_ai_gateway.generate_completion.call_count == 1
+        assert interpreter.get_router_stats() == {"enabled": False}
+    
+    @pytest.mark.asyncio
+    async def test_ambiguous_command_memoized(self, fast_interpreter, mock_ai_gateway):
+        """Test repeated ambiguous commands are served from the memo"""
+        mock_ai_gateway.generate_completion.return_value = self._llm_response(
+            '{"command_type": "OPEN_URL", "parameters": {"url": "https://google.com"}, "confidence": 0.98}'
+        )
+        
+        first = await fast_interpreter.interpret_async("xerife abra o google")
+        second = await fast_interpreter.interpret_async("Xerife  ABRA o google?")
+        
+        assert mock_ai_gateway.generate_completion.call_count == 1
+        assert second.command_type == CommandType.OPEN_URL
+        assert second.parameters == first.parameters
+        assert second.raw_input == "ABRA o google?"
+        stats = fast_interpreter.get_tier_stats()
+        assert stats["llm"] == 1
+        assert stats["memo"] == 1
+        assert stats["llm_calls_avoided"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_memo_is_bounded(self, fast_interpreter, mock_ai_gateway):
+        """Test the memo evicts the least recently used command"""
+        mock_ai_gateway.generate_completion.return_value = self._llm_response(
+            '{"command_type": "CHAT", "parameters": {}, "confidence": 0.9}'
+        )
+        
+        for command in ("bom dia", "como vai", "que horas sao", "bom dia"):
+            await fast_interpreter.interpret_async(command)
+        
+        assert mock_ai_gateway.generate_completion.call_count == 4
+        assert fast_interpreter.get_tier_stats()["memo_size"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_failed_llm_call_not_memoized(self, fast_interpreter, mock_ai_gateway):
+        """Test gateway errors are not memoized"""
+        mock_ai_gateway.generate_completion.side_effect = Exception("LLM error")
+        
+        await fast_interpreter.interpret_async("bom dia")
+        await fast_interpreter.interpret_async("bom dia")
+        
+        assert mock_ai_gateway.generate_completion.call_count == 2
+        assert fast_interpreter.get_tier_stats()["fallback"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_unusable_llm_reply_not_memoized(self, fast_interpreter, mock_ai_gateway):
+        """Test low-confidence and unparseable replies fall back without being memoized"""
+        mock_ai_gateway.generate_completion.return_value = self._llm_response(
+            '{"command_type": "CHAT", "parameters": {}, "confidence": 0.1}'
+        )
+        await fast_interpreter.interpret_async("bom dia")
+        mock_ai_gateway.generate_completion.return_value = self._llm_response("not json")
+        await fast_interpreter.interpret_async("bom dia")
+        
+        stats = fast_interpreter.get_tier_stats()
+        assert mock_ai_gateway.generate_completion.call_count == 2
+        assert stats["memo_size"] == 0
+        assert stats["llm"] == 0
+        assert stats["fallback"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_combined_mode_returns_chat_reply(self, fast_interpreter, mock_ai_gateway):
+        """Test combined mode classifies and answers chat input in one completion"""
+        mock_ai_gateway.generate_completion.return_value = self._llm_response(
+            '{"command_type": "CHAT", "parameters": {}, "confidence": 0.9, "response": "Bom dia!"}'
+        )
+        
+        intent = await fast_interpreter.interpret_async("bom dia", conversation_instruction="Persona")
+        
+        assert intent.command_type == CommandType.CHAT
+        assert intent.parameters["response"] == "Bom dia!"
+        assert mock_ai_gateway.generate_completion.call_count == 1
+        messages = mock_ai_gateway.generate_completion.call_args.kwargs["messages"]
+        assert any(message["content"] == "Persona" for message in messages)
+        stats = fast_interpreter.get_tier_stats()
+        assert stats["combined_replies"] == 1
+        assert stats["memo_size"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_lazy_instruction_only_built_for_llm_tier(self, fast_interpreter, mock_ai_gateway):
+        """Test an instruction builder is not awaited when a fast tier answers"""
+        mock_ai_gateway.generate_completion.return_value = self._llm_response(
+            '{"command_type": "CHAT", "parameters": {}, "confidence": 0.9, "response": "Oi!"}'
+        )
+        built = []
+        
+        async def build_instruction():
+            built.append(True)
+            return "Persona"
+        
+        await fast_interpreter.interpret_async("escreva ola", conversation_instruction=build_instruction)
+        assert built == []
+        
+        intent = await fast_interpreter.interpret_async("bom dia", conversation_instruction=build_instruction)
+        assert built == [True]
+        assert intent.parameters["response"] == "Oi!"
+    
+    @pytest.mark.asyncio
+    async def test_chat_without_reply_becomes_unknown(self, fast_interpreter, mock_ai_gateway):
+        """Test a CHAT classification without a reply is left for the conversational path"""
+        mock_ai_gateway.generate_completion.return_value = self._llm_response(
+            '{"command_type": "CHAT", "parameters": {}, "confidence": 0.9}'
+        )
+        
+        intent = await fast_interpreter.interpret_async("bom dia")
+        
+        assert intent.command_type == CommandType.UNKNOWN
+        assert intent.parameters == {"raw_command": "bom dia"}
+
+    
+    @staticmethod
+    def _stream_of(*chunks):
+        """Build a fake stream_completion yielding the chunks as deltas"""
+        calls = []
+        
+        async def stream_completion(messages, force_provider=None):
+            calls.append(messages)
+            for chunk in chunks:
+                yield {"type": "delta", "text": chunk}
+            yield {"type": "done", "text": "".join(chunks), "provider": "groq", "model": "m"}
+        
+        stream_completion.calls = calls
+        return stream_completion
+    
+    @pytest.mark.asyncio
+    async def test_interpret_stream_streams_chat_reply(self, fast_interpreter, mock_ai_gateway):
+        """Test conversational input is classified and answered by one streamed completion"""
+        mock_ai_gateway.stream_completion = self._stream_of(
+            '{"command_type": "CHAT", "parameters": {}, ', '"confidence": 0.9}\nBom dia', ", senhor."
+        )
+        
+        items = [item async for item in fast_interpreter.interpret_stream("bom dia", "Persona")]
+        
+        assert items[:-1] == ["Bom dia", ", senhor."]
+        assert items[-1].command_type == CommandType.CHAT
+        assert items[-1].parameters["response"] == "Bom dia, senhor."
+        assert len(mock_ai_gateway.stream_completion.calls) == 1
+        mock_ai_gateway.generate_completion.assert_not_called()
+        assert fast_interpreter.get_tier_stats()["combined_replies"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_interpret_stream_action_yields_only_intent(self, fast_interpreter, mock_ai_gateway):
+        """Test an action classification ends the stream and is memoized"""
+        mock_ai_gateway.stream_completion = self._stream_of(
+            '{"command_type": "OPEN_URL", "parameters": {"url": "https://g.co"}, "confidence": 0.9}\n', "extra"
+        )
+        
+        items = [item async for item in fast_interpreter.interpret_stream("me leva ao google", "Persona")]
+        
+        assert len(items) == 1
+        assert items[0].command_type == CommandType.OPEN_URL
+        assert fast_interpreter.get_tier_stats()["memo_size"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_interpret_stream_skips_llm_for_fast_tiers(self, fast_interpreter, mock_ai_gateway):
+        """Test fast-tier hits neither stream nor build the instruction"""
+        mock_ai_gateway.stream_completion = self._stream_of("unused")
+        built = []
+        
+        async def build_instruction():
+            built.append(True)
+            return "Persona"
+        
+        items = [item async for item in fast_interpreter.interpret_stream("escreva ola", build_instruction)]
+        
+        assert [item.command_type for item in items] == [CommandType.TYPE_TEXT]
+        assert mock_ai_gateway.stream_completion.calls == []
+        assert built == []
+    
+    @pytest.mark.asyncio
+    async def test_interpret_stream_unparseable_header_uses_fallback(self, fast_interpreter, mock_ai_gateway):
+        """Test a stream that never opens with a classification falls back to keywords"""
+        mock_ai_gateway.stream_completion = self._stream_of("Olá, tudo bem?")
+        
+        items = [item async for item in fast_interpreter.interpret_stream("bom dia", "Persona")]
+        
+        assert len(items) == 1
+        assert items[0].command_type == CommandType.UNKNOWN
+        assert fast_interpreter.get_tier_stats()["fallback"] == 1
 
 
 class TestLLMCapabilityDetector:
@@ -3,17 +3,21 @@
 """
 Jarvis Voice Assistant - Worker for Distributed Mode
 
-This worker runs on the PC and polls the database (Supabase/PostgreSQL)
-for pending commands. When found, it executes them using PyAutoGUI
-and updates the status in the database.
+This worker runs on the PC and takes pending commands from the database
+(Supabase/PostgreSQL). It leases them in batches (several workers can share
+one queue), executes them using PyAutoGUI and updates the status in the
+database. New tasks wake it immediately (PostgreSQL LISTEN/NOTIFY, or the
+API's /v1/tasks/wait long-poll); polling is only a backing-off safety net.
 """
 
 import logging
 import os
+import socket
 import sys
 import time
 
 from app.adapters.infrastructure.sqlite_history_adapter import SQLiteHistoryAdapter
+from app.adapters.infrastructure.task_notifier import HttpTaskWaiter, PollBackoff, PostgresTaskListener
 from app.application.services import AssistantService
 from app.container import create_edge_container
 from app.core.config import settings
@@ -31,6 +35,85 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def execute_claimed_command(
+    assistant: AssistantService,
+    db_adapter: SQLiteHistoryAdapter,
+    pending_command: dict,
+    worker_id: str,
+) -> None:
+    """
+    Execute one claimed command and record its result.
+
+    The result is only recorded while this worker still holds the lease.
+    """
+    logger.info(
+        f"Executing command {pending_command['id']} (attempt {pending_command['attempts']}): "
+        f"{pending_command['user_input']}"
+    )
+    try:
+        # Execute the command
+        response = assistant.process_command(pending_command['user_input'])
+        
+        # Update status based on execution result
+        if response.success:
+            db_adapter.update_command_status(
+                command_id=pending_command['id'],
+                status='completed',
+                success=True,
+                response_text=response.message,
+                worker_id=worker_id,
+            )
+            logger.info(f"Command {pending_command['id']} completed successfully")
+        else:
+            db_adapter.update_command_status(
+                command_id=pending_command['id'],
+                status='failed',
+                success=False,
+                response_text=response.message or response.error or "Unknown error",
+                worker_id=worker_id,
+            )
+            logger.warning(f"Command {pending_command['id']} failed: {response.message}")
+    
+    except Exception as e:
+        # Handle execution errors
+        error_msg = f"Error executing command: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        db_adapter.update_command_status(
+            command_id=pending_command['id'],
+            status='failed',
+            success=False,
+            response_text=error_msg,
+            worker_id=worker_id,
+        )
+
+
+def create_task_waiter(db_adapter: SQLiteHistoryAdapter):
+    """
+    Choose how the worker learns about new tasks.
+
+    Returns:
+        PostgresTaskListener on PostgreSQL, HttpTaskWaiter when JARVIS_API_URL and
+        JARVIS_API_TOKEN are set, otherwise None (polling only)
+    """
+    if db_adapter.engine.dialect.name == "postgresql":
+        try:
+            return PostgresTaskListener(db_adapter.engine)
+        except Exception as e:
+            logger.warning(f"Could not LISTEN for new tasks: {e}")
+
+    api_url = os.getenv("JARVIS_API_URL")
+    token = os.getenv("JARVIS_API_TOKEN")
+    if api_url and token:
+        try:
+            logger.info(f"Long-polling {api_url} for new tasks")
+            return HttpTaskWaiter(api_url, token)
+        except Exception as e:
+            logger.warning(f"Could not long-poll the API for new tasks: {e}")
+
+    logger.info("No task notifications available - polling only")
+    return None
+
+
 def main() -> None:
     """
     Main entry point for the worker.
@@ -60,55 +143,46 @@ def main() -> None:
 
     # Main worker loop
     poll_interval = float(os.getenv("WORKER_POLL_INTERVAL", "2"))
-    logger.info(f"Using poll interval: {poll_interval} seconds")
+    max_poll_interval = float(os.getenv("WORKER_MAX_POLL_INTERVAL", "30"))
+    batch_size = int(os.getenv("WORKER_BATCH_SIZE", "5"))
+    lease_seconds = float(os.getenv("WORKER_LEASE_SECONDS", "120"))
+    worker_id = os.getenv("WORKER_ID") or f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(
+        f"Worker {worker_id}: poll interval {poll_interval}-{max_poll_interval}s, "
+        f"batch {batch_size}, lease {lease_seconds}s"
+    )
+    waiter = create_task_waiter(db_adapter)
+    backoff = PollBackoff(min_interval=poll_interval, max_interval=max_poll_interval)
     
     try:
         while True:
             try:
-                # Get the next pending command
-                pending_command = db_adapter.get_next_pending_command()
+                # Lease a batch; other workers on the same queue never get the same rows
+                commands = db_adapter.claim_batch(batch_size, worker_id, lease_seconds=lease_seconds)
+                
+                for pending_command in commands:
+                    # Earlier commands in the batch may have outlasted this one's lease;
+                    # once another worker has reclaimed it, running it here would repeat it
+                    if not db_adapter.renew_lease(pending_command['id'], worker_id, lease_seconds=lease_seconds):
+                        logger.warning(f"Lease on command {pending_command['id']} was lost - skipping it")
+                        continue
+                    execute_claimed_command(assistant, db_adapter, pending_command, worker_id)
+                
+                if len(commands) == batch_size:
+                    # More may be waiting: claim again right away
+                    backoff.reset()
+                    continue
+                if commands:
+                    backoff.reset()
                 
-                if pending_command:
-                    logger.info(f"Found pending command {pending_command['id']}: {pending_command['user_input']}")
-                    
-                    try:
-                        # Execute the command
-                        response = assistant.process_command(pending_command['user_input'])
-                        
-                        # Update status based on execution result
-                        if response.success:
-                            db_adapter.update_command_status(
-                                command_id=pending_command['id'],
-                                status='completed',
-                                success=True,
-                                response_text=response.message,
-                            )
-                            logger.info(f"Command {pending_command['id']} completed successfully")
-                        else:
-                            db_adapter.update_command_status(
-                                command_id=pending_command['id'],
-                                status='failed',
-                                success=False,
-                                response_text=response.message or response.error or "Unknown error",
-                            )
-                            logger.warning(f"Command {pending_command['id']} failed: {response.message}")
-                    
-                    except Exception as e:
-                        # Handle execution errors
-                        error_msg = f"Error executing command: {str(e)}"
-                        logger.error(error_msg, exc_info=True)
-                        db_adapter.update_command_status(
-                            command_id=pending_command['id'],
-                            status='failed',
-                            success=False,
-                            response_text=error_msg,
-                        )
-                else:
-                    # No pending commands, log less frequently
-                    pass
+                if waiter is None:
+                    # Polling only: a longer sleep would only delay the next task
+                    time.sleep(poll_interval)
+                    continue
                 
-                # Sleep to avoid overloading the database
-                time.sleep(poll_interval)
+                # Queue drained: block until a task is announced, polling as a safety net
+                if waiter.wait(backoff.next_delay()):
+                    backoff.reset()
                 
             except KeyboardInterrupt:
                 logger.info("Received keyboard interrupt - shutting down worker")
@@ -121,6 +195,8 @@ def main() -> None:
     except KeyboardInterrupt:
         logger.info("Worker stopped by user")
     finally:
+        if waiter is not None:
+            waiter.close()
         logger.info("Worker shutdown complete")
 
 